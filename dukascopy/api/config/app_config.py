@@ -13,16 +13,31 @@ class HTTPServiceLimits:
     max_per_page: int = 100
     max_page: int = 1000
 
+@dataclass
+class HTTPResponseCacheConfig:
+    """Response cache of the OHLCV endpoint"""
+    enabled: bool = True
+    # Budget of the cached bodies in memory (per worker process)
+    max_bytes: int = 268435456
+    # Larger responses are not cached
+    max_entry_bytes: int = 33554432
+    # Directory shared by the worker processes (None: memory only)
+    path: Optional[str] = None
+    # Budget of the cached bodies on disk
+    max_disk_bytes: int = 1073741824
+
 @dataclass
 class HTTPServiceConfig:
     """The root configuration for the http-service script."""
     docs: str = "config/dukascopy/http-docs"
     listen: str = "127.0.0.1:8000"
+    flight: str = "grpc://127.0.0.1:8815"
     fmode: str = "binary"
     poolmode: str = "thread"
     reload: int = 1
     workers: int = 4
     limits: HTTPServiceLimits = field(default_factory=HTTPServiceLimits)
+    response_cache: HTTPResponseCacheConfig = field(default_factory=HTTPResponseCacheConfig)
 
 @dataclass
 class AppConfig:
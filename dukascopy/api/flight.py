@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        flight.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Updated:     2026-10-16
+ Description: Apache Arrow Flight server for OHLCV queries.
+
+              This module exposes the OHLCV query DSL of the HTTP API over
+              Arrow Flight (gRPC). A Flight ticket is the same path-encoded
+              query that follows `/ohlcv/1.1/` in the HTTP API, e.g.:
+
+                  select/EUR-USD,1m[rsi_14]/after/2025-01-01+00:00:00/limit/500000
+
+              `limit`, `offset`, `order` and `cursor` are passed as path
+              options (query parameters do not exist in Flight). The cursor
+              of the next page is part of the options in the schema
+              metadata (`next_cursor`). Results are returned
+              as Arrow record batches built from the Polars result frame
+              without any row-wise serialization.
+
+              Responsibilities:
+
+              - Parse tickets with the shared `parse_uri`/`discover_options`
+              - Execute selections via the shared query helpers
+              - Stream record batches (DoGet)
+              - Provide symbol and indicator listings (DoAction)
+
+ Usage:
+     python3 api/flight.py               (listens on http.flight)
+
+     import pyarrow.flight as flight
+     client = flight.connect("grpc://127.0.0.1:8815")
+     table = client.do_get(flight.Ticket(b"select/EUR-USD,1m/limit/100000")).read_all()
+
+ Requirements:
+     - Python 3.8+
+     - PyArrow (with Flight)
+     - Polars
+
+ License:
+     MIT License
+===============================================================================
+"""
+import time
+import orjson
+import pyarrow as pa
+import pyarrow.flight as flight
+
+from pathlib import Path
+from typing import Dict
+
+from util.cache import MarketDataCache
+from util.planner import QueryPlanner
+from api.config.app_config import load_app_config
+from api.v1_1.helper import (
+    parse_uri, discover_options, plan_page, query_select, merge_selects, to_arrow_table,
+    encode_cursor, resolve_cursor, _get_ms, ARROW_BATCH_ROWS
+)
+
+# Upper bound for the number of rows per query (same as the HTTP API)
+MAX_LIMIT = 1000000
+
+# Default number of rows per query (same as the HTTP API)
+DEFAULT_LIMIT = 1440
+
+
+class OHLCVFlightServer(flight.FlightServerBase):
+    """Arrow Flight server executing OHLCV query DSL tickets."""
+
+    def __init__(self, location: str = "grpc://127.0.0.1:8815", **kwargs):
+        """Initialize the Flight server.
+
+        Args:
+            location (str): URI to listen on (e.g. "grpc://0.0.0.0:8815").
+            **kwargs: Forwarded to `pyarrow.flight.FlightServerBase`.
+        """
+        super().__init__(location, **kwargs)
+        self.location = location
+
+    def execute(self, request_uri: str) -> pa.Table:
+        """Execute a path-encoded OHLCV query and return an Arrow table.
+
+        Args:
+            request_uri (str): Query DSL, as used in the HTTP API path.
+
+        Returns:
+            pa.Table: Result table with the query options as schema metadata.
+
+        Raises:
+            ValueError: If the query is invalid.
+        """
+        # Record wall-clock start time
+        time_start = time.time()
+
+        # Parse the request URI into structured options
+        options = parse_uri(request_uri)
+
+        # Flight has no query parameters, pagination is part of the path
+        try:
+            limit = int(options.get("limit", DEFAULT_LIMIT))
+            offset = int(options.get("offset", 0))
+        except ValueError:
+            raise ValueError("limit and offset must be integers")
+
+        order = options.get("order", "asc")
+
+        if not 0 < limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+
+        options.update({
+            "limit": limit,
+            "offset": offset,
+            "order": order,
+            "output_type": "ARROW",
+            "return_polars": True,
+        })
+
+        # Resolve derived options (selects, indicators, modifiers)
+        options = discover_options(options)
+
+        if not options["select_data"]:
+            raise ValueError("Query does not select any data")
+
+        # Resolve temporal bounds
+        after_ms = _get_ms(options.get("after") or "1970-01-01 00:00:00")
+        until_ms = _get_ms(options.get("until") or "3000-01-01 00:00:00")
+
+        # Continue after the last row of the previous page
+        bounds = [(after_ms, until_ms)] * len(options["select_data"])
+        if options.get("cursor"):
+            bounds = resolve_cursor(options["cursor"], options["select_data"], after_ms, until_ms, order)
+
+        # Flight requests already run on their own gRPC worker thread, one
+        # planner shares nested get_data calls across the selects
+        with QueryPlanner():
+            calls = plan_page(options["select_data"], bounds, limit, order)
+            frames = [
+                query_select(item, select_after_ms, select_until_ms, select_limit, order, True)
+                for item, select_after_ms, select_until_ms, select_limit in calls
+            ]
+
+        # Merge and limit all result frames
+        df = merge_selects(frames, options, order)
+
+        # Attach response metadata
+        options["count"] = len(df)
+        options["next_cursor"] = encode_cursor(df, options["select_data"], after_ms, until_ms, limit, order)
+        options["wall"] = time.time() - time_start
+
+        return to_arrow_table(df, options)
+
+    def do_get(self, context, ticket: flight.Ticket):
+        """Stream the result of the query in the ticket as record batches.
+
+        Args:
+            context: Flight server call context.
+            ticket (flight.Ticket): Ticket holding the query DSL (UTF-8).
+
+        Returns:
+            flight.RecordBatchStream: Result stream.
+        """
+        try:
+            table = self.execute(ticket.ticket.decode("utf-8"))
+        except ValueError as e:
+            raise flight.FlightServerError(f"{e}")
+        except Exception as e:
+            # Log full traceback to the service console for debugging
+            import traceback
+            traceback.print_exc()
+            raise flight.FlightServerError(f"{e}")
+
+        # Keep batches bounded so clients can start consuming early
+        return flight.RecordBatchStream(
+            pa.RecordBatchReader.from_batches(
+                table.schema, table.to_batches(max_chunksize=ARROW_BATCH_ROWS)
+            )
+        )
+
+    def list_actions(self, context):
+        """List the supported DoAction types.
+
+        Returns:
+            List[Tuple[str, str]]: Action types and descriptions.
+        """
+        return [
+            ("list_symbols", "Available symbols and their timeframes (JSON)"),
+            ("list_indicators", "Indicator plugins and their metadata (JSON)"),
+        ]
+
+    def do_action(self, context, action: flight.Action):
+        """Execute a listing action and return a single JSON result.
+
+        Args:
+            context: Flight server call context.
+            action (flight.Action): Requested action.
+
+        Yields:
+            flight.Result: JSON encoded listing.
+        """
+        cache = MarketDataCache()
+
+        if action.type == "list_symbols":
+            # Group discovered timeframes by symbol
+            symbols: Dict[str, list] = {}
+            for ds in cache.registry.get_available_datasets():
+                symbols.setdefault(ds.symbol, []).append(ds.timeframe)
+            payload = symbols
+        elif action.type == "list_indicators":
+            payload = cache.indicators.get_metadata_registry()
+        else:
+            raise flight.FlightServerError(f"Unknown action: {action.type}")
+
+        yield flight.Result(orjson.dumps(payload, default=str))
+
+
+def get_config():
+    """Load the HTTP service configuration (user-specific config preferred)."""
+    config_file = 'config.user.yaml' if Path('config.user.yaml').exists() else 'config.yaml'
+    return load_app_config(config_file).http
+
+
+# Entrypoint for running the Flight server
+if __name__ == "__main__":
+    config = get_config()
+    server = OHLCVFlightServer(config.flight)
+    print(f"Arrow Flight server listening on {config.flight}")
+    server.serve()
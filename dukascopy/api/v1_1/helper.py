@@ -8,6 +8,10 @@ Author:      JP Ueberbach
 Created:     2026-01-02
 Updated:     2026-01-23
              2026-02-08 Polars nativeness
+             2026-10-16 Arrow IPC output and shared query execution
+             2026-10-16 K-way merge and limit pushdown for multi-select
+             2026-10-16 Chunked native CSV and NDJSON serialization
+             2026-10-16 Cursor pagination
 
 Core helper utilities for path-based OHLCV query parsing, resolution,
 and output formatting.
@@ -28,7 +32,10 @@ Primary responsibilities:
     - Resolve user selections into concrete dataset definitions using
       filesystem-backed discovery and selection resolution.
     - Enrich query options with resolved symbol/timeframe selections.
-    - Format query results into JSON, JSONP, CSV, or NDJSON outputs.
+    - Execute resolved selections and merge them into one result frame.
+    - Push the row limit down to the individual selections.
+    - Encode and resolve pagination cursors.
+    - Format query results into JSON, JSONP, CSV, NDJSON or Arrow IPC outputs.
     - Apply MT4-compatible CSV formatting when requested.
     - Stream large result sets efficiently to minimize memory usage.
 
@@ -36,8 +43,13 @@ Design notes:
     - Query parsing and dataset resolution are decoupled from data access.
     - Indicator warmup and execution are handled by downstream layers.
     - Streaming responses (CSV, NDJSON) are used for large result sets to
-      reduce memory pressure and latency.
+      reduce memory pressure and latency. They are serialized by Polars
+      in slices of STREAM_CHUNK_ROWS rows (no per-row Python code).
     - Polars is used as the internal DataFrame engine for performance.
+    - Selection results are already sorted by time, multi-select results
+      are k-way merged (util/merge.py) instead of sorted again.
+    - Arrow IPC output hands the Polars buffers to pyarrow without copying
+      and streams them as record batches (no per-row serialization).
 
 Public functions:
     normalize_timestamp(ts: str) -> str
@@ -49,6 +61,27 @@ Public functions:
     discover_options(options: Dict[str, Any]) -> Dict[str, Any]
         Resolve user selections against discovered datasets.
 
+    plan_selects(select_data, after_ms, until_ms, limit, order) -> List[Tuple[int, int]]
+        Compute the row limit and upper time bound of every selection.
+
+    encode_cursor(df, select_data, after_ms, until_ms, limit, order) -> str | None
+        Return the cursor of the page following a result.
+
+    resolve_cursor(cursor, select_data, after_ms, until_ms, order) -> List
+        Resolve a cursor into the time bounds of every selection.
+
+    plan_page(select_data, bounds, limit, order) -> List[Tuple]
+        Return the get_data calls computing one page of a query.
+
+    query_select(item, after_ms, until_ms, limit, order, disable_recursive_mapping)
+        Retrieve OHLCV data and indicators for one resolved selection.
+
+    merge_selects(frames, options, order) -> polars.DataFrame
+        Merge and limit per-selection results.
+
+    to_arrow_table(df: polars.DataFrame, options: Dict[str, Any]) -> pyarrow.Table
+        Convert a result frame into an Arrow table with response metadata.
+
     generate_output(
         df: polars.DataFrame,
         options: Dict[str, Any]
@@ -65,12 +98,16 @@ Internal helpers:
     _stream_csv(...)
         Stream CSV output with optional MT4 compatibility.
 
+    _stream_arrow(...)
+        Stream an Arrow IPC stream of record batches.
+
     _get_ms(...)
         Convert timestamps to epoch milliseconds (UTC).
 
 Requirements:
     - Python 3.8+
     - Polars
+    - PyArrow
     - FastAPI
     - orjson
 
@@ -79,14 +116,18 @@ License:
 ===============================================================================
 """
 
+import base64
 import csv
+import hashlib
 import io
 import orjson
 import re
+import numpy as np
 import polars as pl
+import pyarrow as pa
 
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import unquote_plus
 from pathlib import Path
 from fastapi.responses import PlainTextResponse, StreamingResponse, ORJSONResponse
@@ -98,10 +139,21 @@ from util.discovery import *
 from util.resolver import *
 
 from util.cache import MarketDataCache
+from util.api import get_data
+from util.merge import merge_sorted
 
 # Canonical timestamp format used for human-readable output
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Media type of the Arrow IPC streaming format
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Maximum number of rows per streamed Arrow record batch
+ARROW_BATCH_ROWS = 65536
+
+# Number of rows serialized per streamed CSV/NDJSON chunk
+STREAM_CHUNK_ROWS = 65536
+
 
 def normalize_timestamp(ts: str) -> str:
     """Normalize user-supplied timestamp strings for consistent parsing.
@@ -222,6 +274,323 @@ def discover_options(options: Dict):
         raise
 
 
+def plan_selects(
+    select_data: List,
+    after_ms: int,
+    until_ms: int,
+    limit: int,
+    order: str,
+) -> List[Tuple[int, int]]:
+    """Compute the row limit and upper time bound of every selection.
+
+    A multi-select result holds the first `limit` rows of all selections
+    merged by time. Asking every selection for `limit` rows computes up to
+    `limit * selections` rows (and their indicators) to keep `limit`. The
+    timestamps of the views tell which rows make it into the result: every
+    selection is asked for those only.
+
+    The upper bound of each selection is pinned to one millisecond after
+    the last row seen here, rows appended meanwhile would otherwise shift a
+    descending window. Not to the row itself: a selection whose only row
+    is at after_ms would get an empty window (get_data needs after < until).
+    A dropped open last candle (skiplast) is covered by taking one extra
+    row per selection into account.
+
+    Args:
+        select_data (List): Resolved select tuples.
+        after_ms (int): Lower time bound in epoch milliseconds (inclusive).
+        until_ms (int): Upper time bound in epoch milliseconds (inclusive).
+        limit (int): Maximum number of rows of the merged result.
+        order (str): Sort order ("asc" or "desc").
+
+    Returns:
+        List[Tuple[int, int]]: (limit, until_ms) per selection.
+    """
+    unchanged = [(limit, until_ms)] * len(select_data)
+    if len(select_data) < 2 or not limit:
+        return unchanged
+
+    try:
+        cache = MarketDataCache()
+        windows = []
+        for item in select_data:
+            symbol, timeframe = item[0], item[1]
+            view = cache.discover_view(symbol, timeframe)
+            lo = cache.find_record(symbol, timeframe, after_ms, "left", view=view)
+            hi = cache.find_record(symbol, timeframe, until_ms, "right", view=view)
+            # The rows get_data returns at most (ascending timestamps)
+            if order == "asc":
+                windows.append(np.asarray(view['ts_index'][lo:min(hi, lo + limit)]))
+            else:
+                windows.append(np.asarray(view['ts_index'][max(lo, hi - limit):hi]))
+    except Exception:
+        # Unknown view, the selection reports the error itself
+        return unchanged
+
+    # The result is within the first limit + one row per selection (skiplast)
+    # rows of all windows merged
+    candidates = np.concatenate(windows)
+    needed = limit + len(select_data)
+    if len(candidates) <= needed:
+        return unchanged
+
+    if order == "asc":
+        bound = np.partition(candidates, needed - 1)[needed - 1]
+        counts = [np.searchsorted(ts, bound, side="right") for ts in windows]
+    else:
+        bound = np.partition(candidates, len(candidates) - needed)[len(candidates) - needed]
+        counts = [len(ts) - np.searchsorted(ts, bound, side="left") for ts in windows]
+
+    return [
+        (max(1, min(limit, int(count))), min(until_ms, int(ts[-1]) + 1) if len(ts) else until_ms)
+        for count, ts in zip(counts, windows)
+    ]
+
+
+def _cursor_query(select_data: List, after_ms: int, until_ms: int, order: str) -> str:
+    """Return the fingerprint of the query a cursor belongs to."""
+    payload = orjson.dumps([[[item[0], item[1]] for item in select_data], after_ms, until_ms, order])
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def encode_cursor(
+    df: pl.DataFrame,
+    select_data: List,
+    after_ms: int,
+    until_ms: int,
+    limit: int,
+    order: str,
+) -> Optional[str]:
+    """Return the cursor of the page following a result, None on the last page.
+
+    The token is opaque to clients: base64url encoded JSON holding the time
+    and selection of the last row, the direction and a fingerprint of the
+    query it belongs to.
+
+    Args:
+        df (pl.DataFrame): Merged result of the current page.
+        select_data (List): Resolved select tuples.
+        after_ms (int): Lower time bound of the query.
+        until_ms (int): Upper time bound of the query.
+        limit (int): Page size.
+        order (str): Sort order ("asc" or "desc").
+
+    Returns:
+        str | None: Cursor token, None if the page is not full.
+    """
+    if not limit or df.height < limit or "time_ms" not in df.columns:
+        return None
+
+    last = df.tail(1).to_dicts()[0]
+    payload = {
+        "t": int(last["time_ms"]),
+        "s": [last.get("symbol"), last.get("timeframe")],
+        "o": order,
+        "q": _cursor_query(select_data, after_ms, until_ms, order),
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b"=").decode("ascii")
+
+
+def resolve_cursor(
+    cursor: str,
+    select_data: List,
+    after_ms: int,
+    until_ms: int,
+    order: str,
+) -> List[Optional[Tuple[int, int]]]:
+    """Resolve a cursor into the time bounds of every selection.
+
+    The page continues strictly after the last row of the previous page.
+    Rows with the same time are ordered by symbol and timeframe: selections
+    ordered up to the last row continue one millisecond later, the others
+    still include its time. The bounds are time values, get_data seeks them
+    with a binary search, a page costs O(log n + page) wherever it starts.
+    Candles appended between two pages do not invalidate a cursor.
+
+    Args:
+        cursor (str): Cursor token from a previous page.
+        select_data (List): Resolved select tuples.
+        after_ms (int): Lower time bound of the query (inclusive).
+        until_ms (int): Upper time bound of the query (inclusive).
+        order (str): Sort order ("asc" or "desc").
+
+    Returns:
+        List[Tuple[int, int] | None]: (after_ms, until_ms) per selection,
+        None for selections without rows left.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_ms = int(payload["t"])
+        last_key = tuple(payload["s"])
+        direction = payload["o"]
+        query = payload["q"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if direction != order:
+        raise ValueError(f"Cursor was issued for order={direction}")
+    if query != _cursor_query(select_data, after_ms, until_ms, order):
+        raise ValueError("Cursor does not belong to this query")
+
+    bounds = []
+    for item in select_data:
+        key = (item[0], item[1])
+        if order == "asc":
+            # Ordered up to the last row: its row at last_ms was sent
+            seen = last_key[0] is None or key <= last_key
+            bounds.append((max(after_ms, last_ms + 1 if seen else last_ms), until_ms))
+        else:
+            seen = last_key[0] is None or key >= last_key
+            bounds.append((after_ms, min(until_ms, last_ms - 1 if seen else last_ms)))
+
+    # The bounds are inclusive, a window of a single millisecond still holds
+    # a row (e.g. the only row of a selection sits at after_ms). get_data
+    # needs after < until, candle times are far more than 1 ms apart.
+    return [(lo, max(hi, lo + 1)) if lo <= hi else None for lo, hi in bounds]
+
+
+def plan_page(
+    select_data: List,
+    bounds: List[Optional[Tuple[int, int]]],
+    limit: int,
+    order: str,
+) -> List[Tuple[Any, int, int, int]]:
+    """Return the get_data calls computing one page of a query.
+
+    Selections without rows left (see resolve_cursor) are skipped, the
+    others are limited by plan_selects.
+
+    Args:
+        select_data (List): Resolved select tuples.
+        bounds (List): (after_ms, until_ms) per selection, None if exhausted.
+        limit (int): Maximum number of rows of the merged result.
+        order (str): Sort order ("asc" or "desc").
+
+    Returns:
+        List[Tuple]: (item, after_ms, until_ms, limit) per selection to query.
+    """
+    active = [(item, bound) for item, bound in zip(select_data, bounds) if bound]
+    if not active:
+        return []
+
+    # Bounds of a cursor differ by one millisecond between selections, the
+    # widest window plans a (slightly conservative) limit for all of them
+    after_ms = min(lo for _, (lo, _) in active)
+    until_ms = max(hi for _, (_, hi) in active)
+    plan = plan_selects([item for item, _ in active], after_ms, until_ms, limit, order)
+
+    calls = []
+    for (item, (lo, hi)), (select_limit, select_until_ms) in zip(active, plan):
+        hi = min(hi, select_until_ms)
+        if lo < hi:
+            calls.append((item, lo, hi, select_limit))
+    return calls
+
+
+def query_select(
+    item,
+    after_ms: int,
+    until_ms: int,
+    limit: int,
+    order: str,
+    disable_recursive_mapping: bool,
+) -> pl.DataFrame:
+    """Retrieve OHLCV data and indicators for a single resolved selection.
+
+    This is a blocking call, the HTTP route offloads it to a thread per
+    selection while the Flight server calls it from its own worker threads.
+
+    Args:
+        item (tuple): Resolved select tuple (symbol, timeframe, _, modifiers, indicators).
+        after_ms (int): Lower time bound in epoch milliseconds (inclusive).
+        until_ms (int): Upper time bound in epoch milliseconds (exclusive).
+        limit (int): Maximum number of rows to return.
+        order (str): Sort order ("asc" or "desc").
+        disable_recursive_mapping (bool): Return indicator columns flat.
+
+    Returns:
+        pl.DataFrame: OHLCV rows with indicator columns.
+    """
+    # Unpack resolved select tuple
+    symbol, timeframe, _, modifiers, indicators = item
+
+    # Retrieve OHLCV data and indicators via internal API
+    return get_data(
+        symbol,
+        timeframe,
+        after_ms,
+        until_ms,
+        limit,
+        order,
+        indicators,
+        {
+            "modifiers": modifiers,
+            "disable_recursive_mapping": disable_recursive_mapping,
+            "return_polars": True,
+        },
+    )
+
+
+def merge_selects(frames: List[pl.DataFrame], options: Dict, order: str) -> pl.DataFrame:
+    """Merge, order and limit the results of all select clauses.
+
+    The frames are sorted by time already, they are k-way merged up to the
+    limit. Rows with the same time are ordered by symbol and timeframe (in
+    the query order). Frames that do not qualify (e.g. unsorted) are
+    concatenated and sorted instead.
+
+    Args:
+        frames (List[pl.DataFrame]): Result frame per select clause.
+        options (Dict): Query options including select_data and limit.
+        order (str): Sort order ("asc" or "desc").
+
+    Returns:
+        pl.DataFrame: Merged result frame.
+    """
+    # Every selection was exhausted by the cursor
+    if not frames:
+        return pl.DataFrame(schema={"symbol": pl.Utf8, "timeframe": pl.Utf8, "time_ms": pl.UInt64})
+
+    descending = order != "asc"
+    keyed = all({"symbol", "timeframe"} <= set(df.columns) for df in frames)
+
+    if len(frames) == 1 or keyed:
+        # Rows with the same time are taken in frame order: symbol, timeframe
+        ordered = frames
+        if len(frames) > 1:
+            ordered = sorted(
+                (df for df in frames if df.height),
+                key=lambda df: (df["symbol"][0], df["timeframe"][0]),
+                reverse=descending,
+            )
+        merged = merge_sorted(ordered, options.get("limit") or None, descending)
+        if merged is not None:
+            return merged
+
+    # Concatenate all result frames using Polars
+    df = pl.concat(frames)
+
+    # Default sort order
+    sort_columns = ["time_ms"]
+
+    # Multi-select queries require additional sort keys
+    if len(options["select_data"]) > 1:
+        sort_columns = ["time_ms", "symbol", "timeframe"]
+
+    # Apply final sorting
+    df = df.sort(sort_columns, descending=(order != "asc"))
+
+    # Apply row limit after sorting
+    if options.get("limit"):
+        df = df.head(options["limit"])
+
+    return df
+
+
 def generate_output(df: pl.DataFrame, options: Dict):
     """Generate formatted API output from a Polars DataFrame.
 
@@ -255,6 +624,10 @@ def generate_output(df: pl.DataFrame, options: Dict):
     if options.get("output_type") == "CSV":
         return _stream_csv(df, options)
 
+    # Arrow IPC streaming output (binary, columnar)
+    if options.get("output_type") == "ARROW":
+        return _stream_arrow(df, options)
+
     return None
 
 
@@ -367,6 +740,8 @@ def _format_json(df: pl.DataFrame, options: Dict):
 def _stream_json(df: pl.DataFrame, options: Dict):
     """Stream a Polars DataFrame as newline-delimited JSON (NDJSON).
 
+    Each chunk is a slice of STREAM_CHUNK_ROWS rows serialized by Polars.
+
     Args:
         df (pl.DataFrame): Result DataFrame to stream.
         options (Dict): Query options (unused, reserved for future use).
@@ -374,16 +749,55 @@ def _stream_json(df: pl.DataFrame, options: Dict):
     Returns:
         StreamingResponse: NDJSON streaming response.
     """
-    async def json_generator_fast(df_gen: pl.DataFrame):
-        for record in df_gen.to_dicts():
-            yield orjson.dumps(record) + b"\n"
-
+    def json_generator(df_gen: pl.DataFrame):
+        for offset in range(0, df_gen.height, STREAM_CHUNK_ROWS):
+            sink = io.BytesIO()
+            # Float32 values are written widened, as orjson wrote them
+            df_gen.slice(offset, STREAM_CHUNK_ROWS).with_columns(
+                pl.col(pl.Float32).cast(pl.Float64)
+            ).write_ndjson(sink)
+            yield sink.getvalue()
+
+    # A plain generator, Starlette iterates it on a worker thread
     return StreamingResponse(
-        json_generator_fast(df),
+        json_generator(df),
         media_type="application/x-ndjson"
     )
 
 
+def _python_formatted(df: pl.DataFrame) -> pl.DataFrame:
+    """Format bool and float columns the way `str()` does.
+
+    Keeps the CSV output of the former per-row writer: True/False, nan and
+    1e-07 instead of Polars' true/false, NaN and 1e-7. The digits are the
+    same (shortest round trip), only the notation differs: Python switches
+    to scientific notation below 1e-4 (Polars below 1e-5) and writes the
+    exponent with a sign and at least two digits.
+
+    Args:
+        df (pl.DataFrame): Slice to serialize.
+
+    Returns:
+        pl.DataFrame: The slice with bool and float columns as strings.
+    """
+    exprs = []
+    for name, dtype in df.schema.items():
+        if dtype == pl.Boolean:
+            col = pl.col(name)
+            exprs.append(pl.when(col).then(pl.lit("True")).when(~col).then(pl.lit("False")).alias(name))
+        elif dtype.is_float():
+            exprs.append(
+                pl.col(name).cast(pl.Float64).cast(pl.String)
+                .str.replace(r"^(-?)0\.0000(\d)(\d*)$", "${1}${2}.${3}e-05")
+                .str.replace(r"\.e", "e")
+                .str.replace(r"e(\d)", "e+${1}")
+                .str.replace(r"e([+-])(\d)$", "e${1}0${2}")
+                .str.replace(r"^NaN$", "nan")
+                .alias(name)
+            )
+    return df.with_columns(exprs) if exprs else df
+
+
 def _stream_csv(df: pl.DataFrame, options: Dict):
     """Stream a Polars DataFrame as a CSV response.
 
@@ -417,18 +831,20 @@ def _stream_csv(df: pl.DataFrame, options: Dict):
         df = df.rename({"time_only": "time"})
 
     if not df.is_empty():
-        async def csv_generator_fast(df_csv: pl.DataFrame):
-            # Emit CSV header unless MT4 mode suppresses it
-            if not options.get('mt4'):
-                yield ','.join(df_csv.columns) + '\n'
-
-            # Emit row data
-            for row in df_csv.iter_rows():
-                yield ','.join(str(val) if val is not None else "" for val in row) + '\n'
-
+        def csv_generator(df_csv: pl.DataFrame):
+            # Emit row data, one natively serialized slice at a time. The
+            # first slice carries the header unless MT4 mode suppresses it.
+            for offset in range(0, df_csv.height, STREAM_CHUNK_ROWS):
+                sink = io.BytesIO()
+                _python_formatted(df_csv.slice(offset, STREAM_CHUNK_ROWS)).write_csv(
+                    sink, include_header=(offset == 0 and not options.get('mt4'))
+                )
+                yield sink.getvalue()
+
+        # A plain generator, Starlette iterates it on a worker thread
         filename = options.get('filename', 'data.csv')
         return StreamingResponse(
-            csv_generator_fast(df),
+            csv_generator(df),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -436,6 +852,64 @@ def _stream_csv(df: pl.DataFrame, options: Dict):
     return None
 
 
+def to_arrow_table(df: pl.DataFrame, options: Dict) -> pa.Table:
+    """Convert a result frame into an Arrow table with response metadata.
+
+    The Polars buffers are handed to pyarrow without copying. The query
+    options (including count and wall time) are attached as JSON in the
+    schema metadata under the "options" key.
+
+    Args:
+        df (pl.DataFrame): Result DataFrame.
+        options (Dict): Query options.
+
+    Returns:
+        pa.Table: Arrow table with schema metadata.
+    """
+    # Drop index artifacts if present
+    table = df.drop(["index", "level_0"], strict=False).to_arrow()
+
+    # Attach response metadata (the counterpart of the JSON envelope)
+    return table.replace_schema_metadata({
+        "status": "ok",
+        "options": orjson.dumps(options, default=str),
+    })
+
+
+def _stream_arrow(df: pl.DataFrame, options: Dict):
+    """Stream a Polars DataFrame as an Arrow IPC stream.
+
+    The stream starts with the schema and is followed by record batches of
+    at most ARROW_BATCH_ROWS rows, each yielded as soon as it is encoded.
+    Clients read it with `pyarrow.ipc.open_stream` or `polars.read_ipc_stream`.
+
+    Args:
+        df (pl.DataFrame): Result DataFrame to stream.
+        options (Dict): Query options, attached as schema metadata.
+
+    Returns:
+        StreamingResponse: Arrow IPC streaming response.
+    """
+    table = to_arrow_table(df, options)
+
+    def arrow_generator(table_ipc: pa.Table):
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table_ipc.schema) as writer:
+            for batch in table_ipc.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+                writer.write_batch(batch)
+                # Hand out what has been encoded so far and reset the sink
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate(0)
+        # End-of-stream marker (and the schema for empty results)
+        yield sink.getvalue()
+
+    return StreamingResponse(
+        arrow_generator(table),
+        media_type=ARROW_STREAM_MEDIA_TYPE
+    )
+
+
 def _get_ms(val):
     """Convert a numeric or timestamp value to epoch milliseconds (UTC).
 
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+File:        response_cache.py
+
+Author:      JP Ueberbach
+Created:     2026-10-16
+
+Response cache and conditional GET support for the OHLCV endpoint.
+
+Chart frontends and dashboards poll the same query every few seconds, while
+the underlying data only changes when a candle is written. Every poll used
+to be recomputed and serialized again.
+
+A cached response is keyed on the normalized query options (after
+`parse_uri` and `discover_options`) and stores the versions of every view
+and indicator plugin the query read, as recorded by the request's
+`QueryPlanner`. A lookup revalidates these versions (a dict lookup per view
+with the change watcher running) and serves the stored body when nothing
+changed. The ETag is derived from the query and the versions, a matching
+`If-None-Match` is answered with 304 Not Modified.
+
+Versions are (file path, size, mtime), identical in every worker process.
+With a `path` configured, entries are also written to a directory shared by
+the workers: a response computed by one worker is served by all of them.
+
+Responses of every output type are cached. Streaming responses (CSV, NDJSON,
+Arrow) keep streaming, the chunks are collected while they are sent and the
+entry is stored once the stream completed.
+
+Notes:
+    - A cached JSON envelope is served as it was produced, including its
+      "wall" time.
+    - Views read on threads outside the request context (plugins using
+      their own executor) are not recorded, see util/planner.py.
+
+Requirements:
+    - Python 3.8+
+    - FastAPI
+    - orjson
+
+License:
+    MIT License
+===============================================================================
+"""
+
+import hashlib
+import os
+import threading
+import orjson
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from util.cache import MarketDataCache, view_version
+from util.indicator import plugin_version
+
+# Options that do not affect the response body
+VOLATILE_OPTIONS = ("wall", "count")
+
+# Headers replayed from the original response
+REPLAYED_HEADERS = ("content-disposition", "x-next-cursor")
+
+
+@dataclass
+class CachedResponse:
+    """A serialized response and the versions it was computed from."""
+    etag: str
+    reads: Dict[Tuple[str, Hashable], Tuple]
+    body: bytes
+    media_type: Optional[str]
+    headers: Dict[str, str]
+    status_code: int = 200
+
+
+def matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return whether an If-None-Match header matches an ETag (weak comparison).
+
+    Args:
+        if_none_match (str | None): Header value, a list of ETags or "*".
+        etag (str): Current ETag.
+    """
+    if not if_none_match:
+        return False
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    current = opaque(etag)
+    return any(tag.strip() == "*" or opaque(tag) == current for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Return a 304 Not Modified response for an ETag."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses with a byte budget.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entry_bytes: int = 32 * 1024 * 1024,
+        path: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Budget of the cached bodies in memory.
+            max_entry_bytes: Larger responses are not cached.
+            path: Directory shared by the worker processes, None for memory only.
+            max_disk_bytes: Budget of the cached bodies on disk.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.path = Path(path) if path else None
+        self.max_disk_bytes = max_disk_bytes
+
+        # Key digest -> CachedResponse, least recently used first
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Bytes written to disk since the last prune
+        self._written = 0
+
+        # Statistics (tests, profiling)
+        self.hits = 0
+        self.misses = 0
+
+        if self.path:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(options: Dict) -> str:
+        """Return the cache key of normalized query options."""
+        normalized = {k: v for k, v in options.items() if k not in VOLATILE_OPTIONS}
+        payload = orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    @staticmethod
+    def etag(key: str, reads: Dict) -> str:
+        """Return the ETag of a query computed from the given versions."""
+        versions = orjson.dumps(sorted([list(name), list(version)] for name, version in reads.items()))
+        digest = hashlib.blake2b(key.encode() + versions, digest_size=16).hexdigest()
+        # Weak: a recomputed body differs in its wall time
+        return f'W/"{digest}"'
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """
+        Return the cached response of a query if it is still current.
+
+        Blocking (file system checks), to be called from a worker thread.
+
+        Args:
+            key (str): Cache key of the query.
+
+        Returns:
+            CachedResponse | None: The entry, None if missing or outdated.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.path:
+            entry = self._load(key)
+            if entry is not None:
+                self._insert(key, entry)
+
+        if entry is None or not self._current(entry):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def respond(self, entry: CachedResponse, if_none_match: Optional[str]) -> Response:
+        """Return the response for a cache hit (304 if the client has it)."""
+        if matches(if_none_match, entry.etag):
+            return not_modified(entry.etag)
+
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+        return Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            media_type=entry.media_type,
+            headers=headers,
+        )
+
+    async def store(self, key: str, reads: Dict, response: Response, if_none_match: Optional[str]) -> Response:
+        """
+        Cache a computed response and return the response to send.
+
+        Streaming responses are wrapped, their body is cached once it has
+        been sent completely. Files are written on a worker thread.
+
+        Args:
+            key (str): Cache key of the query.
+            reads (Dict): Views and plugins read by the query (QueryPlanner.reads).
+            response (Response): The computed response.
+            if_none_match (str | None): If-None-Match header of the request.
+
+        Returns:
+            Response: The response to send, 304 if the client has it.
+        """
+        reads = dict(reads)
+        etag = self.etag(key, reads)
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name in REPLAYED_HEADERS
+        }
+
+        def entry(body: bytes) -> CachedResponse:
+            return CachedResponse(etag, reads, body, response.media_type, headers, response.status_code)
+
+        if isinstance(response, StreamingResponse):
+            # The client has it, the computed stream is dropped unsent
+            if matches(if_none_match, etag):
+                return not_modified(etag)
+            response.body_iterator = self._collect(key, response.body_iterator, response.charset, entry)
+        else:
+            if len(response.body) <= self.max_entry_bytes:
+                await self._put_async(key, entry(response.body))
+            if matches(if_none_match, etag):
+                return not_modified(etag)
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def clear(self) -> None:
+        """Drop all entries held in memory."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    async def _collect(self, key, body_iterator, charset, entry):
+        """Pass the chunks of a streaming response through, cache the body at the end."""
+        chunks = []
+        size = 0
+        async for chunk in body_iterator:
+            if size <= self.max_entry_bytes:
+                data = chunk if isinstance(chunk, bytes) else chunk.encode(charset)
+                chunks.append(data)
+                size += len(data)
+            yield chunk
+
+        if size <= self.max_entry_bytes:
+            await self._put_async(key, entry(b"".join(chunks)))
+
+    @staticmethod
+    def _current(entry: CachedResponse) -> bool:
+        """Return whether the views and plugins of an entry are unchanged."""
+        cache = MarketDataCache()
+        try:
+            for (kind, name), version in entry.reads.items():
+                if kind == "view":
+                    current = view_version(cache.discover_view(*name))
+                else:
+                    plugin = cache.indicators.refresh([name]).get(name)
+                    current = plugin_version(plugin) if plugin else None
+                if current != version:
+                    return False
+        except Exception:
+            # Dataset removed or not readable, recompute (and fail there)
+            return False
+        return True
+
+    def _put(self, key: str, entry: CachedResponse) -> None:
+        """Store an entry in memory and on disk."""
+        self._insert(key, entry)
+        if self.path:
+            self._save(key, entry)
+
+    async def _put_async(self, key: str, entry: CachedResponse) -> None:
+        """Store an entry in memory, write it to disk without blocking the event loop."""
+        self._insert(key, entry)
+        if self.path:
+            await run_in_threadpool(self._save, key, entry)
+
+    def _insert(self, key: str, entry: CachedResponse) -> None:
+        """Store an entry in memory, evicting least recently used entries."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        """Read an entry from the shared directory, a corrupt file is a miss."""
+        file_path = self.path / f"{key}.bin"
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            # Recently used files are pruned last
+            os.utime(file_path)
+        except OSError:
+            return None
+
+        try:
+            header_size = int.from_bytes(data[:4], "little")
+            header = orjson.loads(data[4:4 + header_size])
+            reads = {
+                (kind, tuple(name) if isinstance(name, list) else name): tuple(version)
+                for kind, name, version in header["reads"]
+            }
+            return CachedResponse(
+                header["etag"], reads, data[4 + header_size:],
+                header["media_type"], header["headers"], header["status_code"]
+            )
+        except (ValueError, KeyError, TypeError):
+            # Truncated or foreign file (orjson.JSONDecodeError is a ValueError),
+            # drop it so it is written again
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            return None
+
+    def _save(self, key: str, entry: CachedResponse) -> None:
+        """Write an entry to the shared directory (atomic replace)."""
+        header = orjson.dumps({
+            "etag": entry.etag,
+            "reads": [[kind, name, version] for (kind, name), version in entry.reads.items()],
+            "media_type": entry.media_type,
+            "headers": entry.headers,
+            "status_code": entry.status_code,
+        })
+        file_path = self.path / f"{key}.bin"
+        temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(len(header).to_bytes(4, "little"))
+                f.write(header)
+                f.write(entry.body)
+            os.replace(temp_path, file_path)
+        except OSError:
+            # The disk cache is optional, memory still serves this worker
+            return
+
+        self._written += len(entry.body)
+        if self._written > self.max_disk_bytes // 10:
+            self._written = 0
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete least recently used files until the disk budget is met."""
+        files = []
+        for item in os.scandir(self.path):
+            if item.name.endswith(".bin"):
+                try:
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+                except OSError:
+                    continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, file_path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            total -= size
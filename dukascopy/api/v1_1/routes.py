@@ -9,6 +9,12 @@ Created:     2026-01-12
 Updated:     2026-01-15
              2026-01-23
              2026-02-08 Polars nativeness
+             2026-10-16 Arrow IPC output
+             2026-10-16 Request-scoped query planner
+             2026-10-16 Response cache and conditional GET
+             2026-10-16 Single-flight coalescing of identical queries
+             2026-10-16 Multi-select limit pushdown and k-way merge
+             2026-10-16 Cursor pagination
 
 FastAPI router implementing the public OHLCV query and indicator execution API.
 
@@ -23,7 +29,10 @@ The router is responsible for:
     - Discovering available symbols, timeframes, and indicator plugins
     - Retrieving OHLCV data from the underlying data layer
     - Executing indicator logic and post-processing results
-    - Serializing responses into JSON, JSONP, or CSV
+    - Serializing responses into JSON, JSONP, CSV or Arrow IPC
+    - Serving unchanged query results from the response cache (ETag/304)
+    - Sharing one computation between identical concurrent queries
+    - Paging through long histories with opaque cursors
 
 Execution Model:
     - Incoming requests are parsed into an internal options dictionary
@@ -64,21 +73,24 @@ import time
 import orjson
 import re
 import pandas as pd
-import polars as pl
 import asyncio
 
 from starlette.concurrency import run_in_threadpool
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Header
 from fastapi.responses import PlainTextResponse, JSONResponse
 from typing import Optional
 from pathlib import Path
 from functools import lru_cache
 
 from util.cache import MarketDataCache
+from util.planner import QueryPlanner, AsyncSingleFlight
 from api.config.app_config import load_app_config
-from api.v1_1.helper import parse_uri, discover_options, generate_output, _get_ms
+from api.v1_1.helper import (
+    parse_uri, discover_options, generate_output, plan_page, query_select, merge_selects,
+    encode_cursor, resolve_cursor, _get_ms,
+)
+from api.v1_1.response_cache import ResponseCache
 from api.v1_1.version import API_VERSION
-from util.api import get_data
 
 
 @lru_cache
@@ -97,6 +109,29 @@ def get_config():
     return load_app_config(config_file)
 
 
+@lru_cache
+def get_response_cache():
+    """
+    Create the response cache of the OHLCV endpoint (one per process).
+
+    Returns:
+        ResponseCache | None: The cache, None if disabled in the configuration.
+    """
+    settings = get_config().http.response_cache
+    if not settings.enabled:
+        return None
+    return ResponseCache(
+        max_bytes=settings.max_bytes,
+        max_entry_bytes=settings.max_entry_bytes,
+        path=settings.path,
+        max_disk_bytes=settings.max_disk_bytes,
+    )
+
+
+# Identical queries in flight in this worker (e.g. polls on the minute boundary)
+QUERIES_IN_FLIGHT = AsyncSingleFlight()
+
+
 # Initialize the FastAPI router for versioned OHLCV endpoints
 router = APIRouter(
     prefix=f"/ohlcv/{API_VERSION}",
@@ -338,11 +373,14 @@ async def get_ohlcv(
     limit: Optional[int] = Query(1440, gt=0, le=1000000),
     offset: Optional[int] = Query(0, ge=0, le=1000000),
     order: Optional[str] = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = None,
     callback: Optional[str] = "__bp_callback",
     filename: Optional[str] = "data.csv",
     id: Optional[str] = None,
     subformat: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
     config=Depends(get_config),
+    response_cache=Depends(get_response_cache),
 ):
     """
     Execute a path-based OHLCV query and return market data.
@@ -354,16 +392,28 @@ async def get_ohlcv(
     Internally, Polars is used as the execution engine for performance.
     Output formatting is delegated to shared helper utilities.
 
+    Responses are cached on the normalized query and the versions of the
+    views and plugins it read. Unchanged results are served from the cache,
+    or answered with 304 Not Modified when If-None-Match holds their ETag.
+
+    A full page carries the cursor of the next page (options.next_cursor
+    and the X-Next-Cursor header). Passing it back as `cursor` continues
+    after the last row, seeking the views by time instead of re-reading
+    them from `after`.
+
     Args:
         request_uri (str): Path-encoded OHLCV query DSL.
         limit (Optional[int]): Maximum number of rows to return.
         offset (Optional[int]): Row offset for pagination.
         order (Optional[str]): Sort order ("asc" or "desc").
+        cursor (Optional[str]): Cursor of the page to return (from a previous page).
         callback (Optional[str]): JSONP callback function name.
         filename (Optional[str]): Output filename when CSV is requested.
         id (Optional[str]): Optional request identifier.
         subformat (Optional[int]): Optional alternate JSON format selector.
+        if_none_match (Optional[str]): ETag(s) of a previously received response.
         config: Injected application configuration.
+        response_cache: Injected response cache (None if disabled).
 
     Returns:
         dict | PlainTextResponse | JSONResponse:
@@ -387,6 +437,12 @@ async def get_ohlcv(
         }
     )
 
+    # The cursor is part of the query (and of its cache key), the path
+    # form (as used by Flight) is accepted too
+    cursor = cursor or options.get("cursor")
+    if cursor:
+        options["cursor"] = cursor
+
     # Echo request id back to the client
     if id:
         options["id"] = id
@@ -416,68 +472,78 @@ async def get_ohlcv(
         limit = options.get("limit", 1000)
         order = options.get("order", "desc")
 
-        # Disable recursive mapping for CSV and specific subformats
-        disable_recursive_mapping = (
-            options.get("output_type") == "CSV" or options.get("subformat") == 3
-        )
-
-        # Collect Polars DataFrames for each select clause
-        select_df = []
-
-        tasks = []
-
-        for item in options["select_data"]:
-            # Unpack resolved select tuple
-            symbol, timeframe, _, modifiers, indicators = item
-
-            # run_in_threadpool offloads the blocking 'get_data' call to a thread
-            tasks.append(
-                # Retrieve OHLCV data and indicators via internal API
-                run_in_threadpool(
-                    get_data,
-                    symbol,
-                    timeframe,
-                    after_ms,
-                    until_ms,
-                    limit,
-                    order,
-                    indicators,
-                    {
-                        "modifiers": modifiers,
-                        "disable_recursive_mapping": disable_recursive_mapping,
-                        "return_polars": True,
-                    },
-                )
-            )
-
-        # This allows multiple symbols to be calculated on different threads simultaneously.
-        select_df = await asyncio.gather(*tasks)
-
-        # Concatenate all result frames using Polars
-        enriched_df = pl.concat(select_df)
+        # Continue after the last row of the previous page
+        bounds = [(after_ms, until_ms)] * len(options["select_data"])
+        if cursor:
+            bounds = resolve_cursor(cursor, options["select_data"], after_ms, until_ms, order)
 
-        # Default sort order
-        sort_columns = ["time_ms"]
+        # Unchanged since cached: serve the stored body (or 304)
+        if response_cache is not None:
+            cache_key = response_cache.key(options)
+            cached = await run_in_threadpool(response_cache.lookup, cache_key)
+            if cached is not None:
+                return response_cache.respond(cached, if_none_match)
 
-        # Multi-select queries require additional sort keys
-        if len(options["select_data"]) > 1:
-            sort_columns = ["time_ms", "symbol", "timeframe"]
-
-        # Apply final sorting
-        enriched_df = enriched_df.sort(sort_columns, descending=(order != "asc"))
+        # Disable recursive mapping for CSV, Arrow and specific subformats
+        disable_recursive_mapping = (
+            options.get("output_type") in ("CSV", "ARROW") or options.get("subformat") == 3
+        )
 
-        # Apply row limit after sorting
-        if options.get("limit"):
-            enriched_df = enriched_df.head(options["limit"])
+        async def execute():
+            # One planner for the whole request: nested get_data calls made by
+            # the indicators of all selects are computed once (the threadpool
+            # inherits the request context)
+            with QueryPlanner() as planner:
+                # Ask every selection only for the rows the merge can use
+                calls = await run_in_threadpool(plan_page, options["select_data"], bounds, limit, order)
+
+                tasks = []
+
+                for item, select_after_ms, select_until_ms, select_limit in calls:
+                    # run_in_threadpool offloads the blocking 'get_data' call to a thread
+                    tasks.append(
+                        run_in_threadpool(
+                            query_select,
+                            item,
+                            select_after_ms,
+                            select_until_ms,
+                            select_limit,
+                            order,
+                            disable_recursive_mapping,
+                        )
+                    )
+
+                # This allows multiple symbols to be calculated on different threads simultaneously.
+                select_df = await asyncio.gather(*tasks)
+
+            # Merge and limit all result frames
+            return merge_selects(select_df, options, order), planner.reads
+
+        # Identical queries running concurrently share one execution (the
+        # output format is applied per request)
+        query_key = QueryPlanner.key(
+            options["select_data"], bounds, limit, order, disable_recursive_mapping
+        )
+        enriched_df, reads = await QUERIES_IN_FLIGHT.run(query_key, execute)
 
         # Attach response metadata
         options["count"] = len(enriched_df)
+        options["next_cursor"] = encode_cursor(
+            enriched_df, options["select_data"], after_ms, until_ms, limit, order
+        )
         options["wall"] = time.time() - time_start
 
         # Generate serialized output
         output = generate_output(enriched_df, options)
 
         if output:
+            # Streaming outputs have no envelope, the cursor goes in a header
+            if options["next_cursor"]:
+                output.headers["X-Next-Cursor"] = options["next_cursor"]
+
+            if response_cache is not None:
+                # The planner recorded the views and plugins the query read
+                return await response_cache.store(cache_key, reads, output, if_none_match)
             return output
 
         raise Exception("Unsupported content type")
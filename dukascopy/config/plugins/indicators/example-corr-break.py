@@ -15,7 +15,8 @@ def meta() -> Dict:
         "panel": 1,
         "verified": 1,
         "polars": 0,
-        "polars_input": 1
+        "polars_input": 1,
+        "executor": "thread"        # Calls get_data, shares the request planner
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -33,7 +34,7 @@ def position_args(args: List[str]) -> Dict[str, Any]:
 
 def calculate(df: pl.DataFrame, options: Dict[str, Any]) -> pl.DataFrame:
     from util.api import get_data
-    from concurrent.futures import ThreadPoolExecutor
+    from util.planner import submit
     import numpy as np
 
     # Parse options
@@ -77,12 +78,11 @@ def calculate(df: pl.DataFrame, options: Dict[str, Any]) -> pl.DataFrame:
             .sort("time_ms")
         )
     
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        f1 = executor.submit(fetch_symbol_data, symbol1, "val1")
-        f2 = executor.submit(fetch_symbol_data, symbol2, "val2")
+    f1 = submit(fetch_symbol_data, symbol1, "val1")
+    f2 = submit(fetch_symbol_data, symbol2, "val2")
         
-        lazy1 = f1.result()
-        lazy2 = f2.result()
+    lazy1 = f1.result()
+    lazy2 = f2.result()
     
     timeline = df.select([pl.col("time_ms").cast(pl.UInt64)]).lazy()
     
@@ -15,7 +15,8 @@ def meta() -> Dict:
         "version": 1.0,
         "panel": 1,
         "verified": 1,
-        "polars_input": 1
+        "polars_input": 1,
+        "executor": "thread"        # Calls get_data, shares the request planner
     }
 
 def position_args(args: List[str]) -> Dict[str, Any]:
@@ -18,7 +18,7 @@ def description() -> str:
     )
 
 def meta() -> Dict:
-    return {"author": "JP", "version": "2.2.0", "panel": 1, "verified": 1}
+    return {"author": "JP", "version": "2.2.0", "panel": 1, "verified": 1, "executor": "thread"}
 
 def position_args(args: List[str]) -> Dict[str, Any]:
     return {
@@ -16,7 +16,8 @@ def meta() -> Dict:
         "panel": 1,
         "verified": 1,
         "polars": 0,
-        "polars_input": 1
+        "polars_input": 1,
+        "executor": "thread"        # Calls get_data, shares the request planner
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -35,7 +36,7 @@ def position_args(args: List[str]) -> Dict[str, Any]:
 def calculate(df: pl.DataFrame, options: Dict[str, Any]) -> pl.DataFrame:
     # Import here so these only load when the function actually runs
     from util.api import get_data
-    from concurrent.futures import ThreadPoolExecutor
+    from util.planner import submit
     import polars as pl
 
     # Toggle for performance profiling (leave False in production)
@@ -110,17 +111,16 @@ def calculate(df: pl.DataFrame, options: Dict[str, Any]) -> pl.DataFrame:
         )
 
     # Fetch RSI data for three timeframes in parallel to save time
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        f_current = executor.submit(fetch_indicator_data, tf, "rsi", rsi_col)
-        f_4h = executor.submit(fetch_indicator_data, "4h", "rsi4h", rsi_col_4h)
-        f_1d = executor.submit(fetch_indicator_data, "1d", "rsi1d", rsi_col_1d)
-        f_1W = executor.submit(fetch_indicator_data, "1W", "rsi1W", rsi_col_1W)
-
-        # Wait for all fetches to finish
-        lazy_current = f_current.result()
-        lazy_4h = f_4h.result()
-        lazy_1d = f_1d.result()
-        lazy_1W = f_1W.result()
+    f_current = submit(fetch_indicator_data, tf, "rsi", rsi_col)
+    f_4h = submit(fetch_indicator_data, "4h", "rsi4h", rsi_col_4h)
+    f_1d = submit(fetch_indicator_data, "1d", "rsi1d", rsi_col_1d)
+    f_1W = submit(fetch_indicator_data, "1W", "rsi1W", rsi_col_1W)
+
+    # Wait for all fetches to finish
+    lazy_current = f_current.result()
+    lazy_4h = f_4h.result()
+    lazy_1d = f_1d.result()
+    lazy_1W = f_1W.result()
 
     # Make a flat timeline to join into
     timeline = df.select([pl.col("time_ms").cast(pl.UInt64)]).lazy()
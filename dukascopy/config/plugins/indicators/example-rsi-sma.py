@@ -13,7 +13,8 @@ def meta() -> Dict:
         "version": 1.8,
         "panel": 1,
         "verified": 1,
-        "polars": 0
+        "polars": 0,
+        "executor": "thread"        # Calls get_data, shares the request planner
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -5,10 +5,12 @@
  File:        aggregate.py
  Author:      JP Ueberbach
  Created:     2025-12-19
- Updated:     2025-12-23
+ Updated:     2026-10-16
               Strengthening of code
               - Optional fsync
               - Custom exceptions for better traceability
+              - Skip already aggregated dates without filesystem checks
+              - Direct appends from the transform stage (binary fmode)
  Description: Incremental OHLCV aggregation engine.
 
               This module provides:
@@ -17,12 +19,18 @@
               - AggregateWorker: Manages the aggregation lifecycle for a symbol 
                 across a range of dates.
 
+              With `transform.direct_aggregate` the transform stage appends
+              historic days to the symbol file itself (`append_day`), using
+              the same index protocol as `process_date`. Only the live day
+              still goes through a per-day file and this stage.
+
  Requirements:
      - Python 3.8+
      - Pandas
 ===============================================================================
 """
 import os
+import pandas as pd
 from pathlib import Path
 from datetime import date, datetime
 from typing import Tuple, List
@@ -84,6 +92,20 @@ class AggregateEngine:
         
         return path
 
+    def last_date(self) -> date:
+        """Return the last aggregated date according to the index.
+
+        Returns:
+            date: Last aggregated date, 1970-01-01 if nothing was aggregated yet.
+        """
+        if not self.index_path.exists():
+            return date(1970, 1, 1)
+
+        index = ResampleIOFactory.get_index_handler(self.index_path, self.fmode, fsync=self.config.fsync)
+        date_int, _, _ = index.read()
+        date_str = str(date_int)
+        return date(year=int(date_str[:4]), month=int(date_str[4:6]), day=int(date_str[6:8]))
+
     def process_date(self, dt: date) -> bool:
         """Aggregate a single day of CSV data into the master output file.
 
@@ -170,6 +192,81 @@ class AggregateEngine:
         return True
 
 
+    def append_day(self, dt: date, df: pd.DataFrame) -> bool:
+        """Append a transformed day straight to the master output file.
+
+        Same crash-safe protocol as `process_date`, with the day's records
+        taken from memory instead of a per-day file: the index decides
+        whether the date is new, already partially aggregated (resume after
+        the committed input position) or already done, the output is
+        rewound to the last committed position, the records are written and
+        the index is updated last.
+
+        Only supported for binary fmode (fixed record size).
+
+        Args:
+            dt (date): The trading date of the records.
+            df (pd.DataFrame): Transformed OHLCV records of the whole day.
+
+        Returns:
+            bool: True if records were appended; False if the date was
+                already processed or there was nothing new.
+
+        Raises:
+            ProcessingError: If the fmode is not binary.
+            TransactionError: If a disk I/O error occurs.
+        """
+        if self.fmode != "binary":
+            raise ProcessingError(f"Direct aggregation requires binary fmode, got {self.fmode}")
+
+        # Initialize index reader
+        index = ResampleIOFactory.get_index_handler(self.index_path, self.fmode, fsync=self.config.fsync)
+
+        # Read the index
+        date_int, input_position, output_position = index.read()
+
+        # Convert into date object
+        date_str = str(date_int)
+        date_from = date(year=int(date_str[:4]), month=int(date_str[4:6]), day=int(date_str[6:8]))
+
+        if dt < date_from:
+            # Already processed date, return
+            return False
+
+        if dt > date_from:
+            # New date, start from the first record
+            input_position = 0
+
+        # Input positions are byte offsets into the (virtual) day file
+        record_size = ResampleIOReaderBinary.DTYPE.itemsize
+        records = df.iloc[input_position // record_size:]
+
+        if records.empty:
+            return False
+
+        try:
+            writer = ResampleIOFactory.get_writer(self.output_path, self.fmode, fsync=self.config.fsync)
+
+            with writer:
+                # Initialize output position if this is the first write
+                if output_position == 0:
+                    output_position = writer.tell()
+
+                # Crash-safety: rewind output file to last committed position
+                writer.truncate(output_position)
+
+                writer.write_batch(records, offset=output_position)
+                writer.flush()
+
+                dt_int = int(dt.strftime('%Y%m%d'))
+
+                index.write(len(df) * record_size, writer.tell(), dt_int)
+        except OSError as e:
+                raise TransactionError(f"I/O failure during direct aggregation of {self.symbol} for {dt}: {e}")
+
+        return True
+
+
 class AggregateWorker:
     """
     Orchestrates the aggregation process for a symbol across multiple dates.
@@ -207,8 +304,14 @@ class AggregateWorker:
         """
 
         try:
+            # Dates before the last aggregated date are complete, skip them
+            # without resolving their input files (full backfill date ranges)
+            last_date = self.engine.last_date()
+
             # For each date
             for dt in self.dates:
+                if dt < last_date:
+                    continue
                 # Process date using engine
                 self.engine.process_date(dt)
 
@@ -5,6 +5,7 @@
  File:        app_config.py
  Author:      JP Ueberbach
  Created:     2025-11-09
+ Updated:     2026-10-16
  Description: Application configuration loader and YAML include resolver.
 
               This module defines the dataclass-based configuration schema for 
@@ -111,6 +112,8 @@ class ResampleSymbol:
     batch_size: Optional[int] = None
     fsync: Optional[bool] = None
     fmode: Optional[str] = None
+    engine: Optional[str] = None
+    fused: Optional[bool] = None
     skip_timeframes: List[str] = field(default_factory=list)
     timeframes: Dict[str, ResampleTimeframe] = field(default_factory=dict)
     timezone: str = ""
@@ -125,6 +128,8 @@ class ResampleConfig:
     batch_size: int = 250_000
     fmode: str = "binary"
     fsync: bool = False
+    engine: str = "pandas"
+    fused: bool = False
     paths: ResamplePaths = field(default_factory=ResamplePaths)
     timeframes: Dict[str, ResampleTimeframe] = field(default_factory=dict)
     symbols: Dict[str, ResampleSymbol] = field(default_factory=dict)
@@ -163,6 +168,10 @@ class DownloadConfig:
     paths: DownloadPaths = field(default_factory=DownloadPaths)
     mode: str = "requests"
     jitter: float = 0.5
+    connections: int = 2
+    concurrency: int = 16
+    format: str = "json"
+    compression: str = "zlib"
 
 @dataclass
 class TransformDateRange:
@@ -208,6 +217,8 @@ class TransformConfig:
     fmode: Optional[str] = None
     fsync: bool = False
     validate: bool = False
+    batch_days: int = 1
+    direct_aggregate: bool = False
     paths: TransformPaths = field(default_factory=TransformPaths)
     timezones: Dict[str, TransformTimezone] = field(default_factory=dict)
     symbols: Dict[str, TransformSymbol] = field(default_factory=dict)
@@ -219,12 +230,15 @@ class OrchestratorPaths:
     downloads: str = "cache"
     transforms: str = "data/transform/1m"
     locks: str = "data/locks"
+    manifest: str = "data/manifest"
 
 @dataclass
 class OrchestratorConfig:
     """Root configuration for the orchestrator."""
     num_processes: Optional[int] = None
     disable_download: Optional[bool] = False 
+    pipelined: bool = True
+    manifest: bool = True
     paths: OrchestratorPaths = field(default_factory=OrchestratorPaths)
 
 
@@ -373,6 +387,13 @@ def resample_get_symbol_config(symbol: str, app_config: AppConfig) -> ResampleSy
     # fmode binary, inherit from global
     symbol_override.fmode = merged_config.fmode
 
+    # Resample engine (pandas or polars), symbol may override the global one
+    symbol_override.engine = symbol_override.engine or merged_config.engine
+
+    # Fused cascade (all timeframes from a single pass), inherit if not set
+    if symbol_override.fused is None:
+        symbol_override.fused = merged_config.fused
+
     def normalize_tf(tf: ResampleTimeframe) -> ResampleTimeframe:
         """Normalize timeframe pre/post processing steps.
 
@@ -5,7 +5,7 @@
 File:        download.py
 Author:      JP Ueberbach
 Created:     2025-12-19
-Updated:     2026-02-08
+Updated:     2026-10-16
 
 Purpose:
     Download worker responsible for orchestrating Dukascopy candle downloads
@@ -37,7 +37,12 @@ Typical Call Stack:
     fork_download()
         -> DownloadWorker.run()
             -> DownloadEngine.fetch_data()
-            -> DownloadEngine.filter_backfilled_items()
+            -> DownloadWorker.persist()
+
+    run_bulk_download()                 (mode: async, single process)
+        -> DownloadEngineBulk.fetch_data()   (shared pool + token bucket)
+        -> DownloadWorker.persist()
+        -> on_complete(symbol, dt)           (e.g. hand off to transform)
 
 Requirements:
     - Python 3.8+
@@ -60,11 +65,12 @@ import time
 
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Iterable, Optional, Tuple
 
 from config.app_config import AppConfig
 from exceptions import ForkProcessError
 from downloaders.factory import DownloadFactory
+from etl.io.archive import RawArchive, raw_archive_path
 
 
 class DownloadWorker:
@@ -81,13 +87,15 @@ class DownloadWorker:
     This class is intentionally boring and explicit.
     """
 
-    def __init__(self, app_config: AppConfig):
+    def __init__(self, app_config: AppConfig, engine=None):
         """
         Initialize the download worker.
 
         Args:
             app_config: Global application configuration containing
                 download settings and filesystem paths.
+            engine: Optional engine instance to use instead of creating
+                one (the bulk stage shares a single engine).
         """
         self.app_config = app_config
         self.config = app_config.download
@@ -95,11 +103,51 @@ class DownloadWorker:
         # Resolve the correct engine implementation via factory.
         # This allows switching between HTTP/2 and legacy requests
         # without changing worker logic.
-        self.engine = DownloadFactory.get_engine(
+        self.engine = engine or DownloadFactory.get_engine(
             self.config,
             mode=self.config.mode,
         )
 
+    def _first_new_candle(self, data_cache: dict, data_temp: dict):
+        """
+        Find the first downloaded candle that is newer than the cache.
+
+        Timestamps are reconstructed from Dukascopy's delta-encoded format.
+
+        Args:
+            data_cache: Cached payload (non-empty).
+            data_temp: Newly downloaded payload.
+
+        Returns:
+            Index of the first candle strictly after the last cached candle,
+            None if there are no new candles.
+        """
+        # ------------------------------------
+        # Compute last timestamp in cache
+        # ------------------------------------
+        cut_off = (
+            np.cumsum(
+                np.asarray(data_cache["times"], dtype=np.int64)
+                * data_cache["shift"]
+            )
+            + data_cache["timestamp"]
+        )[-1]
+
+        # ------------------------------------
+        # Compute timestamps for new data
+        # ------------------------------------
+        times_temp = (
+            np.cumsum(
+                np.asarray(data_temp["times"], dtype=np.int64)
+                * data_temp["shift"]
+            )
+            + data_temp["timestamp"]
+        )
+
+        # Identify candles strictly AFTER the cutoff
+        indices = np.where(times_temp > cut_off)[0]
+        return indices[0] if indices.size > 0 else None
+
     def _filter_backfilled_items(self, temp_path: Path, cache_path: Path) -> bool:
         """
         Merge forward-only candle data into an existing cache file.
@@ -132,32 +180,7 @@ class DownloadWorker:
             if not data_cache["times"]:
                 return False
 
-            # ------------------------------------
-            # Compute last timestamp in cache
-            # ------------------------------------
-            cut_off = (
-                np.cumsum(
-                    np.array(data_cache["times"], dtype=np.int64)
-                    * data_cache["shift"]
-                )
-                + data_cache["timestamp"]
-            )[-1]
-
-            # ------------------------------------
-            # Compute timestamps for new data
-            # ------------------------------------
-            times_temp = (
-                np.cumsum(
-                    np.array(data_temp["times"], dtype=np.int64)
-                    * data_temp["shift"]
-                )
-                + data_temp["timestamp"]
-            )
-
-            # Identify candles strictly AFTER the cutoff
-            mask = times_temp > cut_off
-            indices = np.where(mask)[0]
-            start_idx = indices[0] if indices.size > 0 else None
+            start_idx = self._first_new_candle(data_cache, data_temp)
 
             if start_idx is not None:
                 # Append new candles column-by-column (explicit on purpose)
@@ -267,6 +290,38 @@ class DownloadWorker:
             if not content:
                 return False
 
+            return self.persist(symbol, dt, content)
+
+        except Exception:
+            # Let the caller decide how to handle failures.
+            raise
+
+    def persist(self, symbol: str, dt: date, content: str) -> bool:
+        """
+        Merge and atomically write a downloaded payload.
+
+        Steps:
+            1. Write data to a temporary file
+            2. Merge forward-only candles if cache exists
+            3. Atomically replace the target file
+            4. Cleanup obsolete live files
+
+        Args:
+            symbol: Trading symbol of the payload.
+            dt: Date of the payload (UTC).
+            content: Raw JSON payload.
+
+        Returns:
+            True if the file was written.
+        """
+        try:
+            # Resolve filesystem paths
+            target, hist_path, live_path, is_historical = self._resolve_paths(symbol, dt)
+
+            # Finalized days go into the monthly archive (live days stay JSON)
+            if is_historical and self.config.format == "archive":
+                return self._persist_archive(symbol, dt, content, live_path)
+
             # Ensure target directory exists
             target.parent.mkdir(parents=True, exist_ok=True)
 
@@ -302,6 +357,119 @@ class DownloadWorker:
             raise
 
 
+    def _persist_archive(self, symbol: str, dt: date, content: str, live_path: Path) -> bool:
+        """
+        Merge a finalized day and store it in the monthly raw archive.
+
+        Same forward-only merge as the JSON cache: the live file (if any)
+        or the already archived day is extended with the newer candles.
+
+        Args:
+            symbol: Trading symbol of the payload.
+            dt: Date of the payload (UTC, not today).
+            content: Raw JSON payload.
+            live_path: Live staging file of the day.
+
+        Returns:
+            True if the day was written.
+        """
+        archive = RawArchive(
+            raw_archive_path(self.config.paths.historic, symbol, dt),
+            self.config.compression
+        )
+        data = orjson.loads(content)
+
+        # Prefer live cache if it exists, otherwise the archived day
+        data_cache = orjson.loads(live_path.read_bytes()) if live_path.is_file() else archive.read(dt)
+
+        if data_cache is not None and len(data_cache["times"]):
+            start_idx = self._first_new_candle(data_cache, data)
+            merged = dict(data_cache)
+            if start_idx is not None:
+                # Append new candles column-by-column
+                for col in ("times", "opens", "highs", "lows", "closes", "volumes"):
+                    merged[col] = np.concatenate(
+                        (np.asarray(data_cache[col]), np.asarray(data[col])[start_idx:])
+                    )
+            data = merged
+
+        archive.write(dt, data)
+
+        # Day is finalized, remove stale live file
+        live_path.unlink(missing_ok=True)
+        return True
+
+
+def run_bulk_download(
+    tasks: Iterable[tuple],
+    app_config: AppConfig,
+    on_complete: Optional[Callable[[str, date], None]] = None,
+    engine=None,
+) -> int:
+    """
+    Download all symbol/date tasks from a single process with asyncio.
+
+    All tasks share one pooled HTTP/2 engine and one token bucket, so
+    `rate_limit_rps` is enforced globally. At most `concurrency` downloads
+    are in flight. Every completed payload is persisted (forward-only merge,
+    atomic replace) and reported to `on_complete`, which lets the caller
+    start the transform of that file while downloads continue.
+
+    Args:
+        tasks: Iterable of (symbol, dt, app_config) tuples, same shape as
+            the fork_download tasks.
+        app_config: Global application configuration.
+        on_complete: Optional callback(symbol, dt), called from the event
+            loop for every written file.
+        engine: Optional engine instance (defaults to mode "async").
+
+    Returns:
+        Number of files written.
+
+    Raises:
+        ForkProcessError: On the first failed download, remaining downloads
+            are cancelled.
+    """
+    engine = engine or DownloadFactory.get_engine(app_config.download, mode="async")
+    worker = DownloadWorker(app_config, engine=engine)
+    queue = iter(tasks)
+    written = 0
+
+    async def download_loop():
+        nonlocal written
+        # Coroutines pull from a shared iterator, no per-task coroutine
+        for symbol, dt, _ in queue:
+            try:
+                content = await engine.fetch_data(engine.get_url(symbol, dt))
+                if not content:
+                    continue
+
+                # Disk writes run in a thread to keep the connections busy
+                if await asyncio.to_thread(worker.persist, symbol, dt, content):
+                    written += 1
+                    if on_complete:
+                        on_complete(symbol, dt)
+            except Exception as e:
+                raise ForkProcessError(
+                    f"Error during bulk download for symbol={symbol}, date={dt}"
+                ) from e
+
+    async def main():
+        async with engine.client:
+            loops = [
+                asyncio.create_task(download_loop())
+                for _ in range(max(1, app_config.download.concurrency))
+            ]
+            try:
+                await asyncio.gather(*loops)
+            finally:
+                for task in loops:
+                    task.cancel()
+
+    asyncio.run(main())
+    return written
+
+
 def fork_download(args: tuple) -> bool:
     """
     Multiprocessing entry point for downloading a single symbol/date pair.
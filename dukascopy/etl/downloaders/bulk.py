@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+File:        bulk.py
+Author:      JP Ueberbach
+Created:     2026-10-16
+Updated:     2026-10-16
+
+Purpose:
+    Pooled HTTP/2 download engine with a global token-bucket rate limiter,
+    used by the single-process asyncio download stage (mode: async).
+
+    The forked download stage creates one engine (and one connection) per
+    task and enforces `rate_limit_rps` per process only. This engine is
+    created ONCE per run and shared by all concurrent download coroutines:
+
+        - One httpx.AsyncClient with a small pool of HTTP/2 connections
+        - One token bucket: `rate_limit_rps` is the global request rate
+        - Retry/backoff behavior inherited from DownloadEngineHTTP2
+
+Design Notes:
+    - The token bucket holds at most one token, requests are spaced evenly
+      (no bursts after idle periods)
+    - Retries consume tokens too, the endpoint never sees more than the
+      configured rate
+
+Requirements:
+    - Python 3.8+
+    - httpx (with h2)
+
+License:
+    MIT License
+===============================================================================
+"""
+
+import time
+import asyncio
+import httpx
+
+from config.app_config import DownloadConfig
+from etl.downloaders.http2 import DownloadEngineHTTP2
+
+
+class TokenBucket:
+    """
+    Asyncio token-bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` per second up to `capacity`.
+    Every `acquire` takes one token, waiting until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens per second. Zero or negative disables limiting.
+            capacity: Maximum number of tokens (burst size).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = None
+
+    async def acquire(self) -> None:
+        """
+        Take one token, waiting for the refill if the bucket is empty.
+        """
+        if self.rate <= 0:
+            return
+
+        # Created lazily so the bucket binds to the running event loop
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+
+        # Waiters queue on the lock, tokens are handed out in FIFO order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class DownloadEngineBulk(DownloadEngineHTTP2):
+    """
+    HTTP/2 download engine for many concurrent downloads in one event loop.
+
+    One instance serves the whole download stage. All coroutines share the
+    connection pool and the token bucket.
+    """
+
+    def __init__(self, config: DownloadConfig):
+        """
+        Initialize the pooled HTTP/2 download engine.
+
+        Args:
+            config: Download-specific configuration. `connections` sets the
+                pool size, `rate_limit_rps` the global request rate.
+        """
+        self.config = config
+
+        # Small pool of persistent connections, requests are multiplexed
+        self.limits = httpx.Limits(
+            max_connections=config.connections,
+            max_keepalive_connections=config.connections,
+            keepalive_expiry=60.0,
+        )
+
+        # Persistent HTTP/2 client shared by all download coroutines
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=self.limits,
+            timeout=config.timeout,
+        )
+
+        # Global rate limit across all concurrent requests
+        self.bucket = TokenBucket(config.rate_limit_rps)
+
+    async def _throttle(self) -> None:
+        """
+        Wait for a token from the shared bucket.
+        """
+        await self.bucket.acquire()
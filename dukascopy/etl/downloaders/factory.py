@@ -5,7 +5,7 @@
 File:        download.py
 Author:      JP Ueberbach
 Created:     2025-12-19
-Updated:     2026-02-08
+Updated:     2026-10-16
 
 Purpose:
     Factory module for selecting and instantiating Dukascopy download engines.
@@ -51,6 +51,7 @@ from typing import Union
 from config.app_config import DownloadConfig
 from etl.downloaders.requests import DownloadEngineRequests
 from etl.downloaders.http2 import DownloadEngineHTTP2
+from etl.downloaders.bulk import DownloadEngineBulk
 
 
 class DownloadFactory:
@@ -71,7 +72,7 @@ class DownloadFactory:
     def get_engine(
         config: DownloadConfig,
         mode: str = "http2",
-    ) -> Union[DownloadEngineRequests, DownloadEngineHTTP2]:
+    ) -> Union[DownloadEngineRequests, DownloadEngineHTTP2, DownloadEngineBulk]:
         """
         Return a download engine instance based on the requested mode.
 
@@ -82,6 +83,8 @@ class DownloadFactory:
                 Supported values:
                     - "http2": HTTP/2 multiplexed engine (recommended)
                     - "requests": Legacy requests-based engine
+                    - "async": Pooled HTTP/2 engine with a global token
+                      bucket, for the single-process asyncio stage
 
         Returns:
             An initialized download engine instance matching the requested mode.
@@ -99,6 +102,12 @@ class DownloadFactory:
         if mode == "http2":
             return DownloadEngineHTTP2(config)
 
+        # Pooled HTTP/2 engine:
+        # - One instance per run, shared by all download coroutines
+        # - rate_limit_rps is enforced globally (token bucket)
+        if mode == "async":
+            return DownloadEngineBulk(config)
+
         # Legacy requests engine:
         # - Easier to debug
         # - Slower
@@ -109,7 +118,7 @@ class DownloadFactory:
         # If we reach this point, the caller passed nonsense
         raise ValueError(
             f"Unknown download mode: {mode}. "
-            "Valid options are 'http2' or 'requests'."
+            "Valid options are 'http2', 'requests' or 'async'."
         )
 
     @staticmethod
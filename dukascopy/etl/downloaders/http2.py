@@ -5,7 +5,7 @@
 File:        download.py
 Author:      JP Ueberbach
 Created:     2025-12-19
-Updated:     2026-02-08
+Updated:     2026-10-16
 
 Purpose:
     HTTP/2-based download engine for Dukascopy minute-level delta JSON
@@ -132,6 +132,25 @@ class DownloadEngineHTTP2:
             f"{symbol}/BID/{dt.year}/{dt.month}/{dt.day}"
         )
 
+    async def _throttle(self) -> None:
+        """
+        Wait until the next request is allowed by the rate limit.
+
+        The default implementation enforces a minimum interval between
+        requests of this process. Engines with a shared limiter override this.
+        """
+        min_interval = (
+            1.0 / self.config.rate_limit_rps
+            if self.config.rate_limit_rps > 0
+            else 0
+        )
+
+        elapsed = time.monotonic() - DownloadEngineHTTP2.last_request_time
+        sleep_needed = max(0.0, min_interval - elapsed)
+
+        if sleep_needed > 0:
+            await asyncio.sleep(sleep_needed)
+
     async def fetch_data(self, url: str) -> str:
         """
         Download raw JSON candle data from Dukascopy.
@@ -159,17 +178,7 @@ class DownloadEngineHTTP2:
                 # -------------------------------
                 # Global rate limiting
                 # -------------------------------
-                min_interval = (
-                    1.0 / self.config.rate_limit_rps
-                    if self.config.rate_limit_rps > 0
-                    else 0
-                )
-
-                elapsed = time.monotonic() - DownloadEngineHTTP2.last_request_time
-                sleep_needed = max(0.0, min_interval - elapsed)
-
-                if sleep_needed > 0:
-                    await asyncio.sleep(sleep_needed)
+                await self._throttle()
 
                 # -------------------------------
                 # Perform HTTP request
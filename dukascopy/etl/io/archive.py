@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        archive.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+
+ Description:
+     Packed monthly archive for raw Dukascopy candle downloads.
+
+     The download stage stores every (symbol, day) as raw JSON by default.
+     Every transform re-parses that JSON and converts it list by list into
+     NumPy arrays. With `download.format: archive` historic days are stored
+     in one binary file per symbol and month instead:
+
+         {historic}/{YYYY}/{MM}/{symbol}_{YYYYMM}.dka
+
+     Layout:
+
+         Header     64 bytes   magic "DUKARAW1", version
+         Directory  31 x 24    per day: offset, length, raw length,
+                               candle count, codec
+         Blocks     ...        one block per day, appended
+
+     A day block holds the scalar base values of the Dukascopy payload
+     (timestamp, shift, multiplier, open, high, low, close) followed by the
+     delta-encoded columns (times, opens, highs, lows, closes) and the
+     volumes. Every column is stored with the narrowest lossless dtype
+     (int8 ... int64, decimal-scaled integers, float32, float64), the block
+     is optionally compressed (zlib, or zstd when the `zstandard` package is
+     installed).
+
+     Reading a day is a directory lookup, one read and `np.frombuffer`
+     views on the (decompressed) block, no parsing. The decoded payload is
+     a dict with the same keys as the JSON payload, so the transform engine
+     consumes both formats.
+
+     Concurrency:
+         - Writers (download workers) serialize per month on a file lock
+         - A rewritten day is appended, the directory entry is switched
+           afterwards. Readers never see partial blocks
+         - Files with more dead than live bytes are compacted (atomic
+           replace)
+
+ Usage:
+     Imported by the download and transform stages. Command line:
+
+         python3 etl/io/archive.py pack [--symbol S ...] [--delete]
+         python3 etl/io/archive.py remove --from YYYY-MM-DD [--to YYYY-MM-DD] [--symbol S ...]
+
+ Requirements:
+     - Python 3.8+
+     - numpy
+     - filelock
+     - zstandard (optional)
+
+ Exceptions:
+     - ProcessingError: Raised for malformed payloads or corrupt archives.
+     - ConfigurationError: Raised for unknown or unavailable codecs.
+===============================================================================
+"""
+import os
+import re
+import zlib
+import argparse
+import numpy as np
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from filelock import FileLock
+
+from etl.exceptions import *
+
+# zstd is optional, zlib (stdlib) is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File extension of monthly archives
+RAW_ARCHIVE_EXTENSION = ".dka"
+
+# File magic and format version
+RAW_ARCHIVE_MAGIC = b"DUKARAW1"
+RAW_ARCHIVE_VERSION = 1
+
+# Supported codecs (stored per block)
+RAW_ARCHIVE_CODECS = {"none": 0, "zlib": 1, "zstd": 2}
+
+# Scalar base values and columns of a Dukascopy candle payload
+RAW_ARCHIVE_SCALARS = ("timestamp", "shift", "multiplier", "open", "high", "low", "close")
+RAW_ARCHIVE_COLUMNS = ("times", "opens", "highs", "lows", "closes", "volumes")
+
+# Column dtypes, the code is stored in the block header
+RAW_ARCHIVE_DTYPES = [np.dtype(t) for t in ("<i1", "<i2", "<i4", "<i8", "<f4", "<f8")]
+
+# Maximum number of decimals for decimal-scaled float columns (e.g. volumes)
+RAW_ARCHIVE_MAX_DECIMALS = 8
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("reserved", "u1", (52,)),
+])
+
+DIRECTORY_DTYPE = np.dtype([
+    ("offset", "<u8"),       # Block position in the file, 0 = no data
+    ("length", "<u4"),       # Stored (compressed) block size
+    ("raw_length", "<u4"),   # Decompressed block size
+    ("count", "<u4"),        # Number of candles
+    ("codec", "u1"),         # RAW_ARCHIVE_CODECS value
+    ("padding", "u1", (3,)),
+])
+
+BLOCK_DTYPE = np.dtype([
+    ("count", "<u4"),
+    ("codes", "u1", (6,)),   # RAW_ARCHIVE_DTYPES index per column
+    ("scales", "u1", (6,)),  # Decimals of scaled integer columns (0 = none)
+    ("timestamp", "<i8"),
+    ("shift", "<i8"),
+    ("multiplier", "<f8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+])
+
+# One directory entry per possible day of month
+DIRECTORY_DAYS = 31
+DATA_START = HEADER_DTYPE.itemsize + DIRECTORY_DAYS * DIRECTORY_DTYPE.itemsize
+
+
+def raw_archive_path(root: str, symbol: str, dt: date) -> Path:
+    """
+    Return the monthly archive file of a symbol/date.
+
+    Args:
+        root: Historic downloads directory.
+        symbol: Trading symbol.
+        dt: Any date of the month.
+
+    Returns:
+        Path of the archive.
+    """
+    return Path(root) / dt.strftime(f"%Y/%m/{symbol}_%Y%m{RAW_ARCHIVE_EXTENSION}")
+
+
+def _narrowest_int(array: np.ndarray) -> Tuple[int, np.ndarray]:
+    """Convert an integer array to the smallest integer dtype holding it."""
+    low, high = int(array.min()), int(array.max())
+    for code, dtype in enumerate(RAW_ARCHIVE_DTYPES[:4]):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return code, array.astype(dtype)
+    return 3, array.astype(np.int64)
+
+
+def _narrowest(values) -> Tuple[int, int, np.ndarray]:
+    """
+    Convert a column to its narrowest lossless representation.
+
+    Floats with few decimals (e.g. volumes) are stored as integers scaled by
+    10^decimals. Division is correctly rounded, so `ints / 10^decimals` is
+    the same double as the parsed decimal. Every conversion is verified.
+
+    Returns:
+        Tuple[int, int, np.ndarray]: Dtype code, decimals and converted array.
+    """
+    array = np.asarray(values)
+    if array.size == 0:
+        return 0, 0, array.astype(RAW_ARCHIVE_DTYPES[0])
+
+    if array.dtype.kind in "iub":
+        code, ints = _narrowest_int(array)
+        return code, 0, ints
+
+    array = array.astype(np.float64)
+    if np.all(np.isfinite(array)):
+        for decimals in range(RAW_ARCHIVE_MAX_DECIMALS + 1):
+            scaled = np.round(array * 10 ** decimals)
+            if np.abs(scaled).max() >= 2 ** 53:
+                break
+            # Exact roundtrip only, -0.0 is kept as float
+            if np.array_equal(scaled / 10 ** decimals, array) and not np.any(np.signbit(array) & (array == 0)):
+                code, ints = _narrowest_int(scaled.astype(np.int64))
+                return code, decimals, ints
+
+    narrow = array.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64), array, equal_nan=True):
+        return 4, 0, narrow
+    return 5, 0, array
+
+
+def raw_archive_encode(data: dict) -> Tuple[bytes, int]:
+    """
+    Encode a Dukascopy candle payload into an (uncompressed) day block.
+
+    Args:
+        data: Parsed payload (JSON lists or NumPy arrays).
+
+    Returns:
+        Tuple[bytes, int]: Block bytes and number of candles.
+
+    Raises:
+        ProcessingError: If the payload misses keys or columns differ in length.
+    """
+    try:
+        columns = [_narrowest(data[name]) for name in RAW_ARCHIVE_COLUMNS]
+        header = np.zeros(1, dtype=BLOCK_DTYPE)
+        for name in RAW_ARCHIVE_SCALARS:
+            header[name] = data[name]
+    except KeyError as e:
+        raise ProcessingError(f"Malformed candle payload: missing key {e}")
+    except (TypeError, ValueError) as e:
+        raise ProcessingError(f"Malformed candle payload: {e}")
+
+    count = len(columns[0][2])
+    if any(len(array) != count for _, _, array in columns):
+        raise ProcessingError("Malformed candle payload: column lengths differ")
+
+    header["count"] = count
+    header["codes"] = [code for code, _, _ in columns]
+    header["scales"] = [decimals for _, decimals, _ in columns]
+
+    # Columns are 8-byte aligned for aligned frombuffer views
+    parts = [header.tobytes()]
+    for _, _, array in columns:
+        raw = array.tobytes()
+        parts.append(raw + b"\0" * (-len(raw) % 8))
+    return b"".join(parts), count
+
+
+def raw_archive_decode(block: bytes) -> dict:
+    """
+    Decode a day block into a payload dict (arrays are views on the block).
+
+    Args:
+        block: Uncompressed block bytes.
+
+    Returns:
+        dict: Payload with the same keys as the Dukascopy JSON.
+    """
+    header = np.frombuffer(block, dtype=BLOCK_DTYPE, count=1)[0]
+    count = int(header["count"])
+
+    data = {
+        "timestamp": int(header["timestamp"]),
+        "shift": int(header["shift"]),
+        "multiplier": float(header["multiplier"]),
+        "open": float(header["open"]),
+        "high": float(header["high"]),
+        "low": float(header["low"]),
+        "close": float(header["close"]),
+    }
+
+    position = BLOCK_DTYPE.itemsize
+    for name, code, decimals in zip(RAW_ARCHIVE_COLUMNS, header["codes"], header["scales"]):
+        dtype = RAW_ARCHIVE_DTYPES[code]
+        data[name] = np.frombuffer(block, dtype=dtype, count=count, offset=position)
+        if decimals:
+            # Decimal-scaled floats, the only column that is not a view
+            data[name] = data[name] / 10 ** int(decimals)
+        size = count * dtype.itemsize
+        position += size + (-size % 8)
+
+    return data
+
+
+class RawArchive:
+    """
+    Monthly archive of raw candle payloads for one symbol.
+    """
+
+    def __init__(self, path: Path, codec: str = "zlib", fsync: bool = False):
+        """
+        Initialize the archive handle (the file is opened per operation).
+
+        Args:
+            path: Archive file path (see `raw_archive_path`).
+            codec: Compression for written blocks: none, zlib or zstd.
+            fsync: Force blocks and directory updates to disk.
+
+        Raises:
+            ConfigurationError: If the codec is unknown or unavailable.
+        """
+        if codec not in RAW_ARCHIVE_CODECS:
+            raise ConfigurationError(f"Unknown archive codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ConfigurationError("Archive codec zstd requires the zstandard package")
+
+        self.path = Path(path)
+        self.codec = codec
+        self.fsync = fsync
+        self.lock_path = self.path.with_suffix(self.path.suffix + ".lock")
+
+    def _read_directory(self, f) -> np.ndarray:
+        """Read and validate header and directory from an open file."""
+        raw = f.read(DATA_START)
+        if len(raw) < DATA_START:
+            raise ProcessingError(f"Archive truncated: {self.path}")
+
+        header = np.frombuffer(raw, dtype=HEADER_DTYPE, count=1)[0]
+        if header["magic"] != RAW_ARCHIVE_MAGIC or header["version"] != RAW_ARCHIVE_VERSION:
+            raise ProcessingError(f"Not a raw archive (or unsupported version): {self.path}")
+
+        # Writable copy, entries are updated in place by writers
+        return np.frombuffer(raw, dtype=DIRECTORY_DTYPE, count=DIRECTORY_DAYS,
+                             offset=HEADER_DTYPE.itemsize).copy()
+
+    def directory(self) -> Optional[np.ndarray]:
+        """
+        Return the day directory, None if the archive does not exist.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                return self._read_directory(f)
+        except FileNotFoundError:
+            return None
+
+    def fingerprint(self, dt: date) -> Optional[Tuple[int, int]]:
+        """
+        Return (length, offset) of a day block, None if the day is missing.
+
+        The fingerprint changes whenever the day is rewritten.
+        """
+        directory = self.directory()
+        if directory is None:
+            return None
+        entry = directory[dt.day - 1]
+        if entry["offset"] == 0:
+            return None
+        return int(entry["length"]), int(entry["offset"])
+
+    def has(self, dt: date) -> bool:
+        """Check whether a day is stored."""
+        return self.fingerprint(dt) is not None
+
+    def days(self) -> List[int]:
+        """Return the stored days of month."""
+        directory = self.directory()
+        if directory is None:
+            return []
+        return [int(i) + 1 for i in np.flatnonzero(directory["offset"])]
+
+    def read(self, dt: date) -> Optional[dict]:
+        """
+        Read the payload of a day.
+
+        Args:
+            dt: Trading date.
+
+        Returns:
+            Optional[dict]: Payload dict (see `raw_archive_decode`), None if
+            the day is not stored.
+
+        Raises:
+            ProcessingError: On corrupt blocks or unavailable codecs.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                entry = self._read_directory(f)[dt.day - 1]
+                if entry["offset"] == 0:
+                    return None
+                f.seek(int(entry["offset"]))
+                block = f.read(int(entry["length"]))
+        except FileNotFoundError:
+            return None
+
+        codec = int(entry["codec"])
+        if codec == RAW_ARCHIVE_CODECS["zlib"]:
+            block = zlib.decompress(block)
+        elif codec == RAW_ARCHIVE_CODECS["zstd"]:
+            if zstandard is None:
+                raise ProcessingError(f"Archive {self.path} uses zstd, install zstandard")
+            block = zstandard.ZstdDecompressor().decompress(block, max_output_size=int(entry["raw_length"]))
+
+        if len(block) != int(entry["raw_length"]):
+            raise ProcessingError(f"Corrupt block for {dt} in {self.path}")
+
+        return raw_archive_decode(block)
+
+    def _compress(self, block: bytes) -> bytes:
+        """Compress a block with the configured codec."""
+        if self.codec == "zlib":
+            return zlib.compress(block, 6)
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(block)
+        return block
+
+    def _sync(self, f) -> None:
+        """Flush (and optionally fsync) an open file."""
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def write(self, dt: date, data: dict) -> None:
+        """
+        Store (or replace) the payload of a day.
+
+        Args:
+            dt: Trading date (must belong to the archive month).
+            data: Payload dict (JSON lists or NumPy arrays).
+
+        Raises:
+            ProcessingError: If the payload is malformed.
+        """
+        raw, count = raw_archive_encode(data)
+        block = self._compress(raw)
+
+        entry = np.zeros(1, dtype=DIRECTORY_DTYPE)
+        entry["length"] = len(block)
+        entry["raw_length"] = len(raw)
+        entry["count"] = count
+        entry["codec"] = RAW_ARCHIVE_CODECS[self.codec]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.lock_path):
+            if not self.path.exists():
+                self._create()
+
+            with open(self.path, "r+b") as f:
+                directory = self._read_directory(f)
+
+                # Append the block first, then switch the directory entry
+                f.seek(0, os.SEEK_END)
+                entry["offset"] = f.tell()
+                f.write(block)
+                self._sync(f)
+
+                f.seek(HEADER_DTYPE.itemsize + (dt.day - 1) * DIRECTORY_DTYPE.itemsize)
+                f.write(entry.tobytes())
+                self._sync(f)
+
+                directory[dt.day - 1] = entry[0]
+                size = os.fstat(f.fileno()).st_size
+
+            # Rewritten days leave dead blocks behind, compact when they dominate
+            live = int(directory["length"].sum())
+            if size - DATA_START - live > live:
+                self._compact(directory)
+
+    def remove(self, dt: date) -> bool:
+        """
+        Remove a day from the archive (the block is reclaimed on compaction).
+
+        Returns:
+            True if the day was stored.
+        """
+        if not self.path.exists():
+            return False
+
+        with FileLock(self.lock_path):
+            with open(self.path, "r+b") as f:
+                directory = self._read_directory(f)
+                if directory[dt.day - 1]["offset"] == 0:
+                    return False
+                f.seek(HEADER_DTYPE.itemsize + (dt.day - 1) * DIRECTORY_DTYPE.itemsize)
+                f.write(np.zeros(1, dtype=DIRECTORY_DTYPE).tobytes())
+                self._sync(f)
+        return True
+
+    def _create(self) -> None:
+        """Create an empty archive (caller holds the lock)."""
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = RAW_ARCHIVE_MAGIC
+        header["version"] = RAW_ARCHIVE_VERSION
+
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header.tobytes())
+            f.write(np.zeros(DIRECTORY_DAYS, dtype=DIRECTORY_DTYPE).tobytes())
+            self._sync(f)
+        os.replace(tmp_path, self.path)
+
+    def _compact(self, directory: np.ndarray) -> None:
+        """Rewrite the archive without dead blocks (caller holds the lock)."""
+        tmp_path = self.path.with_suffix(".tmp")
+        compacted = directory.copy()
+
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            dst.seek(DATA_START)
+            for day in np.flatnonzero(directory["offset"]):
+                src.seek(int(directory[day]["offset"]))
+                compacted[day]["offset"] = dst.tell()
+                dst.write(src.read(int(directory[day]["length"])))
+
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header["magic"] = RAW_ARCHIVE_MAGIC
+            header["version"] = RAW_ARCHIVE_VERSION
+            dst.seek(0)
+            dst.write(header.tobytes())
+            dst.write(compacted.tobytes())
+            self._sync(dst)
+
+        os.replace(tmp_path, self.path)
+
+
+def main():
+    """
+    Command line interface to migrate JSON caches and remove days.
+    """
+    import orjson
+    from etl.config.app_config import load_app_config
+
+    parser = argparse.ArgumentParser(description="Manage raw download archives")
+    parser.add_argument("command", choices=["pack", "remove"])
+    parser.add_argument("--symbol", action="append", default=[], help="Symbol (repeatable), default all")
+    parser.add_argument("--from", dest="start", help="First date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--delete", action="store_true", help="pack: delete JSON files after packing")
+    args = parser.parse_args()
+
+    config = load_app_config("config.user.yaml" if Path("config.user.yaml").exists() else "config.yaml").download
+    root = Path(config.paths.historic)
+    symbols = {s.replace("/", "-") for s in args.symbol}
+    start = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else date.min
+    end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else date.max
+
+    if args.command == "pack":
+        # {symbol}_{YYYYMMDD}.json below YYYY/MM
+        pattern = re.compile(r"^(.+)_(\d{8})\.json$")
+        packed = 0
+        for path in sorted(root.glob("*/*/*.json")):
+            match = pattern.match(path.name)
+            if not match or (symbols and match.group(1) not in symbols):
+                continue
+            dt = datetime.strptime(match.group(2), "%Y%m%d").date()
+            if not start <= dt <= end:
+                continue
+            RawArchive(raw_archive_path(root, match.group(1), dt), config.compression).write(
+                dt, orjson.loads(path.read_bytes())
+            )
+            if args.delete:
+                path.unlink()
+            packed += 1
+        print(f"Packed {packed} days")
+    else:
+        if not args.start:
+            parser.error("remove requires --from")
+        removed = 0
+        for path in sorted(root.glob(f"*/*/*{RAW_ARCHIVE_EXTENSION}")):
+            symbol, month = path.stem.rsplit("_", 1)
+            if symbols and symbol not in symbols:
+                continue
+            archive = RawArchive(path, config.compression)
+            for day in archive.days():
+                dt = date(int(month[:4]), int(month[4:6]), day)
+                if start <= dt <= end and archive.remove(dt):
+                    removed += 1
+        print(f"Removed {removed} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@
  File:        protocols.py
  Author:      JP Ueberbach
  Created:     2026-01-07
+ Updated:     2026-10-16
 
  Description:
      Abstract base interfaces (protocols) for resample and aggregation I/O.
@@ -17,7 +18,8 @@
      Key classes:
          - EtlIO: Generic context-managed I/O interface supporting `with` statements.
          - ResampleIOReader: Abstract interface for batch reading, seeking,
-           EOF detection, and offset tracking.
+           EOF detection, and offset tracking. Also provides `read_columns`,
+           a DataFrame-free batch read used by the vectorized resample engine.
          - ResampleIOWriter: Abstract interface for batch writing, truncation,
            flushing, offset tracking, and finalization.
          - ResampleIOIndexReaderWriter: Abstract interface for reading and
@@ -55,7 +57,8 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -93,6 +96,28 @@ class ResampleIOReader(EtlIO):
     def eof(self) -> bool:
         pass
 
+    def read_columns(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """Read a batch of records as a mapping of column name to array.
+
+        Memory-mapped readers override this to return zero-copy slices. This
+        default implementation converts the result of `read_batch`.
+
+        Args:
+            batch_size (int): Maximum number of records to read.
+
+        Returns:
+            Dict[str, np.ndarray]: 'ts' (epoch ms, int64), 'open', 'high',
+            'low', 'close', 'volume' and 'offset'. Empty if no records remain.
+        """
+        df = self.read_batch(batch_size)
+        if df.empty:
+            return {}
+
+        columns = {'ts': df.index.values.astype('datetime64[ms]').astype(np.int64)}
+        for name in ('open', 'high', 'low', 'close', 'volume', 'offset'):
+            columns[name] = df[name].to_numpy()
+        return columns
+
 
 class ResampleIOWriter(EtlIO):
     
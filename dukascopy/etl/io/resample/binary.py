@@ -5,6 +5,7 @@
  File:        binary.py
  Author:      JP Ueberbach
  Created:     2026-01-07
+ Updated:     2026-10-16
 
  Description:
      Binary-format, incremental OHLCV file I/O and aggregation engine.
@@ -55,7 +56,7 @@ import mmap
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 from etl.io.protocols import ResampleIOReader, ResampleIOWriter, ResampleIOIndexReaderWriter
 from etl.exceptions import *
@@ -153,6 +154,36 @@ class ResampleIOReaderBinary(ResampleIOReader):
         self._pos = end_idx * self.RECORD_SIZE
         return df
 
+    def read_columns(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """
+        Read a batch of records as column arrays without building a DataFrame.
+
+        Args:
+            batch_size (int): Maximum number of records to read.
+
+        Returns:
+            Dict[str, np.ndarray]: Zero-copy (strided) column views plus an
+            'offset' column in bytes. Empty if no records remain.
+        """
+        start_idx = self._pos // self.RECORD_SIZE
+        end_idx = min(start_idx + batch_size, len(self.data_view))
+
+        if start_idx >= end_idx:
+            return {}
+
+        # Zero-copy slicing of the memory view
+        batch = self.data_view[start_idx:end_idx]
+
+        columns = {'ts': batch['ts'].astype(np.int64)}
+        for i, name in enumerate(('open', 'high', 'low', 'close', 'volume')):
+            columns[name] = batch['ohlcv'][:, i]
+
+        # Add byte offsets for each row (required for incremental resample logic)
+        columns['offset'] = np.arange(start_idx, end_idx) * self.RECORD_SIZE
+
+        self._pos = end_idx * self.RECORD_SIZE
+        return columns
+
     def read_raw(self, size: int = -1):
         """
         Read raw bytes from the memory map.
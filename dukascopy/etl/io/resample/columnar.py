@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        columnar.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Updated:     2026-10-16
+
+ Description:
+     Columnar-format, incremental OHLCV file I/O.
+
+     This module provides crash-safe, incremental reading, writing, and
+     index-tracking for OHLCV data stored in a column-oriented layout. Each
+     field (ts, open, high, low, close, volume) is stored as its own
+     contiguous little-endian array inside a single file, so consumers can
+     map a column straight into NumPy, Arrow or Polars without copying or
+     de-interleaving 64-byte records.
+
+     File layout:
+         - 64 bytes header (magic, version, column count, capacity, count)
+         - 6 column segments of `capacity` x 8 bytes each, in COLUMNS order
+
+     Only the first `count` slots of each segment are valid. The remaining
+     slots are reserved for appends and are left as sparse holes on disk.
+     When the capacity is exhausted, the file is rebuilt with a larger
+     capacity and atomically replaced, so readers that still map the old
+     file keep a consistent view.
+
+     Offsets used by the reader, writer and index are expressed in records
+     (not bytes). They are opaque to the aggregate and resample engines.
+
+     Key classes:
+         - ResampleIOReaderColumnar: Reads batches of records with record
+           offset tracking, providing EOF detection and random-access seeking.
+         - ResampleIOWriterColumnar: Writes batches of OHLCV records into the
+           column segments, growing the file when needed.
+         - ResampleIOIndexReaderWriterColumnar: Persists input/output record
+           offsets for crash-safe incremental processing.
+
+ Usage:
+     - Selected with fmode "columnar" (extension .col) via ResampleIOFactory.
+
+ Requirements:
+     - Python 3.8+
+     - numpy
+     - pandas
+     - mmap
+
+ Exceptions:
+     - ProcessingError: Raised for corrupt files or invalid operations.
+     - IndexValidationError: Raised when offsets are invalid.
+
+ License:
+     MIT License
+===============================================================================
+"""
+import os
+import mmap
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Tuple, Optional
+
+from etl.io.protocols import ResampleIOReader, ResampleIOWriter
+from etl.io.resample.binary import ResampleIOIndexReaderWriterBinary
+from etl.exceptions import *
+
+# File magic and layout version
+MAGIC = b'DUKASCOL'
+VERSION = 1
+
+# Header structure (64 bytes, keeps every column segment 64-byte aligned)
+HEADER = np.dtype([
+    ('magic', 'S8'),          # b'DUKASCOL'
+    ('version', '<u4'),       # Layout version
+    ('ncols', '<u4'),         # Number of column segments
+    ('capacity', '<u8'),      # Reserved slots per column segment
+    ('count', '<u8'),         # Number of valid records
+    ('padding', '<u8', (4,))  # Padding to 64 bytes
+])
+
+HEADER_SIZE = 64
+
+# Column order and types (all 8 bytes wide)
+COLUMNS = (
+    ('ts', '<u8'),            # Timestamp in milliseconds
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+)
+
+ITEM_SIZE = 8
+
+# Capacity is always a multiple of this number of records
+CAPACITY_STEP = 1024
+
+
+def columnar_views(buffer, count: Optional[int] = None) -> Tuple[int, Dict[str, np.ndarray]]:
+    """Interpret a columnar file buffer as zero-copy NumPy column views.
+
+    Args:
+        buffer: Buffer (e.g. mmap) holding the complete file.
+        count (Optional[int]): Number of records to expose. Defaults to the
+            record count stored in the header.
+
+    Returns:
+        Tuple[int, Dict[str, np.ndarray]]: Record count and a mapping of
+        column name to a read-only 1-D view of that column.
+
+    Raises:
+        ProcessingError: If the buffer is not a valid columnar file.
+    """
+    if len(buffer) < HEADER_SIZE:
+        raise ProcessingError("Columnar file too small for header")
+
+    header = np.frombuffer(buffer, dtype=HEADER, count=1)[0]
+    if header['magic'] != MAGIC or int(header['ncols']) != len(COLUMNS):
+        raise ProcessingError("Invalid columnar file header")
+
+    capacity = int(header['capacity'])
+    count = int(header['count']) if count is None else count
+
+    # Guard against a header that points beyond the end of the file
+    if count > capacity or HEADER_SIZE + len(COLUMNS) * capacity * ITEM_SIZE > len(buffer):
+        raise ProcessingError("Columnar file truncated")
+
+    # One contiguous view per column segment
+    views = {
+        name: np.frombuffer(
+            buffer,
+            dtype=dtype,
+            count=count,
+            offset=HEADER_SIZE + i * capacity * ITEM_SIZE
+        )
+        for i, (name, dtype) in enumerate(COLUMNS)
+    }
+    return count, views
+
+
+class ResampleIOReaderColumnar(ResampleIOReader):
+    """
+    Zero-copy columnar reader using mmap and numpy memory views.
+    """
+
+    def __init__(self, filepath: Path, **kwargs):
+        """
+        Initialize a columnar reader with memory-mapped access.
+
+        Args:
+            filepath (Path): Path to the columnar OHLCV file.
+            **kwargs: Placeholder for future extensions.
+        """
+        self.filepath = filepath
+        self.file_handle = None
+        self.mm = None
+        self.columns = None
+        self.count = 0
+        self._pos = 0  # Current record offset
+        self._open()
+
+    def _open(self) -> None:
+        """
+        Open the columnar file and memory-map it for zero-copy reading.
+
+        Raises:
+            ProcessingError: If the file is invalid or mapping fails.
+        """
+        try:
+            self.file_handle = open(self.filepath, 'rb')
+            # Map the file into memory
+            self.mm = mmap.mmap(self.file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            # Create zero-copy numpy views of the column segments
+            self.count, self.columns = columnar_views(self.mm)
+        except Exception as e:
+            self.close()
+            raise ProcessingError(f"Failed to map columnar file {self.filepath}: {e}")
+
+    def read_batch(self, batch_size: int) -> pd.DataFrame:
+        """
+        Read a batch of records as a DataFrame.
+
+        Args:
+            batch_size (int): Maximum number of records to read.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns ['open', 'high', 'low', 'close', 'volume'],
+            indexed by 'time', and an additional 'offset' column in records.
+        """
+        start_idx = self._pos
+        end_idx = min(start_idx + batch_size, self.count)
+
+        if start_idx >= end_idx:
+            return pd.DataFrame()
+
+        # Columns are already contiguous, no de-interleaving required
+        df = pd.DataFrame(
+            {name: self.columns[name][start_idx:end_idx] for name, _ in COLUMNS[1:]},
+            index=pd.to_datetime(self.columns['ts'][start_idx:end_idx], unit='ms')
+        )
+        df.index.name = 'time'
+
+        # Add record offsets for each row (required for incremental resample logic)
+        df['offset'] = np.arange(start_idx, end_idx)
+
+        self._pos = end_idx
+        return df
+
+    def read_columns(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """
+        Read a batch of records as column arrays without building a DataFrame.
+
+        Args:
+            batch_size (int): Maximum number of records to read.
+
+        Returns:
+            Dict[str, np.ndarray]: Zero-copy column slices plus an 'offset'
+            column in records. Empty if no records remain.
+        """
+        start_idx = self._pos
+        end_idx = min(start_idx + batch_size, self.count)
+
+        if start_idx >= end_idx:
+            return {}
+
+        columns = {name: self.columns[name][start_idx:end_idx] for name, _ in COLUMNS[1:]}
+        columns['ts'] = self.columns['ts'][start_idx:end_idx].astype(np.int64)
+
+        # Add record offsets for each row (required for incremental resample logic)
+        columns['offset'] = np.arange(start_idx, end_idx)
+
+        self._pos = end_idx
+        return columns
+
+    def read_raw(self, size: int = -1) -> Dict[str, np.ndarray]:
+        """
+        Read raw column slices from the memory map.
+
+        Args:
+            size (int): Number of records to read. -1 for all remaining.
+
+        Returns:
+            Dict[str, np.ndarray]: Column name to zero-copy slice mapping.
+            Empty if no records remain.
+        """
+        end_idx = self.count if size == -1 else min(self._pos + size, self.count)
+
+        if self._pos >= end_idx:
+            return {}
+
+        # Slice the column views directly (no copy)
+        data = {name: view[self._pos:end_idx] for name, view in self.columns.items()}
+        self._pos = end_idx
+        return data
+
+    def seek(self, offset: int) -> None:
+        """
+        Move the reader to a specific record offset.
+
+        Args:
+            offset (int): Record offset in the file.
+        """
+        if offset < 0 or offset > self.count:
+            raise IndexValidationError(f"Invalid seek offset: {offset}")
+
+        self._pos = offset
+
+    def tell(self) -> int:
+        """
+        Return the current record offset.
+
+        Returns:
+            int: Current record offset in the file.
+        """
+        return self._pos
+
+    def eof(self) -> bool:
+        """
+        Check if end-of-file is reached.
+
+        Returns:
+            bool: True if the current position is at or beyond the last record.
+        """
+        return self._pos >= self.count
+
+    def close(self) -> None:
+        """
+        Close the memory map and file handle, ensuring references are cleared.
+        """
+        # Clear the numpy views first to release exported pointers
+        self.columns = None
+
+        # Now it is safe to close the mmap
+        if self.mm is not None:
+            try:
+                self.mm.close()
+            except BufferError:
+                pass
+            self.mm = None
+
+        # Close the file handle
+        if self.file_handle is not None:
+            self.file_handle.close()
+            self.file_handle = None
+
+
+class ResampleIOWriterColumnar(ResampleIOWriter):
+    """
+    Columnar writer appending into pre-reserved column segments.
+    """
+
+    def __init__(self, filepath: Path, fsync: bool = False, **kwargs):
+        """
+        Initialize a columnar writer.
+
+        Args:
+            filepath (Path): Path to write OHLCV columnar data.
+            fsync (bool, optional): Force flush to disk on writes.
+            **kwargs: Placeholder for future extensions.
+        """
+        self.filepath = filepath
+        self.fsync = fsync
+        self.file = None
+        self.capacity = 0
+        self.count = 0
+        self._pos = 0  # Current record offset
+        self._initialize()
+
+    def _initialize(self) -> None:
+        """
+        Prepare the file for writing, creating it (and parent directories) as needed.
+
+        Raises:
+            ProcessingError: If an existing file is not a valid columnar file.
+        """
+        if not self.filepath.exists():
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            # Create an empty file (header only)
+            self.file = open(self.filepath, 'wb+', buffering=0)
+            self._write_header()
+            return
+
+        self.file = open(self.filepath, 'rb+', buffering=0)
+        header = np.frombuffer(self.file.read(HEADER_SIZE), dtype=HEADER, count=1)[0]
+        if header['magic'] != MAGIC:
+            self.close()
+            raise ProcessingError(f"Invalid columnar file header: {self.filepath}")
+
+        self.capacity = int(header['capacity'])
+        self.count = int(header['count'])
+
+    def _write_header(self, handle=None) -> None:
+        """
+        Write the header (capacity and record count) to the file.
+
+        Args:
+            handle: File handle to write to. Defaults to the current file.
+        """
+        handle = handle or self.file
+        header = np.zeros(1, dtype=HEADER)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['ncols'] = len(COLUMNS)
+        header['capacity'] = self.capacity
+        header['count'] = self.count
+        handle.seek(0)
+        handle.write(header.tobytes())
+
+    def _reserve(self, records: int) -> None:
+        """
+        Make sure the column segments can hold at least `records` records.
+
+        Growing rebuilds the file with (at least) double capacity into a
+        temporary file and atomically replaces the original. Unused slots
+        are never written, so they stay sparse on disk.
+
+        Args:
+            records (int): Required number of records.
+        """
+        if records <= self.capacity:
+            return
+
+        # Amortized growth, rounded up to the capacity step
+        capacity = max(records, self.capacity * 2)
+        capacity = -(-capacity // CAPACITY_STEP) * CAPACITY_STEP
+
+        temp_path = self.filepath.with_name(self.filepath.name + ".grow")
+        new_file = open(temp_path, 'wb+', buffering=0)
+        try:
+            # Allocate the full (sparse) file
+            new_file.truncate(HEADER_SIZE + len(COLUMNS) * capacity * ITEM_SIZE)
+
+            # Relocate the valid part of each column segment
+            for i in range(len(COLUMNS)):
+                self.file.seek(HEADER_SIZE + i * self.capacity * ITEM_SIZE)
+                new_file.seek(HEADER_SIZE + i * capacity * ITEM_SIZE)
+                new_file.write(self.file.read(self.count * ITEM_SIZE))
+
+            self.capacity = capacity
+            self._write_header(new_file)
+            if self.fsync:
+                os.fsync(new_file.fileno())
+        except Exception:
+            new_file.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        # Swap in the new file, existing readers keep the old inode
+        os.replace(temp_path, self.filepath)
+        self.file.close()
+        self.file = new_file
+
+    def _write_columns(self, arrays) -> int:
+        """
+        Write column arrays at the current record offset.
+
+        Args:
+            arrays: Sequence of arrays in COLUMNS order, all of equal length.
+
+        Returns:
+            int: Record offset after writing.
+        """
+        count = len(arrays[0])
+        if count == 0:
+            return self._pos
+
+        end = self._pos + count
+        self._reserve(end)
+
+        # One sequential write per column segment
+        for i, ((name, dtype), values) in enumerate(zip(COLUMNS, arrays)):
+            self.file.seek(HEADER_SIZE + (i * self.capacity + self._pos) * ITEM_SIZE)
+            self.file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+        self._pos = end
+        self.count = max(self.count, end)
+        return self._pos
+
+    def write_batch(self, df: pd.DataFrame, offset: Optional[int] = None) -> int:
+        """
+        Write a batch of OHLCV records to the column segments.
+
+        Args:
+            df (pd.DataFrame): DataFrame with OHLCV data indexed by time.
+            offset (Optional[int]): Record offset at which to write. Appends if None.
+
+        Returns:
+            int: Record offset after writing the batch.
+        """
+        if offset is not None:
+            self.seek(offset)
+
+        values = df.values
+        arrays = [df.index.values.astype('datetime64[ms]').astype('uint64')]
+        arrays += [values[:, i] for i in range(len(COLUMNS) - 1)]
+        return self._write_columns(arrays)
+
+    def write_raw(self, data: Dict[str, np.ndarray]) -> int:
+        """
+        Write column slices as returned by ResampleIOReaderColumnar.read_raw.
+
+        Args:
+            data (Dict[str, np.ndarray]): Column name to array mapping.
+
+        Returns:
+            int: Record offset after writing.
+        """
+        self._write_columns([data[name] for name, _ in COLUMNS])
+        if self.fsync:
+            self.flush(fsync=True)
+        return self._pos
+
+    def seek(self, offset: int) -> None:
+        """
+        Move the write position to a specific record offset.
+
+        Args:
+            offset (int): Record offset in the file.
+        """
+        if offset < 0 or offset > self.count:
+            raise IndexValidationError(f"Invalid seek offset: {offset}")
+        self._pos = offset
+
+    def truncate(self, size: int) -> None:
+        """
+        Logically truncate the file to a number of records.
+
+        The file itself is never shrunk (readers may still map it), only the
+        record count in the header is lowered on the next flush.
+
+        Args:
+            size (int): New record count.
+        """
+        if size < self.count:
+            self.count = size
+
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Write the header and optionally force a disk sync.
+
+        Args:
+            fsync (bool): Whether to force a full disk sync.
+        """
+        # Header goes last, the record count only covers written data
+        self._write_header()
+        if fsync or self.fsync:
+            os.fsync(self.file.fileno())
+
+    def tell(self) -> int:
+        """
+        Return the current record offset.
+
+        Returns:
+            int: Current record offset.
+        """
+        return self._pos
+
+    def finalize(self) -> Path:
+        """
+        Flush, close the file, and return its path.
+
+        Returns:
+            Path: Filepath of the finalized file.
+        """
+        self.flush(fsync=True)
+        self.close()
+        return self.filepath
+
+    def close(self) -> None:
+        """
+        Flush the header and close the file handle.
+        """
+        if self.file:
+            self._write_header()
+            self.file.close()
+            self.file = None
+
+
+class ResampleIOIndexReaderWriterColumnar(ResampleIOIndexReaderWriterBinary):
+    """
+    Index handler for columnar files.
+
+    Uses the binary 24-byte index structure, in_pos and out_pos hold record
+    offsets instead of byte offsets.
+    """
+    pass
@@ -5,26 +5,27 @@
  File:        factory.py
  Author:      JP Ueberbach
  Created:     2026-01-07
+ Updated:     2026-10-16
 
  Description:
      Format-aware factory for resample and aggregation I/O handlers.
 
      This module provides a centralized factory (`ResampleIOFactory`) for
-     creating readers, writers, and index handlers for both text (CSV) and
-     binary formats. It abstracts format detection, file initialization, and
+     creating readers, writers, and index handlers for text (CSV), binary
+     and columnar formats. It abstracts format detection, file initialization, and
      ensures consistent interface usage across resampling and aggregation
      pipelines.
 
      Key classes and methods:
          - ResampleIOFactory: Factory class to obtain I/O handler instances.
              - get_reader(filepath, format_hint, **kwargs)
-                 Returns a text or binary reader based on file or hint.
+                 Returns a text, binary or columnar reader based on file or hint.
              - get_writer(filepath, format, **kwargs)
-                 Returns a text or binary writer for writing OHLCV data.
+                 Returns a text, binary or columnar writer for writing OHLCV data.
              - get_index_handler(filepath, format, **kwargs)
                  Returns an index reader/writer for crash-safe offset tracking.
              - get_appropriate_extension(format)
-                 Returns ".csv" or ".bin" for text or binary formats.
+                 Returns ".csv", ".bin" or ".col" for text, binary or columnar formats.
              - _detect_format(filepath)
                  Infers format from file extension or file content.
 
@@ -61,6 +62,7 @@ from typing import Optional, Dict, Any
 from etl.io.protocols import ResampleIOReader, ResampleIOWriter, ResampleIOIndexReaderWriter
 from etl.io.resample.text import ResampleIOReaderText, ResampleIOWriterText, ResampleIOIndexReaderWriterText
 from etl.io.resample.binary import ResampleIOReaderBinary, ResampleIOWriterBinary, ResampleIOIndexReaderWriterBinary
+from etl.io.resample.columnar import ResampleIOReaderColumnar, ResampleIOWriterColumnar, ResampleIOIndexReaderWriterColumnar
 from etl.exceptions import *
 
 class ResampleIOFactory:
@@ -76,6 +78,8 @@ class ResampleIOFactory:
         
         if format_hint == 'binary':
             return ResampleIOReaderBinary(filepath, **kwargs)
+        elif format_hint == 'columnar':
+            return ResampleIOReaderColumnar(filepath, **kwargs)
         else:
             return ResampleIOReaderText(filepath, **kwargs)
     
@@ -87,6 +91,8 @@ class ResampleIOFactory:
     ) -> ResampleIOWriter:
         if format == 'binary':
             return ResampleIOWriterBinary(filepath, **kwargs)
+        elif format == 'columnar':
+            return ResampleIOWriterColumnar(filepath, **kwargs)
         else:
             return ResampleIOWriterText(filepath, **kwargs)
     
@@ -98,6 +104,8 @@ class ResampleIOFactory:
     ) -> ResampleIOIndexReaderWriter:
         if format == 'binary':
             return ResampleIOIndexReaderWriterBinary(filepath, **kwargs)
+        elif format == 'columnar':
+            return ResampleIOIndexReaderWriterColumnar(filepath, **kwargs)
         else:
             return ResampleIOIndexReaderWriterText(filepath, **kwargs)
     
@@ -105,6 +113,9 @@ class ResampleIOFactory:
     def _detect_format(filepath: Path) -> str:
         if filepath.suffix == '.bin':
             return 'binary'
+
+        if filepath.suffix == '.col':
+            return 'columnar'
         
         if filepath.exists():
             try:
@@ -112,6 +123,8 @@ class ResampleIOFactory:
                     magic = f.read(8)
                     if magic == b'DUKASBIN':
                         return 'binary'
+                    if magic == b'DUKASCOL':
+                        return 'columnar'
             except:
                 pass
         
@@ -119,4 +132,6 @@ class ResampleIOFactory:
     
     @staticmethod
     def get_appropriate_extension(format: str) -> str:
+        if format == 'columnar':
+            return '.col'
         return '.bin' if format == 'binary' else '.csv'
\ No newline at end of file
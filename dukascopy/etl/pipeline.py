@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        pipeline.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Description: Dependency-driven scheduler for the ETL pipeline stages.
+
+              The classic orchestrator runs Download -> Transform ->
+              Aggregate -> Resample as barriers: no transform starts before
+              the last download finished, no resample before the last
+              aggregate. This scheduler runs the same tasks as a DAG on the
+              same process pool:
+
+              - transform(symbol, date) starts when its download landed
+              - aggregate(symbol) starts when the last transform of the
+                symbol (and of its source symbol) completed
+              - resample(symbol) starts when its aggregate completed
+
+              Ready tasks are submitted in stage priority order (later
+              stages first) and the number of submitted tasks is capped,
+              so downstream work never queues behind thousands of
+              rate-limited downloads. Wall time approaches the slowest
+              stage instead of the sum of all stages.
+
+              Nodes without a function are "external": they are completed
+              by events from outside the pool (e.g. the async download
+              stage running in a thread of the main process).
+
+ Usage:
+     Imported and invoked by run.py (orchestrator.pipelined: true).
+
+ Requirements:
+     - Python 3.8+
+     - tqdm
+
+ License:
+     MIT License
+===============================================================================
+"""
+import heapq
+import queue
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from tqdm import tqdm
+
+from etl.exceptions import DependencyError
+
+
+class PipelineScheduler:
+    """
+    Runs a DAG of stage tasks on a multiprocessing pool.
+
+    Nodes are hashable keys, e.g. ("transform", symbol, date). Each node
+    belongs to a stage. Completion events are collected on a queue by the
+    pool callbacks and processed in the calling thread.
+    """
+
+    def __init__(self, pool, stages: List[str], max_inflight: int):
+        """
+        Initialize the scheduler.
+
+        Args:
+            pool: Multiprocessing pool executing the tasks.
+            stages: Stage names in pipeline order. Later stages get a higher
+                submission priority.
+            max_inflight: Maximum number of tasks submitted to the pool at
+                the same time.
+        """
+        self.pool = pool
+        self.stages = stages
+        self.max_inflight = max(1, max_inflight)
+
+        # node -> (stage, func, args), func None for external nodes
+        self.tasks: Dict[Hashable, tuple] = {}
+        # node -> number of unfinished dependencies
+        self.waiting: Dict[Hashable, int] = {}
+        # node -> nodes waiting for it
+        self.dependents: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        # Completed nodes
+        self.finished = set()
+
+        # Heap of (priority, sequence, node)
+        self.ready: List[tuple] = []
+        self.sequence = 0
+
+        # Completion events (node, error), filled from other threads
+        self.events: "queue.Queue[tuple]" = queue.Queue()
+
+    def add_task(
+        self,
+        node: Hashable,
+        stage: str,
+        func: Optional[Callable[[Any], Any]] = None,
+        args: Any = None,
+        depends_on: Iterable[Hashable] = ()
+    ) -> None:
+        """
+        Register a task node.
+
+        Dependencies must be registered before their dependents. Unknown
+        dependencies are considered satisfied (no work for them this run).
+
+        Args:
+            node: Unique node key.
+            stage: Stage name (one of `stages`).
+            func: Picklable function called as func(args) in the pool. None
+                registers an external node, completed via `complete`.
+            args: Single argument passed to func.
+            depends_on: Nodes that must complete first.
+        """
+        self.tasks[node] = (stage, func, args)
+        self.waiting[node] = 0
+        for dependency in depends_on:
+            if dependency in self.tasks:
+                self.waiting[node] += 1
+                self.dependents[dependency].append(node)
+
+    def complete(self, node: Hashable) -> None:
+        """
+        Mark an external node as completed. Thread-safe.
+
+        Args:
+            node: Node key.
+        """
+        self.events.put((node, None))
+
+    def fail(self, node: Optional[Hashable], error: BaseException) -> None:
+        """
+        Report a failure from outside the pool. Thread-safe.
+
+        Args:
+            node: Node key, None if not bound to a single node.
+            error: Exception to raise from `run`.
+        """
+        self.events.put((node, error))
+
+    def _push(self, node: Hashable) -> None:
+        """Queue a node whose dependencies are satisfied."""
+        stage, func, _ = self.tasks[node]
+        if func is None:
+            # External nodes complete on their own
+            return
+        self.sequence += 1
+        heapq.heappush(self.ready, (-self.stages.index(stage), self.sequence, node))
+
+    def _submit(self, node: Hashable) -> None:
+        """Submit a node to the pool, results go to the event queue."""
+        _, func, args = self.tasks[node]
+        self.pool.apply_async(
+            func,
+            (args,),
+            callback=lambda _, node=node: self.events.put((node, None)),
+            error_callback=lambda e, node=node: self.events.put((node, e)),
+        )
+
+    def run(self, progress: bool = True) -> Dict[str, int]:
+        """
+        Execute all registered tasks respecting their dependencies.
+
+        Args:
+            progress: Show a progress bar per stage.
+
+        Returns:
+            Dict[str, int]: Number of completed tasks per stage.
+
+        Raises:
+            Exception: The first task error, as raised by the task.
+            DependencyError: If the remaining tasks can never become ready.
+        """
+        totals = {stage: 0 for stage in self.stages}
+        for stage, _, _ in self.tasks.values():
+            totals[stage] += 1
+
+        bars = {
+            stage: tqdm(total=totals[stage], desc=f"{stage:<10}", unit="tasks",
+                        colour='white', position=i, disable=not progress)
+            for i, stage in enumerate(s for s in self.stages if totals[s])
+        }
+        counts = {stage: 0 for stage in self.stages}
+
+        try:
+            for node, count in self.waiting.items():
+                if count == 0:
+                    self._push(node)
+
+            # External nodes still to be completed by outside events
+            external = sum(1 for _, func, _ in self.tasks.values() if func is None)
+
+            inflight = 0
+            while len(self.finished) < len(self.tasks):
+                # Keep the pool busy with the highest priority ready tasks
+                while self.ready and inflight < self.max_inflight:
+                    _, _, node = heapq.heappop(self.ready)
+                    self._submit(node)
+                    inflight += 1
+
+                # Nothing running and nothing external pending: stalled
+                if inflight == 0 and external == 0:
+                    raise DependencyError(
+                        f"{len(self.tasks) - len(self.finished)} pipeline tasks can never become ready"
+                    )
+
+                node, error = self.events.get()
+                if error is not None:
+                    raise error
+
+                if node in self.finished:
+                    continue
+                stage, func, _ = self.tasks[node]
+                if func is not None:
+                    inflight -= 1
+                else:
+                    external -= 1
+                self.finished.add(node)
+                counts[stage] += 1
+                bars[stage].update(1)
+
+                # Release the dependents of the completed node
+                for dependent in self.dependents.pop(node, []):
+                    self.waiting[dependent] -= 1
+                    if self.waiting[dependent] == 0:
+                        self._push(dependent)
+        finally:
+            for bar in bars.values():
+                bar.close()
+
+        return counts
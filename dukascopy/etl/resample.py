@@ -5,7 +5,11 @@
  File:        resample.py
  Author:      JP Ueberbach
  Created:     2025-12-19
- Updated:     2026-01-07
+ Updated:     2026-10-16
+              Columnar fmode support (record offsets, .col files)
+              Vectorized polars engine (engine: polars)
+              Fused cascade of all timeframes (fused: true)
+              2026-01-07
               Full refactor and documentation update:
               - Optional fsync for I/O durability
               - Custom exceptions for traceable failures
@@ -32,7 +36,8 @@
                 - ResampleEngine: Handles resampling for a single symbol and
                   timeframe, with full pre- and post-processing.
                 - ResampleWorker: Orchestrates resampling across all configured
-                  timeframes for a symbol.
+                  timeframes for a symbol, either one timeframe at a time or
+                  as a fused cascade from a single pass over the root tail.
               
               Features:
                 - Vectorized session pre-processing
@@ -41,6 +46,8 @@
                 - Optional fsync for guaranteed I/O durability
                 - Incremental, batch-based processing with fail-fast behavior
                 - Multiprocessing-friendly forkable worker
+                - Optional vectorized engine (engine: polars) working on
+                  column arrays instead of a DatetimeIndex DataFrame
 
  Usage:
      - Imported and executed by a resampling scheduler or run per symbol.
@@ -52,6 +59,7 @@
      - pandas
      - numpy
      - pytz
+     - polars (engine: polars)
 
  License:
      MIT License
@@ -61,13 +69,15 @@
 import os
 import pandas as pd
 import numpy as np
+from contextlib import ExitStack
 from pathlib import Path
 from io import StringIO
-from typing import Tuple, IO, Optional
+from typing import Dict, List, Tuple, IO, Optional
 
 from etl.config.app_config import AppConfig, ResampleSymbol, resample_get_symbol_config, ResampleTimeframeProcessingStep
 from etl.processors.resample_pre_process import resample_pre_process_origin
 from etl.processors.resample_post_process import resample_post_process_merge, resample_post_process_shift
+from etl.processors.resample_polars import resample_polars_bucket_keys, resample_polars_aggregate
 
 
 from etl.io.protocols import *
@@ -104,7 +114,8 @@ class ResampleEngine:
                 are stored.
 
         Attributes:
-            fmode: Primary I/O mode (e.g., binary or text).
+            fmode: Primary I/O mode (e.g., binary, columnar or text).
+            engine: Resample engine (pandas or polars).
             symbol: Trading symbol associated with this resampler.
             ident: Unique identifier for this resample configuration.
             config: Resampling configuration object.
@@ -121,6 +132,9 @@ class ResampleEngine:
         # Set primary IO mode
         self.fmode = config.fmode
 
+        # Set resample engine (pandas is the reference implementation)
+        self.engine = config.engine or "pandas"
+
         # Set properties
         self.symbol = symbol
         self.ident = ident
@@ -175,12 +189,12 @@ class ResampleEngine:
             ValueError: If the timeframe configuration references an unknown
                 source timeframe.
         """
-        extension = "csv" if self.fmode == "text" else "bin"
+        extension = ResampleIOFactory.get_appropriate_extension(self.fmode)
         timeframe = self.config.timeframes.get(self.ident)
 
         # Root timeframe: pass-through source (e.g. 1m CSV)
         if not timeframe.rule:
-            root_source = Path(timeframe.source) / f"{self.symbol}.{extension}"
+            root_source = Path(timeframe.source) / f"{self.symbol}{extension}"
 
             # Root CSV must exist
             if not root_source.exists():
@@ -203,13 +217,13 @@ class ResampleEngine:
         # Resolve upstream input path
         if source_tf.rule is not None:
             # Source itself is resampled
-            input_path = self.data_path / timeframe.source / f"{self.symbol}.{extension}"
+            input_path = self.data_path / timeframe.source / f"{self.symbol}{extension}"
         else:
             # Source is an external CSV
-            input_path = Path(source_tf.source) / f"{self.symbol}.{extension}"
+            input_path = Path(source_tf.source) / f"{self.symbol}{extension}"
 
         # Output CSV and index file locations
-        output_path = self.data_path / self.ident / f"{self.symbol}.{extension}"
+        output_path = self.data_path / self.ident / f"{self.symbol}{extension}"
         index_path = self.data_path / self.ident / "index" / f"{self.symbol}.idx"
 
         # Validate that upstream data exists
@@ -278,6 +292,79 @@ class ResampleEngine:
 
         return df
 
+    def read_batch(self, batch_size: int):
+        """Read the next input batch in the representation of the engine.
+
+        Args:
+            batch_size (int): Maximum number of input records to read.
+
+        Returns:
+            Column arrays (polars engine) or a DataFrame (pandas engine).
+        """
+        if self.engine == "polars":
+            return self.reader.read_columns(batch_size)
+        return self.reader.read_batch(batch_size)
+
+    def process_batch(self, batch) -> Tuple[pd.DataFrame, int]:
+        """Resample a batch returned by `read_batch` with the configured engine.
+
+        Args:
+            batch: Column arrays (polars engine) or a DataFrame (pandas engine).
+
+        Returns:
+            Tuple[pd.DataFrame, int]: Resampled bars and the next input offset.
+        """
+        if self.engine == "polars":
+            return self.process_resample_polars(batch)
+        return self.process_resample(batch)
+
+    def process_columns(self, columns: Dict[str, np.ndarray]) -> Tuple[pd.DataFrame, int]:
+        """Resample a column batch (see `read_columns`) with the configured engine.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Batch as column arrays.
+
+        Returns:
+            Tuple[pd.DataFrame, int]: Resampled bars and the next input offset.
+        """
+        if self.engine == "polars":
+            return self.process_resample_polars(columns)
+        return self.process_resample(self._columns_to_frame(columns, columns['ts']))
+
+    def commit_batch(self, resampled: pd.DataFrame, output_pos: int, next_in_pos: int, dt: int) -> int:
+        """Transactionally write a resampled batch and advance the index.
+
+        All but the last bar are written at `output_pos` and committed to the
+        index together with `next_in_pos`. The last bar is written after the
+        commit and stays open, it is rewritten by the next batch.
+
+        Args:
+            resampled (pd.DataFrame): Resampled bars of the batch.
+            output_pos (int): Committed output position to write from.
+            next_in_pos (int): Input position to resume from.
+            dt (int): Date stamp stored in the index.
+
+        Returns:
+            int: The new committed output position.
+        """
+        # Roll back any partial output from a previous failed iteration
+        self.writer.truncate(output_pos)
+
+        # Write all but the last bar (held back for continuity)
+        self.writer.write_batch(resampled.iloc[:-1], output_pos)
+        self.writer.flush()
+
+        # Update output position after successful write
+        output_pos = self.writer.tell()
+
+        # Persist new input/output positions atomically
+        self.index.write(next_in_pos, output_pos, dt)
+
+        # Write the final bar (kept open for next iteration)
+        self.writer.write_batch(resampled.tail(1))
+
+        return output_pos
+
     def process_resample(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
         """Resample a batch of time-series data into the configured timeframe.
 
@@ -372,42 +459,94 @@ class ResampleEngine:
             # Combine all origins and enforce chronological order
             full_resampled = pd.concat(resampled_list).sort_index()
 
-            # Offset column is critical for resume logic and must be preserved
-            if "offset" not in full_resampled.columns:
-                raise ResampleLogicError(
-                    f"Critical: 'offset' column lost during resampling for {self.symbol}."
-                )
+            return self._finalize_resample(full_resampled)
 
-            # Apply any configured post-processing steps per session
-            for name, session in self.config.sessions.items():
-                tf_post = session.timeframes.get(self.ident).post
-                if tf_post:
-                    for name, tf_step in tf_post.items():
-                        full_resampled = self._apply_post_processing(
-                            full_resampled, tf_step
-                        )
+        except (EmptyBatchError, ResampleLogicError, ProcessingError):
+            # Re-raise known, intentional control-flow exceptions
+            raise
+        except Exception as e:
+            # Fail fast: wrap unexpected errors to trigger worker crash logic
+            raise ProcessingError(f"Fail-Fast triggered: {e}") from e
 
-            # Determine the next input offset for incremental processing
-            try:
-                next_input_pos = int(full_resampled.iloc[-1]["offset"])
-            except (IndexError, ValueError, KeyError) as e:
-                raise ResampleLogicError(
-                    f"Post-processing left no bars for {self.symbol}"
-                ) from e
+    def process_resample_polars(self, columns: Dict[str, np.ndarray]) -> Tuple[pd.DataFrame, int]:
+        """Resample a batch of column arrays with the vectorized engine.
 
-            # Remove internal bookkeeping columns and normalize precision
-            full_resampled = (
-                full_resampled.drop(columns=["offset"])
-                .round(self.config.round_decimals)
-            )
+        Bucket keys are computed arithmetically from the epoch-ms timestamps
+        and the session origin, and bars are built with segment reductions
+        (see etl/processors/resample_polars.py). No DatetimeIndex DataFrame is
+        built for the input rows, except for multi-session symbols where the
+        DST-aware origin assignment still runs on an index-only frame.
 
-            # Final data integrity check
-            if full_resampled.isnull().values.any():
-                raise ProcessingError(
-                    f"Data Error: Result contains NaNs for {self.symbol}"
+        Rules the vectorized path does not support fall back to
+        `process_resample`. Post-processing, rounding and integrity checks
+        are shared with the pandas engine.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Batch as returned by
+                `ResampleIOReader.read_columns`.
+
+        Returns:
+            Tuple[pd.DataFrame, int]: Resampled bars and the next input offset.
+
+        Raises:
+            ProcessingError: If the batch is invalid or an unexpected error occurs.
+            EmptyBatchError: If resampling produces no output bars.
+            ResampleLogicError: If critical resampling invariants are violated.
+        """
+        try:
+            # Guard against empty input batches
+            if not columns:
+                raise ValueError("Empty batch read from reader")
+
+            ts = np.asarray(columns['ts'], dtype=np.int64)
+
+            # Retrieve timeframe configuration (assumes consistent config across sessions)
+            session = next(iter(self.config.sessions.values()))
+            tf_cfg = session.timeframes[self.ident]
+
+            # Collect configured pre-processing steps
+            pre_steps = [
+                tf_step
+                for session in self.config.sessions.values()
+                for tf_step in (session.timeframes.get(self.ident).pre or {}).values()
+            ]
+
+            if self.config.sessions.get('default') and len(self.config.sessions) == 1 and not pre_steps:
+                # Fast path: a single origin for the whole batch
+                origins, codes = [tf_cfg.origin], None
+            else:
+                # Session-aware origins are resolved by the shared (DST-aware) routine
+                frame = pd.DataFrame(index=pd.DatetimeIndex(pd.to_datetime(ts, unit='ms'), name='time'))
+                frame = self._apply_pre_processing(
+                    frame, ResampleTimeframeProcessingStep(action="origin")
+                )
+                for tf_step in pre_steps:
+                    frame = self._apply_pre_processing(frame, tf_step)
+                codes, origins = pd.factorize(frame['origin'].to_numpy(), sort=True)
+                if len(origins) == 1:
+                    codes = None
+
+            # Compute bucket keys per origin
+            keys = np.empty(len(ts), dtype=np.int64)
+            for i, origin in enumerate(origins):
+                mask = slice(None) if codes is None else (codes == i)
+                origin_keys = resample_polars_bucket_keys(
+                    ts[mask], tf_cfg.rule, tf_cfg.label, tf_cfg.closed, origin
+                )
+                if origin_keys is None:
+                    # Rule not supported by the vectorized path, use pandas
+                    return self.process_resample(self._columns_to_frame(columns, ts))
+                keys[mask] = origin_keys
+
+            full_resampled = resample_polars_aggregate(columns, keys, codes)
+
+            # Ensure at least one bar was produced
+            if full_resampled.empty:
+                raise EmptyBatchError(
+                    f"Resampling resulted in 0 bars for {self.symbol}."
                 )
 
-            return full_resampled, next_input_pos
+            return self._finalize_resample(full_resampled)
 
         except (EmptyBatchError, ResampleLogicError, ProcessingError):
             # Re-raise known, intentional control-flow exceptions
@@ -416,6 +555,72 @@ class ResampleEngine:
             # Fail fast: wrap unexpected errors to trigger worker crash logic
             raise ProcessingError(f"Fail-Fast triggered: {e}") from e
 
+    def _columns_to_frame(self, columns: Dict[str, np.ndarray], ts: np.ndarray) -> pd.DataFrame:
+        """Convert a column batch into the DataFrame layout of `read_batch`.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Batch from `read_columns`.
+            ts (np.ndarray): Epoch-ms timestamps of the batch.
+
+        Returns:
+            pd.DataFrame: OHLCV and offset columns indexed by `time`.
+        """
+        return pd.DataFrame(
+            {name: columns[name] for name in ('open', 'high', 'low', 'close', 'volume', 'offset')},
+            index=pd.DatetimeIndex(pd.to_datetime(ts, unit='ms'), name='time')
+        )
+
+    def _finalize_resample(self, full_resampled: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """Post-process, round and validate resampled bars (shared by all engines).
+
+        Args:
+            full_resampled (pd.DataFrame): Chronologically ordered bars,
+                including the `offset` column.
+
+        Returns:
+            Tuple[pd.DataFrame, int]: Final bars and the next input offset.
+
+        Raises:
+            ProcessingError: If the result contains NaNs.
+            ResampleLogicError: If the offset column is missing or no bars remain.
+        """
+        # Offset column is critical for resume logic and must be preserved
+        if "offset" not in full_resampled.columns:
+            raise ResampleLogicError(
+                f"Critical: 'offset' column lost during resampling for {self.symbol}."
+            )
+
+        # Apply any configured post-processing steps per session
+        for name, session in self.config.sessions.items():
+            tf_post = session.timeframes.get(self.ident).post
+            if tf_post:
+                for name, tf_step in tf_post.items():
+                    full_resampled = self._apply_post_processing(
+                        full_resampled, tf_step
+                    )
+
+        # Determine the next input offset for incremental processing
+        try:
+            next_input_pos = int(full_resampled.iloc[-1]["offset"])
+        except (IndexError, ValueError, KeyError) as e:
+            raise ResampleLogicError(
+                f"Post-processing left no bars for {self.symbol}"
+            ) from e
+
+        # Remove internal bookkeeping columns and normalize precision
+        full_resampled = (
+            full_resampled.drop(columns=["offset"])
+            .round(self.config.round_decimals)
+        )
+
+        # Final data integrity check
+        if full_resampled.isnull().values.any():
+            raise ProcessingError(
+                f"Data Error: Result contains NaNs for {self.symbol}"
+            )
+
+        return full_resampled, next_input_pos
+
 
 class ResampleWorker:
     """
@@ -471,7 +676,13 @@ class ResampleWorker:
                 behavior.
         """
         try:
-            for ident in self.config.timeframes:
+            timeframes = list(self.config.timeframes)
+
+            # Fused cascade needs fixed-size records (binary/columnar)
+            if self.config.fused and self.config.fmode != "text":
+                timeframes = self._execute_fused()
+
+            for ident in timeframes:
                 # Initialize for this timeframe
                 engine = ResampleEngine(self.symbol, ident, self.config, self.data_path)
 
@@ -527,26 +738,13 @@ class ResampleWorker:
                 # Main incremental processing loop
                 while True:
                     # Read the next batch of input data
-                    df = engine.reader.read_batch(self.config.batch_size)
+                    batch = engine.read_batch(self.config.batch_size)
                     try:
                         # Resample the batch and compute the next resume offset
-                        resampled, next_in_pos = engine.process_resample(df)
+                        resampled, next_in_pos = engine.process_batch(batch)
 
-                        # Roll back any partial output from a previous failed iteration
-                        engine.writer.truncate(output_pos)
-
-                        # Write all but the last bar (held back for continuity)
-                        engine.writer.write_batch(resampled.iloc[:-1], output_pos)
-                        engine.writer.flush()
-
-                        # Update output position after successful write
-                        output_pos = engine.writer.tell()
-
-                        # Persist new input/output positions atomically
-                        engine.index.write(next_in_pos, output_pos, dt)
-
-                        # Write the final bar (kept open for next iteration)
-                        engine.writer.write_batch(resampled.tail(1))
+                        # Write the batch and commit the index
+                        output_pos = engine.commit_batch(resampled, output_pos, next_in_pos, dt)
 
                     finally:
                         # Explicit finally block reserved for future cleanup hooks
@@ -565,6 +763,199 @@ class ResampleWorker:
                 f"I/O failure for {self.symbol} at {engine.ident}: {e}"
             ) from e
 
+    def _execute_fused(self) -> List[str]:
+        """Resample all timeframes as a cascade from a single pass over the root tail.
+
+        The root input (e.g. 1m) is read once, batch by batch. The bars each
+        timeframe writes are handed to its children in memory, in dependency
+        order, so derived files are never re-read from disk.
+
+        Every timeframe processes exactly the batches the sequential path
+        would read: a derived timeframe resamples a full batch as soon as
+        enough final source bars are pending (the last source bar is still
+        open), the remainder is flushed once the root input is exhausted.
+        Output is therefore identical to the sequential path, and writes use
+        the same per-timeframe transaction (`ResampleEngine.commit_batch`),
+        so a crash mid-cascade resumes correctly in either mode.
+
+        Timeframes that cannot be fused are returned and processed
+        sequentially by the caller. This is the case for a timeframe whose
+        input does not exist yet (first build), whose unprocessed input
+        exceeds one batch, and for everything configured after it.
+
+        Returns:
+            List[str]: Timeframe idents left for sequential processing.
+
+        Raises:
+            TransactionError: If any OS-level I/O error occurs.
+        """
+        batch_size = self.config.batch_size
+        idents = list(self.config.timeframes)
+        nodes: Dict[str, Dict] = {}
+        remaining: List[str] = []
+
+        with ExitStack() as stack:
+            try:
+                for i, ident in enumerate(idents):
+                    tf = self.config.timeframes[ident]
+                    if not tf.rule:
+                        # Root timeframe, nothing to resample
+                        continue
+
+                    # Source must be the root or a timeframe fused before this one
+                    source_tf = self.config.timeframes.get(tf.source)
+                    source = None if source_tf is None or not source_tf.rule else tf.source
+                    if source is not None and source not in nodes:
+                        remaining = idents[i:]
+                        break
+
+                    try:
+                        engine = ResampleEngine(self.symbol, ident, self.config, self.data_path)
+                    except (DataNotFoundError, ProcessingError):
+                        # Input not there yet (first build), run sequentially
+                        remaining = idents[i:]
+                        break
+
+                    stack.enter_context(engine.reader)
+                    stack.enter_context(engine.writer)
+
+                    dt, input_pos, output_pos = engine.index.read()
+                    if output_pos == 0:
+                        output_pos = engine.writer.tell()
+
+                    node = {
+                        "engine": engine,
+                        "source": source,
+                        "dt": dt,
+                        "input_pos": input_pos,
+                        "output_pos": output_pos,
+                        "pending": {},
+                        "done": False,
+                    }
+
+                    if source is not None:
+                        # Load the not yet consumed tail of the source file
+                        engine.reader.seek(input_pos)
+                        node["pending"] = engine.reader.read_columns(batch_size + 1)
+                        if not engine.reader.eof():
+                            # Too far behind for an in-memory cascade
+                            remaining = idents[i:]
+                            break
+
+                    nodes[ident] = node
+
+                # Main cascade loop, driven by the root readers
+                while True:
+                    more = False
+                    for ident, node in nodes.items():
+                        engine = node["engine"]
+
+                        if node["source"] is None:
+                            # Root input: read the next batch from the resume position
+                            if node["done"]:
+                                continue
+                            engine.reader.seek(node["input_pos"])
+                            batch = engine.reader.read_columns(batch_size)
+                            node["done"] = engine.reader.eof()
+                            more = more or not node["done"]
+                            if batch:
+                                self._fused_commit(nodes, ident, batch)
+                        else:
+                            # Derived input: only full batches, the last source bar is still open
+                            while len(node["pending"].get("offset", ())) > batch_size:
+                                self._fused_commit(
+                                    nodes, ident, _slice_columns(node["pending"], slice(0, batch_size))
+                                )
+
+                    if not more:
+                        break
+
+                # Source bars are final now, flush the remaining input in dependency order
+                for ident, node in nodes.items():
+                    while node["source"] is not None and node["pending"]:
+                        eof = len(node["pending"]["offset"]) <= batch_size
+                        self._fused_commit(
+                            nodes, ident, _slice_columns(node["pending"], slice(0, batch_size))
+                        )
+                        if eof:
+                            break
+
+            except OSError as e:
+                # Treat any OS-level failure as a transactional I/O error
+                raise TransactionError(
+                    f"I/O failure for {self.symbol} in fused resample: {e}"
+                ) from e
+
+        return remaining
+
+    def _fused_commit(self, nodes: Dict[str, Dict], ident: str, batch: Dict[str, np.ndarray]) -> None:
+        """Resample and commit one batch of a fused timeframe, feed its children.
+
+        Args:
+            nodes (Dict[str, Dict]): Fused timeframe state, in dependency order.
+            ident (str): Timeframe to process.
+            batch (Dict[str, np.ndarray]): Input batch as column arrays.
+        """
+        node = nodes[ident]
+        engine = node["engine"]
+
+        # Resample and commit, exactly like the sequential path
+        resampled, next_in_pos = engine.process_columns(batch)
+        start_pos = node["output_pos"]
+        node["output_pos"] = engine.commit_batch(resampled, start_pos, next_in_pos, node["dt"])
+
+        # Resume from the first input row of the open bar
+        node["input_pos"] = next_in_pos
+        if node["pending"]:
+            node["pending"] = _slice_columns(node["pending"], node["pending"]["offset"] >= next_in_pos)
+
+        # Positions of the written bars (fixed size records)
+        stride = (engine.writer.tell() - start_pos) // len(resampled)
+        rows = _frame_to_columns(resampled, start_pos, stride)
+
+        # Children replace the rewritten bars with the new ones
+        for child in nodes.values():
+            if child["source"] == ident:
+                pending = child["pending"]
+                if pending:
+                    pending = _slice_columns(pending, pending["offset"] < start_pos)
+                child["pending"] = _concat_columns(pending, rows)
+
+
+def _slice_columns(columns: Dict[str, np.ndarray], index) -> Dict[str, np.ndarray]:
+    """Select rows (slice or boolean mask) from a column batch."""
+    return {name: values[index] for name, values in columns.items()}
+
+
+def _concat_columns(
+    left: Dict[str, np.ndarray],
+    right: Optional[Dict[str, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """Concatenate two column batches (either may be empty)."""
+    if not right or not len(right["offset"]):
+        return left
+    if not left or not len(left["offset"]):
+        return right
+    return {name: np.concatenate((left[name], right[name])) for name in right}
+
+
+def _frame_to_columns(df: pd.DataFrame, start_pos: int, stride: int) -> Dict[str, np.ndarray]:
+    """Convert written bars into a column batch with their file offsets.
+
+    Args:
+        df (pd.DataFrame): Bars as written (OHLCV columns, indexed by time).
+        start_pos (int): Position of the first bar in the output file.
+        stride (int): Position increment per bar (record size or 1).
+
+    Returns:
+        Dict[str, np.ndarray]: Column batch as returned by `read_columns`.
+    """
+    columns = {'ts': df.index.values.astype('datetime64[ms]').astype(np.int64)}
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        columns[name] = df[name].to_numpy()
+    columns['offset'] = start_pos + np.arange(len(df), dtype=np.int64) * stride
+    return columns
+
 
 def fork_resample(args) -> bool:
     """
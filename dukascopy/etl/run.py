@@ -5,6 +5,7 @@
  File:        run.py
  Author:      JP Ueberbach
  Created:     2025-11-15
+ Updated:     2026-10-16
  Description: Runs pipeline stages in correct order
 
               Pipeline stages:
@@ -13,6 +14,31 @@
               3. Aggregate daily CSVs into symbol-level CSVs (`aggregate.py`)
               4. Resample symbol-level data to higher timeframes (`resample.py`)
 
+              With `orchestrator.pipelined` the stages are not run as
+              barriers but as a dependency graph (`pipeline.py`): each
+              transform starts when its download landed, each aggregate when
+              the last transform of its symbol completed, each resample when
+              its aggregate completed.
+
+              With `orchestrator.manifest` task planning consults the
+              per-symbol manifest (`manifest.py`) instead of checking two
+              files per symbol and date. Completed tasks are recorded after
+              the run.
+
+              With download mode `async` the download stage runs in the main
+              process (one event loop, one connection pool, one global rate
+              limit) and every completed file is handed to the transform
+              stage in the pool right away.
+
+              With `transform.batch_days` > 1 the transform tasks of a symbol
+              are grouped into contiguous date ranges, each transformed by a
+              single task (`transform.fork_transform_batch`).
+
+              With `transform.direct_aggregate` historic days are appended to
+              the aggregate by the transform itself. All days of a symbol are
+              then transformed by one task (in date order) and a day counts
+              as transformed once the aggregate index is past it.
+
  Usage:
      python3 run.py
 
@@ -30,6 +56,7 @@ import os
 import math
 import time
 import sys
+import threading
 import pandas as pd
 import numpy as np
 from config.app_config import AppConfig, load_app_config
@@ -38,6 +65,8 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from multiprocessing import get_context
 from tqdm import tqdm
+from etl.pipeline import PipelineScheduler
+from manifest import Manifest, manifest_fingerprint, manifest_stage_path
 
 # Import the existing pipeline modules
 import download
@@ -148,6 +177,191 @@ By using this tool, you accept these terms.
             print("Invalid input. Please respond with 'yes' or 'no'.")
 
 
+def run_bulk_download_stage(pool, app_config: AppConfig, download_tasks: list, transform_tasks: list) -> None:
+    """
+    Run the async download stage and overlap the transform stage with it.
+
+    Downloads run in the calling process. Each completed file whose
+    transform is pending is submitted to the pool immediately and removed
+    from `transform_tasks` (in place), so the regular transform stage only
+    handles the leftovers.
+
+    Args:
+        pool: Multiprocessing pool used for the transforms.
+        app_config: Global application configuration.
+        download_tasks: List of (symbol, date, app_config) download tasks.
+        transform_tasks: List of (symbol, date, app_config) transform tasks,
+            modified in place.
+    """
+    # Lookup of pending transforms by (symbol, date)
+    pending = {(task[0], task[1]): task for task in transform_tasks}
+    results = []
+
+    with tqdm(total=len(download_tasks), unit="downloads", colour='white') as progress:
+        def on_complete(symbol, dt):
+            # Hand the completed file to the transform stage
+            task = pending.pop((symbol, dt), None)
+            if task is not None:
+                results.append(pool.apply_async(transform.fork_transform, (task,)))
+            progress.update(1)
+
+        download.run_bulk_download(download_tasks, app_config, on_complete=on_complete)
+        # Count downloads without content as well
+        progress.update(len(download_tasks) - progress.n)
+
+    # Only the transforms that were not submitted remain
+    transform_tasks[:] = list(pending.values())
+
+    # Wait for the overlapped transforms, surfaces the first error
+    for result in tqdm(results, unit="files", colour='white'):
+        result.get()
+
+
+def batch_transform_tasks(transform_tasks: list, batch_days: int, contiguous: bool = True) -> list:
+    """
+    Group per-day transform tasks into contiguous date ranges per symbol.
+
+    Args:
+        transform_tasks: (symbol, date, app_config) transform tasks.
+        batch_days: Maximum number of dates per batch.
+        contiguous: Start a new batch at every gap in the dates.
+
+    Returns:
+        list: (symbol, dates, app_config) batch tasks, dates ascending.
+    """
+    batches = []
+    for symbol, dt, app_config in sorted(transform_tasks, key=lambda task: (task[0], task[1])):
+        last = batches[-1] if batches else None
+        # Extend the current batch if it is the same symbol and the next day
+        if (last is not None and last[0] == symbol and len(last[1]) < batch_days
+                and (not contiguous or last[1][-1] + timedelta(days=1) == dt)):
+            last[1].append(dt)
+        else:
+            batches.append((symbol, [dt], app_config))
+    return batches
+
+
+def plan_transform_batches(transform_tasks: list, app_config: AppConfig) -> list:
+    """
+    Return the batch tasks for the transform stage, None for per-day tasks.
+
+    With direct aggregation every symbol gets a single task so its days are
+    appended in order (the worker still processes batch_days at a time).
+
+    Args:
+        transform_tasks: (symbol, date, app_config) transform tasks.
+        app_config: Global application configuration.
+
+    Returns:
+        list | None: (symbol, dates, app_config) tasks, or None.
+    """
+    if transform.direct_aggregate_enabled(app_config):
+        return batch_transform_tasks(transform_tasks, len(transform_tasks), contiguous=False)
+    if app_config.transform.batch_days > 1:
+        return batch_transform_tasks(transform_tasks, app_config.transform.batch_days)
+    return None
+
+
+def run_pipeline(
+    pool,
+    app_config: AppConfig,
+    num_processes: int,
+    download_tasks: list,
+    transform_tasks: list,
+    aggregate_tasks: list,
+    resample_tasks: list
+) -> None:
+    """
+    Run all stages as a dependency graph instead of stage barriers.
+
+    Dependencies:
+        - transform(symbol, date) waits for download(symbol, date)
+        - aggregate(symbol) waits for all transforms of the symbol and of
+          its transform source symbol (sidetracked symbols)
+        - resample(symbol) waits for aggregate(symbol)
+
+    Tasks without pending work this run (e.g. no download needed) are not
+    part of the graph, their dependents are ready immediately. With download
+    mode `async` the downloads run in a thread of this process and complete
+    their nodes from there.
+
+    Args:
+        pool: Multiprocessing pool.
+        app_config: Global application configuration.
+        num_processes: Number of pool processes.
+        download_tasks: (symbol, date, app_config) download tasks.
+        transform_tasks: (symbol, date, app_config) transform tasks.
+        aggregate_tasks: (symbol, dates, app_config) aggregate tasks.
+        resample_tasks: (symbol, app_config) resample tasks.
+    """
+    # Keep a small backlog per process, higher stages are submitted first
+    scheduler = PipelineScheduler(
+        pool,
+        ["Download", "Transform", "Aggregate", "Resample"],
+        max_inflight=num_processes * 2
+    )
+    bulk = bool(download_tasks) and app_config.download.mode == "async"
+
+    for task in download_tasks:
+        scheduler.add_task(("download", task[0], task[1]), "Download",
+                           None if bulk else download.fork_download, task)
+
+    # Dates transformed per symbol, the aggregate waits for all of them
+    transformed = {}
+    batches = plan_transform_batches(transform_tasks, app_config)
+    if batches is not None:
+        # A batch node is keyed by its first date and waits for all its downloads
+        for task in batches:
+            scheduler.add_task(("transform", task[0], task[1][0]), "Transform",
+                               transform.fork_transform_batch, task,
+                               depends_on=[("download", task[0], dt) for dt in task[1]])
+            transformed.setdefault(task[0], []).append(task[1][0])
+    else:
+        for task in transform_tasks:
+            scheduler.add_task(("transform", task[0], task[1]), "Transform",
+                               transform.fork_transform, task,
+                               depends_on=[("download", task[0], task[1])])
+            transformed.setdefault(task[0], []).append(task[1])
+
+    # Sidetracked symbols are written by the transform of their source
+    sources = {
+        key: symbol.source
+        for key, symbol in app_config.transform.symbols.items() if symbol.source
+    }
+
+    for task in aggregate_tasks:
+        symbol = task[0]
+        scheduler.add_task(("aggregate", symbol), "Aggregate",
+                           aggregate.fork_aggregate, task,
+                           depends_on=[
+                               ("transform", owner, dt)
+                               for owner in (symbol, sources.get(symbol)) if owner
+                               for dt in transformed.get(owner, [])
+                           ])
+
+    for task in resample_tasks:
+        scheduler.add_task(("resample", task[0]), "Resample",
+                           resample.fork_resample, task,
+                           depends_on=[("aggregate", task[0])])
+
+    if bulk:
+        def download_thread():
+            try:
+                download.run_bulk_download(
+                    download_tasks, app_config,
+                    on_complete=lambda symbol, dt: scheduler.complete(("download", symbol, dt))
+                )
+                # Downloads without content are done as well
+                for symbol, dt, _ in download_tasks:
+                    scheduler.complete(("download", symbol, dt))
+            except Exception as e:
+                scheduler.fail(None, e)
+
+        threading.Thread(target=download_thread, daemon=True).start()
+
+    scheduler.run()
+
+
 def main():
     """
     Main entry point for running the Dukascopy ETL pipeline.
@@ -203,12 +417,36 @@ def main():
         today_dt = datetime.now(timezone.utc).date()
         dates = [start_dt + timedelta(days=i) for i in range((today_dt - start_dt).days + 1)]
 
+        # Completed downloads/transforms, None checks every file
+        manifest = Manifest(config.paths.manifest) if config.manifest else None
+
+        # With direct aggregation days before the last aggregated date of a
+        # symbol (and of all symbols sidetracked from it) are transformed
+        aggregated = {}
+        if transform.direct_aggregate_enabled(app_config):
+            for sym in symbols:
+                owners = [sym] + [
+                    key for key, value in app_config.transform.symbols.items() if value.source == sym
+                ]
+                aggregated[sym] = min(
+                    aggregate.AggregateEngine(owner, app_config.aggregate).last_date() for owner in owners
+                )
+
+        def is_complete(stage: str, sym: str, dt) -> bool:
+            if stage == "transform" and sym in aggregated and dt < aggregated[sym]:
+                return True
+            path = manifest_stage_path(config.paths, stage, sym, dt, app_config.download.format)
+            if manifest is None:
+                return manifest_fingerprint(path, dt) is not None
+            # Set lookup, only dates unknown to the manifest are checked on disk
+            return manifest.check(sym, stage, dt, path)
+
         # Prepare download tasks for JSON files that are missing
         download_tasks = [
             (sym, dt, app_config)
             for dt in dates
             for sym in symbols
-            if not Path(f"{config.paths.downloads}/{dt:%Y}/{dt:%m}/{sym}_{dt:%Y%m%d}.json").is_file()
+            if not is_complete("download", sym, dt)
         ]
 
         # Download disable option support
@@ -220,17 +458,20 @@ def main():
                 (sym, dt, app_config)
                 for dt in dates
                 for sym in symbols
-                if not Path(f"{config.paths.transforms}/{dt:%Y}/{dt:%m}/{sym}_{dt:%Y%m%d}.bin").is_file()
+                if not is_complete("transform", sym, dt)
             ]
         else:
             transform_tasks = [
                 (sym, dt, app_config)
                 for dt in dates
                 for sym in symbols
-                if not Path(f"{config.paths.transforms}/{dt:%Y}/{dt:%m}/{sym}_{dt:%Y%m%d}.bin").is_file()
-                if Path(f"{config.paths.downloads}/{dt:%Y}/{dt:%m}/{sym}_{dt:%Y%m%d}.json").is_file()
+                if not is_complete("transform", sym, dt)
+                if is_complete("download", sym, dt)
             ]            
 
+        # Transform tasks are consumed by the async download stage, keep the plan
+        planned_transforms = list(transform_tasks)
+
         # Symbols need to get extended here with the symbols that are sidetracked
         for key in app_config.transform.symbols.keys():
             if app_config.transform.symbols.get(key).source:
@@ -246,6 +487,9 @@ def main():
         # Prepare resample tasks (one per symbol)
         resample_tasks = [(symbol, app_config) for symbol in symbols]
 
+        # Batched transforms (one task per date range), None for per-day tasks
+        transform_batches = plan_transform_batches(transform_tasks, app_config)
+
         # Create a single multiprocessing context to minimize process spawn overhead
         ctx = get_context("fork")
         pool = ctx.Pool(processes=num_processes)
@@ -265,6 +509,12 @@ def main():
                 transform_tasks,
                 max(1, min(128, int(math.sqrt(len(transform_tasks)) / num_processes) or 1)),
                 "files"
+            ) if transform_batches is None else (
+                "Transform",
+                transform.fork_transform_batch,
+                transform_batches,
+                1,
+                "batches"
             ),
             (
                 "Aggregate",
@@ -284,6 +534,35 @@ def main():
 
         # Run each stage in the same pool, with progress bars
         with pool:
+            if config.pipelined:
+                # Dependency-driven, stages overlap
+                try:
+                    print("Step: Pipeline (Download -> Transform -> Aggregate -> Resample)...")
+                    run_pipeline(pool, app_config, num_processes, download_tasks,
+                                 transform_tasks, aggregate_tasks, resample_tasks)
+                except Exception as e:
+                    print(f"\nABORT! Critical error in Pipeline.\n{type(e).__name__}: {e}")
+                    import traceback
+                    traceback.print_exc()
+                stages = []
+
+            elif download_tasks and app_config.download.mode == "async":
+                # Single-process download, transforms overlap in the pool
+                try:
+                    print("Step: Download (async)...")
+                    if transform_batches is not None:
+                        # Batches need all their days, transform after the downloads
+                        run_bulk_download_stage(pool, app_config, download_tasks, [])
+                    else:
+                        run_bulk_download_stage(pool, app_config, download_tasks, transform_tasks)
+                    # Stage is done, transform_tasks now only holds the leftovers
+                    stages = [s for s in stages if s[0] != "Download"]
+                except Exception as e:
+                    print(f"\nABORT! Critical error in Download.\n{type(e).__name__}: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    stages = []
+
             for name, func, tasks, chunksize, unit in stages:
                 if not tasks:
                     print(f"Skipping {name} (no tasks)")
@@ -299,6 +578,15 @@ def main():
                     traceback.print_exc()
                     break
 
+        if manifest is not None:
+            # Record what this run completed (one stat per planned task)
+            for stage, tasks in (("download", download_tasks), ("transform", planned_transforms)):
+                for sym, dt, _ in tasks:
+                    manifest.record(sym, stage, dt, manifest_stage_path(
+                        config.paths, stage, sym, dt, app_config.download.format
+                    ))
+            manifest.save()
+
         # Report total wall-clock runtime
         elapsed = time.time() - start_time
         print("\nETL pipeline complete!")
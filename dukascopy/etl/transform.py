@@ -7,6 +7,9 @@
  Created:     2025-12-19
  Updated:     2025-12-23
               2026-02-12
+              2026-10-16 (raw archive input)
+              2026-10-16 (multi-day batches)
+              2026-10-16 (direct aggregate appends)
 
  Description:
      High-performance transformation engine for converting Dukascopy
@@ -37,6 +40,16 @@
                TransformWorker  → I/O + orchestration
                fork_transform   → multiprocessing boundary
 
+     With `transform.batch_days` > 1 one task transforms a contiguous range
+     of dates for a symbol (`fork_transform_batch`). The days are
+     reconstructed in a single vectorized pass over the concatenated delta
+     arrays and split back into the usual per-day output files.
+
+     With `transform.direct_aggregate` (binary fmode) historic days are not
+     written as per-day files but appended to the symbol's aggregate file
+     under the aggregate index protocol. Only the live day keeps its
+     per-day file, which the aggregate stage picks up as before.
+
      Complexity characteristics:
 
          Let:
@@ -70,7 +83,7 @@ import orjson
 import os
 from datetime import date
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
 
 from dst import get_symbol_time_shift_ms
 from etl.config.app_config import AppConfig, TransformConfig, TransformSymbolProcessingStep
@@ -80,6 +93,27 @@ from etl.io.resample.factory import *
 from etl.exceptions import *
 
 from etl.processors.transform_post_process import _transform_post_process
+from etl.aggregate import AggregateEngine
+from etl.io.archive import RawArchive, RAW_ARCHIVE_EXTENSION, raw_archive_path
+
+def direct_aggregate_enabled(app_config: AppConfig) -> bool:
+    """Return True if historic days are appended directly to the aggregate.
+
+    Requires `transform.direct_aggregate` and binary fmode for both the
+    transform and the aggregate stage, otherwise per-day files are written.
+
+    Args:
+        app_config (AppConfig): Global application configuration.
+
+    Returns:
+        bool: True if direct aggregation is active.
+    """
+    return bool(
+        app_config.transform.direct_aggregate
+        and app_config.transform.fmode == "binary"
+        and app_config.aggregate.fmode == "binary"
+    )
+
 
 class TransformEngine:
     """
@@ -127,7 +161,8 @@ class TransformEngine:
                 M = number of configured post-processing rules
 
         Args:
-            data (dict): Parsed JSON containing delta-encoded market data.
+            data (dict): Parsed JSON (or archived payload with NumPy columns)
+                containing delta-encoded market data.
             alias (str | None): Optional alias symbol override.
 
         Returns:
@@ -148,32 +183,32 @@ class TransformEngine:
             try:
                 # Reconstruct timestamps via cumulative sum (vectorized → O(N))
                 times = (
-                    np.cumsum(np.array(data["times"], dtype=np.int64) * data["shift"])
+                    np.cumsum(np.asarray(data["times"], dtype=np.int64) * data["shift"])
                     + (data["timestamp"] + time_shift_ms)
                 )
 
                 # Reconstruct open prices (vectorized cumulative delta → O(N))
                 opens = data["open"] + np.cumsum(
-                    np.array(data["opens"], dtype=np.float64) * data["multiplier"]
+                    np.asarray(data["opens"], dtype=np.float64) * data["multiplier"]
                 )
 
                 # Reconstruct high prices (O(N))
                 highs = data["high"] + np.cumsum(
-                    np.array(data["highs"], dtype=np.float64) * data["multiplier"]
+                    np.asarray(data["highs"], dtype=np.float64) * data["multiplier"]
                 )
 
                 # Reconstruct low prices (O(N))
                 lows = data["low"] + np.cumsum(
-                    np.array(data["lows"], dtype=np.float64) * data["multiplier"]
+                    np.asarray(data["lows"], dtype=np.float64) * data["multiplier"]
                 )
 
                 # Reconstruct close prices (O(N))
                 closes = data["close"] + np.cumsum(
-                    np.array(data["closes"], dtype=np.float64) * data["multiplier"]
+                    np.asarray(data["closes"], dtype=np.float64) * data["multiplier"]
                 )
 
                 # Volumes are absolute, simple array conversion (O(N))
-                volumes = np.array(data["volumes"], dtype=np.float64)
+                volumes = np.asarray(data["volumes"], dtype=np.float64)
 
             except KeyError as e:
                 raise ProcessingError(
@@ -203,68 +238,229 @@ class TransformEngine:
                 index=idx
             ).round(self.config.round_decimals)  # Vectorized rounding → O(N)
 
-            # Get symbol-specific config block (dict lookup → O(1))
-            sym_cfg = self.config.symbols.get(symbol) if self.config.symbols else None
+            # Select post-processing steps overlapping this day (O(M))
+            active_steps = self.active_steps(symbol, self.dt, self.dt)
 
-            # Initialize list of active post-processing steps (O(1))
-            active_steps = []
+            # Execute each active step (each may scan dataframe → O(N × active_steps))
+            for step in active_steps:
+                full_transformed = _transform_post_process(
+                    self, full_transformed, step
+                )
 
-            # Precompute date boundaries ONCE (avoid repeated object creation → O(1))
-            fmt = "%Y-%m-%d %H:%M:%S"
-            s_start_str = (pd.Timestamp(self.dt) - pd.Timedelta(days=1)).strftime(fmt)
-            s_end_str = (pd.Timestamp(self.dt) + pd.Timedelta(days=2)).strftime(fmt)
+            # Explicitly free large arrays to reduce memory pressure (O(1))
+            del times, opens, highs, lows, closes, volumes
+            del t_f, o_f, h_f, l_f, c_f, v_f, mask, idx
 
-            # If symbol has post-processing rules configured
-            if sym_cfg and sym_cfg.post:
+            # Return final normalized dataframe
+            return full_transformed
 
-                # Iterate rules (O(M) where M = number of rules)
-                for s in sym_cfg.post.values():
+        except (DataValidationError, ProcessingError, TransformLogicError):
+            raise
+        except Exception as e:
+            raise ProcessingError(
+                f"Vectorized transformation failed for {symbol}: {e}"
+            ) from e
+
+    def active_steps(self, symbol: str, first_dt: date, last_dt: date) -> list:
+        """
+        Select the post-processing steps that may touch a range of days.
+
+        Rules whose date window cannot overlap [first_dt - 1 day,
+        last_dt + 2 days] are pruned, the validation step is appended when
+        enabled.
+
+        Args:
+            symbol (str): Effective (alias) symbol name.
+            first_dt (date): First trading date of the range.
+            last_dt (date): Last trading date of the range.
 
-                    # Extract raw boundary strings (O(1))
-                    f_date_str = s.get('from_date')
-                    t_date_str = s.get('to_date')
+        Returns:
+            list: Active TransformSymbolProcessingStep instances in order.
+        """
+        # Get symbol-specific config block (dict lookup → O(1))
+        sym_cfg = self.config.symbols.get(symbol) if self.config.symbols else None
+
+        # Initialize list of active post-processing steps (O(1))
+        active_steps = []
+
+        # Precompute date boundaries ONCE (avoid repeated object creation → O(1))
+        fmt = "%Y-%m-%d %H:%M:%S"
+        s_start_str = (pd.Timestamp(first_dt) - pd.Timedelta(days=1)).strftime(fmt)
+        s_end_str = (pd.Timestamp(last_dt) + pd.Timedelta(days=2)).strftime(fmt)
+
+        # If symbol has post-processing rules configured
+        if sym_cfg and sym_cfg.post:
 
-                    # ISO string comparison is lexicographically sortable → O(1)
-                    # Avoids datetime parsing cost and object allocation
-                    if t_date_str and t_date_str < s_start_str:
-                        continue
+            # Iterate rules (O(M) where M = number of rules)
+            for s in sym_cfg.post.values():
 
-                    if f_date_str and f_date_str > s_end_str:
-                        continue
+                # Extract raw boundary strings (O(1))
+                f_date_str = s.get('from_date')
+                t_date_str = s.get('to_date')
 
-                    # Instantiate rule only if relevant (object creation → O(1))
-                    step = (
-                        TransformSymbolProcessingStep(**s)
-                        if isinstance(s, dict)
-                        else s
-                    )
+                # ISO string comparison is lexicographically sortable → O(1)
+                # Avoids datetime parsing cost and object allocation
+                if t_date_str and t_date_str < s_start_str:
+                    continue
 
-                    active_steps.append(step)
+                if f_date_str and f_date_str > s_end_str:
+                    continue
 
-            # Optionally inject validation step (constant append → O(1))
-            if self.config.validate:
-                active_steps.append(
-                    TransformSymbolProcessingStep(action="validate")
+                # Instantiate rule only if relevant (object creation → O(1))
+                step = (
+                    TransformSymbolProcessingStep(**s)
+                    if isinstance(s, dict)
+                    else s
                 )
 
-            # Execute each active step (each may scan dataframe → O(N × active_steps))
-            for step in active_steps:
-                full_transformed = _transform_post_process(
-                    self, full_transformed, step
+                active_steps.append(step)
+
+        # Optionally inject validation step (constant append → O(1))
+        if self.config.validate:
+            active_steps.append(
+                TransformSymbolProcessingStep(action="validate")
+            )
+
+        return active_steps
+
+    def process_batch(self, days: List[Tuple[date, dict]], alias=None) -> List[Tuple[date, pd.DataFrame]]:
+        """
+        Transform several days of payloads in one vectorized pass.
+
+        The delta columns of all days are concatenated. Cumulative sums run
+        once over the concatenation and are re-based per day by subtracting
+        the running total at each day start, the per-day base values, scale
+        factors and time shifts are broadcast with np.repeat. The result is
+        split back into one DataFrame per day, equal to what process_json
+        returns for that day.
+
+        Complexity:
+            - Reconstruction: O(N) over all rows of the batch
+            - Per-day bookkeeping: O(D)
+            - Post-processing: O(N × active_steps)
+
+            Where:
+                N = total number of candles
+                D = number of days
+
+        Args:
+            days (List[Tuple[date, dict]]): (date, payload) pairs in date order.
+            alias (str | None): Optional alias symbol override.
+
+        Returns:
+            List[Tuple[date, pd.DataFrame]]: One (date, DataFrame) per input day.
+
+        Raises:
+            ProcessingError: If a payload is malformed or transformation fails.
+            TransformLogicError: If invalid post-processing action encountered.
+            DataValidationError: If validation fails and propagation enabled.
+        """
+        symbol = alias if alias is not None else self.symbol
+
+        if not days:
+            return []
+
+        try:
+            try:
+                # Rows per day and the offsets of the day boundaries (O(D))
+                counts = np.array([len(data["times"]) for _, data in days], dtype=np.int64)
+                ends = np.cumsum(counts)
+                starts = ends - counts
+
+                # Per-day scalars (O(D)), the time shift is resolved per date
+                shift = np.array([data["shift"] for _, data in days], dtype=np.int64)
+                multiplier = np.array([data["multiplier"] for _, data in days], dtype=np.float64)
+                base_time = np.array([
+                    data["timestamp"] + get_symbol_time_shift_ms(dt, self.symbol, self.config)
+                    for dt, data in days
+                ], dtype=np.int64)
+
+                def column(key: str, dtype) -> np.ndarray:
+                    # Concatenated delta column (O(N))
+                    return np.concatenate([np.asarray(data[key], dtype=dtype) for _, data in days])
+
+                def rebase(deltas: np.ndarray, scale: np.ndarray, base: np.ndarray) -> np.ndarray:
+                    # Segmented cumulative sum: one global cumsum, minus the
+                    # running total before each day start (O(N))
+                    total = np.cumsum(deltas * np.repeat(scale, counts))
+                    before = np.concatenate(([0], total))[starts]
+                    return total - np.repeat(before, counts) + np.repeat(base, counts)
+
+                # Integer arithmetic, identical to the per-day result
+                times = rebase(column("times", np.int64), shift, base_time)
+
+                opens = rebase(column("opens", np.float64), multiplier,
+                               np.array([data["open"] for _, data in days], dtype=np.float64))
+                highs = rebase(column("highs", np.float64), multiplier,
+                               np.array([data["high"] for _, data in days], dtype=np.float64))
+                lows = rebase(column("lows", np.float64), multiplier,
+                              np.array([data["low"] for _, data in days], dtype=np.float64))
+                closes = rebase(column("closes", np.float64), multiplier,
+                                np.array([data["close"] for _, data in days], dtype=np.float64))
+
+                volumes = column("volumes", np.float64)
+
+            except KeyError as e:
+                raise ProcessingError(
+                    f"Malformed JSON schema for {self.symbol}: missing key {e}"
                 )
 
-            # Explicitly free large arrays to reduce memory pressure (O(1))
-            del times, opens, highs, lows, closes, volumes
-            del t_f, o_f, h_f, l_f, c_f, v_f, mask, idx
+            # Remove zero-volume candles and move the day boundaries along (O(N))
+            mask = volumes != 0.0
+            kept = np.concatenate(([0], np.cumsum(mask)))
+            bounds = kept[np.concatenate((starts, ends[-1:]))]
 
-            # Return final normalized dataframe
-            return full_transformed
+            idx = pd.DatetimeIndex(times[mask] * 1_000_000, name="time")
+
+            full_transformed = pd.DataFrame(
+                data={
+                    "open": opens[mask],
+                    "high": highs[mask],
+                    "low": lows[mask],
+                    "close": closes[mask],
+                    "volume": volumes[mask],
+                },
+                index=idx
+            ).round(self.config.round_decimals)
+
+            del times, opens, highs, lows, closes, volumes, mask, idx
+
+            # Split back into days (slices are views → O(D))
+            frames = [
+                full_transformed.iloc[bounds[i]:bounds[i + 1]]
+                for i in range(len(days))
+            ]
+
+            active_steps = self.active_steps(symbol, days[0][0], days[-1][0])
+
+            if active_steps:
+                if full_transformed.index.is_monotonic_increasing:
+                    # Steps resolve their window with searchsorted, one pass
+                    # over the batch is the same as one pass per day
+                    for step in active_steps:
+                        full_transformed = _transform_post_process(
+                            self, full_transformed, step
+                        )
+                    frames = [
+                        full_transformed.iloc[bounds[i]:bounds[i + 1]]
+                        for i in range(len(days))
+                    ]
+                else:
+                    # Days overlap in time (shift change on a 24/7 symbol),
+                    # fall back to per-day post-processing
+                    for i, frame in enumerate(frames):
+                        frame = frame.copy()
+                        for step in active_steps:
+                            frame = _transform_post_process(self, frame, step)
+                        frames[i] = frame
+
+            return [(dt, frame) for (dt, _), frame in zip(days, frames)]
 
         except (DataValidationError, ProcessingError, TransformLogicError):
             raise
         except Exception as e:
             raise ProcessingError(
-                f"Vectorized transformation failed for {symbol}: {e}"
+                f"Vectorized batch transformation failed for {symbol}: {e}"
             ) from e
 
 
@@ -295,10 +491,13 @@ class TransformWorker:
         self.fmode = self.config.fmode
         self.symbol = symbol
         self.dt = dt
+        # Append historic days straight to the aggregate (binary only)
+        self.direct = direct_aggregate_enabled(app_config)
+        self.aggregators = {}
         # Create engine instance
         self.engine = TransformEngine(dt, symbol, self.config)
 
-    def resolve_paths(self, alias=None) -> Tuple[Path, Path]:
+    def resolve_paths(self, alias=None, dt: date = None) -> Tuple[Path, Path]:
         """
         Resolve source JSON and target output paths for a given symbol/date.
 
@@ -318,6 +517,7 @@ class TransformWorker:
 
         Args:
             alias (str | None): Optional alias symbol name. If None, uses self.symbol.
+            dt (date | None): Trading date, defaults to the worker date.
 
         Returns:
             Tuple[Path, Path]: (source_json_path, target_output_path)
@@ -328,6 +528,7 @@ class TransformWorker:
 
         # Use alias if provided, otherwise default to primary symbol (O(1))
         alias = alias if alias is not None else self.symbol
+        dt = dt if dt is not None else self.dt
 
         # Determine correct file extension based on resample mode (factory lookup → O(1))
         extension = ResampleIOFactory.get_appropriate_extension(self.fmode)
@@ -335,27 +536,36 @@ class TransformWorker:
         # Construct historic JSON source path (pure path arithmetic → O(1))
         hist_cache = (
             Path(self.config.paths.historic)
-            / self.dt.strftime(f"%Y/%m/{self.symbol}_%Y%m%d.json")
+            / dt.strftime(f"%Y/%m/{self.symbol}_%Y%m%d.json")
         )
 
         # Construct historic output path (O(1))
         hist_data = (
             Path(self.config.paths.data)
-            / self.dt.strftime(f"%Y/%m/{alias}_%Y%m%d{extension}")
+            / dt.strftime(f"%Y/%m/{alias}_%Y%m%d{extension}")
         )
 
         # Construct live JSON source path (O(1))
         live_cache = (
             Path(self.config.paths.live)
-            / self.dt.strftime(f"{self.symbol}_%Y%m%d.json")
+            / dt.strftime(f"{self.symbol}_%Y%m%d.json")
         )
 
         # Construct live output path (O(1))
         live_data = (
             Path(self.config.paths.live)
-            / self.dt.strftime(f"{alias}_%Y%m%d{extension}")
+            / dt.strftime(f"{alias}_%Y%m%d{extension}")
         )
 
+        # With the archive format, finalized days live in the monthly archive
+        # (historic JSON files are still accepted, e.g. before packing)
+        if self.app_config.download.format == "archive":
+            hist_archive = raw_archive_path(self.config.paths.historic, self.symbol, dt)
+            if RawArchive(hist_archive).has(dt):
+                live_cache.unlink(missing_ok=True)
+                live_data.unlink(missing_ok=True)
+                return hist_archive, hist_data
+
         # Prefer historic data if file exists (filesystem metadata check → O(1))
         if hist_cache.is_file():
 
@@ -374,10 +584,153 @@ class TransformWorker:
 
         # If neither exists, fail fast (constant time error path → O(1))
         raise DataNotFoundError(
-            f"No JSON source found for {self.symbol} on {self.dt}"
+            f"No JSON source found for {self.symbol} on {dt}"
         )
 
 
+    def aliases(self) -> List[str]:
+        """
+        Return the primary symbol followed by all symbols sidetracked from it.
+
+        Complexity:
+            O(K) where K = number of configured symbols
+
+        Returns:
+            List[str]: Symbols whose output is produced from this source.
+        """
+        # Start with primary symbol (constant time → O(1))
+        aliasses = [self.symbol]
+
+        # Discover derived symbols that use this symbol as source (scan config → O(K))
+        for key in self.config.symbols.keys():
+            if self.config.symbols.get(key).source == self.symbol:
+                aliasses.append(key)
+
+        return aliasses
+
+    def write(self, df: pd.DataFrame, target_path: Path) -> None:
+        """
+        Write a day DataFrame atomically (temp file + os.replace).
+
+        Args:
+            df (pd.DataFrame): Transformed day.
+            target_path (Path): Final output path.
+        """
+        # Ensure directory exists (filesystem check → effectively O(1))
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Create temporary file path for atomic write (O(1))
+        temp_path = target_path.with_suffix(".tmp")
+
+        # Get appropriate writer implementation (factory lookup → O(1))
+        writer = ResampleIOFactory.get_writer(
+            temp_path,
+            self.fmode,
+            fsync=self.config.fsync
+        )
+
+        # Write full dataframe to disk (linear in rows → O(N))
+        with writer:
+            writer.write_batch(df)  # Actual data write
+            writer.flush()          # Ensure OS buffer flush (fsync if enabled)
+
+        # Atomic replace prevents partial/corrupt files (OS-level operation → O(1))
+        os.replace(temp_path, target_path)
+
+    def emit(self, alias: str, dt: date, df: pd.DataFrame, target_path: Path) -> None:
+        """
+        Persist a transformed day.
+
+        In direct mode historic days are appended to the alias' aggregate
+        file, the live day (target in the live directory) is always written
+        as a per-day file.
+
+        Args:
+            alias (str): Symbol the output belongs to.
+            dt (date): Trading date.
+            df (pd.DataFrame): Transformed day.
+            target_path (Path): Per-day output path.
+        """
+        if self.direct and target_path.parent != Path(self.config.paths.live):
+            engine = self.aggregators.get(alias)
+            if engine is None:
+                engine = self.aggregators[alias] = AggregateEngine(alias, self.app_config.aggregate)
+            engine.append_day(dt, df)
+            return
+
+        self.write(df, target_path)
+
+    def load(self, source_path: Path, dt: date, archives: dict = None) -> dict:
+        """
+        Load the raw payload of one day.
+
+        Args:
+            source_path (Path): JSON file or monthly archive.
+            dt (date): Trading date to read.
+            archives (dict | None): Optional cache of opened RawArchive
+                instances by path, reused across days of a batch.
+
+        Returns:
+            dict: Payload in the JSON layout.
+        """
+        # Archived days decode into arrays without parsing
+        if Path(source_path).suffix == RAW_ARCHIVE_EXTENSION:
+            if archives is None:
+                return RawArchive(source_path).read(dt)
+            archive = archives.get(source_path)
+            if archive is None:
+                archive = archives[source_path] = RawArchive(source_path)
+            return archive.read(dt)
+        return orjson.loads(Path(source_path).read_bytes())
+
+    def run_batch(self, dates: List[date]) -> bool:
+        """
+        Transform a contiguous range of dates in one vectorized pass.
+
+        The dates are processed in chunks of `transform.batch_days`. The
+        payloads of a chunk are loaded first, then every alias is
+        reconstructed with TransformEngine.process_batch and written as the
+        usual per-day files, each with its own atomic replace (or appended
+        to the aggregate in direct mode, in date order). Source resolution
+        (historic vs live, stale live cleanup) is the same as for a single
+        day.
+
+        Args:
+            dates (List[date]): Dates to transform, in ascending order.
+
+        Returns:
+            bool: True if all days were transformed and written.
+
+        Raises:
+            DataNotFoundError: If a day has no source payload.
+            ProcessingError: If transformation fails.
+            TransactionError: If disk I/O or unexpected runtime error occurs.
+        """
+        try:
+            archives = {}
+            aliases = self.aliases()
+            chunk = max(1, self.config.batch_days)
+
+            for start in range(0, len(dates), chunk):
+                days = []
+                for dt in dates[start:start + chunk]:
+                    source_path, _ = self.resolve_paths(dt=dt)
+                    days.append((dt, self.load(source_path, dt, archives)))
+
+                for alias in aliases:
+                    for dt, df in self.engine.process_batch(days, alias=alias):
+                        _, target_path = self.resolve_paths(alias=alias, dt=dt)
+                        self.emit(alias, dt, df, target_path)
+
+            return True
+
+        except (DataNotFoundError, ProcessingError):
+            raise
+        except OSError as e:
+            raise TransactionError(f"Disk I/O failure writing {self.symbol}: {e}")
+        except Exception as e:
+            raise TransactionError(f"Unexpected worker failure for {self.symbol}: {e}")
+
     def run(self) -> bool:
         """
         Execute the full transformation pipeline for a single symbol/date.
@@ -410,19 +763,11 @@ class TransformWorker:
             # Resolve correct input/output paths (constant-time path logic → O(1))
             source_path, target_path = self.resolve_paths()
 
-            # Load entire JSON file into memory (linear in file size → O(N))
-            data = orjson.loads(Path(source_path).read_bytes())
-
-            # Start with primary symbol (constant time → O(1))
-            aliasses = [self.symbol]
-
-            # Discover derived symbols that use this symbol as source (scan config → O(K))
-            for key in self.config.symbols.keys():
-                if self.config.symbols.get(key).source == self.symbol:
-                    aliasses.append(key)
+            # Load the payload into memory (linear in file size → O(N))
+            data = self.load(source_path, self.dt)
 
             # Process each alias independently (loop size = number of aliases)
-            for alias in aliasses:
+            for alias in self.aliases():
 
                 # Re-resolve paths for alias (still constant time → O(1))
                 source_path, target_path = self.resolve_paths(alias=alias)
@@ -432,26 +777,8 @@ class TransformWorker:
                 # Post-processing (if enabled) → up to O(N×M)
                 df = self.engine.process_json(data, alias=alias)
 
-                # Ensure directory exists (filesystem check → effectively O(1))
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Create temporary file path for atomic write (O(1))
-                temp_path = target_path.with_suffix(".tmp")
-
-                # Get appropriate writer implementation (factory lookup → O(1))
-                writer = ResampleIOFactory.get_writer(
-                    temp_path,
-                    self.fmode,
-                    fsync=self.config.fsync
-                )
-
-                # Write full dataframe to disk (linear in rows → O(N))
-                with writer:
-                    writer.write_batch(df)  # Actual data write
-                    writer.flush()          # Ensure OS buffer flush (fsync if enabled)
-
-                # Atomic replace prevents partial/corrupt files (OS-level operation → O(1))
-                os.replace(temp_path, target_path)
+                # Atomic write of the day file, or direct append (O(N))
+                self.emit(alias, self.dt, df, target_path)
 
             return True
 
@@ -499,4 +826,32 @@ def fork_transform(args: tuple) -> bool:
         raise ForkProcessError(f"Error on transform fork for {symbol}: {e}") from e
 
 
-    
\ No newline at end of file
+    
+
+
+def fork_transform_batch(args: tuple) -> bool:
+    """Multiprocessing-safe entry point for transforming a range of dates.
+
+    Args:
+        args (tuple): A tuple containing:
+            - symbol (str): Trading symbol to process.
+            - dates (List[date]): Contiguous dates, ascending.
+            - app_config (AppConfig): Application configuration.
+
+    Returns:
+        bool: True if the batch completes successfully.
+
+    Raises:
+        ForkProcessError: If any exception occurs in the forked process.
+    """
+    try:
+
+        symbol, dates, app_config = args
+        # The worker is bound to the first date, run_batch covers the rest
+        worker = TransformWorker(dates[0], symbol, app_config)
+
+        # Execute the batch
+        return worker.run_batch(dates)
+
+    except Exception as e:
+        raise ForkProcessError(f"Error on transform batch fork for {symbol}: {e}") from e
@@ -34,6 +34,7 @@ from ml.alerts.models import AlertJob, ActionConfig, Rule, Condition
 from ml.alerts.evaluator import RuleEvaluator
 from ml.alerts.actions import ActionFactory
 from util.api import get_data
+from util.cache import MarketDataCache
 import re
 
 
@@ -156,6 +157,30 @@ class AlertEngine:
         # Return fully parsed job list
         return jobs
 
+    @staticmethod
+    def _live_edge(rule: Rule) -> Dict[str, Any]:
+        """
+        Return the live edge of the rule's view (whether the triggering
+        candle is still open), an O(1) lookup in the market data cache.
+
+        Args:
+            rule (Rule): The evaluated rule.
+
+        Returns:
+            Dict[str, Any]: last_ms, open and last_closed_ms, or an empty
+            dict if the live edge is unavailable.
+        """
+        try:
+            edge = MarketDataCache().live_edge(rule.symbol, rule.timeframe)
+        except Exception:
+            return {}
+
+        return {
+            "last_ms": edge["last_ms"],
+            "open": edge["open"],
+            "last_closed_ms": edge["last_closed_ms"],
+        }
+
     def process_jobs(self):
         """
         Execute alert jobs based on scheduling and rule evaluation.
@@ -263,6 +288,7 @@ class AlertEngine:
                         "symbol": rule.symbol,
                         "time": current_time.isoformat(),
                         "data": latest_data,
+                        "edge": self._live_edge(rule),
                     }
 
                     # Dispatch all configured actions
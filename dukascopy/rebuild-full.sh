@@ -37,7 +37,7 @@ echo "Stopping services...."
 echo "Done."
 
 # Targeted or Global Deletion
-TARGET_DIRS=("./data/transform" "./data/aggregate" "./data/resample" "./data/temp")
+TARGET_DIRS=("./data/transform" "./data/aggregate" "./data/resample" "./data/temp" "./data/manifest")
 
 for dir in "${TARGET_DIRS[@]}"; do
     if [ -d "$dir" ]; then
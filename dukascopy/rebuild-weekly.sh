@@ -32,6 +32,15 @@ echo "Stopping services...."
 echo "Done."
 
 
+# Invalidate the manifest entries of the days we are about to delete
+MANIFEST_ARGS=()
+for symbol in "${SYMBOLS[@]}"; do
+    MANIFEST_ARGS+=(--symbol "$symbol")
+done
+PYTHONPATH=$PYTHONPATH:$(pwd) python3 etl/manifest.py invalidate --from "$(date -d "-$NUMDAYS days" +%Y-%m-%d)" "${MANIFEST_ARGS[@]}"
+# Archived downloads (download.format: archive) are removed from the monthly archives
+PYTHONPATH=$PYTHONPATH:$(pwd) python3 etl/io/archive.py remove --from "$(date -d "-$NUMDAYS days" +%Y-%m-%d)" "${MANIFEST_ARGS[@]}"
+
 # Clean Cached JSON and Transform CSV
 for ((i=1; i<=NUMDAYS; i++)); do
     DATE_PART=$(date -d "-$i days" +%Y/%m/*_%Y%m%d)
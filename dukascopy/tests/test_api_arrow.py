@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import asyncio
+from unittest.mock import patch
+import orjson
+import polars as pl
+import pyarrow as pa
+import pyarrow.flight as flight
+
+from api.v1_1 import helper
+from api.flight import OHLCVFlightServer
+
+class TestArrowOutput(unittest.TestCase):
+
+    def setUp(self):
+        n = 200000
+        self.df = pl.DataFrame({
+            "symbol": ["EUR-USD"] * n,
+            "timeframe": ["1m"] * n,
+            "time_ms": pl.arange(0, n * 60000, 60000, eager=True).cast(pl.UInt64),
+            "close": pl.arange(0, n, eager=True).cast(pl.Float64),
+            "sma_10": pl.arange(0, n, eager=True).cast(pl.Float64) / 2,
+        })
+        self.options = {"output_type": "ARROW", "select_data": [("EUR-USD", "1m", None, [], ["sma_10"])]}
+
+    def _collect(self, response):
+        async def consume():
+            return b"".join([chunk async for chunk in response.body_iterator])
+        return asyncio.run(consume())
+
+    def test_arrow_stream_roundtrip(self):
+        """The ARROW output type streams an IPC stream equal to the result frame."""
+        response = helper.generate_output(self.df, self.options)
+        self.assertEqual(response.media_type, helper.ARROW_STREAM_MEDIA_TYPE)
+
+        reader = pa.ipc.open_stream(self._collect(response))
+        table = reader.read_all()
+        self.assertTrue(pl.from_arrow(table).equals(self.df))
+
+        # Batches are bounded and the options travel in the schema metadata
+        self.assertTrue(all(b.num_rows <= helper.ARROW_BATCH_ROWS for b in table.to_batches()))
+        meta = orjson.loads(table.schema.metadata[b"options"])
+        self.assertEqual(meta["output_type"], "ARROW")
+
+    def test_arrow_stream_empty(self):
+        """Empty results still produce a readable stream with a schema."""
+        response = helper.generate_output(self.df.head(0), self.options)
+        table = pa.ipc.open_stream(self._collect(response)).read_all()
+        self.assertEqual(table.num_rows, 0)
+        self.assertIn("sma_10", table.column_names)
+
+
+class TestFlightServer(unittest.TestCase):
+
+    def setUp(self):
+        # The server accepts calls as soon as it is constructed
+        self.server = OHLCVFlightServer("grpc://127.0.0.1:0")
+        self.client = flight.connect(f"grpc://127.0.0.1:{self.server.port}")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+
+    def test_do_get_executes_query_dsl(self):
+        """Tickets are parsed with the HTTP DSL and returned as record batches."""
+        frame = pl.DataFrame({
+            "symbol": ["EUR-USD"] * 3,
+            "timeframe": ["1m"] * 3,
+            "time_ms": [3, 1, 2],
+            "close": [1.3, 1.1, 1.2],
+        })
+
+        def discover(options):
+            options["select_data"] = [("EUR-USD", "1m", None, [], [])]
+            return options
+
+        with patch("api.flight.discover_options", side_effect=discover), \
+             patch("api.flight.query_select", return_value=frame) as mock_select:
+            ticket = flight.Ticket(b"select/EUR-USD,1m/after/1970-01-01+00:00:01/limit/2/order/desc")
+            table = self.client.do_get(ticket).read_all()
+
+        # Limit and order come from the path, the after bound is converted to ms
+        args = mock_select.call_args[0]
+        self.assertEqual(args[1:5], (1000, 32503680000000, 2, "desc"))
+        self.assertEqual(table.column("time_ms").to_pylist(), [3, 2])
+
+    def test_invalid_limit_is_rejected(self):
+        """Invalid pagination fails with a Flight error."""
+        with self.assertRaises(flight.FlightServerError):
+            self.client.do_get(flight.Ticket(b"select/EUR-USD,1m/limit/0")).read_all()
+
+    def test_list_actions(self):
+        """Listing actions are advertised."""
+        types = [a.type for a in self.client.list_actions()]
+        self.assertEqual(types, ["list_symbols", "list_indicators"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import polars as pl
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1_1 import helper, routes
+
+UNTIL_MS = 32503680000000
+
+
+def frame(symbol, times, descending=False):
+    times = np.sort(np.asarray(times, dtype=np.uint64))
+    if descending:
+        times = times[::-1]
+    return pl.DataFrame({
+        "symbol": [symbol] * len(times),
+        "timeframe": ["1m"] * len(times),
+        "time_ms": times,
+    })
+
+
+class TestCursorPagination(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        # Coarse times, many rows at the same time in different views
+        self.views = {
+            "EUR-USD": np.sort(rng.choice(400, 250, replace=False)).astype(np.uint64) * 60000,
+            "GBP-USD": np.sort(rng.choice(400, 120, replace=False)).astype(np.uint64) * 60000,
+            "XAU-USD": np.arange(300, 400, dtype=np.uint64) * 60000,
+        }
+        self.select_data = [[s, "1m", None, [], []] for s in self.views]
+
+        cache = MagicMock()
+        cache.discover_view.side_effect = lambda symbol, tf: {"ts_index": self.views[symbol]}
+        cache.find_record.side_effect = lambda symbol, tf, ts, side, view: int(
+            np.searchsorted(view["ts_index"], np.uint64(ts), side=side)
+        )
+        self.patch = patch("api.v1_1.helper.MarketDataCache", return_value=cache)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def select(self, symbol, after_ms, until_ms, limit, order):
+        """What get_data returns for a window."""
+        self.assertLess(after_ms, until_ms)
+        ts = self.views[symbol]
+        ts = ts[(ts >= after_ms) & (ts <= until_ms)]
+        ts = ts[:limit] if order == "asc" else ts[::-1][:limit]
+        return frame(symbol, ts, order == "desc")
+
+    def page(self, select_data, after_ms, limit, order, cursor=None):
+        bounds = [(after_ms, UNTIL_MS)] * len(select_data)
+        if cursor:
+            bounds = helper.resolve_cursor(cursor, select_data, after_ms, UNTIL_MS, order)
+        frames = [
+            self.select(item[0], lo, hi, select_limit, order)
+            for item, lo, hi, select_limit in helper.plan_page(select_data, bounds, limit, order)
+        ]
+        df = helper.merge_selects(frames, {"select_data": select_data, "limit": limit}, order)
+        return df, helper.encode_cursor(df, select_data, after_ms, UNTIL_MS, limit, order)
+
+    def walk(self, select_data, after_ms, limit, order):
+        pages = []
+        df, cursor = self.page(select_data, after_ms, limit, order)
+        pages.append(df)
+        while cursor:
+            df, cursor = self.page(select_data, after_ms, limit, order, cursor)
+            pages.append(df)
+        return pl.concat([df for df in pages if df.height])
+
+    def test_pages_equal_full_result(self):
+        """Walking the cursors returns every row once, in order."""
+        for select_data in (self.select_data, self.select_data[:1]):
+            for order in ("asc", "desc"):
+                for limit in (1, 7, 50, 470):
+                    full, _ = self.page(select_data, 60000, 100000, order)
+                    walked = self.walk(select_data, 60000, limit, order)
+                    self.assertTrue(walked.equals(full), (len(select_data), order, limit))
+
+    def test_single_row_at_after(self):
+        """A selection whose only row is at after_ms is queried on every page."""
+        after_ms = 300 * 60000
+        # E.g. a daily candle next to 1m selections, after_ms set to its time
+        self.views["USD-JPY"] = np.array([after_ms], dtype=np.uint64)
+        select_data = self.select_data + [["USD-JPY", "1m", None, [], []]]
+
+        for order in ("asc", "desc"):
+            bounds = [(after_ms, UNTIL_MS)] * len(select_data)
+            calls = helper.plan_page(select_data, bounds, 10, order)
+            self.assertIn("USD-JPY", [item[0] for item, _, _, _ in calls], order)
+
+            full, _ = self.page(select_data, after_ms, 100000, order)
+            self.assertIn("USD-JPY", full["symbol"].to_list())
+            for limit in (7, 50):
+                walked = self.walk(select_data, after_ms, limit, order)
+                self.assertTrue(walked.equals(full), (order, limit))
+
+    def test_invalid_cursor(self):
+        _, cursor = self.page(self.select_data, 0, 10, "asc")
+
+        with self.assertRaisesRegex(ValueError, "Invalid cursor"):
+            helper.resolve_cursor("not-a-cursor", self.select_data, 0, UNTIL_MS, "asc")
+        with self.assertRaisesRegex(ValueError, "order=asc"):
+            helper.resolve_cursor(cursor, self.select_data, 0, UNTIL_MS, "desc")
+        with self.assertRaisesRegex(ValueError, "this query"):
+            helper.resolve_cursor(cursor, self.select_data[:2], 0, UNTIL_MS, "asc")
+
+    def test_exhausted_page(self):
+        """A full last page links to an empty page, no get_data call is made."""
+        after_ms = int(min(ts[0] for ts in self.views.values()))
+        total = sum(len(ts) for ts in self.views.values())
+        df, cursor = self.page(self.select_data, after_ms, total, "desc")
+        self.assertEqual(df.height, total)
+
+        bounds = helper.resolve_cursor(cursor, self.select_data, after_ms, UNTIL_MS, "desc")
+        self.assertEqual(helper.plan_page(self.select_data, bounds, total, "desc"), [])
+        df, cursor = self.page(self.select_data, after_ms, total, "desc", cursor)
+        self.assertEqual((df.height, cursor), (0, None))
+
+    def test_cursor_seeks_by_time(self):
+        """A cursor stays valid when candles are appended between pages."""
+        _, cursor = self.page(self.select_data[:1], 0, 10, "asc")
+        self.views["EUR-USD"] = np.append(self.views["EUR-USD"], np.uint64(500 * 60000))
+
+        bounds = helper.resolve_cursor(cursor, self.select_data[:1], 0, UNTIL_MS, "asc")
+        self.assertEqual(bounds, [(int(self.views["EUR-USD"][9]) + 1, UNTIL_MS)])
+
+
+class TestCursorRoute(unittest.TestCase):
+
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(routes.router)
+        app.dependency_overrides[routes.get_response_cache] = lambda: None
+        self.client = TestClient(app)
+
+        times = np.arange(1, 6, dtype=np.uint64) * 60000
+
+        def discover(options):
+            options["select_data"] = [["EUR-USD", "1m", "EUR-USD/1m.bin", [], []]]
+            return options
+
+        def select(item, after_ms, until_ms, limit, order, disable_recursive_mapping):
+            ts = times[(times >= after_ms) & (times <= until_ms)][:limit]
+            return frame("EUR-USD", ts).with_columns(pl.lit(1.1).alias("close"))
+
+        self.patches = [
+            patch("api.v1_1.routes.discover_options", side_effect=discover),
+            patch("api.v1_1.routes.query_select", side_effect=select),
+            patch("api.v1_1.routes.plan_page", side_effect=lambda select_data, bounds, limit, order: [
+                (item, lo, hi, limit) for item, (lo, hi) in zip(select_data, bounds)
+            ]),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_walk_pages(self):
+        """JSON carries the cursor in the envelope, CSV in a header."""
+        uri = "/ohlcv/1.1/select/EUR-USD,1m/output/{}?limit=2"
+
+        first = self.client.get(uri.format("JSON")).json()
+        cursor = first["options"]["next_cursor"]
+        self.assertEqual(len(first["result"]), 2)
+
+        second = self.client.get(uri.format("CSV") + f"&cursor={cursor}")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.text.splitlines()), 3)
+
+        last = self.client.get(uri.format("JSON") + f"&cursor={second.headers['x-next-cursor']}").json()
+        self.assertEqual(len(last["result"]), 1)
+        self.assertIsNone(last["options"]["next_cursor"])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/ohlcv/1.1/select/EUR-USD,1m/output/JSON?cursor=abc")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import polars as pl
+
+from api.v1_1 import helper
+from util.merge import merge_sorted
+
+
+def frame(symbol, times, descending=False):
+    times = np.sort(np.asarray(times, dtype=np.uint64))
+    if descending:
+        times = times[::-1]
+    return pl.DataFrame({
+        "symbol": [symbol] * len(times),
+        "timeframe": ["1m"] * len(times),
+        "time_ms": times,
+        "close": np.arange(len(times), dtype=np.float64),
+    })
+
+
+def reference(frames, limit, order):
+    """The former concat + full sort."""
+    df = pl.concat(frames).sort(["time_ms", "symbol", "timeframe"], descending=(order != "asc"))
+    return df.head(limit) if limit else df
+
+
+class TestMergeSorted(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        # Coarse times, many ties between the symbols
+        self.times = {s: rng.choice(5000, 800, replace=False) * 60000 for s in ("GBP-USD", "AUD-USD", "EUR-USD")}
+
+    def test_equals_full_sort(self):
+        """Merged rows equal concat + sort on (time_ms, symbol, timeframe)."""
+        for order in ("asc", "desc"):
+            frames = [frame(s, t, order == "desc") for s, t in self.times.items()]
+            for limit in (None, 1, 1000, 10000):
+                merged = helper.merge_selects(frames, {"select_data": frames, "limit": limit}, order)
+                self.assertTrue(merged.equals(reference(frames, limit, order)), (order, limit))
+
+    def test_unsorted_frames_fall_back(self):
+        """Frames that are not sorted are not merged."""
+        unsorted = frame("EUR-USD", [1, 2, 3])[[2, 0, 1]]
+        self.assertIsNone(merge_sorted([unsorted, frame("GBP-USD", [1])]))
+
+        merged = helper.merge_selects([unsorted], {"select_data": [unsorted], "limit": 2}, "desc")
+        self.assertEqual(merged["time_ms"].to_list(), [3, 2])
+
+    def test_empty_frames(self):
+        empty = frame("EUR-USD", [])
+        merged = helper.merge_selects([empty, frame("GBP-USD", [2, 1])], {"select_data": [0, 1], "limit": 5}, "asc")
+        self.assertEqual(merged["time_ms"].to_list(), [1, 2])
+
+
+class TestPlanSelects(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        # A dense, a sparse and a late starting view
+        self.views = {
+            "EUR-USD": np.arange(0, 20000, dtype=np.uint64) * 60000,
+            "SPX-USD": np.sort(rng.choice(20000, 3000, replace=False)).astype(np.uint64) * 60000,
+            "XAU-USD": np.arange(15000, 20000, dtype=np.uint64) * 60000,
+        }
+        self.select_data = [[s, "1m", None, [], []] for s in self.views]
+
+        cache = MagicMock()
+        cache.discover_view.side_effect = lambda symbol, tf: {"ts_index": self.views[symbol]}
+        cache.find_record.side_effect = lambda symbol, tf, ts, side, view: int(
+            np.searchsorted(view["ts_index"], np.uint64(ts), side=side)
+        )
+        self.patch = patch("api.v1_1.helper.MarketDataCache", return_value=cache)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def select(self, symbol, after_ms, until_ms, limit, order):
+        """What get_data returns for a window (timestamps only)."""
+        self.assertLess(after_ms, until_ms)
+        ts = self.views[symbol]
+        ts = ts[(ts >= after_ms) & (ts <= until_ms)]
+        ts = ts[:limit] if order == "asc" else ts[::-1][:limit]
+        return frame(symbol, ts, order == "desc")
+
+    def test_pushdown_keeps_result(self):
+        """Selections are asked for fewer rows, the merged result is unchanged."""
+        for order in ("asc", "desc"):
+            for after_ms, limit in ((0, 1000), (14000 * 60000, 5000), (0, 100000)):
+                until_ms = 32503680000000
+                plan = helper.plan_selects(self.select_data, after_ms, until_ms, limit, order)
+
+                full = [self.select(s, after_ms, until_ms, limit, order) for s in self.views]
+                pushed = [
+                    self.select(s, after_ms, select_until, select_limit, order)
+                    for s, (select_limit, select_until) in zip(self.views, plan)
+                ]
+                options = {"select_data": self.select_data, "limit": limit}
+                self.assertTrue(
+                    helper.merge_selects(pushed, options, order).equals(helper.merge_selects(full, options, order)),
+                    (order, after_ms, limit)
+                )
+
+        # Ascending from the start, the late view contributes nothing but one row
+        plan = helper.plan_selects(self.select_data, 0, 32503680000000, 1000, "asc")
+        self.assertLess(sum(select_limit for select_limit, _ in plan), 3 * 1000)
+        self.assertEqual(plan[2][0], 1)
+
+    def test_single_row_at_after(self):
+        """A selection whose only row is at after_ms keeps a non-empty window."""
+        after_ms = 15000 * 60000
+        # E.g. a daily candle next to 1m selections, after_ms set to its time
+        self.views["USD-JPY"] = np.array([after_ms], dtype=np.uint64)
+        select_data = self.select_data + [["USD-JPY", "1d", None, [], []]]
+
+        for order in ("asc", "desc"):
+            plan = helper.plan_selects(select_data, after_ms, 32503680000000, 100, order)
+            self.assertEqual(plan[3][1], after_ms + 1, order)
+            self.assertEqual(self.select("USD-JPY", after_ms, plan[3][1], plan[3][0], order).height, 1)
+
+    def test_single_select_unchanged(self):
+        plan = helper.plan_selects(self.select_data[:1], 0, 10, 50, "asc")
+        self.assertEqual(plan, [(50, 10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch, MagicMock
+import polars as pl
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from api.v1_1 import routes
+from api.v1_1.response_cache import ResponseCache, CachedResponse, matches
+from util.planner import record
+
+URI = "/ohlcv/1.1/select/EUR-USD,1m/output/{}"
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.response_cache = ResponseCache()
+        app = FastAPI()
+        app.include_router(routes.router)
+        app.dependency_overrides[routes.get_response_cache] = lambda: self.response_cache
+        self.client = TestClient(app)
+
+        # Version of the EUR-USD 1m view, as read by the query and as on disk now
+        self.version = ("EUR-USD/1m.bin", 640, 1.0)
+        self.frame = pl.DataFrame({
+            "symbol": ["EUR-USD"] * 3,
+            "timeframe": ["1m"] * 3,
+            "time_ms": [60000, 120000, 180000],
+            "close": [1.1, 1.2, 1.3],
+        })
+
+        def discover(options):
+            options["select_data"] = [["EUR-USD", "1m", "EUR-USD/1m.bin", [], []]]
+            return options
+
+        def select(*args):
+            record("view", ("EUR-USD", "1m"), self.version)
+            return self.frame
+
+        self.market = MagicMock()
+        self.market.discover_view.side_effect = lambda symbol, tf: dict(
+            zip(("file_path", "size", "mtime"), self.version)
+        )
+        self.patches = [
+            patch("api.v1_1.routes.discover_options", side_effect=discover),
+            patch("api.v1_1.routes.query_select", side_effect=select),
+            patch("api.v1_1.response_cache.MarketDataCache", return_value=self.market),
+        ]
+        self.select = self.patches[1].start()
+        for p in self.patches[::2]:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_polls_are_served_from_cache(self):
+        """Identical polls reuse the response, If-None-Match gets a 304."""
+        first = self.client.get(URI.format("JSON"))
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+
+        second = self.client.get(URI.format("JSON"))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers["etag"], etag)
+        self.assertEqual(self.select.call_count, 1)
+
+        conditional = self.client.get(URI.format("JSON"), headers={"If-None-Match": etag})
+        self.assertEqual(conditional.status_code, 304)
+        self.assertEqual(conditional.content, b"")
+        self.assertEqual(self.select.call_count, 1)
+
+    def test_changed_view_is_recomputed(self):
+        """A new version of a view read by the query invalidates the entry."""
+        etag = self.client.get(URI.format("JSON")).headers["etag"]
+
+        self.version = ("EUR-USD/1m.bin", 704, 2.0)
+        self.frame = self.frame.vstack(pl.DataFrame({
+            "symbol": ["EUR-USD"], "timeframe": ["1m"], "time_ms": [240000], "close": [1.4]
+        }))
+        response = self.client.get(URI.format("JSON"), headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+        self.assertEqual(len(response.json()["result"]), 4)
+        self.assertEqual(self.select.call_count, 2)
+
+    def test_streaming_output_is_cached(self):
+        """CSV keeps streaming, the body is cached once sent."""
+        first = self.client.get(URI.format("CSV"))
+        second = self.client.get(URI.format("CSV"))
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers["content-disposition"], first.headers["content-disposition"])
+        self.assertTrue(second.headers["content-type"].startswith("text/csv"))
+        self.assertEqual(self.select.call_count, 1)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def entry(self, size):
+        return CachedResponse('W/"x"', {}, b"x" * size, "text/csv", {}, 200)
+
+    def test_lru_byte_budget(self):
+        """Least recently used entries are evicted beyond the byte budget."""
+        response_cache = ResponseCache(max_bytes=250)
+        response_cache._put("a", self.entry(100))
+        response_cache._put("b", self.entry(100))
+        self.assertIsNotNone(response_cache.lookup("a"))
+        response_cache._put("c", self.entry(100))
+
+        self.assertEqual(list(response_cache._entries), ["a", "c"])
+        self.assertEqual(response_cache._bytes, 200)
+
+    def test_shared_directory(self):
+        """An entry written by one worker is served by another."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            reads = {("view", ("EUR-USD", "1m")): ("EUR-USD/1m.bin", 640, 1.5)}
+            writer = ResponseCache(path=tmp_dir)
+            writer._put("k", CachedResponse('W/"e"', reads, b"body", "text/csv", {"content-disposition": "x"}, 200))
+
+            reader = ResponseCache(path=tmp_dir)
+            with patch.object(ResponseCache, "_current", return_value=True):
+                entry = reader.lookup("k")
+            self.assertEqual(entry.body, b"body")
+            self.assertEqual(entry.reads, reads)
+            self.assertEqual(entry.headers, {"content-disposition": "x"})
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_corrupt_file_is_a_miss(self):
+        """A truncated or garbled file is dropped instead of failing the lookup."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            response_cache = ResponseCache(path=tmp_dir)
+            for name, data in (("a", b"\x40\x00\x00\x00{\"etag\""), ("b", b"\x02\x00\x00\x00{}body")):
+                file_path = os.path.join(tmp_dir, f"{name}.bin")
+                with open(file_path, "wb") as f:
+                    f.write(data)
+
+                self.assertIsNone(response_cache.lookup(name))
+                self.assertFalse(os.path.exists(file_path))
+            self.assertEqual(response_cache.misses, 2)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_disk_write_runs_on_worker_thread(self):
+        """Entries are written to the shared directory off the event loop."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            response_cache = ResponseCache(path=tmp_dir)
+            loop_thread = threading.get_ident()
+            writers = []
+            original_save = response_cache._save
+
+            def save(key, entry):
+                writers.append(threading.get_ident())
+                original_save(key, entry)
+
+            with patch.object(response_cache, "_save", side_effect=save):
+                response = asyncio.run(response_cache.store("k", {}, Response(b"body"), None))
+
+            self.assertEqual(response.headers["cache-control"], "no-cache")
+            self.assertEqual(len(writers), 1)
+            self.assertNotEqual(writers[0], loop_thread)
+            self.assertTrue(os.path.isfile(os.path.join(tmp_dir, "k.bin")))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_key_and_etag(self):
+        """Wall time does not change the key, versions change the ETag."""
+        options = {"select_data": [["EUR-USD", "1m", "p", [], []]], "limit": 10}
+        self.assertEqual(ResponseCache.key(options), ResponseCache.key({**options, "wall": 0.1}))
+        self.assertNotEqual(ResponseCache.key(options), ResponseCache.key({**options, "limit": 20}))
+
+        etag = ResponseCache.etag("k", {("view", ("EUR-USD", "1m")): ("p", 1, 1.0)})
+        self.assertNotEqual(etag, ResponseCache.etag("k", {("view", ("EUR-USD", "1m")): ("p", 2, 1.0)}))
+        self.assertTrue(matches(f'"other", {etag}', etag))
+        self.assertTrue(matches(etag[2:], etag))
+        self.assertFalse(matches(None, etag))
+
+
+if __name__ == '__main__':
+    unittest.main()
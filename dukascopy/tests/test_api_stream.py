@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import asyncio
+import csv
+import io
+from unittest.mock import patch
+import orjson
+import polars as pl
+
+from api.v1_1 import helper
+
+
+class TestStreamingSerializers(unittest.TestCase):
+
+    def setUp(self):
+        n = 1000
+        self.df = pl.DataFrame({
+            "symbol": ["EUR-USD"] * n,
+            "timeframe": ["1m"] * n,
+            "time_ms": pl.arange(0, n * 60000, 60000, eager=True).cast(pl.UInt64),
+            "close": [1.1 + i / 1e4 for i in range(n)],
+            "sma_10": [None] * 9 + [1.0] * (n - 9),
+        })
+
+    def _collect(self, response):
+        async def consume():
+            return b"".join([chunk async for chunk in response.body_iterator])
+        return asyncio.run(consume()).decode()
+
+    def test_csv_chunks(self):
+        """Slices are serialized natively, one header, no row lost at the boundaries."""
+        with patch.object(helper, "STREAM_CHUNK_ROWS", 64):
+            response = helper.generate_output(self.df, {"output_type": "CSV"})
+            rows = list(csv.reader(io.StringIO(self._collect(response))))
+
+        self.assertEqual(rows[0], ["symbol", "timeframe", "time", "close", "sma_10"])
+        self.assertEqual(len(rows), self.df.height + 1)
+        self.assertEqual(rows[1], ["EUR-USD", "1m", "1970-01-01 00:00:00", "1.1", ""])
+        self.assertEqual(rows[-1][2], "1970-01-01 16:39:00")
+        self.assertEqual([float(r[3]) for r in rows[1:]], self.df["close"].to_list())
+
+    def test_csv_mt4(self):
+        """MT4 mode has no header and split date/time columns."""
+        with patch.object(helper, "STREAM_CHUNK_ROWS", 100):
+            response = helper.generate_output(self.df, {"output_type": "CSV", "mt4": True})
+            lines = self._collect(response).splitlines()
+
+        self.assertEqual(len(lines), self.df.height)
+        self.assertEqual(lines[0], "1970.01.01,00:00:00,1.1,")
+        self.assertEqual(lines[10], "1970.01.01,00:10:00,1.101,1.0")
+
+    def test_ndjson_chunks(self):
+        """Subformat 4 emits one JSON record per row, equal to the former per-record output."""
+        options = {"output_type": "JSON", "subformat": 4, "select_data": [1]}
+        with patch.object(helper, "STREAM_CHUNK_ROWS", 64):
+            lines = self._collect(helper.generate_output(self.df, options)).splitlines()
+
+        expected = helper._add_human_readable_time_column(self.df).to_dicts()
+        self.assertEqual([orjson.loads(line) for line in lines], expected)
+
+
+    def test_exact_values(self):
+        """Null, NaN, bool and small float values are written as the per-row writers did."""
+        df = pl.DataFrame({
+            "symbol": ["EUR-USD"] * 4,
+            "timeframe": ["1m"] * 4,
+            "time_ms": pl.Series([0, 60000, 120000, 180000], dtype=pl.UInt64),
+            "close": [1e-07, float("nan"), None, 1.5e-05],
+            "flag": [True, False, None, True],
+        })
+
+        csv_text = self._collect(helper.generate_output(df, {"output_type": "CSV"}))
+        self.assertEqual(csv_text, (
+            "symbol,timeframe,time,close,flag\n"
+            "EUR-USD,1m,1970-01-01 00:00:00,1e-07,True\n"
+            "EUR-USD,1m,1970-01-01 00:01:00,nan,False\n"
+            "EUR-USD,1m,1970-01-01 00:02:00,,\n"
+            "EUR-USD,1m,1970-01-01 00:03:00,1.5e-05,True\n"
+        ))
+
+        options = {"output_type": "JSON", "subformat": 4, "select_data": [1]}
+        ndjson_text = self._collect(helper.generate_output(df, options))
+        prefix = '{"symbol":"EUR-USD","timeframe":"1m","year":1970,"time":"1970-01-01 00:0'
+        self.assertEqual(ndjson_text, (
+            prefix + '0:00","time_ms":0,"close":1e-7,"flag":true}\n'
+            + prefix + '1:00","time_ms":60000,"close":null,"flag":false}\n'
+            + prefix + '2:00","time_ms":120000,"close":null,"flag":null}\n'
+            + prefix + '3:00","time_ms":180000,"close":0.000015,"flag":true}\n'
+        ))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import copy
+import orjson
+import filecmp
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from pathlib import Path
+
+# etl.transform imports its siblings relative to etl/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "etl"))
+
+from etl.config.app_config import load_app_config
+from etl.aggregate import AggregateEngine, AggregateWorker
+from etl.transform import TransformWorker, direct_aggregate_enabled
+from etl.io.resample.binary import ResampleIOReaderBinary
+
+def make_payload(dt, n=1440, seed=0):
+    """Synthetic Dukascopy candle payload (delta-encoded lists as in the JSON)."""
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([1, 1, 1, 2], n)
+    steps[:1] = 0
+    return {
+        "timestamp": int(pd.Timestamp(dt).value // 10 ** 6),
+        "shift": 60000,
+        "multiplier": 0.00001,
+        "open": 1.10512, "high": 1.10530, "low": 1.10498, "close": 1.10520,
+        "times": steps.tolist(),
+        "opens": rng.integers(-40, 40, n).tolist(),
+        "highs": rng.integers(-40, 40, n).tolist(),
+        "lows": rng.integers(-40, 40, n).tolist(),
+        "closes": rng.integers(-400, 400, n).tolist(),
+        "volumes": np.round(rng.random(n) * 100 + 1, 2).tolist(),
+    }
+
+class TestDirectAggregate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.dates = [date(2024, 3, 4) + timedelta(days=i) for i in range(4)]
+        for i, dt in enumerate(self.dates):
+            path = self.tmp_dir / "cache" / dt.strftime("%Y/%m/EUR-USD_%Y%m%d.json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(orjson.dumps(make_payload(dt, seed=i)))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _config(self, name, direct):
+        config = copy.deepcopy(load_app_config('config.yaml'))
+        config.transform.paths.historic = str(self.tmp_dir / "cache")
+        config.transform.paths.live = str(self.tmp_dir / name / "temp")
+        config.transform.paths.data = str(self.tmp_dir / name / "transform")
+        config.aggregate.paths.historic = config.transform.paths.data
+        config.aggregate.paths.live = config.transform.paths.live
+        config.aggregate.paths.data = str(self.tmp_dir / name / "aggregate")
+        config.transform.batch_days = 3
+        config.transform.direct_aggregate = direct
+        return config
+
+    def test_direct_matches_two_stage(self):
+        """Direct appends produce the same aggregate and index as transform + aggregate."""
+        staged = self._config("staged", False)
+        for dt in self.dates:
+            TransformWorker(dt, 'EUR-USD', staged).run()
+        AggregateWorker('EUR-USD', self.dates, staged).run()
+
+        direct = self._config("direct", True)
+        self.assertTrue(direct_aggregate_enabled(direct))
+        TransformWorker(self.dates[0], 'EUR-USD', direct).run_batch(self.dates)
+
+        # No per-day files for historic days
+        self.assertFalse((self.tmp_dir / "direct" / "transform").exists())
+        for name in ("EUR-USD.bin", "index/EUR-USD.idx"):
+            self.assertTrue(filecmp.cmp(self.tmp_dir / "staged/aggregate" / name,
+                                        self.tmp_dir / "direct/aggregate" / name, shallow=False))
+
+        # Re-running is a no-op, the aggregate stage finds nothing left to do
+        size = (self.tmp_dir / "direct/aggregate/EUR-USD.bin").stat().st_size
+        TransformWorker(self.dates[0], 'EUR-USD', direct).run_batch(self.dates)
+        AggregateWorker('EUR-USD', self.dates, direct).run()
+        self.assertEqual((self.tmp_dir / "direct/aggregate/EUR-USD.bin").stat().st_size, size)
+        self.assertEqual(AggregateEngine('EUR-USD', direct.aggregate).last_date(), self.dates[-1])
+
+    def test_resume_after_partial_day(self):
+        """A day that was partially aggregated (live) resumes after the committed records."""
+        direct = self._config("direct", True)
+        engine = AggregateEngine('EUR-USD', direct.aggregate)
+        dt = self.dates[0]
+        df = TransformWorker(dt, 'EUR-USD', direct).engine.process_json(make_payload(dt, seed=0))
+
+        self.assertTrue(engine.append_day(dt, df.iloc[:600]))
+        self.assertTrue(engine.append_day(dt, df))
+        self.assertFalse(engine.append_day(dt, df))
+
+        raw = np.fromfile(engine.output_path, dtype=ResampleIOReaderBinary.DTYPE)
+        self.assertEqual(len(raw), len(df))
+        np.testing.assert_array_equal(raw['ts'], df.index.values.astype('datetime64[ms]').astype('uint64'))
+
+if __name__ == '__main__':
+    unittest.main()
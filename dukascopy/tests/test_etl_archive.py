@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import copy
+import orjson
+import filecmp
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+from datetime import date
+from pathlib import Path
+
+# The download stage imports its siblings relative to etl/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "etl"))
+
+import download
+from etl.config.app_config import load_app_config
+from etl.exceptions import ConfigurationError
+from etl.io.archive import RawArchive, raw_archive_path, raw_archive_encode, raw_archive_decode, zstandard
+from etl.transform import TransformEngine, TransformWorker
+
+def make_payload(dt, n=1440, seed=0):
+    """Synthetic Dukascopy candle payload (delta-encoded lists as in the JSON)."""
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([1, 1, 1, 2], n)
+    steps[0] = 0
+    return {
+        "timestamp": int(pd.Timestamp(dt).value // 10 ** 6),
+        "shift": 60000,
+        "multiplier": 0.00001,
+        "open": 1.10512, "high": 1.10530, "low": 1.10498, "close": 1.10520,
+        "times": steps.tolist(),
+        "opens": rng.integers(-40, 40, n).tolist(),
+        "highs": rng.integers(-40, 40, n).tolist(),
+        "lows": rng.integers(-40, 40, n).tolist(),
+        "closes": rng.integers(-400, 400, n).tolist(),
+        "volumes": np.round(rng.random(n) * 100, 2).tolist(),
+    }
+
+class TestRawArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.dt = date(2024, 1, 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_block_roundtrip(self):
+        """Blocks decode to the same values, with narrow column dtypes."""
+        payload = make_payload(self.dt)
+        block, count = raw_archive_encode(payload)
+        data = raw_archive_decode(block)
+
+        self.assertEqual(count, 1440)
+        self.assertEqual(data["times"].dtype, np.int8)
+        self.assertEqual(data["closes"].dtype, np.int16)
+        for key, value in payload.items():
+            np.testing.assert_array_equal(np.asarray(data[key]), np.asarray(value), err_msg=key)
+
+        # Several times smaller than the JSON it replaces
+        self.assertLess(len(block) * 2, len(orjson.dumps(payload)))
+
+    def test_transform_is_identical(self):
+        """The transform engine produces the same frame from JSON and archive payloads."""
+        config = load_app_config('config.yaml')
+        payload = make_payload(self.dt, seed=1)
+        engine = TransformEngine(self.dt, 'EUR-USD', config.transform)
+        expected = engine.process_json(orjson.loads(orjson.dumps(payload)))
+        result = engine.process_json(raw_archive_decode(raw_archive_encode(payload)[0]))
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_write_replace_remove(self):
+        """Days are stored per month, replaced, removed and compacted."""
+        for codec in ("none", "zlib"):
+            with self.subTest(codec=codec):
+                path = raw_archive_path(self.tmp_dir / codec, 'EUR-USD', self.dt)
+                self.assertEqual(path.name, 'EUR-USD_202401.dka')
+                archive = RawArchive(path, codec)
+                self.assertIsNone(archive.read(self.dt))
+
+                for day in (1, 2, 3):
+                    archive.write(date(2024, 1, day), make_payload(date(2024, 1, day), seed=day))
+                self.assertEqual(archive.days(), [1, 2, 3])
+
+                # Replacing a day switches the directory entry
+                before = archive.fingerprint(self.dt)
+                replacement = make_payload(self.dt, n=10, seed=9)
+                archive.write(self.dt, replacement)
+                self.assertNotEqual(archive.fingerprint(self.dt), before)
+                np.testing.assert_array_equal(archive.read(self.dt)["closes"], replacement["closes"])
+
+                # Dead blocks are reclaimed once they dominate the file
+                for _ in range(4):
+                    archive.write(date(2024, 1, 1), make_payload(date(2024, 1, 1), seed=1))
+                live = sum(archive.fingerprint(date(2024, 1, d))[0] for d in (1, 2, 3))
+                self.assertLessEqual(path.stat().st_size - 808, 2 * live)
+                np.testing.assert_array_equal(archive.read(date(2024, 1, 2))["opens"],
+                                              make_payload(date(2024, 1, 2), seed=2)["opens"])
+
+                self.assertTrue(archive.remove(self.dt))
+                self.assertFalse(archive.has(self.dt))
+                self.assertEqual(archive.days(), [1, 2])
+
+    @unittest.skipIf(zstandard is not None, "zstandard is installed")
+    def test_zstd_requires_package(self):
+        """Requesting zstd without the package fails with a configuration error."""
+        with self.assertRaises(ConfigurationError):
+            RawArchive(self.tmp_dir / "x.dka", "zstd")
+
+
+class TestArchivePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.app_config = copy.deepcopy(load_app_config('config.yaml'))
+        self.app_config.download.paths.historic = str(self.tmp_dir / "cache")
+        self.app_config.download.paths.live = str(self.tmp_dir / "temp")
+        self.app_config.transform.paths.historic = str(self.tmp_dir / "cache")
+        self.app_config.transform.paths.live = str(self.tmp_dir / "temp")
+        self.dt = date(2024, 1, 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _transform(self, fmt):
+        config = copy.deepcopy(self.app_config)
+        config.download.format = fmt
+        config.transform.paths.data = str(self.tmp_dir / f"out-{fmt}")
+        TransformWorker(self.dt, 'EUR-USD', config).run()
+        return Path(config.transform.paths.data) / "2024/01/EUR-USD_20240103.bin"
+
+    def test_download_merge_and_transform(self):
+        """Archived downloads merge forward-only and transform like JSON downloads."""
+        payload = make_payload(self.dt, seed=3)
+        first = dict(payload, **{col: payload[col][:1000] for col in ("times", "opens", "highs", "lows", "closes", "volumes")})
+
+        # JSON cache, the reference
+        worker = download.DownloadWorker(self.app_config)
+        worker.persist('EUR-USD', self.dt, orjson.dumps(first).decode())
+        worker.persist('EUR-USD', self.dt, orjson.dumps(payload).decode())
+        json_data = orjson.loads((self.tmp_dir / "cache/2024/01/EUR-USD_20240103.json").read_bytes())
+
+        # Archive cache, same sequence of downloads
+        self.app_config.download.format = "archive"
+        worker = download.DownloadWorker(self.app_config)
+        worker.persist('EUR-USD', self.dt, orjson.dumps(first).decode())
+        worker.persist('EUR-USD', self.dt, orjson.dumps(payload).decode())
+        archived = RawArchive(raw_archive_path(self.tmp_dir / "cache", 'EUR-USD', self.dt)).read(self.dt)
+        for key in ("times", "closes", "volumes"):
+            np.testing.assert_array_equal(archived[key], json_data[key])
+
+        # Transform from the archive (JSON file hidden) matches the JSON transform
+        json_output = self._transform("json")
+        (self.tmp_dir / "cache/2024/01/EUR-USD_20240103.json").unlink()
+        self.assertTrue(filecmp.cmp(json_output, self._transform("archive"), shallow=False))
+
+if __name__ == '__main__':
+    unittest.main()
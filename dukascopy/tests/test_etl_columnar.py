@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import pandas as pd
+import tempfile
+import shutil
+from pathlib import Path
+
+from etl.io.resample.factory import ResampleIOFactory
+from etl.io.resample.columnar import ResampleIOReaderColumnar, CAPACITY_STEP
+from util import cache
+
+class TestColumnarIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.path = self.tmp_dir / "EUR-USD.col"
+        np.random.seed(3)
+
+    def tearDown(self):
+        cache.MarketDataCache._instance = None
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _frame(self, start, n):
+        index = pd.to_datetime(np.arange(start, start + n) * 60000, unit='ms')
+        return pd.DataFrame(
+            np.random.rand(n, 5),
+            columns=['open', 'high', 'low', 'close', 'volume'],
+            index=index
+        )
+
+    def _write(self, path, df):
+        with ResampleIOFactory.get_writer(path, 'columnar') as writer:
+            writer.write_batch(df)
+            writer.flush()
+
+    def _read_all(self, path):
+        with ResampleIOFactory.get_reader(path) as reader:
+            return reader.read_batch(10 ** 9)
+
+    def test_roundtrip_and_growth(self):
+        """Batches spanning several capacity increments read back unchanged."""
+        df = self._frame(0, CAPACITY_STEP * 3 + 7)
+        with ResampleIOFactory.get_writer(self.path, 'columnar') as writer:
+            for start in range(0, len(df), 500):
+                writer.write_batch(df.iloc[start:start + 500])
+                writer.flush()
+
+        result = self._read_all(self.path)
+        self.assertEqual(list(result['offset'][:3]), [0, 1, 2])
+        np.testing.assert_array_equal(result.drop(columns=['offset']).values, df.values)
+        self.assertTrue((result.index == df.index).all())
+
+    def test_truncate_rewrites_open_bar(self):
+        """Resample-style rollback: truncate to the committed offset and rewrite."""
+        df = self._frame(0, 10)
+        self._write(self.path, df)
+
+        # Roll back the last bar and write a replacement plus one new bar
+        replacement = self._frame(9, 2)
+        with ResampleIOFactory.get_writer(self.path, 'columnar') as writer:
+            writer.truncate(9)
+            self.assertEqual(writer.write_batch(replacement, 9), 11)
+            writer.flush()
+
+        result = self._read_all(self.path)
+        self.assertEqual(len(result), 11)
+        np.testing.assert_array_equal(result.drop(columns=['offset']).values[9:], replacement.values)
+
+    def test_raw_append(self):
+        """Aggregate-style raw copy appends a daily file to the master file."""
+        master = self.tmp_dir / "master.col"
+        day_one, day_two = self._frame(0, 1440), self._frame(1440, 1440)
+        self._write(self.tmp_dir / "d1.col", day_one)
+        self._write(self.tmp_dir / "d2.col", day_two)
+
+        for daily in ("d1.col", "d2.col"):
+            reader = ResampleIOFactory.get_reader(self.tmp_dir / daily, 'columnar')
+            writer = ResampleIOFactory.get_writer(master, 'columnar')
+            with reader, writer:
+                writer.seek(writer.count)
+                writer.write_raw(reader.read_raw())
+                writer.flush()
+                self.assertEqual(reader.tell(), 1440)
+
+        result = self._read_all(master)
+        np.testing.assert_array_equal(
+            result.drop(columns=['offset']).values,
+            pd.concat([day_one, day_two]).values
+        )
+
+    def test_format_detection(self):
+        """The .col suffix and the DUKASCOL magic select the columnar reader."""
+        self._write(self.path, self._frame(0, 5))
+        renamed = self.tmp_dir / "EUR-USD.dat"
+        shutil.copy(self.path, renamed)
+        self.assertEqual(ResampleIOFactory.get_appropriate_extension('columnar'), '.col')
+        self.assertIsInstance(ResampleIOFactory.get_reader(self.path), ResampleIOReaderColumnar)
+        self.assertIsInstance(ResampleIOFactory.get_reader(renamed), ResampleIOReaderColumnar)
+
+    def test_cache_zero_copy(self):
+        """MarketDataCache maps columnar files without copying columns."""
+        df = self._frame(0, 100)
+        self._write(self.path, df)
+
+        cache.MarketDataCache._instance = None
+        market_cache = cache.MarketDataCache()
+        market_cache._register_view("EUR-USD", "1m", str(self.path))
+        view = market_cache.mmaps["EUR-USD_1m"]
+        self.assertEqual(view['layout'], 'columnar')
+        self.assertEqual(view['num_records'], 100)
+
+        chunk = market_cache.get_chunk("EUR-USD", "1m", 10, 20, return_polars=True)
+        np.testing.assert_array_equal(chunk['close'].to_numpy(), df['close'].values[10:20])
+        self.assertTrue(np.shares_memory(chunk['close'].to_numpy(), view['columns']['close']))
+
+        table = market_cache.to_arrow_table("EUR-USD", "1m", 0, 5)
+        self.assertTrue(np.shares_memory(table.column('open').to_numpy(), view['columns']['open']))
+
+        pdf = market_cache.get_chunk("EUR-USD", "1m", 0, 3, return_polars=False)
+        self.assertEqual(list(pdf['time_ms']), [0, 60000, 120000])
+
+if __name__ == '__main__':
+    unittest.main()
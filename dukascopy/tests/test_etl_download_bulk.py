@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import time
+import asyncio
+import copy
+import tempfile
+import shutil
+import httpx
+from datetime import date, timedelta
+from pathlib import Path
+
+# The download stage imports its siblings relative to etl/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "etl"))
+
+import download
+from config.app_config import load_app_config
+from exceptions import ForkProcessError
+from etl.downloaders.bulk import TokenBucket, DownloadEngineBulk
+from etl.downloaders.factory import DownloadFactory
+
+class TestBulkDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.app_config = copy.deepcopy(load_app_config('config.yaml'))
+        self.app_config.download.mode = "async"
+        self.app_config.download.rate_limit_rps = 0
+        self.app_config.download.concurrency = 4
+        self.app_config.download.paths.historic = str(self.tmp_dir / "data")
+        self.app_config.download.paths.live = str(self.tmp_dir / "temp")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _engine(self, handler):
+        # Same engine as the factory creates, with a mocked transport
+        engine = DownloadFactory.get_engine(self.app_config.download, mode="async")
+        self.assertIsInstance(engine, DownloadEngineBulk)
+        engine.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return engine
+
+    def test_token_bucket_is_global(self):
+        """Concurrent acquires are paced at the bucket rate."""
+        async def run():
+            bucket = TokenBucket(50)
+            await asyncio.gather(*[bucket.acquire() for _ in range(11)])
+
+        start = time.monotonic()
+        asyncio.run(run())
+        # First token is available immediately, ten more at 50/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_bulk_download_persists_and_reports(self):
+        """All tasks are downloaded, written atomically and reported."""
+        requests = []
+
+        def handler(request):
+            requests.append(str(request.url))
+            return httpx.Response(200, text='{"times": [], "opens": []}')
+
+        days = [date(2024, 1, 1) + timedelta(days=i) for i in range(10)]
+        tasks = [(symbol, dt, self.app_config) for symbol in ('EUR-USD', 'GBP-USD') for dt in days]
+        completed = []
+        written = download.run_bulk_download(
+            tasks, self.app_config,
+            on_complete=lambda symbol, dt: completed.append((symbol, dt)),
+            engine=self._engine(handler)
+        )
+
+        self.assertEqual(written, len(tasks))
+        self.assertEqual(len(requests), len(tasks))
+        self.assertEqual(sorted(completed), sorted((t[0], t[1]) for t in tasks))
+        files = list((self.tmp_dir / "data").rglob("*.json"))
+        self.assertEqual(len(files), len(tasks))
+        self.assertFalse(list((self.tmp_dir / "data").rglob("*.tmp")))
+
+    def test_bulk_download_failure(self):
+        """A failed download aborts the stage with symbol and date."""
+        self.app_config.download.max_retries = 1
+
+        def handler(request):
+            return httpx.Response(404, text='')
+
+        with self.assertRaises(ForkProcessError) as ctx:
+            download.run_bulk_download(
+                [('EUR-USD', date(2024, 1, 1), self.app_config)], self.app_config,
+                engine=self._engine(handler)
+            )
+        self.assertIn("EUR-USD", str(ctx.exception))
+
+if __name__ == '__main__':
+    unittest.main()
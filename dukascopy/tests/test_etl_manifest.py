@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import os
+import orjson
+import tempfile
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# The orchestrator modules import their siblings relative to etl/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "etl"))
+
+from manifest import Manifest
+from etl.aggregate import AggregateEngine, AggregateWorker
+from etl.config.app_config import load_app_config
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.days = [date(2024, 1, 1) + timedelta(days=i) for i in range(10)]
+        for dt in self.days:
+            if dt.day != 5:
+                (self.tmp_dir / f"{dt:%Y%m%d}.json").write_bytes(b"x" * dt.day)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _path(self, dt):
+        return self.tmp_dir / f"{dt:%Y%m%d}.json"
+
+    def test_check_records_and_persists(self):
+        """Existing files are recorded once, later runs do not stat them."""
+        manifest = Manifest(self.tmp_dir / "manifest")
+        found = [dt for dt in self.days if manifest.check("EUR-USD", "download", dt, self._path(dt))]
+        self.assertEqual(len(found), 9)
+        manifest.save()
+
+        data = orjson.loads((self.tmp_dir / "manifest" / "EUR-USD.json").read_bytes())
+        self.assertEqual(data["download"]["ranges"], [["2024-01-01", "2024-01-04"], ["2024-01-06", "2024-01-10"]])
+        self.assertEqual(data["download"]["files"]["20240103"][0], 3)
+
+        manifest = Manifest(self.tmp_dir / "manifest")
+        with patch("manifest.os.stat", side_effect=AssertionError("stat")):
+            self.assertTrue(manifest.check("EUR-USD", "download", self.days[0], self._path(self.days[0])))
+            self.assertFalse(manifest.has("EUR-USD", "transform", self.days[0]))
+
+    def test_invalidate_and_verify(self):
+        """Invalidation removes a date range, verify drops missing or changed files."""
+        manifest = Manifest(self.tmp_dir / "manifest")
+        for dt in self.days:
+            manifest.record("EUR-USD", "download", dt, self._path(dt))
+
+        self.assertEqual(manifest.invalidate("EUR-USD", ["download"], start=date(2024, 1, 9)), 2)
+        self.assertFalse(manifest.has("EUR-USD", "download", date(2024, 1, 9)))
+        self.assertTrue(manifest.has("EUR-USD", "download", date(2024, 1, 8)))
+
+        os.remove(self._path(self.days[0]))
+        self._path(self.days[1]).write_bytes(b"changed")
+        invalid = manifest.verify("EUR-USD", "download", self._path)
+        self.assertEqual(invalid, self.days[:2])
+
+    def test_corrupt_manifest_is_ignored(self):
+        """A corrupt manifest file falls back to disk checks."""
+        (self.tmp_dir / "manifest").mkdir()
+        (self.tmp_dir / "manifest" / "EUR-USD.json").write_text("{broken")
+        manifest = Manifest(self.tmp_dir / "manifest")
+        self.assertTrue(manifest.check("EUR-USD", "download", self.days[0], self._path(self.days[0])))
+
+
+class TestAggregateSkip(unittest.TestCase):
+
+    def test_dates_before_index_are_skipped(self):
+        """Only dates from the last aggregated date onward are processed."""
+        app_config = load_app_config('config.yaml')
+        days = [date(2024, 1, 1) + timedelta(days=i) for i in range(10)]
+        worker = AggregateWorker('EUR-USD', days, app_config)
+        with patch.object(AggregateEngine, 'last_date', return_value=date(2024, 1, 8)), \
+             patch.object(AggregateEngine, 'process_date') as process_date:
+            worker.run()
+        self.assertEqual([c.args[0] for c in process_date.call_args_list], days[7:])
+
+if __name__ == '__main__':
+    unittest.main()
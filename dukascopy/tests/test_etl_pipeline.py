@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+from etl.pipeline import PipelineScheduler
+
+STAGES = ["Download", "Transform", "Aggregate", "Resample"]
+
+class TestPipelineScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ThreadPool(2)
+        self.log = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.pool.terminate()
+
+    def _task(self, node, delay=0.0):
+        def run(_):
+            time.sleep(delay)
+            with self.lock:
+                self.log.append(node)
+        return run
+
+    def test_dependencies_are_respected(self):
+        """Each task runs after its dependencies, stages overlap across symbols."""
+        scheduler = PipelineScheduler(self.pool, STAGES, max_inflight=4)
+        for symbol, delay in (("A", 0.0), ("B", 0.2)):
+            for day in range(3):
+                scheduler.add_task(("download", symbol, day), "Download", self._task(("download", symbol, day), delay))
+                scheduler.add_task(("transform", symbol, day), "Transform", self._task(("transform", symbol, day)),
+                                   depends_on=[("download", symbol, day)])
+            scheduler.add_task(("aggregate", symbol), "Aggregate", self._task(("aggregate", symbol)),
+                               depends_on=[("transform", symbol, day) for day in range(3)])
+            scheduler.add_task(("resample", symbol), "Resample", self._task(("resample", symbol)),
+                               depends_on=[("aggregate", symbol)])
+
+        counts = scheduler.run(progress=False)
+        self.assertEqual(counts, {"Download": 6, "Transform": 6, "Aggregate": 2, "Resample": 2})
+
+        position = {node: i for i, node in enumerate(self.log)}
+        for symbol in ("A", "B"):
+            for day in range(3):
+                self.assertLess(position[("download", symbol, day)], position[("transform", symbol, day)])
+                self.assertLess(position[("transform", symbol, day)], position[("aggregate", symbol)])
+            self.assertLess(position[("aggregate", symbol)], position[("resample", symbol)])
+
+        # The fast symbol is fully resampled before the slow downloads land
+        self.assertLess(position[("resample", "A")], position[("download", "B", 2)])
+
+    def test_later_stages_first(self):
+        """Ready downstream tasks are submitted before queued downloads."""
+        scheduler = PipelineScheduler(self.pool, STAGES, max_inflight=1)
+        scheduler.add_task("d0", "Download", self._task("d0"))
+        scheduler.add_task("t0", "Transform", self._task("t0"), depends_on=["d0"])
+        for i in range(1, 4):
+            scheduler.add_task(f"d{i}", "Download", self._task(f"d{i}"))
+
+        scheduler.run(progress=False)
+        self.assertEqual(self.log, ["d0", "t0", "d1", "d2", "d3"])
+
+    def test_external_nodes_and_failures(self):
+        """External nodes are completed by events, task errors are raised."""
+        scheduler = PipelineScheduler(self.pool, STAGES, max_inflight=2)
+        scheduler.add_task("d0", "Download")
+        scheduler.add_task("t0", "Transform", self._task("t0"), depends_on=["d0"])
+        threading.Timer(0.1, scheduler.complete, args=("d0",)).start()
+        scheduler.run(progress=False)
+        self.assertEqual(self.log, ["t0"])
+
+        def broken(_):
+            raise ValueError("boom")
+
+        scheduler = PipelineScheduler(self.pool, STAGES, max_inflight=2)
+        scheduler.add_task("t1", "Transform", broken)
+        scheduler.add_task("a1", "Aggregate", self._task("a1"), depends_on=["t1"])
+        with self.assertRaises(ValueError):
+            scheduler.run(progress=False)
+        self.assertNotIn("a1", self.log)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import copy
+import filecmp
+import numpy as np
+import pandas as pd
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from etl.config.app_config import load_app_config
+from etl.io.resample.factory import ResampleIOFactory
+from etl.resample import ResampleWorker, ResampleEngine
+
+class TestFusedResample(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app_config = load_app_config('config.yaml')
+
+        # Three weeks of 1m bars with gaps
+        rng = np.random.default_rng(11)
+        ts = pd.Timestamp('2024-03-04').value // 10 ** 6 + np.arange(21 * 1440, dtype=np.int64) * 60000
+        ts = ts[rng.random(len(ts)) > 0.2]
+        close = 100 + np.cumsum(rng.normal(0, 0.1, len(ts)))
+        cls.df = pd.DataFrame({
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+            'volume': rng.integers(1, 5, len(ts)).astype(float)
+        }, index=pd.to_datetime(ts, unit='ms'))
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _config(self, fmode, fused):
+        """Config writing below the temp directory, returns (config, root source dir)."""
+        name = f"{fmode}-{'fused' if fused else 'seq'}"
+        source = self.tmp_dir / f"src-{name}"
+        config = copy.deepcopy(self.app_config)
+        config.resample.fmode = fmode
+        config.resample.fused = fused
+        config.resample.batch_size = 3000
+        config.resample.paths.data = str(self.tmp_dir / f"out-{name}")
+        for tf in config.resample.timeframes.values():
+            if not tf.rule:
+                tf.source = str(source)
+        return config, source
+
+    def _run(self, symbol, fmode, fused):
+        """Build the dataset in three incremental runs, return the output directory."""
+        config, source = self._config(fmode, fused)
+        path = source / f"{symbol}{ResampleIOFactory.get_appropriate_extension(fmode)}"
+        cuts = [0, len(self.df) // 2, len(self.df) // 2 + 500, len(self.df)]
+        for start, end in zip(cuts, cuts[1:]):
+            # Append the next chunk of root data, then run an incremental resample
+            with ResampleIOFactory.get_writer(path, fmode) as writer:
+                writer.seek(writer.count if fmode == 'columnar' else path.stat().st_size)
+                writer.write_batch(self.df.iloc[start:end])
+                writer.flush()
+            ResampleWorker(symbol, config).run()
+
+        return Path(config.resample.paths.data)
+
+    def test_fused_matches_sequential(self):
+        """Fused and sequential runs produce identical outputs and indexes."""
+        for symbol in ('EUR-USD', 'SOYBEAN.CMD-USX'):
+            for fmode in ('binary', 'columnar'):
+                with self.subTest(symbol=symbol, fmode=fmode):
+                    sequential = self._run(symbol, fmode, False)
+                    fused = self._run(symbol, fmode, True)
+                    extension = ResampleIOFactory.get_appropriate_extension(fmode)
+                    for ident in self.app_config.resample.timeframes:
+                        if not (sequential / ident).exists():
+                            continue
+                        for name in (f"{symbol}{extension}", f"index/{symbol}.idx"):
+                            self.assertTrue(
+                                filecmp.cmp(sequential / ident / name, fused / ident / name, shallow=False),
+                                f"{ident}/{name} differs"
+                            )
+                    shutil.rmtree(self.tmp_dir)
+                    self.tmp_dir.mkdir()
+
+    def test_derived_files_are_not_reread(self):
+        """An incremental fused run never falls back to the per-timeframe read loop."""
+        self._run('EUR-USD', 'binary', True)
+        config, _ = self._config('binary', True)
+        with patch.object(ResampleEngine, 'read_batch', side_effect=AssertionError("sequential read")):
+            # Nothing new: every level still rewrites its open bar from memory
+            ResampleWorker('EUR-USD', config).run()
+
+if __name__ == '__main__':
+    unittest.main()
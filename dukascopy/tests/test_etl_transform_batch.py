@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import sys
+import copy
+import orjson
+import filecmp
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from pathlib import Path
+
+# The orchestrator imports its siblings relative to etl/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "etl"))
+
+from run import batch_transform_tasks
+from etl.config.app_config import load_app_config
+from etl.transform import TransformEngine, TransformWorker
+
+def make_payload(dt, n=1440, seed=0):
+    """Synthetic Dukascopy candle payload with some zero-volume candles."""
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([1, 1, 1, 2], n)
+    steps[:1] = 0
+    volumes = np.round(rng.random(n) * 100, 2)
+    volumes[rng.random(n) < 0.05] = 0.0
+    return {
+        "timestamp": int(pd.Timestamp(dt).value // 10 ** 6),
+        "shift": 60000,
+        "multiplier": 0.00001,
+        "open": 1.10512 + seed * 0.001, "high": 1.10530, "low": 1.10498, "close": 1.10520,
+        "times": steps.tolist(),
+        "opens": rng.integers(-40, 40, n).tolist(),
+        "highs": rng.integers(-40, 40, n).tolist(),
+        "lows": rng.integers(-40, 40, n).tolist(),
+        "closes": rng.integers(-400, 400, n).tolist(),
+        "volumes": volumes.tolist(),
+    }
+
+class TestBatchTransform(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.app_config = copy.deepcopy(load_app_config('config.yaml'))
+        self.app_config.transform.paths.historic = str(self.tmp_dir / "cache")
+        self.app_config.transform.paths.live = str(self.tmp_dir / "temp")
+        self.dates = [date(2024, 3, 4) + timedelta(days=i) for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_batch_matches_per_day(self):
+        """A batch produces the same frames as transforming every day on its own."""
+        config = self.app_config.transform
+        days = [(dt, make_payload(dt, n=0 if i == 2 else 1440, seed=i)) for i, dt in enumerate(self.dates)]
+
+        frames = TransformEngine(self.dates[0], 'EUR-USD', config).process_batch(days)
+
+        self.assertEqual([dt for dt, _ in frames], self.dates)
+        for (dt, data), (_, result) in zip(days, frames):
+            expected = TransformEngine(dt, 'EUR-USD', config).process_json(data)
+            pd.testing.assert_frame_equal(result, expected)
+
+    def test_worker_writes_identical_files(self):
+        """run_batch writes the same day files as run."""
+        for i, dt in enumerate(self.dates):
+            path = Path(self.app_config.transform.paths.historic) / dt.strftime("%Y/%m/EUR-USD_%Y%m%d.json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(orjson.dumps(make_payload(dt, seed=i)))
+
+        single = copy.deepcopy(self.app_config)
+        single.transform.paths.data = str(self.tmp_dir / "single")
+        for dt in self.dates:
+            TransformWorker(dt, 'EUR-USD', single).run()
+
+        batched = copy.deepcopy(self.app_config)
+        batched.transform.paths.data = str(self.tmp_dir / "batched")
+        self.assertTrue(TransformWorker(self.dates[0], 'EUR-USD', batched).run_batch(self.dates))
+
+        for dt in self.dates:
+            name = dt.strftime("%Y/%m/EUR-USD_%Y%m%d.bin")
+            self.assertTrue(filecmp.cmp(self.tmp_dir / "single" / name, self.tmp_dir / "batched" / name, shallow=False))
+
+    def test_tasks_are_grouped_by_contiguous_dates(self):
+        """Batches hold contiguous dates of one symbol, capped at batch_days."""
+        tasks = [(sym, dt, None) for sym in ("B", "A") for dt in self.dates if dt != self.dates[2]]
+        batches = batch_transform_tasks(tasks, 2)
+        self.assertEqual([(sym, dates) for sym, dates, _ in batches], [
+            ("A", self.dates[0:2]), ("A", self.dates[3:5]),
+            ("B", self.dates[0:2]), ("B", self.dates[3:5]),
+        ])
+        self.assertEqual(len(batch_transform_tasks(tasks, 1)), len(tasks))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import pandas as pd
+
+from util.plugins.indicators.helpers.window_backend import (
+    _window_min, _window_max, _window_sums, _window_std, _window_wma, _window_linreg
+)
+from util.plugins.indicators.helpers.volumeprofile_backend import _volumeprofile_backend
+from util.plugins.indicators.helpers.linregchannel_backend import _linregchannel_backend
+from util.plugins.indicators.helpers.hurst_backend import _hurst_backend
+
+
+def brute(values, period, fn):
+    """Apply fn to every full window ending at each row (the O(n*w) reference)."""
+    out = np.full(len(values), np.nan)
+    for i in range(period - 1, len(values)):
+        out[i] = fn(values[i - period + 1:i + 1])
+    return out
+
+
+def volumeprofile_reference(highs, lows, closes, volumes, period, tick_size):
+    """Histogram rebuilt per bar, as the backend used to do."""
+    n = len(closes)
+    out = [np.full(n, np.nan) for _ in range(3)]
+    for i in range(period, n):
+        min_p = lows[i - period:i].min()
+        max_p = highs[i - period:i].max()
+        num_bins = int(np.ceil((max_p - min_p) / tick_size)) + 1
+        if num_bins < 2:
+            continue
+        hist = np.zeros(num_bins)
+        for c, v in zip(closes[i - period:i], volumes[i - period:i]):
+            hist[int((c - min_p) / tick_size)] += v
+        out[0][i] = min_p + np.argmax(hist) * tick_size
+        current, prices = 0.0, []
+        for idx in np.argsort(hist)[::-1]:
+            current += hist[idx]
+            prices.append(min_p + idx * tick_size)
+            if current >= hist.sum() * 0.70:
+                out[1][i], out[2][i] = max(prices), min(prices)
+                break
+    return out
+
+
+class TestWindowKernels(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        # Price levels (cancellation-prone) with a flat stretch and NaN warmup
+        self.values = 1.1 + np.cumsum(rng.normal(0, 0.0005, 6000))
+        self.values[3000:3100] = self.values[3000]
+        self.with_nans = self.values.copy()
+        self.with_nans[:10] = np.nan
+
+    def test_min_max(self):
+        for period in (1, 3, 64):
+            np.testing.assert_array_equal(_window_min(self.values, period), brute(self.values, period, np.min))
+            np.testing.assert_array_equal(_window_max(self.values, period), brute(self.values, period, np.max))
+
+    def test_sums_and_std(self):
+        """Running updates match the per-window computation, across reseeds."""
+        for period in (1, 20, 500):
+            sums, _ = _window_sums(self.with_nans, period)
+            np.testing.assert_allclose(sums, brute(self.with_nans, period, np.sum), rtol=1e-10)
+            np.testing.assert_allclose(_window_std(self.with_nans, period), brute(self.with_nans, period, np.std), atol=1e-9)
+
+    def test_wma(self):
+        """Equals rolling().apply(np.dot) as used by coppock and hma before."""
+        for period in (1, 10, 200):
+            weights = np.arange(1, period + 1)
+            expected = pd.Series(self.with_nans).rolling(period).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+            np.testing.assert_allclose(_window_wma(self.with_nans, period), expected.values, rtol=1e-9)
+
+    def test_linreg(self):
+        for period in (2, 50):
+            slope, intercept = _window_linreg(self.values, period)
+            x = np.arange(period)
+            np.testing.assert_allclose(slope, brute(self.values, period, lambda w: np.polyfit(x, w, 1)[0]), atol=1e-9)
+            np.testing.assert_allclose(intercept, brute(self.values, period, lambda w: np.polyfit(x, w, 1)[1]), rtol=1e-10)
+
+
+class TestRebuiltBackends(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 1500
+        self.close = 100 + np.cumsum(rng.normal(0, 0.3, n))
+        self.high = self.close + rng.random(n) * 0.3
+        self.low = self.close - rng.random(n) * 0.3
+        self.volume = rng.uniform(1, 100, n)
+
+    def test_volumeprofile(self):
+        """Incremental histogram and volume order give the rebuilt profile."""
+        for period, tick in ((50, 0.25), (200, 0.1)):
+            result = _volumeprofile_backend(self.high, self.low, self.close, self.volume, period, tick)
+            expected = volumeprofile_reference(self.high, self.low, self.close, self.volume, period, tick)
+            for actual, reference in zip(result, expected):
+                np.testing.assert_allclose(actual, reference)
+
+    def test_linregchannel(self):
+        period = 30
+        mid, upper, lower = _linregchannel_backend(self.close, period)
+        x = np.arange(period)
+
+        def channel(w):
+            slope, intercept = np.polyfit(x, w, 1)
+            return slope * (period - 1) + intercept, np.abs(w - (slope * x + intercept)).max()
+
+        expected_mid = brute(self.close, period, lambda w: channel(w)[0])
+        expected_dev = brute(self.close, period, lambda w: channel(w)[1])
+        np.testing.assert_allclose(mid, expected_mid, rtol=1e-10)
+        np.testing.assert_allclose(upper - mid, expected_dev, atol=1e-8)
+
+    def test_hurst(self):
+        """Per-lag rolling std equals np.std of the window differences."""
+        period = 40
+        lags = np.unique(np.linspace(2, period // 2, 5).astype(np.int32))
+        x_diff = np.log(lags) - np.log(lags).mean()
+
+        def hurst(w):
+            taus = np.log([max(np.std(w[lag:] - w[:-lag]), 1e-10) for lag in lags])
+            return np.sum(x_diff * (taus - taus.mean())) / np.sum(x_diff ** 2) * 2.0
+
+        np.testing.assert_allclose(_hurst_backend(self.close, period), brute(self.close, period, hurst), atol=1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,7 +47,7 @@ class TestMarketAPI(unittest.TestCase):
     def test_get_data_basic_flow_pandas(self, MockCache, mock_parallel):
         """Test basic data retrieval returning a Pandas DataFrame."""
         mock_instance = MockCache.return_value
-        mock_instance.find_record.side_effect = lambda sym, tf, ts, side: 0 if ts <= 1000 else 10
+        mock_instance.find_record.side_effect = lambda sym, tf, ts, side, **kwargs: 0 if ts <= 1000 else 10
         mock_instance.get_record_count.return_value = 10
         mock_instance.get_chunk.return_value = self.df_pd.copy()
         mock_instance.indicators.get_maximum_warmup_rows.return_value = 0
@@ -92,6 +92,7 @@ class TestMarketAPI(unittest.TestCase):
         # Mock getting 8 rows (3 warmup + 5 target)
         warmup_df = pd.concat([self.df_pd[:3], self.df_pd[:5]], ignore_index=True)
         mock_instance.get_chunk.return_value = warmup_df
+        mock_instance.store.fetch.return_value = (None, ["sma_3"])
         mock_parallel.side_effect = lambda df, *args: df
 
         result = api.get_data("EURUSD", "1m", limit=target_limit, indicators=["sma_3"])
@@ -117,6 +118,21 @@ class TestMarketAPI(unittest.TestCase):
         args, _ = mock_instance.get_chunk.call_args
         self.assertEqual(args[3], 99)
 
+    @patch('util.api.MarketDataCache')
+    def test_skiplast_keeps_closed_candle(self, MockCache):
+        """Test that skiplast keeps the last candle once it is closed (live edge)."""
+        mock_instance = MockCache.return_value
+        mock_instance.get_record_count.return_value = 100
+        mock_instance.indicators.get_maximum_warmup_rows.return_value = 0
+        mock_instance.find_record.side_effect = [90, 100]
+        mock_instance.get_chunk.return_value = pd.DataFrame()
+        mock_instance.live_edge.return_value = {'open': False}
+
+        api.get_data("EURUSD", "1h", options={'modifiers': ['skiplast']})
+
+        args, _ = mock_instance.get_chunk.call_args
+        self.assertEqual(args[3], 100)
+
     def test_get_data_auto(self):
         """Test the convenience wrapper infers parameters correctly."""
         with patch('util.api.get_data') as mock_get_data:
@@ -142,6 +158,7 @@ class TestMarketAPI(unittest.TestCase):
         # find_record = 5. Warmup = 10. 5-10 = -5. Clamp to 0.
         mock_instance.find_record.side_effect = [5, 20]
         mock_instance.get_chunk.return_value = pd.DataFrame()
+        mock_instance.store.fetch.return_value = (None, ["big_warmup"])
 
         api.get_data("EURUSD", "1m", indicators=["big_warmup"])
         
@@ -155,5 +155,40 @@ class TestMarketDataCache(unittest.TestCase):
         self.assertEqual(table.num_rows, 5)
         self.assertEqual(table.column_names, ['ts', 'open', 'high', 'low', 'close', 'volume'])
 
+    def test_snapshot_swap_keeps_old_readers(self):
+        """A writer swaps in a new snapshot, readers keep using the one they grabbed."""
+        import tempfile, shutil, time
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "1m.bin")
+            with open(path, "wb") as f:
+                f.write(self.raw_data[:5].tobytes())
+
+            old = self.cache._register_view("EUR-USD", "1m", path)
+            self.assertIs(self.cache.snapshot("EUR-USD", "1m"), old)
+            # Unchanged file, same snapshot (no new generation)
+            self.assertIs(self.cache._register_view("EUR-USD", "1m", path), old)
+            with self.assertRaises(TypeError):
+                old['num_records'] = 0
+
+            # Append records, a new generation is published
+            time.sleep(0.01)
+            with open(path, "ab") as f:
+                f.write(self.raw_data[5:].tobytes())
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+            new = self.cache._register_view("EUR-USD", "1m", path)
+
+            self.assertGreater(new['generation'], old['generation'])
+            self.assertEqual(self.cache.get_record_count("EUR-USD", "1m"), 10)
+            self.assertEqual(self.cache.get_record_count("EUR-USD", "1m", view=old), 5)
+
+            # The old snapshot is still readable
+            chunk = self.cache.get_chunk("EUR-USD", "1m", 0, 5, return_polars=True, view=old)
+            np.testing.assert_array_equal(chunk["time_ms"].to_numpy(), self.test_ts[:5])
+            self.assertEqual(self.cache.find_record("EUR-USD", "1m", 10 ** 9, view=old), 5)
+            del old, chunk
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
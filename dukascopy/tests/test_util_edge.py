@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import polars as pl
+
+from util import cache
+from util.api import get_data
+from util.edge import open_mark_ms
+
+HOUR = 3600000
+
+def make_view(ts, generation):
+    """Minimal snapshot as published by MarketDataCache._register_view."""
+    ts = np.asarray(ts, dtype='<u8')
+    return {'ts_index': ts, 'num_records': len(ts), 'generation': generation}
+
+
+@patch('util.edge.utc_drift_ms', side_effect=lambda symbol, heartbeat_ms, last_ms: heartbeat_ms - last_ms)
+class TestOpenMark(unittest.TestCase):
+
+    def test_live_intraday_candle(self, _):
+        """An asset trading with the heartbeat has its current candle open."""
+        self.assertEqual(open_mark_ms("EUR-USD", "1h", 10 * HOUR + 60000, 10 * HOUR + 60000, 10 * HOUR), 10 * HOUR)
+
+    def test_lagging_asset_marks_last_candle(self, _):
+        """An asset lagging less than one candle has its last candle open."""
+        self.assertEqual(open_mark_ms("EUR-USD", "4h", 10 * HOUR, 9 * HOUR, 8 * HOUR), 8 * HOUR)
+
+    def test_closed_market(self, _):
+        """A market closed for days has no open candle."""
+        heartbeat = 100 * HOUR
+        mark = open_mark_ms("EUR-USD", "1h", heartbeat, 40 * HOUR, 40 * HOUR)
+        self.assertGreater(mark, 40 * HOUR)
+
+
+class TestLiveEdge(unittest.TestCase):
+
+    def setUp(self):
+        cache.MarketDataCache._instance = None
+        self.cache = cache.MarketDataCache()
+        self.views = {
+            ("EUR-USD", "1h"): make_view([8 * HOUR, 9 * HOUR, 10 * HOUR], 1),
+            ("EUR-USD", "1m"): make_view([10 * HOUR + 60000], 2),
+            ("BTC-USD", "1m"): make_view([10 * HOUR + 60000], 3),
+        }
+        self.cache.discover_view = MagicMock(side_effect=lambda symbol, tf: self.views[(symbol, tf)])
+
+    def tearDown(self):
+        cache.MarketDataCache._instance = None
+
+    @patch('util.cache.open_mark_ms', return_value=10 * HOUR)
+    def test_open_last_candle(self, mock_mark):
+        """The last candle is open, the one before is the last closed one."""
+        edge = self.cache.live_edge("EUR-USD", "1h")
+        self.assertTrue(edge['open'])
+        self.assertEqual(edge['last_ms'], 10 * HOUR)
+        self.assertEqual(edge['last_closed_ms'], 9 * HOUR)
+        self.assertEqual(edge['heartbeat_ms'], 10 * HOUR + 60000)
+
+    @patch('util.cache.open_mark_ms', return_value=11 * HOUR)
+    def test_recomputed_on_new_generation_only(self, mock_mark):
+        """The record is reused until one of the views changes."""
+        first = self.cache.live_edge("EUR-USD", "1h")
+        self.assertIs(self.cache.live_edge("EUR-USD", "1h"), first)
+        self.assertEqual(mock_mark.call_count, 1)
+        self.assertFalse(first['open'])
+
+        self.views[("BTC-USD", "1m")] = make_view([11 * HOUR], 4)
+        second = self.cache.live_edge("EUR-USD", "1h")
+        self.assertIsNot(second, first)
+        self.assertEqual(mock_mark.call_count, 2)
+
+    @patch('util.plugins.indicators.helpers.marketstate_backend._marketstate_backend_shift_for_symbol')
+    def test_skiplast_1m_ignores_shift(self, mock_shift):
+        """skiplast keeps the last 1m candle, whatever the asset's shift against BTC-USD."""
+        self.cache.get_chunk = MagicMock(return_value=pl.DataFrame())
+
+        for asset_shift in (-2 * HOUR, 0, 2 * HOUR):
+            mock_shift.side_effect = lambda symbol, ts_ms: 0 if symbol == "BTC-USD" else asset_shift
+            # Both markets trade, their last candles close at 10:00 UTC
+            self.views[("EUR-USD", "1m")] = make_view(
+                [10 * HOUR - 60000 + asset_shift, 10 * HOUR + asset_shift], 6 + asset_shift
+            )
+            self.views[("BTC-USD", "1m")] = make_view([10 * HOUR - 60000, 10 * HOUR], 7 + asset_shift)
+
+            self.assertFalse(self.cache.live_edge("EUR-USD", "1m")['open'], asset_shift)
+            get_data("EUR-USD", "1m", options={'modifiers': ['skiplast'], 'return_polars': True})
+            args, _ = self.cache.get_chunk.call_args
+            self.assertEqual(args[3], 2, asset_shift)
+
+    def test_empty_view(self):
+        """Without data there is no edge and nothing is open."""
+        self.views[("BTC-USD", "1m")] = make_view([], 5)
+        edge = self.cache.live_edge("EUR-USD", "1h")
+        self.assertIsNone(edge['mark_ms'])
+        self.assertFalse(edge['open'])
+
+
+if __name__ == '__main__':
+    unittest.main()
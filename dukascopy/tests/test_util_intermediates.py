@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+import polars as pl
+
+from util import cache
+from util.intermediates import SharedIntermediates, true_range, wilder, ema, diff, rolling_mean
+from util.parallel import parallel_indicators
+
+
+class TestSharedIntermediates(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(3)
+        n = 300
+        close = 100 + np.cumsum(np.random.randn(n))
+        self.df = pl.DataFrame({
+            "time_ms": np.arange(n, dtype=np.uint64) * 60000,
+            "open": close,
+            "high": close + np.random.rand(n),
+            "low": close - np.random.rand(n),
+            "close": close,
+            "volume": np.full(n, 1000.0),
+        })
+
+    def test_outside_scope_returns_expression(self):
+        """Without an engine scope the plain expression is returned."""
+        result = self.df.select(ema(10).alias("ema"))
+        expected = self.df.select(pl.col("close").ewm_mean(span=10, adjust=False).alias("ema"))
+        self.assertTrue(result.equals(expected))
+
+    def test_scope_deduplicates_and_stages(self):
+        """Each distinct intermediate is registered once, dependents in a later stage."""
+        with SharedIntermediates() as shared:
+            first = wilder(14, true_range())
+            second = wilder(14, true_range())
+            other = wilder(10, true_range())
+            change = diff()
+
+        self.assertEqual(first.meta.output_name(), second.meta.output_name())
+        self.assertNotEqual(first.meta.output_name(), other.meta.output_name())
+        self.assertEqual(len(shared.columns), 4)
+        self.assertEqual(shared.requests, 7)
+
+        stages = shared.stages()
+        self.assertEqual(len(stages), 2)
+        self.assertEqual(len(stages[0]), 2)   # true range, diff
+        self.assertEqual(len(stages[1]), 2)   # both smoothings
+
+        # Shared evaluation equals the inline expressions
+        lazy = self.df.lazy()
+        for stage in stages:
+            lazy = lazy.with_columns(stage)
+        result = lazy.select(first.alias("a"), other.alias("b"), change.alias("c")).collect()
+        expected = self.df.select(
+            wilder(14, true_range()).alias("a"),
+            wilder(10, true_range()).alias("b"),
+            diff().alias("c")
+        )
+        self.assertTrue(result.equals(expected))
+
+    def test_rejects_unshared_expression_source(self):
+        """Within a scope, sources must be columns or intermediates."""
+        with SharedIntermediates():
+            with self.assertRaises(ValueError):
+                rolling_mean(5, pl.col("close") * 2)
+
+
+class TestEngineSharing(unittest.TestCase):
+
+    def setUp(self):
+        cache.MarketDataCache._instance = None
+        self.plugins = cache.MarketDataCache().indicators.registry
+
+    def tearDown(self):
+        cache.MarketDataCache._instance = None
+
+    def test_engine_output_unchanged(self):
+        """Indicators sharing intermediates compute the same values, without helper columns."""
+        np.random.seed(5)
+        n = 500
+        close = 100 + np.cumsum(np.random.randn(n))
+        df = pl.DataFrame({
+            "time_ms": np.arange(n, dtype=np.uint64) * 60000,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(n, 1000.0),
+        })
+
+        indicators = ["atr_14", "keltner_20_14_2", "sma_20", "bbands_20_2", "ema_20", "rsi_14"]
+        result = parallel_indicators(df, indicators, self.plugins, True, True)
+        self.assertFalse([c for c in result.columns if c.startswith("__shared__")])
+
+        # Computed one by one there is nothing to share
+        for ind in indicators:
+            single = parallel_indicators(df, [ind], self.plugins, True, True)
+            columns = [c for c in single.columns if c not in df.columns]
+            self.assertTrue(result.select(columns).equals(single.select(columns)), ind)
+
+
+if __name__ == '__main__':
+    unittest.main()
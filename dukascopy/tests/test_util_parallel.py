@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+import ast
+import glob
+import os
+import numpy as np
+import polars as pl
+
+from util.indicator import IndicatorRegistry
+from util.parallel import (
+    IndicatorEngine,
+    SharedFrame,
+    _execute_process_task,
+    _shutdown_process_pool
+)
+
+class TestIndicatorEngineBackends(unittest.TestCase):
+    """Thread, process and inline backends must produce identical results."""
+
+    @classmethod
+    def setUpClass(cls):
+        np.random.seed(3)
+        size = 1000
+        close = 100 + np.cumsum(np.random.normal(0, 1, size))
+        cls.df = pl.DataFrame({
+            "symbol": ["EUR-USD"] * size,
+            "timeframe": ["1h"] * size,
+            "time_ms": np.arange(size, dtype=np.uint64) * 3600000,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(size, 1000.0)
+        })
+        registry = IndicatorRegistry().registry
+
+        # Force the pandas path of a simple plugin, routing decided per test
+        cls.plugins = {"sma": dict(registry["sma"], meta=lambda: {})}
+
+    @classmethod
+    def tearDownClass(cls):
+        _shutdown_process_pool()
+
+    def _compute(self, executor, df=None):
+        with IndicatorEngine(max_workers=2, executor=executor) as engine:
+            return engine.compute(df if df is not None else self.df, ["sma_20"], self.plugins, True, True)
+
+    def test_shared_frame_roundtrip(self):
+        """The worker entry point rebuilds the frame from shared memory."""
+        shared = SharedFrame(self.df)
+        try:
+            self.assertEqual(shared.descriptor['constants'], {"symbol": "EUR-USD", "timeframe": "1h"})
+            payload = _execute_process_task(
+                shared.descriptor, self.plugins["sma"]["path"], self.plugins["sma"]["mtime"],
+                "sma_20", {"period": "20"}, False
+            )
+        finally:
+            shared.close()
+
+        self.assertIsInstance(payload, bytes)
+
+    def test_process_matches_thread(self):
+        expected = self._compute("thread")
+        result = self._compute("process")
+        np.testing.assert_allclose(
+            result["sma_20"].to_numpy(), expected["sma_20"].to_numpy(), equal_nan=True
+        )
+
+    def test_inline_matches_thread(self):
+        expected = self._compute("thread")
+        result = self._compute("inline")
+        np.testing.assert_allclose(
+            result["sma_20"].to_numpy(), expected["sma_20"].to_numpy(), equal_nan=True
+        )
+
+    def test_unshareable_frame_falls_back(self):
+        """Non-constant string columns cannot be shared, threads take over."""
+        df = self.df.with_columns(pl.Series("symbol", ["A", "B"] * (self.df.height // 2)))
+        with self.assertRaises(ValueError):
+            SharedFrame(df)
+
+        result = self._compute("process", df)
+        self.assertIn("sma_20", result.columns)
+
+
+class TestPluginRouting(unittest.TestCase):
+
+    def test_get_data_plugins_run_on_threads(self):
+        """Plugins calling get_data must not run in process workers (no shared planner)."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        paths = glob.glob(os.path.join(root, "util", "plugins", "indicators", "*.py"))
+        paths += glob.glob(os.path.join(root, "config", "plugins", "indicators", "*.py"))
+
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+            if "get_data(" not in source:
+                continue
+
+            # Read the meta() dict statically, some plugins import optional packages
+            tree = ast.parse(source)
+            meta = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "meta")
+            returned = next(node.value for node in ast.walk(meta) if isinstance(node, ast.Return))
+            self.assertEqual(ast.literal_eval(returned).get("executor"), "thread", path)
+
+if __name__ == '__main__':
+    unittest.main()
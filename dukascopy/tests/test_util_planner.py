@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import time
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from util import api
+from util.planner import QueryPlanner, SingleFlight, AsyncSingleFlight, record, submit
+
+
+class TestQueryPlanner(unittest.TestCase):
+
+    def test_run_memoizes(self):
+        """A key is computed once, callers get independent copies."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return pd.DataFrame({"close": [1.0, 2.0]})
+
+        with QueryPlanner() as planner:
+            first = planner.run(("EUR-USD", "1m"), compute)
+            first["close"] = 0.0
+            second = planner.run(("EUR-USD", "1m"), compute)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second["close"].tolist(), [1.0, 2.0])
+        self.assertEqual((planner.hits, planner.misses), (1, 1))
+
+    def test_concurrent_callers_share_one_computation(self):
+        """Callers asking while the result is computed wait for it."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        with QueryPlanner() as planner:
+            futures = [submit(planner.run, "key", compute) for _ in range(8)]
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_exceptions_are_memoized(self):
+        """A failing query fails every caller without running again."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            raise ValueError("no dataset")
+
+        with QueryPlanner() as planner:
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    planner.run("key", compute)
+
+        self.assertEqual(len(calls), 1)
+
+    def test_submit_keeps_request_context(self):
+        """Submitted work sees the planner, nested submits run inline."""
+        with QueryPlanner() as planner:
+            seen = submit(QueryPlanner.current).result()
+            worker = submit(lambda: submit(threading.current_thread).result()).result()
+
+        self.assertIs(seen, planner)
+        self.assertTrue(worker.name.startswith("query-planner"))
+        self.assertIsNone(QueryPlanner.current())
+
+    def test_submit_outside_request_runs_inline(self):
+        """Without a planner submit returns a completed future."""
+        future = submit(threading.current_thread)
+        self.assertTrue(future.done())
+        self.assertIs(future.result(), threading.current_thread())
+
+
+class TestNestedGetData(unittest.TestCase):
+
+    @patch('util.api._get_data')
+    def test_nested_calls_are_deduplicated(self, mock_get_data):
+        """Nested get_data calls with the same arguments run once per request."""
+        mock_get_data.return_value = pd.DataFrame({"time_ms": [1]})
+
+        with QueryPlanner():
+            for _ in range(3):
+                api.get_data("BTC-USD", "1m", limit=1, order="desc", options={"return_polars": False, "benchmark": "x"})
+            api.get_data("BTC-USD", "1m", limit=1, order="desc", options={"return_polars": False})
+            api.get_data("BTC-USD", "1m", limit=2, order="desc", options={"return_polars": False})
+
+        # Options get_data ignores (plugin options) do not split the key
+        self.assertEqual(mock_get_data.call_count, 2)
+
+    @patch('util.api._get_data')
+    def test_outermost_call_opens_scope(self, mock_get_data):
+        """The outermost call runs directly, within a planner."""
+        mock_get_data.side_effect = lambda *args: QueryPlanner.current()
+
+        self.assertIsNotNone(api.get_data("EUR-USD", "1h"))
+        self.assertIsNone(QueryPlanner.current())
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_requests_share_one_computation(self):
+        """Requests asking while a computation is in flight share its result and reads."""
+        flight = SingleFlight()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            record("view", ("EUR-USD", "1m"), ("p", 64, 1.0))
+            time.sleep(0.1)
+            return pd.DataFrame({"close": [1.0]})
+
+        planners = [QueryPlanner() for _ in range(4)]
+
+        def request(planner):
+            with planner:
+                flight.run("key", compute)
+
+        threads = [threading.Thread(target=request, args=(p,)) for p in planners]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((flight.hits, flight.misses), (3, 1))
+        for planner in planners:
+            self.assertEqual(planner.reads, {("view", ("EUR-USD", "1m")): ("p", 64, 1.0)})
+
+        # Nothing is kept once the computation completed
+        flight.run("key", compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_exception_is_shared_and_released(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.run("key", fail)
+        self.assertEqual(flight.run("key", lambda: 1), 1)
+
+    def test_async_callers_share_one_task(self):
+        """A cancelled caller does not cancel the computation of the others."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 42
+
+        async def main():
+            first = asyncio.ensure_future(flight.run("key", compute))
+            second = asyncio.ensure_future(flight.run("key", compute))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), 42)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight._tasks, {})
+
+    @patch('util.api._get_data')
+    def test_concurrent_get_data_calls_are_coalesced(self, mock_get_data):
+        """Outermost get_data calls of different requests share one computation."""
+        def compute(*args):
+            time.sleep(0.1)
+            return pd.DataFrame({"time_ms": [1]})
+        mock_get_data.side_effect = compute
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(api.get_data("EUR-USD", "1m", limit=5)))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(mock_get_data.call_count, 1)
+        self.assertEqual(len({id(df) for df in results}), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+import numpy as np
+import polars as pl
+import os
+import tempfile
+import shutil
+
+from util import cache
+from util.store import IndicatorStore
+from util.parallel import parallel_indicators
+
+class TestIndicatorStore(unittest.TestCase):
+
+    def setUp(self):
+        """Fresh cache singleton with an injected view backed by a temp directory."""
+        cache.MarketDataCache._instance = None
+        self.cache = cache.MarketDataCache()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "EUR-USD.bin")
+        self.plugins = self.cache.indicators.registry
+
+        # Random-walk OHLCV with 500 records
+        np.random.seed(7)
+        self.raw_data = self._make_data(500)
+        self._inject(self.raw_data)
+
+        self.store = IndicatorStore(self.cache)
+
+    def tearDown(self):
+        cache.MarketDataCache._instance = None
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _make_data(self, n):
+        data = np.zeros(n, dtype=cache.DTYPE)
+        close = 100 + np.cumsum(np.random.normal(0, 1, n))
+        data['ts'] = np.arange(1000, 1000 + n * 60, 60, dtype='<u8')
+        data['ohlcv'][:, 0] = close
+        data['ohlcv'][:, 1] = close + 1
+        data['ohlcv'][:, 2] = close - 1
+        data['ohlcv'][:, 3] = close
+        data['ohlcv'][:, 4] = 1000.0
+        return data
+
+    def _inject(self, data):
+        self.cache.mmaps["EUR-USD_1m"] = {
+            'data': data,
+            'ts_index': data['ts'],
+            'file_path': self.file_path
+        }
+
+    def _reference(self, ind, from_idx, to_idx):
+        """Plain engine computation with full warmup, for comparison."""
+        warmup = self.cache.indicators.get_maximum_warmup_rows([ind])
+        calc_from = max(0, from_idx - warmup)
+        chunk = self.cache.get_chunk("EUR-USD", "1m", calc_from, to_idx, True)
+        res = parallel_indicators(chunk, [ind], self.plugins, True, True)
+        return res.select(pl.exclude(chunk.columns)).slice(from_idx - calc_from)
+
+    def test_fetch_matches_engine(self):
+        """Stored values are identical to a regular computation."""
+        frame, remaining = self.store.fetch("EUR-USD", "1m", ["sma_10"], 200, 300, 0, self.plugins)
+        self.assertEqual(remaining, [])
+        self.assertEqual(frame.height, 100)
+        np.testing.assert_allclose(
+            frame["sma_10"].to_numpy(), self._reference("sma_10", 200, 300)["sma_10"].to_numpy()
+        )
+
+    def test_skip_rows_are_null_padded(self):
+        """Leading warmup rows of the chunk are returned as nulls."""
+        frame, _ = self.store.fetch("EUR-USD", "1m", ["sma_10"], 200, 300, 30, self.plugins)
+        self.assertEqual(frame.height, 100)
+        self.assertEqual(frame["sma_10"].head(30).null_count(), 30)
+        self.assertEqual(frame["sma_10"].tail(70).null_count(), 0)
+
+    def test_non_cacheable_is_remaining(self):
+        """Plugins without the cacheable flag are left to the engine."""
+        frame, remaining = self.store.fetch("EUR-USD", "1m", ["obv"], 0, 100, 0, self.plugins)
+        self.assertIsNone(frame)
+        self.assertEqual(remaining, ["obv"])
+
+    def test_covered_request_does_not_compute(self):
+        """A second, covered request is served as a slice."""
+        self.store.fetch("EUR-USD", "1m", ["rsi_14"], 100, 400, 0, self.plugins)
+        with patch.object(self.store, '_compute') as mock_compute:
+            frame, _ = self.store.fetch("EUR-USD", "1m", ["rsi_14"], 150, 350, 0, self.plugins)
+            mock_compute.assert_not_called()
+        self.assertEqual(frame.height, 200)
+
+    def test_incremental_tail(self):
+        """Appended records only trigger a tail computation (batch plugins)."""
+        self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 500, 0, self.plugins)
+
+        # Append 100 records (existing records unchanged)
+        extended = self._make_data(600)
+        extended[:500] = self.raw_data
+        self._inject(extended)
+
+        original_compute = self.store._compute
+        with patch.object(self.store, '_compute', side_effect=original_compute) as spy:
+            frame, _ = self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 600, 0, self.plugins)
+            # Last record was never persisted, so the tail starts at 499
+            args = spy.call_args[0]
+            self.assertEqual((args[4], args[5]), (499, 600))
+
+        self.assertEqual(frame.height, 500)
+        np.testing.assert_allclose(
+            frame["sma_10"].tail(100).to_numpy(),
+            self._reference("sma_10", 500, 600)["sma_10"].to_numpy(),
+            rtol=1e-4
+        )
+
+    def test_streaming_tail(self):
+        """Streaming plugins advance the carried state by the new rows only."""
+        self.store.fetch("EUR-USD", "1m", ["rsi_14"], 100, 400, 0, self.plugins)
+
+        # First extension bootstraps the state from the warmup window
+        extended = self._make_data(600)
+        extended[:500] = self.raw_data
+        self._inject(extended)
+        self.store.fetch("EUR-USD", "1m", ["rsi_14"], 100, 550, 0, self.plugins)
+        self.assertIsNotNone(self.store.segments[("EUR-USD", "1m", "rsi_14")].state)
+
+        # Second extension only touches the appended rows
+        original_get_chunk = self.cache.get_chunk
+        with patch.object(self.cache, 'get_chunk', side_effect=original_get_chunk) as spy:
+            frame, _ = self.store.fetch("EUR-USD", "1m", ["rsi_14"], 100, 560, 0, self.plugins)
+            self.assertEqual([c[0][2:4] for c in spy.call_args_list], [(550, 560)])
+
+        self.assertEqual(frame.height, 460)
+        np.testing.assert_allclose(
+            frame["rsi_14"].tail(10).to_numpy(),
+            self._reference("rsi_14", 550, 560)["rsi_14"].to_numpy(),
+            rtol=1e-4
+        )
+
+    def test_streaming_open_bar_not_persisted(self):
+        """The open bar is evaluated but the state stops before it."""
+        self.store.fetch("EUR-USD", "1m", ["ema_10"], 100, 400, 0, self.plugins)
+        self.store.fetch("EUR-USD", "1m", ["ema_10"], 100, 500, 0, self.plugins)
+        segment = self.store.segments[("EUR-USD", "1m", "ema_10")]
+        self.assertEqual(segment.end, 499)
+        self.assertAlmostEqual(segment.state["ema"], segment.columns["ema_10"][-1])
+
+    def test_persisted_segment_reloads(self):
+        """A new store instance loads the Arrow side file instead of computing."""
+        self.store.fetch("EUR-USD", "1m", ["bbands_20_2"], 100, 300, 0, self.plugins)
+        side_file = os.path.join(self.tmp_dir, ".indicators", "EUR-USD", "bbands_20_2.arrow")
+        self.assertTrue(os.path.isfile(side_file))
+
+        fresh_store = IndicatorStore(self.cache)
+        with patch.object(fresh_store, '_compute') as mock_compute:
+            frame, _ = fresh_store.fetch("EUR-USD", "1m", ["bbands_20_2"], 120, 280, 0, self.plugins)
+            mock_compute.assert_not_called()
+        self.assertIn("bbands_20_2__upper", frame.columns)
+
+    def test_tail_appended_as_batch(self):
+        """Extensions append a record batch to the side file instead of rewriting it."""
+        self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, self.plugins)
+        side_file = os.path.join(self.tmp_dir, ".indicators", "EUR-USD", "sma_10.arrow")
+        size = os.path.getsize(side_file)
+
+        with patch.object(self.store, '_save') as mock_save:
+            self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 350, 0, self.plugins)
+            mock_save.assert_not_called()
+        segment = self.store.segments[("EUR-USD", "1m", "sma_10")]
+        self.assertEqual(segment.batches, 2)
+        self.assertGreater(os.path.getsize(side_file), size)
+
+        # An interrupted append leaves bytes past the committed length
+        with open(side_file, "ab") as f:
+            f.write(b"\x00" * 64)
+
+        fresh_store = IndicatorStore(self.cache)
+        with patch.object(fresh_store, '_compute') as mock_compute:
+            frame, _ = fresh_store.fetch("EUR-USD", "1m", ["sma_10"], 100, 350, 0, self.plugins)
+            mock_compute.assert_not_called()
+        np.testing.assert_allclose(
+            frame["sma_10"].to_numpy(), self._reference("sma_10", 100, 350)["sma_10"].to_numpy()
+        )
+
+    def test_segments_bounded_by_memory(self):
+        """Least recently used segments are evicted and reloaded from disk."""
+        store = IndicatorStore(self.cache, max_bytes=1)
+        store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, self.plugins)
+        store.fetch("EUR-USD", "1m", ["rsi_14"], 100, 300, 0, self.plugins)
+        self.assertEqual(list(store.segments), [("EUR-USD", "1m", "rsi_14")])
+
+        with patch.object(store, '_compute') as mock_compute:
+            frame, _ = store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, self.plugins)
+            mock_compute.assert_not_called()
+        self.assertEqual(frame.height, 200)
+        self.assertEqual(list(store.segments), [("EUR-USD", "1m", "sma_10")])
+
+    def test_segment_extends_backwards(self):
+        """Requests before the segment grow it backwards, at least doubling it."""
+        self.store.fetch("EUR-USD", "1m", ["sma_10"], 300, 400, 0, self.plugins)
+
+        original_compute = self.store._compute
+        with patch.object(self.store, '_compute', side_effect=original_compute) as spy:
+            frame, _ = self.store.fetch("EUR-USD", "1m", ["sma_10"], 250, 350, 0, self.plugins)
+            args = spy.call_args[0]
+            self.assertEqual((args[4], args[5]), (200, 300))
+
+        segment = self.store.segments[("EUR-USD", "1m", "sma_10")]
+        self.assertEqual((segment.start, segment.end), (200, 400))
+        np.testing.assert_allclose(
+            frame["sma_10"].to_numpy(), self._reference("sma_10", 250, 350)["sma_10"].to_numpy()
+        )
+
+    def test_far_request_keeps_segment(self):
+        """Requests far before the segment are computed without replacing it."""
+        self.store.fetch("EUR-USD", "1m", ["sma_10"], 400, 450, 0, self.plugins)
+        frame, _ = self.store.fetch("EUR-USD", "1m", ["sma_10"], 50, 100, 0, self.plugins)
+        self.assertEqual(frame.height, 50)
+
+        segment = self.store.segments[("EUR-USD", "1m", "sma_10")]
+        self.assertEqual((segment.start, segment.end), (400, 450))
+
+    def test_rewritten_bar_invalidates(self):
+        """Changing the last stored bar drops the segment."""
+        self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, self.plugins)
+        self.raw_data['ohlcv'][299, 3] += 5.0
+
+        original_compute = self.store._compute
+        with patch.object(self.store, '_compute', side_effect=original_compute) as spy:
+            self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, self.plugins)
+            args = spy.call_args[0]
+            self.assertEqual((args[4], args[5]), (100, 300))
+
+    def test_plugin_change_invalidates(self):
+        """A different plugin fingerprint drops the segment."""
+        self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, self.plugins)
+        plugins = dict(self.plugins)
+        plugins['sma'] = dict(plugins['sma'], mtime=0)
+
+        with patch.object(self.store, '_compute', return_value=None) as mock_compute:
+            frame, remaining = self.store.fetch("EUR-USD", "1m", ["sma_10"], 100, 300, 0, plugins)
+            mock_compute.assert_called_once()
+        self.assertEqual(remaining, ["sma_10"])
+
+if __name__ == '__main__':
+    unittest.main()
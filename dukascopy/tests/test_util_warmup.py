@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import polars as pl
+
+from util import cache
+from util.indicator import IndicatorRegistry
+from util.parallel import group_by_warmup, windowed_indicators, parallel_indicators
+
+
+class TestGroupByWarmup(unittest.TestCase):
+
+    def test_similar_warmups_share_one_group(self):
+        """Indicators with comparable warmup are computed in one pass."""
+        warmups = {"sma_20": 20, "sma_30": 30, "rsi_14": 15}
+        self.assertEqual(group_by_warmup(list(warmups), warmups, 30), [(0, ["sma_20", "sma_30", "rsi_14"])])
+
+    def test_short_warmups_get_their_own_window(self):
+        """A long warmup no longer drags short indicators along."""
+        warmups = {"sma_10": 10, "sma_2000": 2000, "ema_1000": 1000, "rsi_14": 15}
+        groups = group_by_warmup(list(warmups), warmups, 2000)
+        self.assertEqual(groups, [(0, ["sma_2000", "ema_1000"]), (1985, ["sma_10", "rsi_14"])])
+
+    def test_clamped_to_available_warmup(self):
+        """Near the start of a dataset the groups use what was retrieved."""
+        warmups = {"sma_10": 10, "sma_2000": 2000}
+        self.assertEqual(group_by_warmup(list(warmups), warmups, 100), [(0, ["sma_10", "sma_2000"])])
+        self.assertEqual(group_by_warmup(list(warmups), warmups, 600), [(0, ["sma_2000"]), (590, ["sma_10"])])
+
+    def test_unknown_warmup_uses_all_rows(self):
+        """Indicators without a warmup_count are computed over all available rows."""
+        warmups = {"sma_10": 10, "sma_2000": 2000, "obv": None}
+        groups = group_by_warmup(list(warmups), warmups, 2000)
+        self.assertEqual(groups, [(0, ["sma_2000", "obv"]), (1990, ["sma_10"])])
+
+
+class TestWarmupRows(unittest.TestCase):
+
+    def test_get_warmup_rows(self):
+        """Warmup is reported per indicator string."""
+        with patch.object(IndicatorRegistry, 'load_all_plugins', return_value={}):
+            mgr = IndicatorRegistry(MagicMock())
+        mgr.registry = {
+            'sma': {
+                'warmup_count': lambda opts: opts['period'],
+                'position_args': lambda params: {'period': int(params[0])}
+            }
+        }
+
+        mgr.registry['obv'] = {}
+
+        self.assertEqual(mgr.get_warmup_rows(["sma_20", "sma_200", "unknown_5"]), {"sma_20": 20, "sma_200": 200, "unknown_5": 0})
+        self.assertEqual(mgr.get_warmup_rows(["obv"]), {"obv": None})
+        self.assertEqual(mgr.get_maximum_warmup_rows(["sma_20", "sma_200", "obv"]), 200)
+        self.assertEqual(mgr.get_maximum_warmup_rows([]), 0)
+
+
+class TestWindowedIndicators(unittest.TestCase):
+
+    def setUp(self):
+        cache.MarketDataCache._instance = None
+        self.plugins = cache.MarketDataCache().indicators.registry
+
+        np.random.seed(11)
+        n = 4000
+        close = 100 + np.cumsum(np.random.randn(n))
+        self.df = pl.DataFrame({
+            "time_ms": np.arange(n, dtype=np.uint64) * 60000,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(n, 1000.0),
+        })
+
+    def tearDown(self):
+        cache.MarketDataCache._instance = None
+
+    def test_matches_single_pass_after_warmup(self):
+        """Windowed results equal the single pass once the warmup is dropped."""
+        indicators = ["sma_1000", "sma_10"]
+        warmups = cache.MarketDataCache().indicators.get_warmup_rows(indicators)
+        available = max(warmups.values())
+        groups = group_by_warmup(indicators, warmups, available)
+        self.assertEqual(len(groups), 2)
+
+        windowed = windowed_indicators(self.df, groups, self.plugins, True, True)
+        single = parallel_indicators(self.df, indicators, self.plugins, True, True)
+
+        # Full height, row-aligned, same columns
+        self.assertEqual(windowed.height, self.df.height)
+        self.assertEqual(sorted(windowed.columns), sorted(single.columns))
+        # Rolling sums restart at a different row, equal up to rounding
+        np.testing.assert_allclose(
+            windowed.slice(available).select(single.columns).to_numpy(),
+            single.slice(available).to_numpy(),
+            rtol=1e-9
+        )
+
+    def test_mixed_set_without_warmup_count(self):
+        """Plugins without a warmup_count (macd, stddev, obv) keep the full warmup."""
+        indicators = ["sma_2000", "macd_12_26_9", "stddev_20", "obv", "sma_10"]
+        warmups = cache.MarketDataCache().indicators.get_warmup_rows(indicators)
+        self.assertIsNone(warmups["obv"])
+        available = 2000
+        close = 100 + np.cumsum(np.random.randn(6500))
+        df = pl.DataFrame({
+            "time_ms": np.arange(6500, dtype=np.uint64) * 60000,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.random.uniform(500, 1500, 6500),
+        })
+        groups = group_by_warmup(indicators, warmups, available)
+        self.assertEqual(len(groups), 2)
+
+        windowed = windowed_indicators(df, groups, self.plugins, True, True)
+        single = parallel_indicators(df, indicators, self.plugins, True, True)
+
+        kept = windowed.slice(available).select(single.columns)
+        self.assertEqual(kept.null_count().sum_horizontal().item(), single.slice(available).null_count().sum_horizontal().item())
+        np.testing.assert_allclose(kept.to_numpy(), single.slice(available).to_numpy(), rtol=1e-9)
+
+    def test_nested_output(self):
+        """Nested mode returns the base columns plus one indicators struct."""
+        warmups = {"sma_1000": 1000, "sma_10": 10}
+        groups = group_by_warmup(list(warmups), warmups, 1000)
+
+        result = windowed_indicators(self.df, groups, self.plugins, False, True)
+        self.assertEqual(result.columns, [*self.df.columns, "indicators"])
+        self.assertEqual(result.height, self.df.height)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from util.watcher import ChangeWatcher, CREATED, DELETED, _load_inotify
+from util.discovery import DataDiscovery
+from util.registry import DatasetRegistry
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class WatcherTests:
+    """Backend independent tests, mixed into one TestCase per backend."""
+    mode = None
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.aggregate = os.path.join(self.tmp_dir, "aggregate", "1m")
+        self.resample = os.path.join(self.tmp_dir, "resample")
+        os.makedirs(self.aggregate)
+        self.events = []
+        self.watcher = ChangeWatcher(mode=self.mode, interval=0.05)
+        self.watcher.watch(self.aggregate)
+        self.watcher.watch(self.resample, subdirs=True)
+        self.watcher.subscribe(lambda path, event: self.events.append((path, event)))
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_version_changes_on_write(self):
+        """Writes to a watched file change its version, nothing else does."""
+        path = os.path.join(self.aggregate, "EUR-USD.bin")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 64)
+        self.watcher.start()
+        self.assertEqual(self.watcher.backend, self.mode)
+
+        before = self.watcher.version(path)
+        self.assertIsNotNone(before)
+        time.sleep(0.2)
+        self.assertEqual(self.watcher.version(path), before)
+
+        with open(path, "ab") as f:
+            f.write(b"\0" * 64)
+        self.assertTrue(wait_for(lambda: self.watcher.version(path) != before))
+
+    def test_unwatched_path_has_no_version(self):
+        """Files outside the watched directories are not versioned."""
+        self.watcher.start()
+        self.assertIsNone(self.watcher.version(os.path.join(self.tmp_dir, "other.bin")))
+
+    def test_new_timeframe_directory(self):
+        """Files in a timeframe directory created after start are reported."""
+        self.watcher.start()
+        path = os.path.join(self.resample, "5m", "EUR-USD.bin")
+        os.makedirs(os.path.dirname(path))
+        time.sleep(0.2)
+        with open(path, "wb") as f:
+            f.write(b"\0" * 64)
+
+        self.assertTrue(wait_for(lambda: (path, CREATED) in self.events))
+        self.assertIsNotNone(self.watcher.version(path))
+
+        os.remove(path)
+        self.assertTrue(wait_for(lambda: (path, DELETED) in self.events))
+
+
+@unittest.skipIf(_load_inotify() is None, "inotify not available")
+class TestWatcherInotify(WatcherTests, unittest.TestCase):
+    mode = "inotify"
+
+
+class TestWatcherPoll(WatcherTests, unittest.TestCase):
+    mode = "poll"
+
+
+class TestDatasetTracking(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        config = SimpleNamespace(fmode="binary", paths=SimpleNamespace(data=self.tmp_dir))
+        self.discovery = DataDiscovery(config)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_dataset_for(self):
+        """Paths map to datasets, temporary and foreign files do not."""
+        aggregate_dir, resample_dir = self.discovery.watch_dirs()
+
+        ds = self.discovery.dataset_for(os.path.join(resample_dir, "1h", "EUR-USD.bin"))
+        self.assertEqual((ds.symbol, ds.timeframe), ("EUR-USD", "1h"))
+        ds = self.discovery.dataset_for(os.path.join(aggregate_dir, "EUR-USD.bin"))
+        self.assertEqual((ds.symbol, ds.timeframe), ("EUR-USD", "1m"))
+
+        self.assertIsNone(self.discovery.dataset_for(os.path.join(aggregate_dir, "EUR-USD.bin.tmp")))
+        self.assertIsNone(self.discovery.dataset_for(os.path.join(self.tmp_dir, "EUR-USD.bin")))
+
+    def test_registry_add_remove(self):
+        """Datasets added at runtime are found and listed, removed ones are not."""
+        registry = DatasetRegistry([])
+        _, resample_dir = self.discovery.watch_dirs()
+        ds = self.discovery.dataset_for(os.path.join(resample_dir, "4h", "GBP-USD.bin"))
+
+        registry.add(ds)
+        registry.add(ds)
+        self.assertIs(registry.find("GBP-USD", "4h"), ds)
+        self.assertEqual(registry.get_available_datasets(), [ds])
+
+        registry.remove("GBP-USD", "4h")
+        self.assertIsNone(registry.find("GBP-USD", "4h"))
+        self.assertEqual(registry.get_available_datasets(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,7 @@
  File:        api.py
  Author:      JP Ueberbach
  Created:     2026-01-12
- Updated:     2026-01-23
+ Updated:     2026-10-16
  Description: Provides API-level data retrieval for OHLCV datasets and indicator
               computation within the Dukascopy data pipeline.
 
@@ -13,10 +13,12 @@
                 - Retrieves time-sliced OHLCV data from the cached memory-mapped
                   datasets
                 - Applies user-specified indicators, automatically handling
-                  warmup rows
+                  warmup rows (each indicator group on its own warmup window)
                 - Supports output modifiers such as "skiplast" and limit constraints
                 - Performs optional parallelized indicator calculations
                 - Returns a normalized Pandas DataFrame with OHLCV and indicator columns
+                - Runs every call inside a request-scoped QueryPlanner, nested
+                  calls made by indicators are computed once per request
 
  Requirements:
      - Python 3.8+
@@ -35,7 +37,18 @@ import polars as pl
 
 from typing import Dict,List, Union
 from util.cache import MarketDataCache
-from util.parallel import parallel_indicators
+from util.indicator import plugin_version
+from util.parallel import parallel_indicators, group_by_warmup, windowed_indicators
+from util.planner import QueryPlanner, IN_FLIGHT, record
+
+# Options that change the result of get_data (memoization key)
+QUERY_OPTIONS = (
+    "return_polars",
+    "modifiers",
+    "disable_recursive_mapping",
+    "indicator_store",
+    "force_ordering",
+)
 
 def get_data_auto(
     df: Union[pd.DataFrame, pl.DataFrame],
@@ -124,6 +137,18 @@ def get_data_auto(
 
 
 
+def _last_is_open(cache: MarketDataCache, symbol: str, timeframe: str) -> bool:
+    """Return whether the last candle of a view is open (live edge).
+
+    Without a live edge (e.g. no heartbeat data available) the last candle
+    is treated as open, skiplast then drops it unconditionally.
+    """
+    try:
+        return bool(cache.live_edge(symbol, timeframe)['open'])
+    except Exception:
+        return True
+
+
 def get_data(
     symbol: str,
     timeframe: str,
@@ -153,8 +178,11 @@ def get_data(
             (e.g., ["sma_20", "bbands_20_2"]). Defaults to empty list.
         options (Dict, optional): Dictionary of additional options and modifiers.
             Recognized keys include:
-                - "modifiers": List of strings, e.g., ["skiplast"].
+                - "modifiers": List of strings, e.g., ["skiplast"] (drops
+                  the last candle while it is open).
                 - "disable_recursive_mapping": Boolean flag for indicator processing.
+                - "indicator_store": Serve cacheable indicators from the
+                  incremental result store (default True).
 
     Returns:
         pd.DataFrame: A DataFrame containing OHLCV data sliced according to the
@@ -162,7 +190,47 @@ def get_data(
         The DataFrame includes normalized columns:
             - "symbol", "timeframe", "sort_key", "open", "high", "low",
               "close", "volume", and any indicator columns.
+
+    Note: the outermost call opens a QueryPlanner. Calls made while it is
+          active (e.g. by indicator plugins) with the same arguments are
+          computed once and shared. Identical calls running concurrently in
+          other requests share one computation as well (single flight).
     """
+    # The arguments that affect the result
+    key = QueryPlanner.key(
+        symbol, timeframe, int(after_ms), int(until_ms), limit, order, indicators,
+        options={name: options[name] for name in QUERY_OPTIONS if name in options}
+    )
+
+    # Join an identical computation in flight in another request
+    def compute():
+        return IN_FLIGHT.run(
+            key,
+            lambda: _get_data(symbol, timeframe, after_ms, until_ms, limit, order, indicators, options)
+        )
+
+    planner = QueryPlanner.current()
+
+    # Outermost call, open the request scope
+    if planner is None:
+        with QueryPlanner():
+            return compute()
+
+    # Memoize within the request
+    return planner.run(key, compute)
+
+
+def _get_data(
+    symbol: str,
+    timeframe: str,
+    after_ms: int,
+    until_ms: int,
+    limit: int,
+    order: str,
+    indicators: List[str],
+    options: Dict
+) -> Union[pd.DataFrame,pl.DataFrame]:
+    """Execute a get_data query (see get_data), without memoization."""
     # Setup cache
     cache = MarketDataCache()
 
@@ -182,8 +250,9 @@ def get_data(
     # Extract modifiers, eg skiplast
     modifiers = options.get('modifiers', [])
 
-    # Check if the view is here, if not, cache it.
-    cache.discover_view(symbol, timeframe)
+    # Check if the view is here, if not, cache it. The snapshot pins one
+    # generation of the view for the whole query (no locking).
+    view = cache.discover_view(symbol, timeframe)
 
     # Determine how many warmup rows are needed for indicators
     warmup_rows = cache.indicators.get_maximum_warmup_rows(indicators)
@@ -192,8 +261,8 @@ def get_data(
     total_limit = limit + warmup_rows
 
     # Find index positions in cache for the requested time range
-    after_idx = cache.find_record(symbol, timeframe, after_ms, "left")
-    until_idx = cache.find_record(symbol, timeframe, until_ms, "right")
+    after_idx = cache.find_record(symbol, timeframe, after_ms, "left", view=view)
+    until_idx = cache.find_record(symbol, timeframe, until_ms, "right", view=view)
 
     # Store the intended start before clamping to 0
     intended_start_idx = after_idx - warmup_rows
@@ -217,34 +286,73 @@ def get_data(
         if order == "asc":
             until_idx = effective_after_idx + total_limit
 
-    max_idx = cache.get_record_count(symbol, timeframe)
+    max_idx = cache.get_record_count(symbol, timeframe, view=view)
 
     # Never slice beyond last row
     if until_idx > max_idx:
         until_idx = max_idx
 
-    # Skiplast handling
-    if until_idx == max_idx and "skiplast" in modifiers:
+    # Skiplast handling, only an open (live) last candle is dropped
+    if until_idx == max_idx and "skiplast" in modifiers and _last_is_open(cache, symbol, timeframe):
         until_idx -= 1
 
     # Retrieve the data slice from cache
-    chunk_df = cache.get_chunk(symbol, timeframe, effective_after_idx, until_idx, return_polars)
+    chunk_df = cache.get_chunk(symbol, timeframe, effective_after_idx, until_idx, return_polars, view=view)
 
     if indicators:
         # Hot reload support (only for custom user indicators)
         indicator_registry = cache.indicators.refresh(indicators)
 
+        # Record the plugin versions read by the running request (response cache)
+        for name in {item.split('_')[0] for item in indicators}:
+            if name in indicator_registry:
+                record("plugin", name, plugin_version(indicator_registry[name]))
+
         # Recursive mapping disable from options
         disable_recursive_mapping = options.get('disable_recursive_mapping', True)
 
+        # Serve cacheable indicators from the incremental result store
+        precomputed, live_indicators = None, indicators
+        if options.get('indicator_store', True):
+            precomputed, live_indicators = cache.store.fetch(
+                symbol,
+                timeframe,
+                indicators,
+                effective_after_idx,
+                until_idx,
+                actual_warmup_retrieved,
+                indicator_registry
+            )
+
+        # Indicators needing far less warmup than the maximum are computed
+        # on a shorter slice, grouped by their own warmup requirement
+        groups = []
+        if len(live_indicators) > 1:
+            groups = group_by_warmup(
+                live_indicators,
+                cache.indicators.get_warmup_rows(live_indicators),
+                actual_warmup_retrieved
+            )
+
         # Enrich the returned result with the requested indicators
-        chunk_df = parallel_indicators(
-            chunk_df, 
-            indicators, 
-            indicator_registry, 
-            disable_recursive_mapping, 
-            return_polars
-        )
+        if len(groups) > 1:
+            chunk_df = windowed_indicators(
+                chunk_df,
+                groups,
+                indicator_registry,
+                disable_recursive_mapping,
+                return_polars,
+                precomputed
+            )
+        else:
+            chunk_df = parallel_indicators(
+                chunk_df, 
+                live_indicators, 
+                indicator_registry, 
+                disable_recursive_mapping, 
+                return_polars,
+                precomputed
+            )
 
     # Drop ONLY the actual warmup rows retrieved
     is_pl = isinstance(chunk_df, pl.DataFrame)
@@ -4,7 +4,7 @@ File:        cache.py
 
 Author:      JP Ueberbach
 Created:     2026-01-12
-Updated:     2026-01-23
+Updated:     2026-10-16
 
 In-memory cache and view manager for OHLCV market data backed by
 memory-mapped binary files.
@@ -28,12 +28,30 @@ Key capabilities:
     - Extract contiguous OHLCV slices as Pandas DataFrames.
     - Lazily register views on demand via dataset discovery.
     - Share memory-mapped files across queries for efficient reuse.
+    - Lock-free reads: every registered view is an immutable snapshot
+      (mmap, timestamp index, record count, generation). Readers grab the
+      current snapshot with a single dict lookup and use it without
+      locking, writers build a new snapshot and swap it in.
+    - Change watching: a `ChangeWatcher` (inotify, or polling) tracks the
+      dataset and plugin files. Views are only re-checked on disk when
+      their file changed, and datasets created or removed while running
+      are added to or dropped from the registry.
+    - Live edge: per view, the last candle, whether it is still open and
+      the last closed candle, recomputed only when one of the views it is
+      derived from changed (see util/edge.py).
 
 Design notes:
-    - Binary files are assumed to use a fixed 64-byte record layout.
+    - Binary files use either the fixed 64-byte record layout or the
+      columnar layout (detected by the DUKASCOL magic). Columnar views are
+      contiguous per field, making Arrow/Polars conversion zero-copy.
     - Data access is read-only and optimized for random access.
     - Memory maps are reused when file size and modification time
-      are unchanged.
+      are unchanged. With the watcher enabled an unchanged view costs
+      no system call at all, the watcher version of the file is compared
+      instead.
+    - Replaced snapshots are never mutated or closed explicitly. Their
+      memory map is released by reference counting once the last reader
+      (or zero-copy frame) holding it is gone.
     - Timestamp indices are stored as NumPy arrays for efficient search.
     - Indicator execution is handled externally; this module provides
       only the underlying OHLCV data views.
@@ -65,11 +83,18 @@ import os
 import sys
 import mmap
 import threading
-from typing import Dict
+import itertools
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from numpy.lib.stride_tricks import as_strided
 from util.helper import *
 from util.registry import *
 from util.indicator import *
+from util.store import IndicatorStore
+from util.watcher import ChangeWatcher, CREATED, DELETED
+from util.edge import HEARTBEAT_SYMBOL, open_mark_ms
+from util.planner import record
+from util.layout import OHLCV, is_columnar, columnar_columns, row_columns, view_columns
 
 # Define the C-struct equivalent for numpy
 DTYPE = np.dtype([
@@ -80,6 +105,16 @@ DTYPE = np.dtype([
 
 RECORD_SIZE = 64
 
+
+def view_version(snapshot: Mapping) -> tuple:
+    """Return the version of a view snapshot: (file path, size, mtime).
+
+    Unlike the generation counter, the version is the same in every process
+    reading the file.
+    """
+    return (snapshot['file_path'], snapshot['size'], snapshot['mtime'])
+
+
 class MarketDataCache:
     # Singleton instance
     _instance = None
@@ -102,14 +137,90 @@ class MarketDataCache:
         
         # Setup the memory-maps
         self.mmaps = {}
+        # Live-edge records by view name
+        self.edges = {}
+        # Load the configuration (user-specific or default)
+        config = load_default_config()
         # Discover datasets and build registry
-        self.registry = DatasetRegistry(discover_all())
+        self.discovery = data_discovery(config)
+        self.registry = DatasetRegistry(self.discovery.scan())
         # Discover indicators and build registry
         self.indicators = IndicatorRegistry()
+        # Watch datasets and plugins for changes (None = stat on every query)
+        self.watcher = self._start_watcher(config.cache)
+        # Persistent, incremental indicator result store
+        self.store = IndicatorStore(self, max_bytes=config.cache.indicator_store_max_bytes)
         # Set initialized to true
         self._initialized = True
-        # Setup lock (thread-safety)
+        # Setup lock (serializes writers only, readers never take it)
         self._lock = threading.RLock()
+        # Monotonic snapshot generation counter
+        self._generation = itertools.count(1)
+
+    def _start_watcher(self, config) -> Optional[ChangeWatcher]:
+        """Start the change watcher for the dataset and plugin directories.
+
+        Args:
+            config (CacheConfig): The cache section of the configuration.
+
+        Returns:
+            ChangeWatcher | None: The running watcher, None if disabled or
+            unavailable.
+        """
+        if config.watch == "off":
+            return None
+
+        watcher = ChangeWatcher(mode=config.watch, interval=config.poll_interval)
+
+        # 1m datasets live in aggregate/1m, other timeframes in resample/<tf>
+        aggregate_dir, resample_dir = self.discovery.watch_dirs()
+        watcher.watch(aggregate_dir)
+        watcher.watch(resample_dir, subdirs=True)
+        watcher.subscribe(self._on_dataset_change)
+
+        # Plugin hot-reload
+        self.indicators.watch(watcher)
+
+        try:
+            return watcher.start()
+        except OSError as e:
+            print(f"Change watcher unavailable ({e}), checking files on every query")
+            return None
+
+    def _on_dataset_change(self, path, event):
+        """Keep the dataset registry in sync with the data directory.
+
+        Runs on the watcher thread. Modified files need no action here,
+        their views are refreshed on the next query.
+
+        Args:
+            path (str): Absolute path of the changed file.
+            event (str): CREATED, MODIFIED or DELETED.
+        """
+        dataset = self.discovery.dataset_for(path)
+        if dataset is None:
+            return
+
+        if event == CREATED:
+            self.registry.add(dataset)
+        elif event == DELETED and not os.path.exists(path):
+            self.registry.remove(dataset.symbol, dataset.timeframe)
+
+    def snapshot(self, symbol, tf) -> Optional[Mapping]:
+        """Return the current immutable snapshot of a view.
+
+        The lookup is a single dict read (atomic under the GIL). The returned
+        snapshot stays valid, including its memory map, for as long as the
+        caller holds it, even if a writer swaps in a newer one.
+
+        Args:
+            symbol (str): Trading symbol identifier.
+            tf (str): Timeframe identifier.
+
+        Returns:
+            Mapping | None: The snapshot, or None if the view is not registered.
+        """
+        return self.mmaps.get(f"{symbol}_{tf}")
 
     def discover_view(self, symbol, tf):
         """Discover and register a dataset view for a symbol and timeframe.
@@ -122,29 +233,43 @@ class MarketDataCache:
             symbol (str): Trading symbol identifier (e.g., "EURUSD").
             tf (str): Timeframe identifier (e.g., "5m", "1h").
 
+        Returns:
+            Mapping: The current snapshot of the view, to be passed to the
+            read methods so a query sees one consistent generation.
+
         Raises:
             Exception: If no dataset is found for the given symbol and timeframe.
         """
-        with self._lock:
-            # Look up the dataset matching the symbol and timeframe
-            dataset = self.registry.find(symbol, tf)
+        # Look up the dataset matching the symbol and timeframe
+        dataset = self.registry.find(symbol, tf)
+
+        # Fail fast if no dataset is available
+        if not dataset:
+            raise Exception(f"No dataset found for symbol {symbol}/{tf}")
+
+        # Register a view using the dataset's file path
+        snapshot = self._register_view(symbol, tf, dataset.path)
 
-            # Fail fast if no dataset is available
-            if not dataset:
-                raise Exception(f"No dataset found for symbol {symbol}/{tf}")
+        # Record the version read by the running request (response cache)
+        record("view", (symbol, tf), view_version(snapshot))
 
-            # Register a view using the dataset's file path
-            self._register_view(symbol, tf, dataset.path)
+        return snapshot
 
 
     def _register_view(self, symbol, tf, file_path):
         """Register or update a memory-mapped OHLCV view for a given symbol and timeframe.
 
         This method maps the binary OHLCV file into memory using `mmap` and
-        stores metadata and structured data in the internal `mmaps` cache.
-        If the file has not changed since the last registration (same size
-        and modification time), the view is left unchanged. Otherwise, the
-        existing memory-mapped view is replaced.
+        publishes an immutable snapshot (memory map, structured data, column
+        views, record count, generation) in the internal `mmaps` cache. If
+        the file has not changed since the last registration (same size and
+        modification time), the current snapshot is returned without taking
+        the lock. Otherwise a new snapshot is built under the writer lock and
+        swapped in; the old one is left untouched for readers still using it.
+
+        With the change watcher running, the snapshot is returned without
+        any system call when the watcher version of the file is the one the
+        snapshot was built at.
 
         Args:
             symbol (str): Trading symbol identifier (e.g., "EURUSD").
@@ -152,56 +277,106 @@ class MarketDataCache:
             file_path (str): Path to the OHLCV binary file to register.
 
         Returns:
-            None
+            Mapping: The current snapshot of the view.
         """
-        with self._lock:
-            # Construct a unique view name based on symbol and timeframe
-            view_name = f"{symbol}_{tf}"
-
-            # Get the file size and modification time
-            size = os.path.getsize(file_path)
-            mtime = os.stat(file_path).st_mtime
+        # Construct a unique view name based on symbol and timeframe
+        view_name = f"{symbol}_{tf}"
+
+        # Watched fast path: file unchanged since the snapshot was built
+        version = self.watcher.version(file_path) if self.watcher else None
+        cached = self.mmaps.get(view_name)
+        if cached and version is not None and cached.get('watch_version') == version:
+            return cached
+
+        # Get the file size, modification time and inode
+        size = os.path.getsize(file_path)
+        stat = os.stat(file_path)
+        mtime = stat.st_mtime
+        ino = getattr(stat, 'st_ino', None)
+
+        # Lock-free fast path: unchanged file, keep the current snapshot
+        cached = self.mmaps.get(view_name)
+        if cached and size == cached['size'] and mtime == cached['mtime']:
+            return self._restamp(view_name, cached, version)
 
-            # Estimate number of records assuming 64 bytes per record
-            num_records = size // 64
-
-            # Check if a cached view already exists
+        with self._lock:
+            # Another writer may have swapped in this generation meanwhile
             cached = self.mmaps.get(view_name)
-
-            # If the cached view exists and file has not changed, do nothing
             if cached and size == cached['size'] and mtime == cached['mtime']:
-                return
+                return self._restamp(view_name, cached, version)
+
+            # Reuse the file object if cached and still the same file (columnar
+            # files are atomically replaced when they grow), otherwise open it.
+            # Closing the old file object is safe, the old map keeps its own
+            # descriptor.
+            if cached and cached.get('ino') == ino:
+                f = cached['f']
+            else:
+                f = open(file_path, "rb")
+                if cached:
+                    cached['f'].close()
 
-            # Reuse the file object if cached, otherwise open the file
-            f = cached['f'] if cached else open(file_path, "rb")
-            
             # Memory-map the file for fast access
             new_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             new_mm.madvise(mmap.MADV_RANDOM)  # Optimize for random access
 
-            # Interpret the memory-mapped bytes as a structured NumPy array
-            data_view = np.frombuffer(new_mm, dtype=DTYPE)
-
-            # Clean up old cached view if present
-            if cached:
-                cached['data'] = None
-                cached['ts_index'] = None 
-                cached['mm'].close()
-
-            # Register the new memory-mapped view in the internal cache
-            self.mmaps[view_name] = {
-                'f': f, 
-                'mm': new_mm, 
-                'ts_index': data_view['ts'], 
+            if is_columnar(new_mm):
+                # Columnar layout: one contiguous view per field, no record array
+                num_records, columns = columnar_columns(new_mm)
+                data_view = None
+            else:
+                # Interpret the memory-mapped bytes as a structured NumPy array
+                data_view = np.frombuffer(new_mm, dtype=DTYPE)
+                # Strided per-field views on the records
+                columns = row_columns(data_view)
+                num_records = size // RECORD_SIZE
+
+            # Build the immutable snapshot and swap it in (atomic dict store)
+            snapshot = MappingProxyType({
+                'f': f,
+                'mm': new_mm,
+                'ts_index': columns['ts'],
                 'data': data_view,
-                'size': size, 
-                'mtime': mtime, 
+                'columns': MappingProxyType(columns),
+                'layout': 'row' if data_view is not None else 'columnar',
+                'size': size,
+                'mtime': mtime,
+                'ino': ino,
                 'num_records': num_records,
-                'file_path': file_path
-            }
+                'file_path': file_path,
+                'generation': next(self._generation),
+                # Read before the stat, a change during the build bumps it again
+                'watch_version': version
+            })
+            self.mmaps[view_name] = snapshot
+
+            return snapshot
+
+
+    def _restamp(self, view_name, cached, version):
+        """Record a new watcher version on an unchanged snapshot.
+
+        The watcher reports events that leave the data as is (e.g. a touch
+        or an attribute change). The snapshot is copied with the new version
+        so the next query takes the watched fast path again.
+
+        Args:
+            view_name (str): View key in the `mmaps` cache.
+            cached (Mapping): The current, still valid snapshot.
+            version (int | None): Current watcher version of the file.
+
+        Returns:
+            Mapping: The snapshot to use.
+        """
+        if version is None or cached.get('watch_version') == version:
+            return cached
+
+        snapshot = MappingProxyType({**cached, 'watch_version': version})
+        self.mmaps[view_name] = snapshot
+        return snapshot
 
 
-    def get_chunk(self, symbol, tf, from_idx, to_idx, return_polars=False):
+    def get_chunk(self, symbol, tf, from_idx, to_idx, return_polars=False, view=None):
         """
         Retrieve a slice of OHLCV data for a given symbol and timeframe.
 
@@ -215,93 +390,152 @@ class MarketDataCache:
             to_idx (int): Ending index (exclusive) of the data slice.
             return_polars (bool): If True, return a Polars DataFrame.
                 If False, return a Pandas DataFrame.
+            view (Mapping, optional): Snapshot to read from, defaults to the
+                current snapshot of the view.
 
         Returns:
             pl.DataFrame | pd.DataFrame:
                 A DataFrame containing OHLCV data plus metadata columns.
                 Returns an empty DataFrame if no cached data exists.
         """
-        with self._lock:
-            # Build the lookup key used to access the memory-mapped data
-            view_name = f"{symbol}_{tf}"
+        # Grab the snapshot once, no lock needed (immutable)
+        cached = view if view is not None else self.snapshot(symbol, tf)
 
-            # Try to fetch cached data for this symbol + timeframe
-            cached = self.mmaps.get(view_name)
+        # If nothing is cached, return an empty DataFrame of the requested type
+        if not cached:
+            return pl.DataFrame() if return_polars else pd.DataFrame()
 
-            # If nothing is cached, return an empty DataFrame of the requested type
-            if not cached:
-                return pl.DataFrame() if return_polars else pd.DataFrame()
+        # Slice the per-field views by index range (no copy)
+        subset = {name: column[from_idx:to_idx] for name, column in view_columns(cached).items()}
 
-            # Slice the underlying structured NumPy array by index range
-            subset = cached['data'][from_idx:to_idx]
+        # Column names corresponding to OHLCV values
+        columns = list(OHLCV)
 
-            # Extract OHLCV data (shape: N x 5)
-            data_points = subset['ohlcv']
+        # Fast path: construct a Polars DataFrame
+        if return_polars:
+            # Go through Arrow: contiguous (columnar) views are wrapped
+            # without copying, strided (row) views are copied once
+            table = pa.Table.from_arrays(
+                [pa.array(subset['ts'])] + [pa.array(subset[name]) for name in columns],
+                names=['time_ms'] + columns
+            )
+            plf = pl.from_arrow(table, rechunk=False)
 
-            # Column names corresponding to OHLCV values
-            columns = ['open', 'high', 'low', 'close', 'volume']
+            # Add metadata columns (symbol, timeframe)
+            plf = plf.with_columns([
+                pl.lit(symbol).alias("symbol"),
+                pl.lit(tf).alias("timeframe")
+            ])
 
-            # Fast path: construct a Polars DataFrame
-            if return_polars:
-                # Raw OHLCV NumPy array
-                ohlcv_raw = subset['ohlcv']
+            # Return Polars DataFrame (check later - unit test compliance)
+            return plf.select([
+                "symbol", "timeframe", "time_ms", 
+                "open", "high", "low", "close", "volume"
+            ])
 
-                # Ensure memory is contiguous for faster zero-copy conversion
-                ohlcv_contiguous = np.ascontiguousarray(ohlcv_raw)
+        # Slow path: construct a Pandas DataFrame
+        pdf = pd.DataFrame({name: subset[name] for name in columns})
 
-                # Create Polars DataFrame directly from NumPy array
-                plf = pl.from_numpy(
-                    ohlcv_contiguous,
-                    schema=['open', 'high', 'low', 'close', 'volume']
-                )
+        # Add metadata columns directly for minimal overhead
+        pdf['time_ms'] = subset['ts']
+        pdf['symbol'] = symbol
+        pdf['timeframe'] = tf
 
-                # Add metadata columns (timestamp, symbol, timeframe)
-                plf = plf.with_columns([
-                    pl.Series("time_ms", subset['ts'], dtype=pl.UInt64),
-                    pl.lit(symbol).alias("symbol"),
-                    pl.lit(tf).alias("timeframe")
-                ])
+        # Return Pandas DataFrame (check later - unit test compliance)
+        return pdf[['symbol', 'timeframe', 'time_ms', 'open', 'high', 'low', 'close', 'volume']]
 
-                # Return Polars DataFrame (check later - unit test compliance)
-                return plf.select([
-                    "symbol", "timeframe", "time_ms", 
-                    "open", "high", "low", "close", "volume"
-                ])
 
-            # Slow path: construct a Pandas DataFrame
-            pdf = pd.DataFrame(subset['ohlcv'], columns=columns)
+    def live_edge(self, symbol, tf) -> Mapping:
+        """Return the live-edge record of a view.
 
-            # Add metadata columns directly for minimal overhead
-            pdf['time_ms'] = subset['ts']
-            pdf['symbol'] = symbol
-            pdf['timeframe'] = tf
+        The record tells which candles of the view are still open. It is
+        derived from the view, the 1m view of the symbol and the heartbeat
+        (BTC-USD 1m) view, and rebuilt only when the generation of one of
+        them changed. Otherwise this is a dict lookup.
 
-            # Return Pandas DataFrame (check later - unit test compliance)
-            return pdf[['symbol', 'timeframe', 'time_ms', 'open', 'high', 'low', 'close', 'volume']]
+        Args:
+            symbol (str): Trading symbol identifier.
+            tf (str): Timeframe identifier.
 
+        Returns:
+            Mapping: Immutable record with the keys
+                - last_ms: time of the last candle (None if the view is empty)
+                - mark_ms: candles with time_ms >= mark_ms are open
+                - open: whether the last candle is open
+                - last_closed_ms: time of the last closed candle (or None)
+                - heartbeat_ms: time of the last heartbeat candle
+                - last_1m_ms: time of the last 1m candle of the symbol
+                - generation: generations of the views it was derived from
 
-    def get_record_count(self, symbol, tf):
+        Raises:
+            Exception: If one of the views is not available.
+        """
+        view = self.discover_view(symbol, tf)
+        view_1m = self.discover_view(symbol, "1m")
+        heartbeat = self.discover_view(HEARTBEAT_SYMBOL, "1m")
+
+        generation = (view['generation'], view_1m['generation'], heartbeat['generation'])
+
+        # Unchanged views, serve the current record
+        view_name = f"{symbol}_{tf}"
+        cached = self.edges.get(view_name)
+        if cached is not None and cached['generation'] == generation:
+            return cached
+
+        ts = view['ts_index']
+        last_ms = int(ts[-1]) if len(ts) else None
+        last_1m_ms = int(view_1m['ts_index'][-1]) if view_1m['num_records'] else None
+        heartbeat_ms = int(heartbeat['ts_index'][-1]) if heartbeat['num_records'] else None
+
+        # Empty views, nothing is open
+        mark_ms = None
+        if None not in (last_ms, last_1m_ms, heartbeat_ms):
+            mark_ms = open_mark_ms(symbol, tf, heartbeat_ms, last_1m_ms, last_ms)
+
+        is_open = mark_ms is not None and last_ms >= mark_ms
+
+        # The candle before an open last candle is closed (one open candle at most)
+        last_closed_ms = last_ms
+        if is_open:
+            last_closed_ms = int(ts[-2]) if len(ts) > 1 else None
+
+        edge = MappingProxyType({
+            'last_ms': last_ms,
+            'mark_ms': mark_ms,
+            'open': is_open,
+            'last_closed_ms': last_closed_ms,
+            'heartbeat_ms': heartbeat_ms,
+            'last_1m_ms': last_1m_ms,
+            'generation': generation
+        })
+        self.edges[view_name] = edge
+
+        return edge
+
+
+    def get_record_count(self, symbol, tf, view=None):
         """Return the number of timestamped records available in a cached view.
 
-        This method looks up the memory-mapped cache for the current view and
-        returns the total number of indexed timestamps available for lookup
-        and retrieval.
+        This method looks up the current snapshot of the view (or uses the
+        given one) and returns the total number of indexed timestamps
+        available for lookup and retrieval.
+
+        Args:
+            symbol (str): Trading symbol identifier.
+            tf (str): Timeframe identifier.
+            view (Mapping, optional): Snapshot to read from.
 
         Returns:
             int: Total number of records in the cache.
         """
-        with self._lock:
-            # Construct the cache view name from symbol and timeframe
-            view_name = f"{symbol}_{tf}"
-            
-            # Retrieve the cached view from the memory-mapped storage
-            cached = self.mmaps.get(view_name)
+        # Grab the snapshot once, no lock needed (immutable)
+        cached = view if view is not None else self.snapshot(symbol, tf)
 
-            # Return the number of timestamp entries in the index
-            return len(cached['ts_index'])
+        # Return the number of timestamp entries in the index
+        return len(cached['ts_index'])
 
 
-    def find_record(self, symbol, tf, target_ts, side="right"):
+    def find_record(self, symbol, tf, target_ts, side="right", view=None):
         """Find the index of a record closest to a target timestamp.
 
         This method performs a binary search over the cached timestamp index
@@ -316,37 +550,33 @@ class MarketDataCache:
             side (str, optional): Search direction passed to ``np.searchsorted``.
                 Use "right" to return the insertion point after existing entries,
                 or "left" to return the insertion point before. Defaults to "right".
+            view (Mapping, optional): Snapshot to search, defaults to the
+                current snapshot of the view.
 
         Returns:
             int | None: Index position of the matching or insertion record if
             found, otherwise ``None``.
         """
-        with self._lock:
-            # Construct the cache view name from symbol and timeframe
-            view_name = f"{symbol}_{tf}"
-
-            # Retrieve the cached data for this view
-            cached = self.mmaps.get(view_name)
+        # Grab the snapshot once, no lock needed (immutable)
+        cached = view if view is not None else self.snapshot(symbol, tf)
 
-            # Cast to numpy uint64 to avoid re-entry to GIL on each search
-            search_key = np.uint64(target_ts)
+        # Cast to numpy uint64 to avoid re-entry to GIL on each search
+        search_key = np.uint64(target_ts)
 
-            # Perform a binary search on the sorted timestamp index
-            idx = np.searchsorted(cached['ts_index'], search_key, side=side)
+        # Perform a binary search on the sorted timestamp index
+        idx = np.searchsorted(cached['ts_index'], search_key, side=side)
 
-            # Ensure the index is valid before returning
-            if idx >= 0:
-                return idx
-
-            return None
-
-    def to_arrow_table(self, symbol, tf, from_idx, to_idx):
-        with self._lock:
-            view = self.mmaps[f"{symbol}_{tf}"]['data'][from_idx:to_idx]
-            ts_arr = pa.array(view['ts'])
-            ohlcv_raw = view['ohlcv']
-            arrays = [ts_arr] + [pa.array(ohlcv_raw[:, i]) for i in range(5)]
-            names = ['ts', 'open', 'high', 'low', 'close', 'volume']
-            return pa.Table.from_arrays(arrays, names=names)
+        # Ensure the index is valid before returning
+        if idx >= 0:
+            return idx
 
+        return None
 
+    def to_arrow_table(self, symbol, tf, from_idx, to_idx, view=None):
+        # Grab the snapshot once, no lock needed (immutable)
+        cached = view if view is not None else self.snapshot(symbol, tf)
+        # Zero-copy for columnar views, one copy per field for row views
+        columns = view_columns(cached)
+        names = ['ts', 'open', 'high', 'low', 'close', 'volume']
+        arrays = [pa.array(columns[name][from_idx:to_idx]) for name in names]
+        return pa.Table.from_arrays(arrays, names=names)
@@ -36,10 +36,30 @@ class BuilderConfig:
     num_processes: Optional[int] = None
     paths: BuilderPaths = field(default_factory=BuilderPaths)
 
+@dataclass
+class IndicatorEngineConfig:
+    """Execution settings for non-Polars indicators in the IndicatorEngine."""
+    # Default backend: thread, process or inline (plugins may override via meta)
+    executor: str = "thread"
+    # Worker count for the thread/process pools (None = number of cores)
+    max_workers: Optional[int] = None
+
+@dataclass
+class CacheConfig:
+    """Change detection for the dataset views and indicator plugins."""
+    # Backend: auto (inotify, else poll), inotify, poll or off (stat on every query)
+    watch: str = "auto"
+    # Polling interval in seconds (inotify: interval for picking up new directories)
+    poll_interval: float = 1.0
+    # Memory budget of the incremental indicator store in bytes (least recently used are evicted)
+    indicator_store_max_bytes: int = 268435456
+
 @dataclass
 class AppConfig:
     """The root configuration for the entire application."""
     builder: BuilderConfig = field(default_factory=BuilderConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    indicators: IndicatorEngineConfig = field(default_factory=IndicatorEngineConfig)
     ml: Dict[str, Any] = None
 
 
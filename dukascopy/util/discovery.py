@@ -5,11 +5,12 @@
  File:        discovery.py
  Author:      JP Ueberbach
  Created:     2026-01-12
+ Updated:     2026-10-16
  Description: Provides functionality to discover and manage datasets
               for the Dukascopy data pipeline.
 
               The `DataDiscovery` class scans configured directories for
-              dataset files in either binary or CSV format. It supports:
+              dataset files in binary, columnar or CSV format. It supports:
                 - Aggregate and resampled directory structures
                 - Automatic file extension selection based on configuration
                 - Construction of Dataset objects with symbol, timeframe,
@@ -29,16 +30,22 @@
 ===============================================================================
 """
 import os
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Optional
 
 from util.dataclass import Dataset
 
+# File extension per file mode (anything else is CSV)
+EXTENSIONS = {
+    "binary": ".bin",
+    "columnar": ".col",
+}
+
 class DataDiscovery:
     def __init__(self, config):
         """Initializes the builder with configuration and sets up datasets.
 
         This constructor stores the provided configuration, determines the file
-        extension based on the mode (binary or CSV), and initializes an empty
+        extension based on the mode (binary, columnar or CSV), and initializes an empty
         list to hold dataset objects.
 
         Args:
@@ -49,7 +56,7 @@ class DataDiscovery:
         self.config = config
 
         # Determine file extension based on configuration mode
-        self.extension = ".bin" if config.fmode == "binary" else ".csv"
+        self.extension = EXTENSIONS.get(config.fmode, ".csv")
 
         # Initialize an empty list to hold Dataset instances
         self._datasets: List[Dataset] = []
@@ -112,3 +119,40 @@ class DataDiscovery:
         # Sort datasets by symbol and timeframe and store internally
         self._datasets = sorted(list(found), key=lambda d: (d.symbol, d.timeframe))
         return self._datasets
+
+    def watch_dirs(self) -> List[str]:
+        """Returns the directories holding datasets (absolute).
+
+        The aggregate directory holds the 1m datasets, the resample
+        directory holds one subdirectory per timeframe.
+
+        Returns:
+            List[str]: [aggregate/1m, resample]
+        """
+        data_dir = os.path.abspath(str(self.config.paths.data))
+        return [os.path.join(data_dir, "aggregate", "1m"), os.path.join(data_dir, "resample")]
+
+    def dataset_for(self, path: str) -> Optional[Dataset]:
+        """Maps a dataset file path to its Dataset.
+
+        Args:
+            path (str): Absolute path of a file in one of the watch_dirs.
+
+        Returns:
+            Optional[Dataset]: The dataset, or None if the path is not a
+                dataset file (wrong extension, temporary file, other dir).
+        """
+        if not path.endswith(self.extension):
+            return None
+
+        directory, name = os.path.split(path)
+        aggregate_dir, resample_dir = self.watch_dirs()
+
+        if directory == aggregate_dir:
+            tf = "1m"
+        elif os.path.dirname(directory) == resample_dir:
+            tf = os.path.basename(directory)
+        else:
+            return None
+
+        return Dataset(symbol=name[:-len(self.extension)], timeframe=tf, path=path)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        edge.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Description: Live-edge rules: which candle of a view is still open.
+
+              A candle is open when it is still being formed by live data.
+              The BTC-USD 1m market trades 24/7 and serves as the global
+              clock ("heartbeat"). The boundary is derived from the last
+              BTC-USD 1m candle, the last candle of the view, and the last
+              1m candle of the symbol (monthly/yearly candles):
+
+                - 1m: candles are always closed
+                - 1M / 1Y: candles at or after the start of the current
+                  month / year are open
+                - intraday: when the asset lags the heartbeat by less than
+                  one candle, its last candle is open; otherwise candles
+                  within one candle length of the heartbeat are open
+
+              Timestamps are compared in UTC, the timezone shifts applied by
+              the transform stage are taken out first.
+
+              These rules were part of the is-open indicator. They now back
+              `MarketDataCache.live_edge`, which evaluates them once per
+              generation of the views involved and serves is-open, drift,
+              the skiplast modifier and the alert engine.
+
+ Requirements:
+     - Python 3.8+
+
+ License:
+     MIT License
+===============================================================================
+"""
+from datetime import datetime
+
+# Symbol whose 1m candles serve as the global clock
+HEARTBEAT_SYMBOL = "BTC-USD"
+
+# Duration (in ms) of each supported timeframe
+TF_LENGTHS = {
+    "2m": 120000,
+    "3m": 180000,
+    "5m": 300000,
+    "10m": 600000,
+    "15m": 900000,
+    "30m": 1800000,
+    "1h": 3600000,
+    "2h": 7200000,
+    "3h": 10800000,
+    "4h": 14400000,
+    "6h": 21600000,
+    "8h": 28800000,
+    "12h": 43200000,
+    "1d": 86400000,
+    "1W": 604800000,
+}
+
+
+def utc_drift_ms(symbol: str, heartbeat_ms: int, last_ms: int) -> int:
+    """
+    Return how far a symbol lags the heartbeat, in UTC milliseconds.
+
+    Args:
+        symbol: The symbol of `last_ms`.
+        heartbeat_ms: Time of the last heartbeat candle.
+        last_ms: Time of the last candle of the symbol.
+    """
+    # Loads the timezone configuration on first use
+    from util.plugins.indicators.helpers.marketstate_backend import _marketstate_backend_shift_for_symbol
+
+    # Shift applied to BTC (Config: America/New_York) and to the asset
+    btc_shift = _marketstate_backend_shift_for_symbol(HEARTBEAT_SYMBOL, heartbeat_ms)
+    asset_shift = _marketstate_backend_shift_for_symbol(symbol, last_ms)
+
+    # Normalize to UTC
+    return (heartbeat_ms - btc_shift) - (last_ms - asset_shift)
+
+
+def open_mark_ms(symbol: str, tf: str, heartbeat_ms: int, last_1m_ms: int, last_ms: int) -> int:
+    """
+    Return the time from which candles of a view are open.
+
+    Args:
+        symbol: The symbol of the view.
+        tf: The timeframe of the view.
+        heartbeat_ms: Time of the last heartbeat (BTC-USD 1m) candle.
+        last_1m_ms: Time of the last 1m candle of the symbol.
+        last_ms: Time of the last candle of the view.
+
+    Returns:
+        int: Candles with time_ms >= the returned value are open.
+    """
+    if tf == "1m":
+        # 1m candles are always closed in this system. Not derived from the
+        # heartbeat: its time is in the BTC-USD shift, last_ms in the
+        # asset's own shift
+        return last_ms + 1
+
+    if tf in ("1M", "1Y"):
+        # Start of the current month / year of the last candle
+        dt = datetime.fromtimestamp(last_1m_ms / 1000)
+        if tf == "1M":
+            dt = dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        else:
+            dt = dt.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return int(dt.timestamp() * 1000)
+
+    tf_length = TF_LENGTHS.get(tf, 0)
+    drift_ms = utc_drift_ms(symbol, heartbeat_ms, last_ms)
+
+    # Candles that may span a bigger period than the tf indicates (eg
+    # SGD-IDX:1151 merge logic), only applicable to timeframes < 1D: just
+    # mark the last candle as open
+    if drift_ms < tf_length and tf_length < 86400000:
+        return last_ms
+
+    # Regular path, the boundary of the current candle
+    return heartbeat_ms - tf_length
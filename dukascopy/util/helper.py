@@ -2,6 +2,24 @@ from util.discovery import *
 from pathlib import Path
 from util.config import load_app_config
 
+def load_default_config():
+    """Load the application configuration used by the util layer.
+
+    The user-specific `config.user.yaml` takes precedence over the default
+    `config.yaml` when it exists.
+
+    Returns:
+        AppConfig: The loaded application configuration.
+    """
+    # Determine which configuration file to load: user-specific or default
+    config_file_user = resolve_path('config.user.yaml')
+    config_file_regular = resolve_path('config.yaml')
+
+    config_file = config_file_user if Path(config_file_user).exists() else config_file_regular
+
+    # Load the application configuration from the YAML file
+    return load_app_config(config_file)
+
 def discover_all(options: Dict = {}):
     """Discovers all datasets based on the application configuration.
 
@@ -16,23 +34,24 @@ def discover_all(options: Dict = {}):
     Returns:
         List[Dataset]: A list of Dataset instances found in the filesystem.
     """
-    # Determine which configuration file to load: user-specific or default
-    config_file_user = resolve_path('config.user.yaml')
-    config_file_regular = resolve_path('config.yaml')
-
-    config_file = config_file_user if Path(config_file_user).exists() else config_file_regular
+    # Scan the filesystem and return the discovered datasets
+    return data_discovery().scan()
 
-    # Load the application configuration from the YAML file
-    config = load_app_config(config_file)
+def data_discovery(config=None) -> DataDiscovery:
+    """Returns a DataDiscovery for the configured data directory.
 
-    # Resolve config.builder.paths.data
-    config.builder.paths.data = resolve_path(config.builder.paths.data)
+    Loads the configuration (user-specific or default) when none is given
+    and resolves config.builder.paths.data.
 
-    # Initialize the DataDiscovery instance with the builder configuration
-    discovery = DataDiscovery(config.builder)
+    Args:
+        config (AppConfig, optional): Already loaded configuration.
 
-    # Scan the filesystem and return the discovered datasets
-    return discovery.scan()
+    Returns:
+        DataDiscovery: Discovery instance (not scanned yet).
+    """
+    config = config or load_default_config()
+    config.builder.paths.data = resolve_path(config.builder.paths.data)
+    return DataDiscovery(config.builder)
 
 def resolve_path(path_str):
     if Path(path_str).exists():
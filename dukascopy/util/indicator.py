@@ -5,7 +5,7 @@
 File:        indicator.py
 Author:      JP Ueberbach
 Created:     2026-01-23
-Updated:     2026-01-23
+Updated:     2026-10-16
 
 Indicator plugin management for the Dukascopy data pipeline.
 
@@ -18,9 +18,11 @@ Key responsibilities:
     - Discover indicator plugins from core and user directories.
     - Dynamically import and reload plugin modules from file paths.
     - Track file metadata to detect changes and support hot-reloading.
+      With a change watcher attached, unchanged plugins are not stat'ed.
     - Expose indicator calculation functions for downstream use.
     - Build a normalized, metadata-rich registry of all loaded indicators.
-    - Determine the maximum warmup row requirement across multiple indicators.
+    - Determine the warmup row requirement of each indicator, and the maximum
+      across multiple indicators.
 
 Indicator plugin interface:
     - Must define a `calculate` function for computing indicator values.
@@ -29,6 +31,8 @@ Indicator plugin interface:
         - `warmup_count(options: dict) -> int`: Return required warmup rows.
         - `description() -> str`: Provide a human-readable description.
         - `meta() -> dict`: Return optional metadata dictionary.
+        - `calculate_incremental(state, new_rows, options) -> (state, df)`:
+          Streaming update that carries accumulators between calls.
 
 Requirements:
     - Python 3.8+
@@ -43,9 +47,14 @@ import os
 import sys
 import importlib.util
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 from util.helper import resolve_path
 
+def plugin_version(entry: Dict) -> tuple:
+    """Return the version of a registered plugin: (file path, size, mtime)."""
+    return (entry['path'], entry['size'], entry['mtime'])
+
+
 class IndicatorRegistry:
     """
     Manages the lifecycle of indicator plugins, including discovery, 
@@ -74,10 +83,46 @@ class IndicatorRegistry:
         
         # Internal registry to store loaded plugin functions and file stats
         self.registry = {}
+
+        # Optional change watcher (see watch)
+        self.watcher = None
         
         # Initial load of all available plugins
         self.load_all_plugins()
 
+    def watch(self, watcher):
+        """Use a change watcher for hot-reload checks.
+
+        The plugin directories are added to the watcher. `refresh` then
+        skips the file checks of plugins whose files did not change.
+
+        Args:
+            watcher (ChangeWatcher): The watcher (started or not).
+        """
+        self._core_abs = os.path.abspath(str(self.core_dir))
+        self._user_abs = os.path.abspath(str(self.user_dir))
+        watcher.watch(self._core_abs)
+        watcher.watch(self._user_abs)
+        self.watcher = watcher
+
+    def _watch_version(self, name):
+        """Return the watcher versions of a plugin's user and core file.
+
+        Args:
+            name (str): Plugin name.
+
+        Returns:
+            tuple | None: (user version, core version), None if there is no
+            watcher or the files are not covered by it.
+        """
+        if self.watcher is None:
+            return None
+        user = self.watcher.version(os.path.join(self._user_abs, f"{name}.py"))
+        core = self.watcher.version(os.path.join(self._core_abs, f"{name}.py"))
+        if user is None or core is None:
+            return None
+        return (user, core)
+
     def _import_plugin(self, name, path):
         """Dynamically import a Python module from a filesystem path.
 
@@ -162,6 +207,9 @@ class IndicatorRegistry:
         Returns:
             None
         """
+        # Read the watcher version first, a change while loading bumps it again
+        version = self._watch_version(name)
+
         # Get file metadata for potential hot-reload checks
         file_stat = path.resolve().stat()
 
@@ -174,12 +222,15 @@ class IndicatorRegistry:
 
                 'calculate': getattr(module, "calculate", None),                # Reference to plugin function
                 'calculate_polars': getattr(module, "calculate_polars", None),  # Reference to plugin polars function
+                'calculate_incremental': getattr(module, "calculate_incremental", None),  # Optional streaming hook
                 'meta': getattr(module, "meta", lambda: {}),                    # Reference to meta function
                 'warmup_count': getattr(module, "warmup_count", None),          # Reference to warmup_count function
                 'description': getattr(module, "description", lambda: "N/A"),   # Reference to description function
                 'position_args': getattr(module, "position_args", None),        # Reference to position_args function
+                'path': str(path.resolve()),                                    # Source file (process-pool workers reload it)
                 'mtime': file_stat.st_mtime,                                    # Last modification timestamp
-                'size': file_stat.st_size                                       # File size for change detection
+                'size': file_stat.st_size,                                      # File size for change detection
+                'watch_version': version                                        # Watcher version at load time
             }
             #print(f"Registered plugin {path} succesfully.")
         else:
@@ -212,6 +263,11 @@ class IndicatorRegistry:
         unique_required = {item.split('_')[0] for item in indicators}
 
         for name in unique_required:
+            # Watched plugin files unchanged since loading, nothing to check
+            version = self._watch_version(name)
+            if version is not None and self.registry.get(name, {}).get('watch_version') == version:
+                continue
+
             # Prefer user plugin directory for overrides
             file_path = self.user_dir / f"{name}.py"
             if not file_path.exists():
@@ -235,6 +291,9 @@ class IndicatorRegistry:
             # Register or reload plugin if required
             if needs_reload:
                 self._register_plugin(name, file_path)
+            else:
+                # Unchanged content (e.g. touched), skip the checks next time
+                cached['watch_version'] = version
 
         return self.registry
 
@@ -294,33 +353,29 @@ class IndicatorRegistry:
         return {k: metadata_map[k] for k in sorted(metadata_map)}
 
 
-    def get_maximum_warmup_rows(self, indicators: List[str]) -> int:
-        """Determine the maximum warmup row count required by a set of indicators.
+    def get_warmup_rows(self, indicators: List[str]) -> Dict[str, Optional[int]]:
+        """Determine the warmup row count required by each indicator.
 
         This function inspects each requested indicator plugin to determine how many
         historical rows are required before the `after_str` timestamp in order to
-        correctly compute indicator values (e.g., rolling windows). The maximum
-        warmup requirement across all indicators is returned.
+        correctly compute its values (e.g., rolling windows).
 
         Args:
-            symbol (str): Trading symbol (e.g., "EURUSD"). Included for interface
-                consistency and future extensibility.
-            timeframe (str): Timeframe identifier (e.g., "5m", "1h"). Included for
-                interface consistency and future extensibility.
-            after_str (str): ISO-formatted timestamp string representing the starting
-                point of the query. Not modified by this function.
             indicators (List[str]): List of indicator strings (e.g., ["sma_20", "bbands_20_2"]).
 
         Returns:
-            int: The maximum number of warmup rows required across all indicators.
+            Dict[str, Optional[int]]: Warmup rows keyed by indicator string.
+            Unregistered indicators require 0 rows. Plugins without a
+            `warmup_count` report None (unknown), they may depend on every
+            row they are given.
         """
-        # Track the largest warmup requirement found
-        max_rows = 0
+        warmups = {}
 
         # Iterate through all requested indicators
         for ind_str in indicators:
             parts = ind_str.split('_')
             name = parts[0]
+            warmups[ind_str] = 0
 
             # Skip indicators that are not registered
             if name not in self.registry:
@@ -335,7 +390,21 @@ class IndicatorRegistry:
 
             # Query the plugin for its warmup row requirement, if defined
             if self.registry[name].get('warmup_count'):
-                warmup_rows = self.registry[name].get('warmup_count')(ind_opts)
-                max_rows = max(max_rows, warmup_rows)
+                warmups[ind_str] = int(self.registry[name].get('warmup_count')(ind_opts))
+            else:
+                warmups[ind_str] = None
 
-        return max_rows
\ No newline at end of file
+        return warmups
+
+
+    def get_maximum_warmup_rows(self, indicators: List[str]) -> int:
+        """Determine the maximum warmup row count required by a set of indicators.
+
+        Args:
+            indicators (List[str]): List of indicator strings (e.g., ["sma_20", "bbands_20_2"]).
+
+        Returns:
+            int: The maximum number of warmup rows required across all indicators.
+        """
+        warmups = self.get_warmup_rows(indicators).values()
+        return max((rows for rows in warmups if rows is not None), default=0)
\ No newline at end of file
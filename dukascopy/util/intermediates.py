@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        intermediates.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Description: Shared intermediate expressions for Polars-native indicators.
+
+              The IndicatorEngine injects the expressions of all Polars
+              indicators into one `with_columns`. Many of them compute the
+              same building blocks: the true range for ATR, Keltner and
+              ADX, the close diff for RSI and momentum, the same EMA or
+              rolling mean for several bands. Each copy used to be
+              evaluated on its own.
+
+              The functions of this module return those building blocks.
+              Called from `calculate_polars` while the engine collects
+              expressions, they return a reference to a named column
+              instead, and the engine materializes every distinct
+              intermediate once per computation (in stages, intermediates
+              may depend on each other), evaluates the indicators against
+              them and drops them again.
+
+              Outside the engine (tests, direct calls) the functions return
+              the plain expression, plugins behave the same either way.
+
+ Usage:
+     from util.intermediates import true_range, wilder
+
+     def calculate_polars(indicator_str, options):
+         period = int(options.get('period', 14))
+         return wilder(period, true_range()).alias(indicator_str)
+
+ Requirements:
+     - Python 3.8+
+     - Polars
+
+ License:
+     MIT License
+===============================================================================
+"""
+import contextvars
+from typing import Callable, Dict, List, Tuple, Union
+
+import polars as pl
+
+# Column prefix of materialized intermediates
+PREFIX = "__shared__"
+
+# Scope of the computation collecting expressions, None outside the engine
+_SCOPE: contextvars.ContextVar = contextvars.ContextVar("shared_intermediates", default=None)
+
+
+class SharedIntermediates:
+    """
+    Collects the intermediates requested by the indicators of one computation.
+    """
+
+    def __init__(self):
+        # Column name -> (stage, expression)
+        self._exprs: Dict[str, Tuple[int, pl.Expr]] = {}
+        # Statistics (tests, profiling)
+        self.requests = 0
+
+    def __enter__(self) -> "SharedIntermediates":
+        self._token = _SCOPE.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _SCOPE.reset(self._token)
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the intermediate columns."""
+        return list(self._exprs)
+
+    def stages(self) -> List[List[pl.Expr]]:
+        """
+        Return the intermediates grouped by evaluation stage.
+
+        Intermediates of one stage only depend on input columns and earlier
+        stages, each stage is one `with_columns`.
+        """
+        if not self._exprs:
+            return []
+        depth = max(stage for stage, _ in self._exprs.values())
+        return [
+            [expr.alias(name) for name, (stage, expr) in self._exprs.items() if stage == level]
+            for level in range(1, depth + 1)
+        ]
+
+    def stage_of(self, name: str) -> int:
+        """Return the stage of an intermediate, 0 for input columns."""
+        entry = self._exprs.get(name)
+        return entry[0] if entry else 0
+
+    def register(self, name: str, stage: int, expr: pl.Expr) -> pl.Expr:
+        """Register an intermediate (first registration wins), return its reference."""
+        self.requests += 1
+        if name not in self._exprs:
+            self._exprs[name] = (stage, expr)
+        return pl.col(name)
+
+
+Source = Union[str, pl.Expr]
+
+
+def _resolve(source: Source) -> Tuple[str, pl.Expr, int]:
+    """
+    Resolve a source into (key, expression, stage).
+
+    Sources are input column names, or expressions returned by this module.
+    """
+    scope = _SCOPE.get()
+
+    if isinstance(source, str):
+        return source, pl.col(source), 0
+
+    if scope is None:
+        # Outside the engine, the expression is used as is
+        return "", source, 0
+
+    name = source.meta.output_name()
+    if not name.startswith(PREFIX):
+        raise ValueError(f"source must be a column name or a shared intermediate, got {source}")
+    return name[len(PREFIX):], source, scope.stage_of(name)
+
+
+def _shared(key: str, build: Callable[..., pl.Expr], *sources: Source) -> pl.Expr:
+    """
+    Return the intermediate `key` computed by `build(*sources)`.
+
+    Within an engine scope a reference to the shared column is returned,
+    otherwise the expression itself.
+    """
+    resolved = [_resolve(source) for source in sources]
+    expr = build(*(expr for _, expr, _ in resolved))
+
+    scope = _SCOPE.get()
+    if scope is None:
+        return expr
+
+    name = PREFIX + "_".join([key] + [k for k, _, _ in resolved])
+    stage = 1 + max((stage for _, _, stage in resolved), default=0)
+    return scope.register(name, stage, expr)
+
+
+def true_range() -> pl.Expr:
+    """True range: max(high - low, |high - prev close|, |low - prev close|)."""
+    def build(high, low, close):
+        prev_close = close.shift(1)
+        return pl.max_horizontal([
+            high - low,
+            (high - prev_close).abs(),
+            (low - prev_close).abs()
+        ])
+    return _shared("tr", build, "high", "low", "close")
+
+
+def typical_price() -> pl.Expr:
+    """Typical price: (high + low + close) / 3."""
+    return _shared("tp", lambda high, low, close: (high + low + close) / 3.0, "high", "low", "close")
+
+
+def diff(n: int = 1, source: Source = "close") -> pl.Expr:
+    """Difference with the value n rows back."""
+    return _shared(f"diff{n}", lambda s: s.diff(n), source)
+
+
+def ema(span: int, source: Source = "close") -> pl.Expr:
+    """Exponential moving average, ewm_mean(span, adjust=False)."""
+    return _shared(f"ema{span}", lambda s: s.ewm_mean(span=span, adjust=False), source)
+
+
+def wilder(period: int, source: Source = "close") -> pl.Expr:
+    """Wilder's smoothing, alpha = 1 / period (ewm_mean(span=2 * period - 1, adjust=False))."""
+    return _shared(f"wilder{period}", lambda s: s.ewm_mean(span=2 * period - 1, adjust=False), source)
+
+
+def rolling_mean(window: int, source: Source = "close") -> pl.Expr:
+    """Rolling mean over `window` rows."""
+    return _shared(f"mean{window}", lambda s: s.rolling_mean(window_size=window), source)
+
+
+def rolling_std(window: int, source: Source = "close", ddof: int = 0) -> pl.Expr:
+    """Rolling standard deviation over `window` rows."""
+    return _shared(f"std{window}d{ddof}", lambda s: s.rolling_std(window_size=window, ddof=ddof), source)
+
+
+def rolling_sum(window: int, source: Source = "close") -> pl.Expr:
+    """Rolling sum over `window` rows."""
+    return _shared(f"sum{window}", lambda s: s.rolling_sum(window_size=window), source)
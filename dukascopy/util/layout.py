@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        layout.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Updated:     2026-10-16
+
+ Description:
+     On-disk OHLCV layouts understood by the util layer.
+
+     Two layouts are supported:
+         - row:      fixed 64-byte records (ts, 5x float64, 16 bytes padding)
+         - columnar: 64-byte header followed by one contiguous segment per
+                     field (see etl/io/resample/columnar.py for the writer)
+
+     Both layouts are exposed to the cache and the indicator store as a
+     mapping of column name to 1-D NumPy view. Columnar views are contiguous
+     and can be handed to Arrow/Polars without copying, row views are
+     strided.
+
+ Requirements:
+     - Python 3.8+
+     - NumPy
+
+ License:
+     MIT License
+===============================================================================
+"""
+import numpy as np
+from typing import Dict, Tuple
+
+# Field order shared by both layouts
+COLUMNS = ('ts', 'open', 'high', 'low', 'close', 'volume')
+OHLCV = COLUMNS[1:]
+
+# Columnar file header (mirrors etl.io.resample.columnar.HEADER)
+COLUMNAR_MAGIC = b'DUKASCOL'
+COLUMNAR_HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('ncols', '<u4'),
+    ('capacity', '<u8'),
+    ('count', '<u8'),
+    ('padding', '<u8', (4,))
+])
+COLUMNAR_HEADER_SIZE = 64
+
+
+def is_columnar(buffer) -> bool:
+    """Return True if the buffer starts with the columnar file magic.
+
+    Args:
+        buffer: Buffer (e.g. mmap) holding the file contents.
+
+    Returns:
+        bool: True for columnar files.
+    """
+    return len(buffer) >= COLUMNAR_HEADER_SIZE and buffer[:8] == COLUMNAR_MAGIC
+
+
+def columnar_columns(buffer) -> Tuple[int, Dict[str, np.ndarray]]:
+    """Map a columnar file buffer to zero-copy column views.
+
+    Args:
+        buffer: Buffer (e.g. mmap) holding the complete columnar file.
+
+    Returns:
+        Tuple[int, Dict[str, np.ndarray]]: Record count and column views.
+
+    Raises:
+        ValueError: If the header does not match the buffer.
+    """
+    header = np.frombuffer(buffer, dtype=COLUMNAR_HEADER, count=1)[0]
+    capacity = int(header['capacity'])
+    count = int(header['count'])
+
+    # A header pointing beyond the mapped buffer means a torn write
+    if count > capacity or COLUMNAR_HEADER_SIZE + len(COLUMNS) * capacity * 8 > len(buffer):
+        raise ValueError("Columnar file truncated")
+
+    columns = {
+        name: np.frombuffer(
+            buffer,
+            dtype='<u8' if name == 'ts' else '<f8',
+            count=count,
+            offset=COLUMNAR_HEADER_SIZE + i * capacity * 8
+        )
+        for i, name in enumerate(COLUMNS)
+    }
+    return count, columns
+
+
+def row_columns(data: np.ndarray) -> Dict[str, np.ndarray]:
+    """Expose a 64-byte record array as (strided) column views.
+
+    Args:
+        data (np.ndarray): Structured array with 'ts' and 'ohlcv' fields.
+
+    Returns:
+        Dict[str, np.ndarray]: Column views, no data is copied.
+    """
+    columns = {'ts': data['ts']}
+    for i, name in enumerate(OHLCV):
+        columns[name] = data['ohlcv'][:, i]
+    return columns
+
+
+def view_columns(view: Dict) -> Dict[str, np.ndarray]:
+    """Return the column views of a registered cache view.
+
+    Views registered by MarketDataCache carry a 'columns' mapping. Views
+    that only carry a structured 'data' array are mapped on the fly.
+
+    Args:
+        view (Dict): Cache entry from MarketDataCache.mmaps.
+
+    Returns:
+        Dict[str, np.ndarray]: Column views.
+    """
+    columns = view.get('columns')
+    if columns is None:
+        columns = row_columns(view['data'])
+    return columns
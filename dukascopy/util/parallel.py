@@ -5,7 +5,7 @@
  File:        parallel.py
  Author:      JP Ueberbach
  Created:     2026-01-12
- Updated:     2026-02-10
+ Updated:     2026-10-16
 
  Description:
       Hybrid parallel execution engine for technical indicator computation.
@@ -20,7 +20,9 @@
         - Polars-native indicators are injected directly into a single lazy
           Polars execution graph and evaluated exactly once.
         - Legacy or complex Pandas-based indicators are executed eagerly in
-          parallel using a thread pool and merged back into the final result.
+          parallel using a thread pool (or a shared process pool fed via
+          shared memory, see `indicators.executor`) and merged back into the
+          final result.
 
       Both execution paths operate concurrently without blocking each other.
 
@@ -32,6 +34,11 @@
       - Preserve strict row alignment across all indicator outputs
       - Safely handle warmup periods, missing values, and partial results
       - Support both flat outputs and nested per-row indicator structures
+      - Advance streaming indicators by appended rows (calculate_incremental)
+      - Evaluate intermediates shared by Polars indicators (true range, EMA,
+        rolling means, see util.intermediates) once per computation
+      - Compute indicators on their own warmup window, grouped by warmup
+        requirement (windowed_indicators)
 
  Design goals:
       - Enable rapid prototyping with Pandas-based indicators
@@ -59,11 +66,19 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import atexit
+import threading
+import contextvars
+import importlib.util
 import concurrent.futures
+import multiprocessing
 import polars.selectors as cs
+import pyarrow as pa
 import logging
 import warnings
-from typing import List, Dict, Any, Optional, Union
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 # Polars is required for the high-performance execution path.
 # Fail early with a clear message if it is missing.
@@ -72,9 +87,89 @@ try:
 except ImportError:
     raise ImportError("Polars is required. Run 'pip install polars'")
 
+from util.intermediates import SharedIntermediates
+
 # Configure a module-level logger for robust error reporting
 logger = logging.getLogger(__name__)
 
+# Supported execution backends for non-Polars indicators
+EXECUTORS = ("thread", "process", "inline")
+
+# Engine configuration, loaded once per process
+_ENGINE_CONFIG = None
+
+# Process pool shared by all engines (spawning workers is expensive)
+_PROCESS_POOL = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+# Worker-side plugin modules, keyed by path -> (mtime, module)
+_WORKER_PLUGINS = {}
+
+# Warmup grouping: an indicator joins a group if it needs at least
+# 1/WARMUP_GROUP_RATIO of the group's warmup, or less than
+# WARMUP_GROUP_MIN_ROWS rows fewer (not worth a separate pass)
+WARMUP_GROUP_RATIO = 2
+WARMUP_GROUP_MIN_ROWS = 256
+
+
+def get_engine_config():
+    """Return the indicator engine configuration (`indicators` section).
+
+    Falls back to defaults (thread backend) if the configuration cannot be
+    loaded, so indicator computation never fails on configuration issues.
+
+    Returns:
+        IndicatorEngineConfig: The engine configuration.
+    """
+    global _ENGINE_CONFIG
+
+    if _ENGINE_CONFIG is None:
+        # Imported lazily, the config layer is not needed by worker processes
+        from util.config import IndicatorEngineConfig
+        try:
+            from util.helper import load_default_config
+            _ENGINE_CONFIG = load_default_config().indicators
+        except Exception as e:
+            logger.warning(f"Indicator engine config unavailable, using defaults: {str(e)}")
+            _ENGINE_CONFIG = IndicatorEngineConfig()
+
+    return _ENGINE_CONFIG
+
+
+def _get_process_pool(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use.
+
+    Workers are spawned (not forked): the parent runs Polars and a thread
+    pool, and forking a multi-threaded process can deadlock.
+
+    Args:
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The shared pool.
+    """
+    global _PROCESS_POOL
+
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_shutdown_process_pool)
+
+        return _PROCESS_POOL
+
+
+def _shutdown_process_pool():
+    """Shut down the shared process pool (registered with atexit)."""
+    global _PROCESS_POOL
+
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is not None:
+            _PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+            _PROCESS_POOL = None
+
 
 class IndicatorWorker:
     """
@@ -165,25 +260,248 @@ class IndicatorWorker:
             return None
 
 
+    @staticmethod
+    def execute_incremental_task(
+        state: Optional[Dict],
+        new_rows: pl.DataFrame,
+        p_func: Any,
+        full_name: str,
+        p_opts: Dict
+    ) -> Tuple[Optional[Dict], Optional[pl.DataFrame]]:
+        """Execute a streaming plugin step and normalize its output.
+
+        The plugin receives the state returned by its previous step (or None
+        to start from scratch) and only the newly appended rows. It returns
+        the new state together with one output row per input row. States are
+        treated as immutable by the engine, so a state can be stepped more
+        than once (e.g. for a still-open bar).
+
+        Args:
+            state: State returned by the previous step, or None.
+            new_rows: Polars DataFrame with the rows to process, in order.
+            p_func: The plugin `calculate_incremental` function.
+            full_name: Fully-qualified indicator name used for output columns.
+            p_opts: Dictionary of options forwarded to the plugin function.
+
+        Returns:
+            A tuple of (new state, normalized Polars DataFrame), or
+            (None, None) if the plugin fails or returns misaligned output.
+        """
+        try:
+            # Run one streaming step
+            new_state, res_df = p_func(state, new_rows, p_opts)
+
+            # Accept pandas output for convenience, normalize to Polars
+            if not isinstance(res_df, pl.DataFrame):
+                res_df = pl.from_pandas(res_df)
+
+            # Streaming output must be strictly row-aligned with the input
+            if res_df.height != new_rows.height:
+                logger.error(f"Incremental step of '{full_name}' returned misaligned output")
+                return None, None
+
+            # Same naming rules as the batch path
+            if len(res_df.columns) > 1:
+                res_df = res_df.rename({c: f"{full_name}__{c}" for c in res_df.columns})
+            else:
+                res_df = res_df.rename({res_df.columns[0]: full_name})
+
+            return new_state, res_df
+
+        except Exception as e:
+            # ROBUSTNESS: Caller falls back to the batch path
+            logger.error(f"Failed incremental step for indicator '{full_name}': {str(e)}")
+            return None, None
+
+class SharedFrame:
+    """
+    Fixed-layout copy of an input frame in shared memory.
+
+    Numeric columns are packed back-to-back into one shared memory block,
+    single-valued columns (symbol, timeframe) travel as constants. Process
+    workers attach by name instead of receiving a pickled DataFrame.
+    """
+
+    def __init__(self, df: pl.DataFrame):
+        """Pack a Polars DataFrame into a new shared memory block.
+
+        Args:
+            df: Input frame.
+
+        Raises:
+            ValueError: If a column cannot be represented (non-constant
+                strings or numeric columns containing nulls).
+        """
+        arrays = []
+        constants = {}
+
+        for name, dtype in df.schema.items():
+            series = df.get_column(name)
+
+            # Numeric, null-free columns go into the shared block
+            if dtype.is_numeric() and series.null_count() == 0:
+                arrays.append((name, np.ascontiguousarray(series.to_numpy())))
+
+            # Metadata columns with a single value travel as constants
+            elif series.n_unique() == 1:
+                constants[name] = series[0]
+
+            else:
+                raise ValueError(f"Column '{name}' cannot be shared")
+
+        # Compute the layout (name, dtype, offset, length)
+        layout = []
+        offset = 0
+        for name, arr in arrays:
+            layout.append((name, arr.dtype.str, offset, len(arr)))
+            offset += arr.nbytes
+
+        # Allocate and fill the block (size 0 is not allowed)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+        for (name, arr), (_, _, start, _) in zip(arrays, layout):
+            self.shm.buf[start:start + arr.nbytes] = arr.view(np.uint8)
+
+        # Everything a worker needs to rebuild the frame
+        self.descriptor = {
+            'name': self.shm.name,
+            'layout': layout,
+            'constants': constants,
+            'columns': df.columns,
+            'height': df.height
+        }
+
+    def close(self):
+        """Release and unlink the shared memory block."""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def _load_worker_plugin(path: str, mtime: float):
+    """Load (or reuse) a plugin module inside a worker process.
+
+    Plugin functions are loaded from file paths under synthetic module names,
+    so they cannot be pickled by reference. Workers import them by path and
+    keep them until the file changes.
+
+    Args:
+        path: Plugin source file.
+        mtime: Modification time known to the parent registry.
+
+    Returns:
+        module: The loaded plugin module.
+    """
+    cached = _WORKER_PLUGINS.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    # Same loading strategy as IndicatorRegistry._import_plugin
+    name = f"worker_plugin_{os.path.splitext(os.path.basename(path))[0]}"
+    if name in sys.modules:
+        del sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    _WORKER_PLUGINS[path] = (mtime, module)
+    return module
+
+
+def _execute_process_task(
+    descriptor: Dict,
+    plugin_path: str,
+    plugin_mtime: float,
+    full_name: str,
+    p_opts: Dict,
+    polars_input: bool
+) -> Optional[bytes]:
+    """Process-pool entry point for a single non-Polars indicator.
+
+    Rebuilds the input frame from shared memory, runs the plugin through
+    `IndicatorWorker.execute_pandas_task` and returns the normalized result
+    as an Arrow IPC stream.
+
+    Args:
+        descriptor: `SharedFrame.descriptor` of the input frame.
+        plugin_path: Plugin source file.
+        plugin_mtime: Plugin modification time (worker cache key).
+        full_name: Fully-qualified indicator name.
+        p_opts: Resolved indicator options.
+        polars_input: Pass a Polars frame instead of pandas.
+
+    Returns:
+        Arrow IPC stream bytes, or None if the plugin produced no output.
+    """
+    # Attach to the parent's block and copy the columns out. Copies keep
+    # the block closable regardless of references the plugin holds on to.
+    shm = shared_memory.SharedMemory(name=descriptor['name'])
+    try:
+        data = {}
+        for name, dtype, offset, length in descriptor['layout']:
+            data[name] = np.ndarray(length, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset).copy()
+    finally:
+        shm.close()
+
+    # Constants are broadcast to full columns
+    height = descriptor['height']
+    for name, value in descriptor['constants'].items():
+        data[name] = [value] * height
+
+    # Restore the original column order
+    frame = {name: data[name] for name in descriptor['columns']}
+    df_input = pl.DataFrame(frame) if polars_input else pd.DataFrame(frame)
+
+    # Run the plugin with the regular normalization and error handling
+    module = _load_worker_plugin(plugin_path, plugin_mtime)
+    res_df = IndicatorWorker.execute_pandas_task(df_input, module.calculate, full_name, p_opts)
+    if res_df is None:
+        return None
+
+    # Ship the result back as Arrow buffers
+    if isinstance(res_df, pl.DataFrame):
+        table = res_df.to_arrow()
+    else:
+        table = pa.Table.from_pandas(res_df, preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
 class IndicatorEngine:
     """
     Core execution engine for technical indicators.
 
     This class orchestrates hybrid execution:
       - Polars indicators are executed lazily in one optimized graph
-      - Pandas indicators are executed concurrently in worker threads
+      - Pandas indicators are executed concurrently in worker threads,
+        in a shared process pool, or inline (per configuration and the
+        plugin's `executor` meta hint)
     """
 
-    def __init__(self, max_workers: int = None):
+    def __init__(self, max_workers: int = None, executor: str = None):
         """
         Initialize the indicator engine.
 
         Args:
-            max_workers (int, optional): Maximum number of worker threads
-                for Pandas indicators. Defaults to CPU core count.
+            max_workers (int, optional): Maximum number of workers
+                for Pandas indicators. Defaults to the configured value,
+                or the CPU core count.
+            executor (str, optional): Default backend for non-Polars
+                indicators ("thread", "process" or "inline"). Defaults to
+                the `indicators.executor` configuration value.
         """
-        # Default to CPU core count if no explicit limit is provided.
-        self.max_workers = max_workers or os.cpu_count()
+        config = get_engine_config()
+
+        # Default to configuration, then CPU core count.
+        self.max_workers = max_workers or config.max_workers or os.cpu_count()
+
+        # Default backend for plugins without an explicit routing hint
+        self.executor_mode = executor or config.executor
 
         # ThreadPoolExecutor is created lazily so we pay the cost
         # only if Pandas indicators are actually used.
@@ -210,6 +528,7 @@ class IndicatorEngine:
         plugins: Dict[str, Any],
         disable_recursive_mapping: bool = False,
         return_polars: bool = False,
+        precomputed: Optional[pl.DataFrame] = None,
     ) -> Union[pd.DataFrame, pl.DataFrame]:
         """Compute indicators using an optimized Pandas/Polars execution strategy.
 
@@ -229,6 +548,9 @@ class IndicatorEngine:
             disable_recursive_mapping: If True, disables nested result mapping
                 and returns a flat output structure.
             return_polars: If True, return a Polars DataFrame instead of pandas.
+            precomputed: Optional Polars DataFrame with indicator columns that
+                were already computed elsewhere (e.g. the indicator store).
+                Must be row-aligned with `df`.
 
         Returns:
             A DataFrame (pandas or Polars) containing the computed indicators.
@@ -267,9 +589,16 @@ class IndicatorEngine:
         # Futures for threaded (pandas-style) indicator execution
         pandas_tasks = []
 
+        # Shared memory copy of the input, created on first process task
+        shared_frame = None
+        shared_unavailable = False
+
         # Polars expressions to be injected into the lazy graph
         polars_expressions = []
 
+        # Intermediates shared by the Polars expressions (util.intermediates)
+        shared = SharedIntermediates()
+
         # Process each requested indicator
         for ind_str in indicators:
             # Extract the base indicator name (before any suffixes)
@@ -295,8 +624,10 @@ class IndicatorEngine:
                     logger.warning(f"{ind_str} lacks calculate_polars function, skipping.")
                     continue
 
-                # Generate one or more Polars expressions
-                expr = calc_func_pl(ind_str, ind_opts)
+                # Generate one or more Polars expressions, shared
+                # intermediates are collected instead of inlined
+                with shared:
+                    expr = calc_func_pl(ind_str, ind_opts)
 
                 # Normalize to a list and collect
                 if isinstance(expr, list):
@@ -304,7 +635,7 @@ class IndicatorEngine:
                 else:
                     polars_expressions.append(expr)
 
-            # SLOW PATH: Threaded execution using pandas or Polars DataFrame
+            # SLOW PATH: Threaded, process-pool or inline execution
             else:
                 # Legacy or complex calculation function
                 calc_func_df = plugin_entry.get('calculate')
@@ -312,11 +643,40 @@ class IndicatorEngine:
                     logger.warning(f"{ind_str} lacks calculate function, skipping.")
                     continue
 
-                # Lazily create a thread pool executor
-                if not self.executor:
-                    self.executor = concurrent.futures.ThreadPoolExecutor(
-                        max_workers=self.max_workers
-                    )
+                # Resolve the backend, the plugin's routing hint wins
+                route = plugin_meta.get('executor', self.executor_mode)
+
+                # PROCESS: ship the frame once via shared memory, results as Arrow
+                if route == "process" and plugin_entry.get('path'):
+                    # Pack the input frame on first use
+                    if shared_frame is None and not shared_unavailable:
+                        try:
+                            shared_frame = SharedFrame(df_polars_source)
+                        except ValueError as e:
+                            logger.warning(f"Process backend unavailable for this frame: {str(e)}")
+                            shared_unavailable = True
+
+                    if shared_frame is not None:
+                        try:
+                            pandas_tasks.append(
+                                _get_process_pool(self.max_workers).submit(
+                                    _execute_process_task,
+                                    shared_frame.descriptor,
+                                    plugin_entry.get('path'),
+                                    plugin_entry.get('mtime'),
+                                    ind_str,
+                                    ind_opts,
+                                    bool(plugin_meta.get('polars_input', False))
+                                )
+                            )
+                            continue
+                        except (concurrent.futures.process.BrokenProcessPool, RuntimeError) as e:
+                            # Dead pool, drop it (recreated on next use) and use threads
+                            logger.error(f"Process pool unavailable, falling back to threads: {str(e)}")
+                            _shutdown_process_pool()
+
+                    # Frame cannot be shared, fall back to threads
+                    route = "thread"
 
                 # Decide which DataFrame view to pass into the worker
                 if plugin_meta.get('polars_input', False):
@@ -335,9 +695,26 @@ class IndicatorEngine:
                         df_for_pandas = df_polars_source.to_pandas()
                     task_input = df_for_pandas
 
-                # Submit the task for parallel execution
+                # INLINE: run in the calling thread (cheap or non-thread-safe plugins)
+                if route == "inline":
+                    future = concurrent.futures.Future()
+                    future.set_result(
+                        IndicatorWorker.execute_pandas_task(task_input, calc_func_df, ind_str, ind_opts)
+                    )
+                    pandas_tasks.append(future)
+                    continue
+
+                # Lazily create a thread pool executor
+                if not self.executor:
+                    self.executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers
+                    )
+
+                # Submit the task for parallel execution, in the request
+                # context (nested get_data calls share the QueryPlanner)
                 pandas_tasks.append(
                     self.executor.submit(
+                        contextvars.copy_context().run,
                         IndicatorWorker.execute_pandas_task,
                         df_slice=task_input,
                         p_func=calc_func_df,
@@ -346,18 +723,75 @@ class IndicatorEngine:
                     )
                 )
 
-        # Inject all Polars expressions into the lazy graph at once
-        if polars_expressions:
-            main_pl = main_pl.with_columns(polars_expressions)
+        try:
+            # Materialize each distinct intermediate once, stage by stage
+            for stage in shared.stages():
+                main_pl = main_pl.with_columns(stage)
+
+            # Inject all Polars expressions into the lazy graph at once
+            if polars_expressions:
+                main_pl = main_pl.with_columns(polars_expressions)
 
-        # Execute the entire Polars graph in a single materialization step
-        collected_pl = main_pl.collect()
+            # Intermediates are not part of the output
+            if shared.columns:
+                main_pl = main_pl.drop(shared.columns)
 
-        # Assemble final output (flat or nested mapping)
-        if disable_recursive_mapping:
-            return self._assemble_flat(df, collected_pl, pandas_tasks, return_polars)
-        else:
-            return self._assemble_nested(df, collected_pl, pandas_tasks, return_polars)
+            # Execute the entire Polars graph in a single materialization step
+            collected_pl = main_pl.collect()
+
+            # Attach precomputed indicator columns (already row-aligned)
+            if precomputed is not None and not precomputed.is_empty():
+                collected_pl = pl.concat([collected_pl, precomputed], how="horizontal")
+
+            # Assemble final output (flat or nested mapping)
+            if disable_recursive_mapping:
+                return self._assemble_flat(df, collected_pl, pandas_tasks, return_polars)
+            else:
+                return self._assemble_nested(df, collected_pl, pandas_tasks, return_polars)
+        finally:
+            # Assembly waited for all process tasks, release the shared block
+            if shared_frame is not None:
+                shared_frame.close()
+
+    def compute_incremental(
+        self,
+        state: Optional[Dict],
+        new_rows: pl.DataFrame,
+        ind_str: str,
+        plugin_entry: Dict
+    ) -> Tuple[Optional[Dict], Optional[pl.DataFrame]]:
+        """Advance a streaming indicator by the given rows.
+
+        This is the O(new rows) counterpart of `compute` for plugins that
+        implement `calculate_incremental`. The caller owns the state and
+        passes it back on the next call; plugins without the hook return
+        (None, None) so the caller can fall back to the batch path.
+
+        Args:
+            state: State returned by the previous call, or None to start.
+            new_rows: Polars DataFrame with the appended OHLCV rows.
+            ind_str: Indicator string (e.g. "rsi_14").
+            plugin_entry: Plugin registry entry.
+
+        Returns:
+            A tuple of (new state, indicator columns), or (None, None).
+        """
+        # Batch-only plugin, caller falls back
+        calc_func_inc = plugin_entry.get('calculate_incremental')
+        if not calc_func_inc:
+            return None, None
+
+        # Nothing to advance, state is unchanged
+        if new_rows.is_empty():
+            return state, None
+
+        return IndicatorWorker.execute_incremental_task(
+            state,
+            new_rows,
+            calc_func_inc,
+            ind_str,
+            self._resolve_options(ind_str, plugin_entry)
+        )
 
     def _resolve_options(self, ind_str: str, plugin_entry: Dict) -> Dict:
         """
@@ -432,9 +866,12 @@ class IndicatorEngine:
                     continue
 
                 # If the result is already Polars, keep it as-is
+                # Process workers return Arrow IPC bytes
                 # Otherwise, convert the pandas DataFrame to Polars
                 if isinstance(res_df, pl.DataFrame):
                     p_res = res_df
+                elif isinstance(res_df, bytes):
+                    p_res = pl.from_arrow(pa.ipc.open_stream(res_df).read_all())
                 else:
                     p_res = pl.from_pandas(res_df)
 
@@ -573,10 +1010,30 @@ class IndicatorEngine:
             # Then merge with the main Polars frame
             main_pl = pl.concat([main_pl, indicator_pl], how="horizontal")
 
+        result_pl = self._nest(main_pl, df_orig.columns)
+
+        if return_polars:
+            return result_pl
+
+        return result_pl.to_pandas(use_threads=True)
+
+    @staticmethod
+    def _nest(main_pl: pl.DataFrame, base_columns: List[str]) -> pl.DataFrame:
+        """
+        Pack the indicator columns of a flat frame into an ``indicators``
+        struct column (see _assemble_nested).
+
+        Args:
+            main_pl (pl.DataFrame): Market data and indicator columns.
+            base_columns (List[str]): The market data columns.
+
+        Returns:
+            pl.DataFrame: The market data columns plus ``indicators``.
+        """
         # Identify indicator columns.
         indicator_cols = [
             c for c in main_pl.columns
-            if c not in df_orig.columns
+            if c not in base_columns
         ]
 
         groups = {}
@@ -605,14 +1062,9 @@ class IndicatorEngine:
             )
 
         # Pack everything into a single "indicators" column.
-        result_pl = main_pl.with_columns(
+        return main_pl.with_columns(
             pl.struct(struct_exprs).alias("indicators")
-        ).select([*df_orig.columns, "indicators"])
-
-        if return_polars:
-            return result_pl
-
-        return result_pl.to_pandas(use_threads=True)
+        ).select([*base_columns, "indicators"])
 
 
 def parallel_indicators(
@@ -620,7 +1072,8 @@ def parallel_indicators(
     indicators,
     plugins,
     disable_recursive_mapping: bool = False,
-    return_polars: bool = False
+    return_polars: bool = False,
+    precomputed: Optional[pl.DataFrame] = None
 ):
     """
     Backward-compatible wrapper around IndicatorEngine.
@@ -631,6 +1084,8 @@ def parallel_indicators(
         plugins (Dict[str, Any]): Loaded plugins.
         disable_recursive_mapping (bool): Return flat output if True.
         return_polars (bool): Return Polars DataFrame if True.
+        precomputed (pl.DataFrame, optional): Row-aligned indicator columns
+            computed elsewhere, merged into the result.
 
     Returns:
         Union[pd.DataFrame, pl.DataFrame]: Indicator results.
@@ -642,5 +1097,145 @@ def parallel_indicators(
             indicators,
             plugins,
             disable_recursive_mapping,
-            return_polars
-        )
\ No newline at end of file
+            return_polars,
+            precomputed
+        )
+
+
+def group_by_warmup(
+    indicators: List[str],
+    warmups: Dict[str, int],
+    available: int
+) -> List[Tuple[int, List[str]]]:
+    """
+    Group indicators with similar warmup requirements.
+
+    Every group is computed on its own slice of the input: the last
+    `available - offset` warmup rows plus the output window, where the
+    offset leaves out the warmup rows none of its members needs.
+
+    Args:
+        indicators (List[str]): Indicator identifiers, in request order.
+        warmups (Dict[str, Optional[int]]): Warmup rows per indicator, None
+            if unknown (computed over all available rows).
+        available (int): Warmup rows present at the top of the input.
+
+    Returns:
+        List[Tuple[int, List[str]]]: (row offset, indicators) per group,
+        largest warmup first. A single group has offset 0.
+    """
+    # Clamp to what was retrieved (start of the dataset), an unknown warmup
+    # needs all of it (e.g. cumulative indicators like obv)
+    needed = {
+        ind: available if warmups.get(ind) is None else min(warmups[ind], available)
+        for ind in indicators
+    }
+
+    groups = []
+    for ind in sorted(indicators, key=lambda i: -needed[i]):
+        if groups:
+            group_warmup, members = groups[-1]
+            if (needed[ind] * WARMUP_GROUP_RATIO >= group_warmup
+                    or group_warmup - needed[ind] < WARMUP_GROUP_MIN_ROWS):
+                members.append(ind)
+                continue
+        groups.append((needed[ind], [ind]))
+
+    if len(groups) <= 1:
+        return [(0, list(indicators))]
+
+    # Keep request order within each group
+    order = {ind: i for i, ind in enumerate(indicators)}
+    return [
+        (available - group_warmup, sorted(members, key=order.get))
+        for group_warmup, members in groups
+    ]
+
+
+def windowed_indicators(
+    df,
+    groups: List[Tuple[int, List[str]]],
+    plugins,
+    disable_recursive_mapping: bool = False,
+    return_polars: bool = False,
+    precomputed: Optional[pl.DataFrame] = None
+):
+    """
+    Compute indicators, each group on its own minimal warmup slice.
+
+    `df` holds `available` warmup rows followed by the output window, sized
+    for the indicator with the largest warmup. Instead of computing every
+    indicator over all of it, indicators are grouped by warmup
+    (group_by_warmup) and each group runs on a zero-copy slice that starts
+    where its own warmup starts. Group outputs are null-padded at the top
+    so every column stays row-aligned with `df`; the padded rows lie in
+    the warmup region the caller drops.
+
+    Falls back to parallel_indicators when all indicators share a group.
+
+    Args:
+        df (pd.DataFrame or pl.DataFrame): Input market data.
+        groups (List[Tuple[int, List[str]]]): Output of group_by_warmup.
+        plugins (Dict[str, Any]): Loaded plugins.
+        disable_recursive_mapping (bool): Return flat output if True.
+        return_polars (bool): Return Polars DataFrame if True.
+        precomputed (pl.DataFrame, optional): Row-aligned indicator columns
+            computed elsewhere, merged into the result.
+
+    Returns:
+        Union[pd.DataFrame, pl.DataFrame]: Indicator results.
+    """
+    # Imported lazily, the planner is not needed by worker processes
+    from util.planner import submit
+
+    is_polars_input = isinstance(df, pl.DataFrame)
+    height = df.height if is_polars_input else len(df)
+
+    if len(groups) == 1 or height == 0:
+        indicators = [ind for _, members in groups for ind in members]
+        return parallel_indicators(
+            df, indicators, plugins, disable_recursive_mapping, return_polars, precomputed
+        )
+
+    def compute_group(offset: int, members: List[str]) -> pl.DataFrame:
+        # Zero-copy slice starting at the group's own warmup (at least one
+        # row, the output columns are needed even for short inputs)
+        offset = min(offset, height - 1)
+        part = df.slice(offset) if is_polars_input else df.iloc[offset:]
+        with IndicatorEngine() as engine:
+            result = engine.compute(part, members, plugins, True, True)
+
+        # Indicator columns only, padded back to the height of df
+        result = result.select([c for c in result.columns if c not in base_columns])
+        if offset:
+            pad = pl.select([
+                pl.repeat(None, offset, dtype=dtype).alias(name)
+                for name, dtype in result.schema.items()
+            ])
+            result = pl.concat([pad, result])
+        return result
+
+    base = df if is_polars_input else pl.from_pandas(df, rechunk=False)
+    base_columns = base.columns
+
+    # Groups run concurrently on the request executor
+    futures = [submit(compute_group, offset, members) for offset, members in groups]
+    frames = [base] + [future.result() for future in futures]
+
+    if precomputed is not None and not precomputed.is_empty():
+        frames.append(precomputed)
+
+    combined_pl = pl.concat(frames, how="horizontal").rechunk()
+
+    if not disable_recursive_mapping:
+        combined_pl = IndicatorEngine._nest(combined_pl, base_columns)
+        return combined_pl if return_polars else combined_pl.to_pandas(use_threads=True)
+
+    if return_polars:
+        return combined_pl
+
+    # Same conversion as IndicatorEngine._assemble_flat
+    return combined_pl.to_pandas(
+        use_threads=True,
+        types_mapper=pd.ArrowDtype if hasattr(pd, 'ArrowDtype') else None
+    )
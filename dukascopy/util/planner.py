@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        planner.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Description: Request-scoped query planner for nested get_data calls.
+
+              Indicators like is-open, drift and pearson call `get_data`
+              themselves. Within one request the same nested query (e.g.
+              the BTC-USD heartbeat, or the DXY series) used to be fetched
+              and computed once per indicator, per select, each time on a
+              fresh thread pool.
+
+              A `QueryPlanner` is opened by the outermost `get_data` call
+              (or by the HTTP route, for all selects of a request) and is
+              visible to everything running inside that request through a
+              context variable:
+
+                - nested get_data calls are memoized on their normalized
+                  arguments; the first caller computes, concurrent and later
+                  callers wait for and reuse the result
+                - `submit` runs fan-out work (e.g. the three heartbeat
+                  fetches of is-open) on one executor shared by the request
+                - the views and plugins read by the request are recorded
+                  with their version (`reads`), the HTTP response cache
+                  revalidates cached responses against them
+
+              Across requests, identical queries running at the same time
+              (many clients polling on the minute boundary, a chart page
+              loading all its panels) are coalesced by a process-wide
+              `SingleFlight`: one caller computes, the others wait for and
+              share its result. `AsyncSingleFlight` does the same for
+              coroutines on the event loop (the HTTP route). Only queries in
+              flight are shared, nothing is kept once they complete.
+
+              Context variables are not inherited by threads started with a
+              plain ThreadPoolExecutor. Work submitted through `submit`, and
+              indicators run by the IndicatorEngine, keep the request
+              context. Plugins fanning out on their own executor still work,
+              but their nested calls are not deduplicated.
+
+ Usage:
+     with QueryPlanner():
+         df = get_data(...)
+
+     future = submit(fetch, "4h")
+
+     df = IN_FLIGHT.run(key, compute)
+
+ Requirements:
+     - Python 3.8+
+
+ License:
+     MIT License
+===============================================================================
+"""
+import os
+import asyncio
+import threading
+import contextvars
+import concurrent.futures
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+# The planner of the request being executed, None outside a request
+_CURRENT: contextvars.ContextVar = contextvars.ContextVar("query_planner", default=None)
+
+# Reads recorded by the computations running in this context, innermost
+# last: (kind, name) -> version dicts
+_RECORDERS: contextvars.ContextVar = contextvars.ContextVar("query_reads", default=())
+
+# Set while running on the planner's executor (nested fan-out runs inline,
+# queued work can then never wait on work queued behind it)
+_IN_WORKER: contextvars.ContextVar = contextvars.ContextVar("query_planner_worker", default=False)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert option values (dicts, lists) into a hashable form."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class QueryPlanner:
+    """
+    Memoizes queries and shares an executor within one request.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize an empty planner.
+
+        Args:
+            max_workers: Size of the shared executor, created on first use.
+                Defaults to the ThreadPoolExecutor default.
+        """
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        # Normalized query -> Future holding its result
+        self._results: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._tokens = []
+        # Views and plugins read by the request: (kind, name) -> version
+        self.reads: Dict[Tuple[str, Hashable], Tuple] = {}
+        # Statistics (tests, profiling)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def current() -> Optional["QueryPlanner"]:
+        """Return the planner of the running request, None if there is none."""
+        return _CURRENT.get()
+
+    def __enter__(self) -> "QueryPlanner":
+        self._tokens.append((
+            _CURRENT.set(self),
+            _RECORDERS.set(_RECORDERS.get() + (self.reads,))
+        ))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        current, recorders = self._tokens.pop()
+        _RECORDERS.reset(recorders)
+        _CURRENT.reset(current)
+        if not self._tokens:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """Shut down the shared executor and drop the memoized results."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._results.clear()
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Return the result of `fn` for `key`, computing it at most once.
+
+        The first caller computes the result in its own thread. Callers
+        asking for the same key meanwhile wait for it. Exceptions are
+        memoized as well. DataFrames are returned as copies, callers may
+        modify them. The reads of the computation are recorded for every
+        caller.
+
+        Args:
+            key: Normalized query (hashable).
+            fn: Computes the result.
+        """
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._results[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                future.set_result(_recorded(fn))
+            except BaseException as e:
+                future.set_exception(e)
+
+        result, reads = future.result()
+        _replay(reads)
+        return self._copy(result)
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        """Return a copy of a shared DataFrame result."""
+        if isinstance(result, pd.DataFrame):
+            return result.copy()
+        if hasattr(result, "clone"):
+            # Polars, metadata only copy
+            return result.clone()
+        return result
+
+    def submit(self, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Run `fn` on the shared executor, within the request context.
+
+        Work submitted from a task already running on the executor is run
+        inline, the calling task would otherwise hold a worker while waiting
+        for a queued one.
+
+        Returns:
+            concurrent.futures.Future: The future of the call.
+        """
+        if _IN_WORKER.get():
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="query-planner"
+                )
+
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self._worker, fn, args, kwargs)
+
+    @staticmethod
+    def _worker(fn: Callable, args: tuple, kwargs: dict) -> Any:
+        """Run a submitted call, flagged as executor work."""
+        _IN_WORKER.set(True)
+        return fn(*args, **kwargs)
+
+    @staticmethod
+    def key(*args, options: Dict = None) -> Hashable:
+        """
+        Build a memoization key from query arguments and options.
+
+        Args:
+            *args: Positional query arguments (lists are allowed).
+            options: Options affecting the result.
+        """
+        return _freeze(args) + (_freeze(options or {}),)
+
+
+class SingleFlight:
+    """
+    Coalesces identical computations running concurrently in the process.
+    """
+
+    def __init__(self):
+        # Key -> Future of the computation in flight
+        self._flights: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        # Statistics (tests, profiling)
+        self.hits = 0
+        self.misses = 0
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Return the result of `fn` for `key`, joining a computation in flight.
+
+        The first caller computes in its own thread, callers arriving before
+        it completes wait for its result (or exception). The key is released
+        on completion, later callers compute again. DataFrames are returned
+        as copies.
+
+        Args:
+            key: Normalized query (hashable).
+            fn: Computes the result.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._flights[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                future.set_result(_recorded(fn))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._flights[key]
+
+        result, reads = future.result()
+        _replay(reads)
+        return QueryPlanner._copy(result)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical coroutines running concurrently on the event loop.
+    """
+
+    def __init__(self):
+        # Key -> Task of the computation in flight
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        # Statistics (tests, profiling)
+        self.hits = 0
+        self.misses = 0
+
+    async def run(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Await the result of the coroutine `fn()` for `key`, joining one in flight.
+
+        The computation runs as a task of its own: a caller being cancelled
+        (client disconnect) does not cancel it for the others. The result
+        is shared as is, callers must not modify it.
+
+        Args:
+            key: Normalized query (hashable).
+            fn: Coroutine function computing the result.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a completed task (unless replaced already)."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+
+# Identical get_data computations in flight in this process
+IN_FLIGHT = SingleFlight()
+
+
+def record(kind: str, name: Hashable, version: Tuple) -> None:
+    """
+    Record a view or plugin read by the running request.
+
+    The read is recorded in the request's planner and in every memoized
+    computation running (their callers replay it). The first version read
+    is kept, a file changing while the request runs then never matches
+    again (see api/v1_1/response_cache.py).
+
+    Args:
+        kind: "view" or "plugin".
+        name: (symbol, timeframe) for views, the plugin name for plugins.
+        version: (file path, size, mtime) at the time of the read.
+    """
+    # setdefault is atomic under the GIL
+    for reads in _RECORDERS.get():
+        reads.setdefault((kind, name), version)
+
+
+def _recorded(fn: Callable[[], Any]) -> Tuple[Any, Dict]:
+    """Run `fn`, return its result and the reads recorded meanwhile."""
+    reads = {}
+    token = _RECORDERS.set(_RECORDERS.get() + (reads,))
+    try:
+        return fn(), reads
+    finally:
+        _RECORDERS.reset(token)
+
+
+def _replay(reads: Dict) -> None:
+    """Record the reads of a shared computation for the current caller."""
+    for (kind, name), version in reads.items():
+        record(kind, name, version)
+
+
+def submit(fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+    """
+    Run `fn` on the executor of the current request.
+
+    Intended for indicator plugins fanning out nested get_data calls. Outside
+    a request the call runs inline.
+
+    Returns:
+        concurrent.futures.Future: The future of the call.
+    """
+    planner = QueryPlanner.current()
+    if planner is None:
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+    return planner.submit(fn, *args, **kwargs)
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import polars as pl
 from typing import List, Dict, Any
+from util.intermediates import true_range, wilder
 
 def description() -> str:
     """
@@ -20,11 +21,12 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "panel": 1,
         "verified": 1,
         "talib-validated": 1, 
-        "polars": 1  # Trigger high-speed Polars execution path
+        "polars": 1,   # Trigger high-speed Polars execution path
+        "cacheable": 1 # Safe for the incremental indicator store
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -56,15 +58,43 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> pl.Expr:
     except (ValueError, TypeError):
         period = 14
 
-    prev_close = pl.col("close").shift(1)
+    # Wilder's smoothing of the true range, both shared with other indicators
+    return wilder(period, true_range()).alias(indicator_str)
 
-    tr1 = pl.col("high") - pl.col("low")
-    tr2 = (pl.col("high") - prev_close).abs()
-    tr3 = (pl.col("low") - prev_close).abs()
+def calculate_incremental(state: Dict[str, Any], new_rows: pl.DataFrame, options: Dict[str, Any]):
+    """
+    Streaming ATR (Wilder's Smoothing), O(1) per new row.
+    State carries the previous close and the last ATR value.
+    """
+    try:
+        period = int(options.get('period', 14))
+    except (ValueError, TypeError):
+        period = 14
+
+    # ewm_mean(span=2p-1, adjust=False) equals alpha = 1/period
+    alpha = 1.0 / period
+
+    highs = new_rows["high"].to_numpy()
+    lows = new_rows["low"].to_numpy()
+    closes = new_rows["close"].to_numpy()
+    out = np.empty(len(closes), dtype=np.float64)
+
+    if state is None:
+        prev_close, atr = None, None
+    else:
+        prev_close, atr = state["prev_close"], state["atr"]
+
+    for i in range(len(closes)):
+        # True range, the first row only has high - low
+        tr = highs[i] - lows[i]
+        if prev_close is not None:
+            tr = max(tr, abs(highs[i] - prev_close), abs(lows[i] - prev_close))
 
-    tr = pl.max_horizontal([tr1, tr2, tr3])
+        atr = tr if atr is None else atr + alpha * (tr - atr)
+        out[i] = atr
+        prev_close = closes[i]
 
-    return tr.ewm_mean(span=2 * period - 1, adjust=False).alias(indicator_str)
+    return {"prev_close": prev_close, "atr": atr}, pl.DataFrame({"atr": out})
 
 def calculate(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
     """
@@ -19,7 +19,7 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "panel": 1,
         "verified": 1,
         "polars": 1
@@ -66,6 +66,12 @@ def calculate(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
     p = int(options.get('period', 30))
     lag = int(options.get('lag', 1))
     
-    auto_corr = df['close'].rolling(window=p).apply(lambda x: x.autocorr(lag=lag), raw=False)
+    # Autocorrelation of a window of p closes pairs its last p - lag closes
+    # with the closes lag rows earlier: a rolling correlation over p - lag
+    # pairs, O(n) instead of one Series.autocorr per window
+    if p - lag < 2:
+        auto_corr = pd.Series(np.nan, index=df.index)
+    else:
+        auto_corr = df['close'].rolling(window=p - lag).corr(df['close'].shift(lag))
     
     return pd.DataFrame({'value': auto_corr}, index=df.index)
\ No newline at end of file
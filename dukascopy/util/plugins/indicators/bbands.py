@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import polars as pl
 from typing import List, Dict, Any
+from util.intermediates import rolling_mean, rolling_std
 
 def description() -> str:
     """
@@ -19,11 +20,12 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "panel": 0,
         "verified": 1,
         "talib-validated":1, 
-        "polars": 1 
+        "polars": 1,
+        "cacheable": 1
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -56,8 +58,8 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> List[pl.Exp
     except (ValueError, TypeError):
         period, std_dev = 20, 2.0
 
-    mid = pl.col("close").rolling_mean(window_size=period)
-    std = pl.col("close").rolling_std(window_size=period,  ddof=0)
+    mid = rolling_mean(period)
+    std = rolling_std(period, ddof=0)
 
     upper = mid + (std * std_dev)
     lower = mid - (std * std_dev)
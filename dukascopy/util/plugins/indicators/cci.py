@@ -9,6 +9,7 @@ except ImportError:
     raise ImportError("Numba is required. Run 'pip install numba' OR 'pip install -r requirements.txt'")
 
 from util.plugins.indicators.helpers.cci_backend import _cci_backend
+from util.intermediates import typical_price
 
 def description() -> str:
     """
@@ -26,7 +27,7 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "panel": 1,
         "verified": 1,
         "talib-validated": 1, 
@@ -60,7 +61,7 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> List[pl.Exp
     except (ValueError, TypeError):
         p = 20
 
-    tp_expr = (pl.col("high") + pl.col("low") + pl.col("close")) / 3.0
+    tp_expr = typical_price()
     
     cci_expr = tp_expr.map_batches(
         lambda s: _cci_backend(s.to_numpy(), p),
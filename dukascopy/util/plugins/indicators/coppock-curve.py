@@ -3,6 +3,8 @@ import numpy as np
 import polars as pl
 from typing import List, Dict, Any
 
+from util.plugins.indicators.helpers.window_backend import _window_wma
+
 def description() -> str:
     """
     The Coppock Curve is a long-term momentum indicator. 
@@ -13,7 +15,7 @@ def description() -> str:
 def meta() -> Dict:
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "panel": 1,
         "verified": 1,
         "polars": 1 # Now uses True WMA via convolution
@@ -64,6 +66,6 @@ def calculate(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
     roc_s = df['close'].pct_change(rs)
     res = (roc_l + roc_s) * 100
     
-    weights = np.arange(1, w + 1)
-    coppock = res.rolling(w).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)    
+    # Weighted moving average from running sums, O(n)
+    coppock = pd.Series(_window_wma(res.to_numpy(dtype=np.float64), w), index=df.index)
     return pd.DataFrame({'value': coppock}, index=df.index)
\ No newline at end of file
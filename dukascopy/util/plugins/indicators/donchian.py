@@ -23,7 +23,8 @@ def meta() -> Dict:
         "version": 1.1,
         "verified": 1,
         "polars": 1,
-        "needs": "surface-colour"
+        "needs": "surface-colour",
+        "cacheable": 1
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import polars as pl
 from typing import List, Dict, Any
+from util.intermediates import ema
 
 def description() -> str:
     """
@@ -22,10 +23,11 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "verified": 1,
         "talib-validated":1, 
-        "polars": 1  
+        "polars": 1,
+        "cacheable": 1
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -58,7 +60,31 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> pl.Expr:
     except (ValueError, TypeError):
         period = 9
 
-    return pl.col("close").ewm_mean(span=period, adjust=False).alias(indicator_str)
+    return ema(period).alias(indicator_str)
+
+def calculate_incremental(state: Dict[str, Any], new_rows: pl.DataFrame, options: Dict[str, Any]):
+    """
+    Streaming EMA, O(1) per new row. State carries the last EMA value.
+    """
+    try:
+        period = int(options.get('period', 9))
+    except (ValueError, TypeError):
+        period = 9
+
+    # ewm_mean(span=period, adjust=False)
+    alpha = 2.0 / (period + 1)
+
+    closes = new_rows["close"].to_numpy()
+    out = np.empty(len(closes), dtype=np.float64)
+
+    ema = None if state is None else state["ema"]
+
+    for i, close in enumerate(closes):
+        # The first observation seeds the average
+        ema = close if ema is None else ema + alpha * (close - ema)
+        out[i] = ema
+
+    return {"ema": ema}, pl.DataFrame({"ema": out})
 
 def calculate(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
     """
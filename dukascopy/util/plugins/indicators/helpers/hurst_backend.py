@@ -2,6 +2,8 @@
 import numba
 import numpy as np
 
+from util.plugins.indicators.helpers.window_backend import _window_std
+
 @numba.jit(nopython=True, cache=True, nogil=True)
 def _hurst_backend(close_v: np.ndarray, period: int) -> np.ndarray:
     n = len(close_v)
@@ -17,22 +19,24 @@ def _hurst_backend(close_v: np.ndarray, period: int) -> np.ndarray:
     x_diff = log_lags - x_mean
     denominator = np.sum(x_diff**2)
 
-    for i in range(period - 1, n):
-        window = close_v[i - (period - 1) : i + 1]
-        log_taus = np.zeros(num_lags)
-        
-        for idx in range(num_lags):
-            lag = lags[idx]
-            diffs = window[lag:] - window[:-lag]
-            
-            std_val = np.std(diffs)
-            if std_val < 1e-10: 
+    # Rolling std of the lagged differences inside each window: the window
+    # ending at row i holds the last (period - lag) differences x[t] - x[t - lag]
+    log_taus = np.full((num_lags, n), np.nan)
+    for idx in range(num_lags):
+        lag = lags[idx]
+        diffs = np.full(n, np.nan)
+        diffs[lag:] = close_v[lag:] - close_v[:-lag]
+        stds = _window_std(diffs, period - lag)
+        for i in range(period - 1, n):
+            std_val = stds[i]
+            if std_val < 1e-10:
                 std_val = 1e-10
-            log_taus[idx] = np.log(std_val)
-        
-        y_mean = np.mean(log_taus)
-        numerator = np.sum(x_diff * (log_taus - y_mean))
+            log_taus[idx, i] = np.log(std_val)
+
+    for i in range(period - 1, n):
+        y_mean = np.mean(log_taus[:, i])
+        numerator = np.sum(x_diff * (log_taus[:, i] - y_mean))
         
         hurst_arr[i] = (numerator / denominator) * 2.0
 
-    return hurst_arr
\ No newline at end of file
+    return hurst_arr
\ No newline at end of file
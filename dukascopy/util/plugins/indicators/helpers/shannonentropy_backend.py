@@ -1,6 +1,8 @@
 import numba
 import numpy as np
 
+from util.plugins.indicators.helpers.window_backend import _window_min, _window_max
+
 @numba.jit(nopython=True, cache=True, nogil=True)
 def _shannonentropy_backend(close_v, period, bins_count):
     n = len(close_v)
@@ -15,18 +17,22 @@ def _shannonentropy_backend(close_v, period, bins_count):
     ret_window_size = period - 1
     max_entropy = np.log2(bins_count) if bins_count > 0 else 1.0
 
+    # Range of the window returns[i - ret_window_size : i], O(n) overall
+    w_mins = _window_min(returns, ret_window_size)
+    w_maxs = _window_max(returns, ret_window_size)
+    counts = np.zeros(max(bins_count, 1))
+
     for i in range(ret_window_size, ret_n + 1):
-        window = returns[i - ret_window_size : i]
-        
-        w_min, w_max = np.min(window), np.max(window)
+        w_min, w_max = w_mins[i - 1], w_maxs[i - 1]
         if w_max == w_min:
             entropy = 0.0
         else:
+            # The bins follow the window range, the counts are rebuilt
             bin_width = (w_max - w_min) / bins_count
-            counts = np.zeros(bins_count)
+            counts[:] = 0.0
             
-            for val in window:
-                idx = int((val - w_min) / bin_width)
+            for k in range(i - ret_window_size, i):
+                idx = int((returns[k] - w_min) / bin_width)
                 if idx >= bins_count: idx = bins_count - 1
                 counts[idx] += 1
             
@@ -42,4 +48,4 @@ def _shannonentropy_backend(close_v, period, bins_count):
         entropy_arr[target_idx] = entropy
         efficiency_arr[target_idx] = max(0.0, min(1.0, efficiency))
 
-    return entropy_arr, efficiency_arr
\ No newline at end of file
+    return entropy_arr, efficiency_arr
@@ -1,58 +1,177 @@
 import numba
 import numpy as np
 
+from util.plugins.indicators.helpers.window_backend import _window_min, _window_max, RESEED
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _vp_move(rank, pos, hist, b):
+    """Restore the volume order (descending) after bin b changed, O(displacement)."""
+    p = pos[b]
+    # Up while larger than the predecessor
+    while p > 0 and hist[rank[p - 1]] < hist[b]:
+        rank[p] = rank[p - 1]
+        pos[rank[p]] = p
+        p -= 1
+    # Down while smaller than the successor
+    k = len(rank)
+    while p < k - 1 and rank[p + 1] >= 0 and hist[rank[p + 1]] > hist[b]:
+        rank[p] = rank[p + 1]
+        pos[rank[p]] = p
+        p += 1
+    rank[p] = b
+    pos[b] = p
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _vp_remove(rank, pos, size, b):
+    """Remove bin b from the volume order, returns the new size."""
+    for p in range(pos[b], size - 1):
+        rank[p] = rank[p + 1]
+        pos[rank[p]] = p
+    rank[size - 1] = -1
+    pos[b] = -1
+    return size - 1
+
 @numba.jit(nopython=True, cache=True, nogil=True)
 def _volumeprofile_backend(highs, lows, closes, volumes, period, tick_size):
     n = len(closes)
     poc_arr = np.full(n, np.nan)
     vah_arr = np.full(n, np.nan)
     val_arr = np.full(n, np.nan)
-    
+
+    if period < 1 or n <= period:
+        return poc_arr, vah_arr, val_arr
+
+    # Range of the window [i - period, i), the window ending at row i - 1
+    mins = _window_min(lows, period)
+    maxs = _window_max(highs, period)
+
+    # Histogram capacity, the widest window
+    capacity = 2
+    for i in range(period, n):
+        num_bins = int(np.ceil((maxs[i - 1] - mins[i - 1]) / tick_size)) + 1
+        if num_bins > capacity:
+            capacity = num_bins
+
+    # Volume and row count per bin, plus the occupied bins ordered by
+    # volume (descending) and each bin's position in that order
+    hist = np.zeros(capacity)
+    counts = np.zeros(capacity, dtype=np.int64)
+    rank = np.full(capacity, -1, dtype=np.int64)
+    pos = np.full(capacity, -1, dtype=np.int64)
+    size = 0
+    used = 0
+    total_vol = 0.0
+    anchor = np.nan
+
     for i in range(period, n):
-        w_close = closes[i-period:i]
-        w_vol = volumes[i-period:i]
-        min_p = np.min(lows[i-period:i])
-        max_p = np.max(highs[i-period:i])
-        
+        min_p = mins[i - 1]
+        max_p = maxs[i - 1]
+
+        if min_p != anchor or i % RESEED == 0:
+            # Bins are anchored at the window low, a new low moves every
+            # bin: rebuild from the window
+            hist[:used] = 0.0
+            counts[:used] = 0
+            pos[:used] = -1
+            rank[:size] = -1
+            used = 0
+            total_vol = 0.0
+            for j in range(i - period, i):
+                bin_idx = int((closes[j] - min_p) / tick_size)
+                if 0 <= bin_idx < capacity:
+                    hist[bin_idx] += volumes[j]
+                    counts[bin_idx] += 1
+                    total_vol += volumes[j]
+                    if bin_idx >= used:
+                        used = bin_idx + 1
+
+            # Full sort of the occupied bins (at most `period`)
+            size = 0
+            for b in range(used):
+                if counts[b] > 0:
+                    rank[size] = b
+                    size += 1
+            order = np.argsort(-hist[rank[:size]], kind="mergesort")
+            sorted_bins = rank[:size][order]
+            for p in range(size):
+                rank[p] = sorted_bins[p]
+                pos[sorted_bins[p]] = p
+            anchor = min_p
+        else:
+            # Same bins: add the row that entered, remove the one that left,
+            # each moves one bin a few places in the volume order
+            bin_idx = int((closes[i - 1] - min_p) / tick_size)
+            if 0 <= bin_idx < capacity:
+                hist[bin_idx] += volumes[i - 1]
+                total_vol += volumes[i - 1]
+                counts[bin_idx] += 1
+                if counts[bin_idx] == 1:
+                    rank[size] = bin_idx
+                    pos[bin_idx] = size
+                    size += 1
+                if bin_idx >= used:
+                    used = bin_idx + 1
+                _vp_move(rank, pos, hist, bin_idx)
+
+            bin_idx = int((closes[i - period - 1] - min_p) / tick_size)
+            if 0 <= bin_idx < capacity:
+                total_vol -= volumes[i - period - 1]
+                counts[bin_idx] -= 1
+                if counts[bin_idx] == 0:
+                    # Exactly empty again, no rounding residue
+                    hist[bin_idx] = 0.0
+                    size = _vp_remove(rank, pos, size, bin_idx)
+                else:
+                    hist[bin_idx] -= volumes[i - period - 1]
+                    _vp_move(rank, pos, hist, bin_idx)
+
         num_bins = int(np.ceil((max_p - min_p) / tick_size)) + 1
         if num_bins < 2:
             continue
-            
-        hist = np.zeros(num_bins)
-        bin_edges = np.zeros(num_bins)
-        for b in range(num_bins):
-            bin_edges[b] = min_p + (b * tick_size)
-
-        for j in range(period):
-            bin_idx = int((w_close[j] - min_p) / tick_size)
-            if 0 <= bin_idx < num_bins:
-                hist[bin_idx] += w_vol[j]
-        
-        poc_idx = np.argmax(hist)
-        poc_arr[i] = bin_edges[poc_idx]
-        
-        total_vol = np.sum(hist)
-        target_vol = total_vol * 0.70
-        
-        sorted_indices = np.argsort(hist)[::-1]
-        
+
+        # Bins beyond the window high (closes above the highs) do not count
+        window_vol = total_vol
+        for b in range(num_bins, used):
+            window_vol -= hist[b]
+
+        # Point of control: the largest bin, the lowest one on ties
+        poc_idx = -1
+        for p in range(size):
+            b = rank[p]
+            if b >= num_bins:
+                continue
+            if poc_idx >= 0 and hist[b] < hist[poc_idx]:
+                break
+            if poc_idx < 0 or b < poc_idx:
+                poc_idx = b
+        if poc_idx < 0:
+            # Empty profile
+            poc_idx = 0
+        poc_arr[i] = min_p + (poc_idx * tick_size)
+
+        # Value area: the largest bins holding 70% of the volume
+        target_vol = window_vol * 0.70
+
         current_vol = 0.0
         v_min = np.inf
         v_max = -np.inf
         found_va = False
 
-        for idx in sorted_indices:
+        for p in range(size):
+            idx = rank[p]
+            if idx >= num_bins:
+                continue
             current_vol += hist[idx]
-            price = bin_edges[idx]
+            price = min_p + (idx * tick_size)
             if price < v_min: v_min = price
             if price > v_max: v_max = price
-            
+
             if current_vol >= target_vol:
                 found_va = True
                 break
-        
+
         if found_va:
             vah_arr[i] = v_max
             val_arr[i] = v_min
-            
-    return poc_arr, vah_arr, val_arr
\ No newline at end of file
+
+    return poc_arr, vah_arr, val_arr
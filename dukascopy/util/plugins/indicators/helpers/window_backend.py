@@ -0,0 +1,286 @@
+import numba
+import numpy as np
+
+# Running sums are recomputed from scratch every RESEED rows, so rounding
+# errors of the add/remove updates cannot build up over long series
+RESEED = 4096
+
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _window_min(values, period):
+    """Minimum of the window ending at each row (monotonic deque, O(n))."""
+    n = len(values)
+    out = np.full(n, np.nan)
+    if period < 1:
+        return out
+
+    # Ring buffer of row indices, values increasing from head to tail
+    dq = np.empty(period + 1, dtype=np.int64)
+    head = 0
+    size = 0
+    cap = period + 1
+
+    for i in range(n):
+        # Drop the row that left the window
+        if size > 0 and dq[head] <= i - period:
+            head = (head + 1) % cap
+            size -= 1
+        # Drop rows that can no longer be the minimum
+        while size > 0 and values[dq[(head + size - 1) % cap]] >= values[i]:
+            size -= 1
+        dq[(head + size) % cap] = i
+        size += 1
+
+        if i >= period - 1:
+            out[i] = values[dq[head]]
+
+    return out
+
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _window_max(values, period):
+    """Maximum of the window ending at each row (monotonic deque, O(n))."""
+    return -_window_min(-values, period)
+
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _window_sums(values, period):
+    """
+    Sum and sum of squares of the window ending at each row, O(n).
+
+    NaNs are counted, windows holding one return NaN.
+    """
+    n = len(values)
+    sums = np.full(n, np.nan)
+    sq_sums = np.full(n, np.nan)
+    if period < 1:
+        return sums, sq_sums
+
+    s = 0.0
+    sq = 0.0
+    nans = 0
+
+    for i in range(n):
+        if i % RESEED == 0:
+            # Recompute the window (rows i - period + 1 .. i - 1) exactly
+            s = 0.0
+            sq = 0.0
+            nans = 0
+            for j in range(max(0, i - period + 1), i):
+                if np.isnan(values[j]):
+                    nans += 1
+                else:
+                    s += values[j]
+                    sq += values[j] * values[j]
+
+        # Add the new row
+        v = values[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            s += v
+            sq += v * v
+
+        # Remove the row that left the window (not part of a reseed)
+        if i >= period and i % RESEED != 0:
+            v = values[i - period]
+            if np.isnan(v):
+                nans -= 1
+            else:
+                s -= v
+                sq -= v * v
+
+        if i >= period - 1 and nans == 0:
+            sums[i] = s
+            sq_sums[i] = sq
+
+    return sums, sq_sums
+
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _window_std(values, period):
+    """
+    Population standard deviation (ddof=0) of the window ending at each row, O(n).
+
+    Sliding Welford updates (mean and sum of squared deviations), stable for
+    price levels where sum-of-squares formulas cancel out. Flat windows are
+    exactly 0, the rounding noise of the updates would survive the sqrt.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if period < 1:
+        return out
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    nans = 0
+    # Length of the run of equal values ending at the current row
+    run = 0
+
+    for i in range(n):
+        run = run + 1 if i > 0 and values[i] == values[i - 1] else 1
+
+        if i % RESEED == 0:
+            # Recompute the window (rows i - period + 1 .. i - 1) exactly
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            nans = 0
+            for j in range(max(0, i - period + 1), i):
+                v = values[j]
+                if np.isnan(v):
+                    nans += 1
+                else:
+                    count += 1
+                    d = v - mean
+                    mean += d / count
+                    m2 += d * (v - mean)
+
+        # Remove the row that left the window first (not part of a reseed),
+        # an emptied window restarts exactly
+        if i >= period and i % RESEED != 0:
+            v = values[i - period]
+            if np.isnan(v):
+                nans -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    d = v - mean
+                    mean -= d / count
+                    m2 -= d * (v - mean)
+
+        # Add the new row
+        v = values[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            count += 1
+            d = v - mean
+            mean += d / count
+            m2 += d * (v - mean)
+
+        if i >= period - 1 and nans == 0:
+            if run >= period:
+                out[i] = 0.0
+            else:
+                out[i] = np.sqrt(max(m2, 0.0) / period)
+
+    return out
+
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _window_wma(values, period):
+    """
+    Weighted moving average (weights 1..period, newest last), O(n).
+
+    Equivalent to rolling(period).apply(np.dot(x, weights) / weights.sum()).
+    The weighted sum is updated with W' = W + period * x_new - S, where S is
+    the plain sum of the previous window.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if period < 1:
+        return out
+
+    denominator = period * (period + 1) / 2.0
+    s = 0.0
+    w = 0.0
+    nans = 0
+
+    for i in range(n):
+        if i % RESEED == 0:
+            # Recompute the window (rows i - period + 1 .. i - 1) exactly,
+            # weights as if row i completes it
+            s = 0.0
+            w = 0.0
+            nans = 0
+            for j in range(max(0, i - period + 1), i):
+                v = values[j]
+                if np.isnan(v):
+                    nans += 1
+                    v = 0.0
+                s += v
+                w += (period - (i - j)) * v
+
+        v = values[i]
+        if np.isnan(v):
+            nans += 1
+            v = 0.0
+
+        # Every row in the window moves one weight down (minus S), the new
+        # row enters with the full weight
+        if i % RESEED == 0:
+            w += period * v
+        else:
+            w += period * v - s
+        s += v
+
+        if i >= period and i % RESEED != 0:
+            old = values[i - period]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                s -= old
+
+        if i >= period - 1 and nans == 0:
+            out[i] = w / denominator
+
+    return out
+
+
+@numba.jit(nopython=True, cache=True, nogil=True)
+def _window_linreg(y, period):
+    """
+    Least squares line (x = 0..period-1) of the window ending at each row, O(n).
+
+    Returns:
+        (slope, intercept): Arrays, NaN before the first full window.
+    """
+    n = len(y)
+    slope = np.full(n, np.nan)
+    intercept = np.full(n, np.nan)
+    if period < 2:
+        return slope, intercept
+
+    x_mean = (period - 1) / 2.0
+    x_ss = period * (period * period - 1) / 12.0
+
+    # Sums are kept relative to a recent value (small magnitudes, less
+    # cancellation), moved on every reseed
+    ref = y[0] if n > 0 else 0.0
+    sy = 0.0
+    sxy = 0.0
+
+    for i in range(n):
+        if i % RESEED == 0 and i >= period:
+            # Recompute the window ending at row i - 1 exactly
+            ref = y[i - 1]
+            sy = 0.0
+            sxy = 0.0
+            for j in range(period):
+                v = y[i - period + j] - ref
+                sy += v
+                sxy += j * v
+
+        if i < period:
+            # Filling the first window
+            sy += y[i] - ref
+            sxy += i * (y[i] - ref)
+        else:
+            # Shift x down by one (minus the remaining sum), append the new row
+            old = y[i - period] - ref
+            new = y[i] - ref
+            sxy = sxy - (sy - old) + (period - 1) * new
+            sy = sy - old + new
+
+        if i >= period - 1:
+            y_mean = sy / period
+            b = (sxy - x_mean * sy) / x_ss
+            slope[i] = b
+            intercept[i] = ref + y_mean - b * x_mean
+
+    return slope, intercept
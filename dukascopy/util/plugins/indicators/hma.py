@@ -3,6 +3,8 @@ import numpy as np
 import polars as pl
 from typing import List, Dict, Any, Union
 
+from util.plugins.indicators.helpers.window_backend import _window_wma
+
 def description() -> str:
     """
     Returns a human-readable description for the API and UI.
@@ -16,7 +18,7 @@ def description() -> str:
 def meta() -> Dict:
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "verified": 0,  # Needs fixing!
         "polars": 1     # TODO: fix polars version. performance profile if polars version is faster 
                         # since uses UDF function. For now, fallback to pandas version. 
@@ -105,9 +107,8 @@ def calculate(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
 
     def fast_wma(series, n):
         if n < 1: return series
-        weights = np.arange(1, n + 1)
-        # Simplified rolling window for fallback compatibility
-        return series.rolling(window=n).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+        # Weighted moving average from running sums, O(n)
+        return pd.Series(_window_wma(series.to_numpy(dtype=np.float64), n), index=series.index)
 
     half_period = int(period / 2)
     sqrt_period = int(np.sqrt(period))
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import polars as pl
 from typing import List, Dict, Any
+from util.intermediates import ema, true_range, wilder
 
 def description() -> str:
     """
@@ -22,7 +23,7 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "verified": 1,
         "polars": 1, 
         "needs": "surface-colouring"
@@ -63,16 +64,10 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> List[pl.Exp
     except (ValueError, TypeError):
         ema_period, atr_period, multiplier = 20, 10, 1.0
 
-    mid = pl.col("close").ewm_mean(span=ema_period, adjust=False)
+    mid = ema(ema_period)
 
-    prev_close = pl.col("close").shift(1)
-    tr1 = pl.col("high") - pl.col("low")
-    tr2 = (pl.col("high") - prev_close).abs()
-    tr3 = (pl.col("low") - prev_close).abs()
-    
-    true_range = pl.max_horizontal([tr1, tr2, tr3])
-
-    atr = true_range.ewm_mean(alpha=1/atr_period, adjust=False)
+    # alpha = 1 / atr_period, the ATR of the atr plugin
+    atr = wilder(atr_period, true_range())
 
     upper = mid + (multiplier * atr)
     lower = mid - (multiplier * atr)
@@ -14,7 +14,8 @@ def meta() -> Dict:
         "version": 1.1,
         "panel": 1,
         "verified": 1,
-        "polars_input": 1
+        "polars_input": 1,
+        "executor": "thread"
     }
 
 def position_args(args: List[str]) -> Dict[str, Any]:
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import polars as pl
 from typing import List, Dict, Any
+from util.intermediates import diff
 
 def description() -> str:
     """
@@ -22,11 +23,12 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "panel": 1,
         "verified": 1,
         "talib-validated":1, 
-        "polars": 1
+        "polars": 1,
+        "cacheable": 1
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -57,10 +59,10 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> pl.Expr:
     except (ValueError, TypeError):
         period = 14
 
-    diff = pl.col("close").diff()
+    change = diff()
 
-    gain = pl.when(diff > 0).then(diff).otherwise(0)
-    loss = pl.when(diff < 0).then(-diff).otherwise(0)
+    gain = pl.when(change > 0).then(change).otherwise(0)
+    loss = pl.when(change < 0).then(-change).otherwise(0)
 
     avg_gain = gain.ewm_mean(span=2 * period - 1, adjust=False)
     avg_loss = loss.ewm_mean(span=2 * period - 1, adjust=False)
@@ -70,6 +72,51 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> pl.Expr:
 
     return rsi.alias(indicator_str)
 
+def calculate_incremental(state: Dict[str, Any], new_rows: pl.DataFrame, options: Dict[str, Any]):
+    """
+    Streaming Wilder's Smoothing, O(1) per new row.
+
+    State carries the previous close and both smoothed averages. A `None`
+    state starts from scratch, exactly like `calculate_polars` on row 0.
+    """
+    try:
+        period = int(options.get('period', 14))
+    except (ValueError, TypeError):
+        period = 14
+
+    # ewm_mean(span=2p-1, adjust=False) equals alpha = 1/period
+    alpha = 1.0 / period
+
+    closes = new_rows["close"].to_numpy()
+    out = np.empty(len(closes), dtype=np.float64)
+
+    if state is None:
+        prev_close, avg_gain, avg_loss = None, None, None
+    else:
+        prev_close, avg_gain, avg_loss = state["prev_close"], state["avg_gain"], state["avg_loss"]
+
+    for i, close in enumerate(closes):
+        # First row has no diff, gain and loss are 0 (as in the batch path)
+        diff = 0.0 if prev_close is None else close - prev_close
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+
+        if avg_gain is None:
+            avg_gain, avg_loss = gain, loss
+        else:
+            avg_gain += alpha * (gain - avg_gain)
+            avg_loss += alpha * (loss - avg_loss)
+
+        # Same IEEE semantics as the vectorized path (0/0 -> NaN, x/0 -> 100)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(avg_gain) / np.float64(avg_loss)
+            out[i] = 100 - (100 / (1 + rs))
+
+        prev_close = close
+
+    new_state = {"prev_close": prev_close, "avg_gain": avg_gain, "avg_loss": avg_loss}
+    return new_state, pl.DataFrame({"rsi": out})
+
 def calculate(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
     """
     Legacy Pandas fallback.
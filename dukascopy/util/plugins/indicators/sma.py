@@ -1,5 +1,6 @@
 import polars as pl
 from typing import List, Dict, Any
+from util.intermediates import rolling_mean
 
 def description() -> str:
     """
@@ -19,10 +20,11 @@ def meta() -> Dict:
     """
     return {
         "author": "Google Gemini",
-        "version": 1.1,
+        "version": 1.2,
         "verified": 1,
         "talib-validated":1, 
-        "polars": 1
+        "polars": 1,
+        "cacheable": 1
     }
 
 def warmup_count(options: Dict[str, Any]) -> int:
@@ -53,7 +55,7 @@ def calculate_polars(indicator_str: str, options: Dict[str, Any]) -> pl.Expr:
     except (ValueError, TypeError):
         period = 14
 
-    return pl.col("close").rolling_mean(window_size=period).alias(indicator_str)
+    return rolling_mean(period).alias(indicator_str)
 
 def calculate(df: Any, options: Dict[str, Any]) -> Any:
     """
@@ -7,7 +7,7 @@ def description() -> str:
     return "Volume Weighted Moving Average (VWMA) weights price by volume, emphasizing price action on high volume bars."
 
 def meta() -> Dict:
-    return {"author": "Google Gemini", "version": 1.0, "panel": 0, "verified": 1, "polars": 1}
+    return {"author": "Google Gemini", "version": 1.0, "panel": 0, "verified": 1, "polars": 1, "cacheable": 1}
 
 def warmup_count(options: Dict[str, Any]) -> int:
     return int(options.get('period', 20))
@@ -27,7 +27,8 @@ def meta() -> Dict:
         "panel": 1,
         "verified": 1,
         "talib-validated": 1, 
-        "polars": 1
+        "polars": 1,
+        "cacheable": 1
     }
     
 def warmup_count(options: Dict[str, Any]) -> int:
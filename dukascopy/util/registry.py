@@ -5,7 +5,7 @@
 File:        registry.py
 Author:      JP Ueberbach
 Created:     2026-01-12
-Updated:     2026-01-23
+Updated:     2026-10-16
 
 Dataset registry management for the Dukascopy data pipeline.
 
@@ -17,6 +17,10 @@ It uses a nested dictionary structure for O(1) retrieval of datasets
 by symbol and timeframe. The registry also exposes methods to list
 available datasets and the timeframes associated with each symbol.
 
+Datasets produced (or removed) while the service runs are added with
+`add`/`remove`, driven by the change watcher. Both are safe to call
+from the watcher thread while queries read the registry.
+
 Classes:
     DatasetRegistry: Maintains a registry of Dataset objects for quick lookup.
 
@@ -81,6 +85,30 @@ class DatasetRegistry:
         # Use nested dictionary lookup with default empty dict
         return self._lookup.get(symbol, {}).get(timeframe)
 
+    def add(self, dataset: Dataset) -> None:
+        """Register a dataset that appeared on disk.
+
+        Args:
+            dataset (Dataset): Dataset to add (replaces an existing entry
+                with the same symbol and timeframe).
+        """
+        self._lookup.setdefault(dataset.symbol, {})[dataset.timeframe] = dataset
+
+        # Copy on write, readers may iterate the old list
+        datasets = [ds for ds in self._datasets if (ds.symbol, ds.timeframe) != (dataset.symbol, dataset.timeframe)]
+        datasets.append(dataset)
+        self._datasets = sorted(datasets, key=lambda d: (d.symbol, d.timeframe))
+
+    def remove(self, symbol: str, timeframe: str) -> None:
+        """Unregister a dataset whose file was removed.
+
+        Args:
+            symbol (str): The financial instrument symbol.
+            timeframe (str): The timeframe identifier.
+        """
+        self._lookup.get(symbol, {}).pop(timeframe, None)
+        self._datasets = [ds for ds in self._datasets if (ds.symbol, ds.timeframe) != (symbol, timeframe)]
+
     def get_available_datasets(self) -> List[Dataset]:
         """Return the list of all registered Dataset objects.
 
@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        store.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Updated:     2026-10-16
+ Description: Persistent, incremental indicator result store.
+
+              The OHLCV views served by `MarketDataCache` are append-only, yet
+              every `get_data` call recomputes its indicators over the full
+              warmup + limit window. Dashboards and alerts ask for the same
+              `rsi_14` / `bbands_20_2` series over and over, so most of that
+              work is repeated.
+
+              This module keeps computed indicator columns per
+              (symbol, timeframe, indicator string) as one contiguous segment
+              of view indices. Segments are persisted as Arrow IPC stream
+              side files next to the OHLCV binary, with a small JSON file
+              holding their bookkeeping:
+
+                  data/resample/<tf>/.indicators/<symbol>/<indicator>.arrow
+                  data/resample/<tf>/.indicators/<symbol>/<indicator>.json
+
+              On subsequent calls, requests inside the segment are served as
+              a slice. Requests running past the end of the segment only
+              compute the newly appended tail (plus warmup) and extend it.
+              Plugins implementing `calculate_incremental` skip the warmup:
+              the segment carries their streaming state, so a new bar costs
+              O(1) instead of O(warmup).
+
+              Extending a segment costs O(new rows):
+                - In memory, a segment is a list of parts. New tails are
+                  merged with the last part only while it is not larger
+                  (binary counter), O(log n) parts and amortized O(log n)
+                  copying per row.
+                - On disk, the tail is appended to the stream as one record
+                  batch, the same protocol as the aggregate: truncate to
+                  the committed length, write, then commit the new length
+                  in the JSON file. The file is rewritten when a segment
+                  grows backwards or holds MAX_BATCHES batches.
+                - Requests before the segment grow it backwards (at least
+                  doubling it), paging back costs amortized O(page).
+                  Requests far before it are computed without replacing
+                  the segment.
+
+              In-memory segments are evicted least recently used beyond
+              the byte budget (`cache.indicator_store_max_bytes`), they
+              are reloaded from their side files.
+
+              Validity rules:
+                - Segments are keyed on the plugin `mtime`/`size` tracked by
+                  `IndicatorRegistry`; editing a plugin invalidates its segments.
+                - The timestamps at both segment ends and the OHLCV values of
+                  the last stored row must still match the view, otherwise the
+                  segment is dropped (rewritten or rebuilt data).
+                - The last record of a view is never persisted, since the
+                  resampler keeps rewriting the open (incomplete) bar.
+
+              Only plugins declaring `cacheable: 1` in their meta section are
+              stored. That flag promises the output at row i depends only on
+              rows <= i (within the warmup window), which is what makes tail
+              extension equivalent to a full recomputation.
+
+ Requirements:
+     - Python 3.8+
+     - NumPy
+     - Polars
+     - PyArrow
+     - orjson
+
+ License:
+     MIT License
+===============================================================================
+"""
+import os
+import threading
+import uuid
+import orjson
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from util.parallel import IndicatorEngine, parallel_indicators
+from util.layout import OHLCV, view_columns
+
+# Directory name, relative to the OHLCV binary, where side files are stored
+STORE_DIRNAME = ".indicators"
+
+# Key used to stash the file id in the Arrow schema
+STORE_METADATA_KEY = b"indicator_store"
+
+# End-of-stream marker of the Arrow IPC stream format
+EOS_MARKER = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+# Record batches in a side file before it is rewritten as one
+MAX_BATCHES = 1024
+
+# Default memory budget of the in-memory segments (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _append_part(parts: List[pl.DataFrame], tail: pl.DataFrame) -> List[pl.DataFrame]:
+    """Append rows to a list of parts, merging parts like a binary counter."""
+    parts = parts + [tail]
+    while len(parts) > 1 and parts[-1].height >= parts[-2].height:
+        parts = parts[:-2] + [pl.concat(parts[-2:], how="vertical_relaxed").rechunk()]
+    return parts
+
+
+class IndicatorSegment:
+    """A contiguous, validated run of computed indicator values.
+
+    Attributes:
+        start (int): View index of the first stored row.
+        parts (List[pl.DataFrame]): Indicator output columns in consecutive parts.
+        columns (pl.DataFrame): The parts as one frame (not rechunked), one
+            row per view row.
+        ts_first (int): Timestamp of the view row at `start`.
+        ts_last (int): Timestamp of the view row at `end - 1`.
+        anchor (List[float]): OHLCV values of the view row at `end - 1`.
+        fingerprint (Tuple[float, int]): Plugin (mtime, size) at compute time.
+        state (Optional[Dict]): Streaming state at `end` for plugins that
+            implement `calculate_incremental` (memory only, never persisted).
+        file_id (Optional[str]): Id of the side file holding the segment.
+        nbytes (int): Committed length of the side file stream (without EOS).
+        batches (int): Record batches in the side file.
+    """
+
+    __slots__ = (
+        "start", "parts", "columns", "ts_first", "ts_last", "anchor", "fingerprint", "state",
+        "file_id", "nbytes", "batches",
+    )
+
+    def __init__(self, start, parts, ts_first, ts_last, anchor, fingerprint, state=None,
+                 file_id=None, nbytes=0, batches=0):
+        self.start = start
+        self.parts = parts
+        self.columns = pl.concat(parts, how="vertical_relaxed", rechunk=False)
+        self.ts_first = ts_first
+        self.ts_last = ts_last
+        self.anchor = anchor
+        self.fingerprint = fingerprint
+        self.state = state
+        self.file_id = file_id
+        self.nbytes = nbytes
+        self.batches = batches
+
+    @property
+    def end(self) -> int:
+        """Exclusive view index of the last stored row."""
+        return self.start + self.columns.height
+
+
+class IndicatorStore:
+    """Incremental indicator result cache on top of `MarketDataCache` views.
+
+    The store is owned by the `MarketDataCache` singleton and uses it for
+    view access and OHLCV retrieval when a (partial) recomputation is needed.
+    """
+
+    def __init__(self, cache, persist: bool = True, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the indicator store.
+
+        Args:
+            cache (MarketDataCache): Owning cache providing views and chunks.
+            persist (bool, optional): Write segments to Arrow side files and
+                load them on first use. Defaults to True.
+            max_bytes (int, optional): Memory budget of the in-memory segments.
+        """
+        # Owning cache (views, chunk extraction, indicator registry)
+        self.cache = cache
+        # Whether segments are written to / read from disk
+        self.persist = persist
+        # Memory budget of the segments, least recently used are evicted
+        self.max_bytes = max_bytes
+        # In-memory segments keyed by (symbol, tf, indicator string), LRU order
+        self.segments: "OrderedDict[Tuple[str, str, str], IndicatorSegment]" = OrderedDict()
+        self._sizes: Dict[Tuple[str, str, str], int] = {}
+        self._bytes = 0
+        # Protects the segment dictionary
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def is_cacheable(plugin_entry: Dict) -> bool:
+        """Return True if a plugin declares itself safe for incremental storage.
+
+        Args:
+            plugin_entry (Dict): Registry entry of the plugin.
+
+        Returns:
+            bool: True when `meta()['cacheable']` is set.
+        """
+        meta_func = plugin_entry.get('meta')
+        plugin_meta = meta_func() if callable(meta_func) else {}
+        return bool(plugin_meta.get('cacheable', 0))
+
+    def fetch(
+        self,
+        symbol: str,
+        tf: str,
+        indicators: List[str],
+        from_idx: int,
+        to_idx: int,
+        skip_rows: int,
+        plugins: Dict
+    ) -> Tuple[Optional[pl.DataFrame], List[str]]:
+        """Serve cacheable indicators for a view slice from the store.
+
+        The returned frame is row-aligned with `get_chunk(from_idx, to_idx)`.
+        The first `skip_rows` rows are warmup rows the caller drops anyway;
+        they are returned as nulls and never computed.
+
+        Args:
+            symbol (str): Trading symbol identifier (e.g., "EUR-USD").
+            tf (str): Timeframe identifier (e.g., "1m", "1h").
+            indicators (List[str]): Requested indicator strings.
+            from_idx (int): First view index of the chunk (inclusive).
+            to_idx (int): Last view index of the chunk (exclusive).
+            skip_rows (int): Leading rows of the chunk that need no values.
+            plugins (Dict): Plugin registry (as returned by `refresh`).
+
+        Returns:
+            Tuple[Optional[pl.DataFrame], List[str]]: The stored indicator
+            columns (or None if nothing was served) and the indicator strings
+            that still need to be computed by the regular engine.
+        """
+        # First row that actually needs indicator values (indices may be NumPy ints)
+        out_from, to_idx = int(from_idx + skip_rows), int(to_idx)
+
+        frames = []
+        remaining = []
+
+        # Deduplicate while preserving order, duplicates would collide on concat
+        for ind_str in dict.fromkeys(indicators):
+            # Look up the plugin by base name
+            plugin_entry = plugins.get(ind_str.split('_')[0])
+
+            # Non-cacheable, unknown or fully-skipped requests go to the engine
+            if not plugin_entry or out_from >= to_idx or not self.is_cacheable(plugin_entry):
+                remaining.append(ind_str)
+                continue
+
+            # Serve from the store, (re)computing the missing part if needed
+            columns = self._fetch_one(symbol, tf, ind_str, plugin_entry, plugins, out_from, to_idx)
+
+            # Plugin failure or empty output, let the engine handle (and log) it
+            if columns is None:
+                remaining.append(ind_str)
+                continue
+
+            frames.append(columns)
+
+        if not frames:
+            return None, remaining
+
+        # Merge all stored indicators horizontally
+        combined = pl.concat(frames, how="horizontal")
+
+        # Pad the skipped warmup rows at the top so rows line up with the chunk
+        if skip_rows > 0:
+            pad = pl.select([
+                pl.repeat(None, skip_rows, dtype=dtype).alias(name)
+                for name, dtype in combined.schema.items()
+            ])
+            combined = pl.concat([pad, combined])
+
+        return combined, remaining
+
+    def _fetch_one(
+        self,
+        symbol: str,
+        tf: str,
+        ind_str: str,
+        plugin_entry: Dict,
+        plugins: Dict,
+        out_from: int,
+        to_idx: int
+    ) -> Optional[pl.DataFrame]:
+        """Return indicator columns for view rows [out_from, to_idx).
+
+        Args:
+            symbol (str): Trading symbol identifier.
+            tf (str): Timeframe identifier.
+            ind_str (str): Indicator string (e.g., "rsi_14").
+            plugin_entry (Dict): Registry entry of the plugin.
+            plugins (Dict): Full plugin registry, forwarded to the engine.
+            out_from (int): First view index to return (inclusive).
+            to_idx (int): Last view index to return (exclusive).
+
+        Returns:
+            Optional[pl.DataFrame]: Indicator columns, or None on failure.
+        """
+        # Resolve the backing view (registered by get_data via discover_view)
+        view = self.cache.mmaps.get(f"{symbol}_{tf}")
+        if not view:
+            return None
+
+        # Per-field views, independent of the on-disk layout (row or columnar)
+        data = view_columns(view)
+        num_records = len(data['ts'])
+        key = (symbol, tf, ind_str)
+        fingerprint = (plugin_entry.get('mtime'), plugin_entry.get('size'))
+
+        # Get the current segment (memory first, disk second) and validate it
+        with self._lock:
+            segment = self.segments.get(key)
+        path = self._side_path(view['file_path'], symbol, ind_str)
+        if segment is None and self.persist:
+            segment = self._load(path)
+        if segment is not None and not self._is_valid(segment, fingerprint, data):
+            segment = None
+
+        # Fast path: fully covered, return a zero-copy slice
+        if segment is not None and segment.start <= out_from and to_idx <= segment.end:
+            self._remember(key, segment)
+            return segment.columns.slice(out_from - segment.start, to_idx - out_from)
+
+        # Warmup requirement of this single indicator
+        warmup_rows = self.cache.indicators.get_maximum_warmup_rows([ind_str])
+
+        height = segment.columns.height if segment is not None else 0
+
+        # Far before the segment (e.g. scrolling back years): computed
+        # without replacing the segment, the recent rows stay stored
+        if segment is not None and to_idx < segment.start - height:
+            self._remember(key, segment)
+            return self._compute(symbol, tf, ind_str, plugins, out_from, to_idx, warmup_rows)
+
+        # Far after the segment (left behind by the live edge), start over
+        if segment is not None and out_from > segment.end + height:
+            segment = None
+
+        if segment is None:
+            # Miss: compute the requested range and start a new segment
+            result = self._compute(symbol, tf, ind_str, plugins, out_from, to_idx, warmup_rows)
+            if result is None:
+                return None
+
+            # Never persist the last record, the open bar is still being rewritten
+            persist_end = min(out_from + result.height, num_records - 1)
+            if persist_end > out_from:
+                new_segment = self._segment(out_from, [result.slice(0, persist_end - out_from)], data, fingerprint)
+                self._remember(key, new_segment)
+                if self.persist:
+                    self._save(path, new_segment)
+            return result
+
+        # Grow backwards, at least doubling the segment: paging back through
+        # the history costs amortized O(page)
+        parts = segment.parts
+        seg_start = segment.start
+        if out_from < segment.start:
+            seg_start = max(0, min(out_from, segment.start - height))
+            head = self._compute(symbol, tf, ind_str, plugins, seg_start, segment.start, warmup_rows)
+            if head is None or head.height != segment.start - seg_start:
+                return None
+            parts = [head] + parts
+
+        # Extend forwards, only the appended tail is computed
+        state = segment.state
+        tail = None
+        if to_idx > segment.end:
+            # Streaming path: advance the carried state by the new rows only
+            if plugin_entry.get('calculate_incremental'):
+                state, tail = self._stream(symbol, tf, ind_str, plugin_entry, segment, to_idx, num_records, warmup_rows)
+
+            # Incremental path: only compute the appended tail (plus warmup)
+            if tail is None:
+                state = None
+                tail = self._compute(symbol, tf, ind_str, plugins, segment.end, to_idx, warmup_rows)
+            if tail is None:
+                return None
+
+        # Never persist the last record, the open bar is still being rewritten
+        appended = None
+        open_rows = None
+        if tail is not None:
+            persist_end = max(segment.end, min(segment.end + tail.height, num_records - 1))
+            appended = tail.slice(0, persist_end - segment.end)
+            open_rows = tail.slice(persist_end - segment.end)
+            if appended.height:
+                parts = _append_part(parts, appended)
+            else:
+                appended = None
+
+        new_segment = self._segment(seg_start, parts, data, fingerprint, state)
+        new_segment.file_id, new_segment.nbytes, new_segment.batches = segment.file_id, segment.nbytes, segment.batches
+        self._remember(key, new_segment)
+
+        # Persist the extension: prepended rows need a rewrite, appended
+        # rows go to the end of the side file
+        if self.persist:
+            if seg_start < segment.start:
+                self._save(path, new_segment)
+            elif appended is not None:
+                self._append(path, new_segment, appended)
+
+        columns = new_segment.columns
+        if open_rows is not None and open_rows.height:
+            columns = pl.concat([columns, open_rows], how="vertical_relaxed", rechunk=False)
+        return columns.slice(out_from - seg_start, to_idx - out_from)
+
+    def _segment(
+        self,
+        start: int,
+        parts: List[pl.DataFrame],
+        data: Dict[str, np.ndarray],
+        fingerprint: Tuple,
+        state: Optional[Dict] = None
+    ) -> IndicatorSegment:
+        """Build a segment over view rows with its validation anchors."""
+        end = start + sum(part.height for part in parts)
+        return IndicatorSegment(
+            start=start,
+            parts=parts,
+            ts_first=int(data['ts'][start]),
+            ts_last=int(data['ts'][end - 1]),
+            anchor=[float(data[name][end - 1]) for name in OHLCV],
+            fingerprint=fingerprint,
+            state=state
+        )
+
+    def _remember(self, key: Tuple[str, str, str], segment: IndicatorSegment) -> None:
+        """Keep a segment in memory, evicting least recently used segments."""
+        size = segment.columns.estimated_size()
+        with self._lock:
+            if key in self.segments:
+                self._bytes -= self._sizes[key]
+            self.segments[key] = segment
+            self.segments.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            # The segment just used always stays
+            while self._bytes > self.max_bytes and len(self.segments) > 1:
+                evicted, _ = self.segments.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+
+    def _stream(
+        self,
+        symbol: str,
+        tf: str,
+        ind_str: str,
+        plugin_entry: Dict,
+        segment: IndicatorSegment,
+        to_idx: int,
+        num_records: int,
+        warmup_rows: int
+    ) -> Tuple[Optional[Dict], Optional[pl.DataFrame]]:
+        """Extend a segment through the plugin's streaming hook.
+
+        Rows [segment.end, to_idx) are processed with the carried state. The
+        state is advanced only over final rows; the open (last) bar of the
+        view is evaluated on a throwaway copy so it can be re-evaluated once
+        it is rewritten. Without a carried state (e.g. freshly loaded from
+        disk), the state is bootstrapped once by replaying the warmup rows.
+
+        Args:
+            symbol (str): Trading symbol identifier.
+            tf (str): Timeframe identifier.
+            ind_str (str): Indicator string.
+            plugin_entry (Dict): Registry entry of the plugin.
+            segment (IndicatorSegment): Segment being extended.
+            to_idx (int): Last view index to produce (exclusive).
+            num_records (int): Current number of records in the view.
+            warmup_rows (int): Rows to replay when bootstrapping the state.
+
+        Returns:
+            Tuple[Optional[Dict], Optional[pl.DataFrame]]: State at the new
+            persisted end and the tail columns, or (None, None) on failure.
+        """
+        engine = IndicatorEngine()
+        state = segment.state
+
+        # Rows below persist_end are final, the open bar is not
+        persist_end = max(segment.end, min(to_idx, num_records - 1))
+
+        # Bootstrap: replay the warmup window to rebuild the accumulators
+        if state is None:
+            boot_from = max(0, segment.end - warmup_rows)
+            if boot_from < segment.end:
+                boot_rows = self.cache.get_chunk(symbol, tf, boot_from, segment.end, True)
+                state, boot_cols = engine.compute_incremental(None, boot_rows, ind_str, plugin_entry)
+                if boot_cols is None:
+                    return None, None
+
+        frames = []
+
+        # Advance the state over the final rows
+        if persist_end > segment.end:
+            final_rows = self.cache.get_chunk(symbol, tf, segment.end, persist_end, True)
+            state, final_cols = engine.compute_incremental(state, final_rows, ind_str, plugin_entry)
+            if final_cols is None:
+                return None, None
+            frames.append(final_cols)
+
+        # Evaluate the open bar without keeping its state
+        if to_idx > persist_end:
+            open_rows = self.cache.get_chunk(symbol, tf, persist_end, to_idx, True)
+            _, open_cols = engine.compute_incremental(state, open_rows, ind_str, plugin_entry)
+            if open_cols is None:
+                return None, None
+            frames.append(open_cols)
+
+        if not frames:
+            return None, None
+
+        return state, pl.concat(frames, how="vertical_relaxed")
+
+    def _compute(
+        self,
+        symbol: str,
+        tf: str,
+        ind_str: str,
+        plugins: Dict,
+        from_idx: int,
+        to_idx: int,
+        warmup_rows: int
+    ) -> Optional[pl.DataFrame]:
+        """Compute indicator columns for [from_idx, to_idx) using the engine.
+
+        Args:
+            symbol (str): Trading symbol identifier.
+            tf (str): Timeframe identifier.
+            ind_str (str): Indicator string.
+            plugins (Dict): Plugin registry.
+            from_idx (int): First view index to return (inclusive).
+            to_idx (int): Last view index to return (exclusive).
+            warmup_rows (int): Rows to prepend for indicator convergence.
+
+        Returns:
+            Optional[pl.DataFrame]: Indicator columns only, or None if the
+            plugin produced no output.
+        """
+        # Include warmup rows in front of the range (clamped at the start)
+        calc_from = max(0, from_idx - warmup_rows)
+
+        # Retrieve OHLCV as Polars, the store is Polars end-to-end
+        chunk = self.cache.get_chunk(symbol, tf, calc_from, to_idx, True)
+        if chunk.is_empty():
+            return None
+
+        # Run the regular engine on this single indicator (flat output)
+        result = parallel_indicators(chunk, [ind_str], plugins, True, True)
+
+        # Keep only the columns produced by the indicator
+        ind_cols = [c for c in result.columns if c not in chunk.columns]
+        if not ind_cols:
+            return None
+
+        # Drop the warmup rows again
+        return result.select(ind_cols).slice(from_idx - calc_from)
+
+    def _is_valid(self, segment: IndicatorSegment, fingerprint: Tuple, data: Dict[str, np.ndarray]) -> bool:
+        """Check a segment against the current plugin and view contents.
+
+        Args:
+            segment (IndicatorSegment): Segment to validate.
+            fingerprint (Tuple): Current plugin (mtime, size).
+            data (Dict[str, np.ndarray]): Per-field views of the view.
+
+        Returns:
+            bool: True if the segment can still be served.
+        """
+        # Plugin changed on disk (hot reload)
+        if tuple(segment.fingerprint) != tuple(fingerprint):
+            return False
+
+        # View shrunk below the segment (truncated or rebuilt)
+        if segment.end > len(data['ts']) or segment.columns.height == 0:
+            return False
+
+        # Boundary timestamps must still line up
+        if int(data['ts'][segment.start]) != segment.ts_first:
+            return False
+        if int(data['ts'][segment.end - 1]) != segment.ts_last:
+            return False
+
+        # Last stored bar must not have been rewritten
+        return [float(data[name][segment.end - 1]) for name in OHLCV] == list(segment.anchor)
+
+    def _side_path(self, file_path: str, symbol: str, ind_str: str) -> str:
+        """Return the Arrow side file path for an indicator of a view.
+
+        Args:
+            file_path (str): Path to the OHLCV binary of the view.
+            symbol (str): Trading symbol identifier.
+            ind_str (str): Indicator string.
+
+        Returns:
+            str: Path to the side file.
+        """
+        return os.path.join(os.path.dirname(file_path), STORE_DIRNAME, symbol, f"{ind_str}.arrow")
+
+    @staticmethod
+    def _meta_path(path: str) -> str:
+        """Return the JSON bookkeeping file of a side file."""
+        return os.path.splitext(path)[0] + ".json"
+
+    def _load(self, path: str) -> Optional[IndicatorSegment]:
+        """Load a persisted segment from an Arrow IPC stream side file.
+
+        Only the committed part of the stream (as recorded in the JSON file)
+        is read, batches of an interrupted append are ignored.
+
+        Args:
+            path (str): Side file path.
+
+        Returns:
+            Optional[IndicatorSegment]: The segment, or None if missing or unreadable.
+        """
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(self._meta_path(path), "rb") as f:
+                meta = orjson.loads(f.read())
+
+            # Read the committed stream, using memory-mapping for the load
+            with pa.memory_map(path, "r") as source:
+                committed = source.read_buffer(meta['nbytes'])
+                table = pa.ipc.open_stream(committed).read_all()
+
+            # The bookkeeping must belong to this file
+            if table.schema.metadata[STORE_METADATA_KEY].decode() != meta['file_id']:
+                return None
+            if table.num_rows != meta['rows']:
+                return None
+
+            return IndicatorSegment(
+                start=meta['start'],
+                parts=[pl.from_arrow(table)],
+                ts_first=meta['ts_first'],
+                ts_last=meta['ts_last'],
+                anchor=meta['anchor'],
+                fingerprint=tuple(meta['fingerprint']),
+                file_id=meta['file_id'],
+                nbytes=meta['nbytes'],
+                batches=meta['batches']
+            )
+        except Exception:
+            # Corrupt or foreign file, recompute and overwrite
+            return None
+
+    def _save(self, path: str, segment: IndicatorSegment) -> None:
+        """Persist a segment atomically as an Arrow IPC stream side file.
+
+        Write failures (e.g. read-only data directories) are ignored, the
+        segment remains available in memory.
+
+        Args:
+            path (str): Side file path.
+            segment (IndicatorSegment): Segment to write.
+        """
+        # Unique temp file per process/thread, multiple HTTP workers may race
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # A new file id ties the bookkeeping to this file
+            file_id = uuid.uuid4().hex
+            table = segment.columns.to_arrow().combine_chunks()
+            table = table.replace_schema_metadata({STORE_METADATA_KEY: file_id.encode()})
+
+            # Write to the temp file, then atomically swap it in
+            with pa.OSFile(temp_path, "wb") as sink:
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                nbytes = sink.tell() - len(EOS_MARKER)
+
+            os.replace(temp_path, path)
+
+            segment.file_id, segment.nbytes, segment.batches = file_id, nbytes, len(table.to_batches())
+            self._commit(path, segment)
+        except OSError:
+            # Best effort, clean up and continue with the in-memory segment
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _append(self, path: str, segment: IndicatorSegment, rows: pl.DataFrame) -> None:
+        """Append rows to the side file of a segment as one record batch.
+
+        The stream is truncated to its committed length (dropping the
+        end-of-stream marker and an interrupted append), the batch is
+        written, then the new length is committed. A side file changed by
+        another process, or holding MAX_BATCHES batches, is rewritten.
+
+        Args:
+            path (str): Side file path.
+            segment (IndicatorSegment): The extended segment.
+            rows (pl.DataFrame): Rows appended to the segment.
+        """
+        try:
+            with open(self._meta_path(path), "rb") as f:
+                meta = orjson.loads(f.read())
+        except (OSError, ValueError):
+            meta = {}
+
+        # Not the file this segment was loaded from or written to
+        if (
+            segment.file_id is None
+            or meta.get('file_id') != segment.file_id
+            or meta.get('nbytes') != segment.nbytes
+            or segment.batches >= MAX_BATCHES
+        ):
+            self._save(path, segment)
+            return
+
+        try:
+            # Only the schema message is read
+            with pa.memory_map(path, "r") as source:
+                schema = pa.ipc.open_stream(source).schema.remove_metadata()
+
+            # Dictionary columns would need dictionary messages, rewrite instead
+            if any(pa.types.is_dictionary(field.type) for field in schema):
+                self._save(path, segment)
+                return
+
+            batch = rows.to_arrow().cast(schema).combine_chunks().to_batches()[0]
+            message = batch.serialize().to_pybytes()
+
+            with open(path, "r+b") as f:
+                f.truncate(segment.nbytes)
+                f.seek(segment.nbytes)
+                f.write(message + EOS_MARKER)
+
+            segment.nbytes += len(message)
+            segment.batches += 1
+            self._commit(path, segment)
+        except (OSError, ValueError, pa.ArrowException):
+            # Schema mismatch or write failure, start the file over
+            self._save(path, segment)
+
+    def _commit(self, path: str, segment: IndicatorSegment) -> None:
+        """Write the bookkeeping of a side file atomically.
+
+        Args:
+            path (str): Side file path.
+            segment (IndicatorSegment): Segment held by the side file.
+        """
+        meta_path = self._meta_path(path)
+        temp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(orjson.dumps({
+                    'file_id': segment.file_id,
+                    'nbytes': segment.nbytes,
+                    'batches': segment.batches,
+                    'rows': segment.columns.height,
+                    'start': segment.start,
+                    'ts_first': segment.ts_first,
+                    'ts_last': segment.ts_last,
+                    'anchor': segment.anchor,
+                    'fingerprint': list(segment.fingerprint)
+                }))
+            os.replace(temp_path, meta_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
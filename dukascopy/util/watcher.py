@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+ File:        watcher.py
+ Author:      JP Ueberbach
+ Created:     2026-10-16
+ Description: Change notifications for dataset and plugin directories.
+
+              Every query used to stat the dataset file of each view and
+              the plugin file of each requested indicator, only to find out
+              that nothing changed. The `ChangeWatcher` keeps a version
+              counter per file instead. Versions are bumped when the file is
+              created, written, replaced or deleted, so the query path
+              compares two integers and only stats files that actually
+              changed.
+
+              Backends:
+                - inotify (Linux, through ctypes, no extra dependency)
+                - polling: a background thread rescans the watched
+                  directories every `interval` seconds (other platforms,
+                  or when inotify is unavailable)
+
+              A watched directory may not exist yet, it is picked up when it
+              appears. Directories watched with `subdirs=True` also cover
+              their direct subdirectories (e.g. one per timeframe), new
+              subdirectories are added automatically.
+
+              `version(path)` returns None for files outside the watched
+              directories. Callers must then fall back to checking the file
+              themselves.
+
+ Usage:
+     watcher = ChangeWatcher(mode="auto", interval=1.0)
+     watcher.watch("data/aggregate/1m")
+     watcher.subscribe(lambda path, event: ...)
+     watcher.start()
+
+ Requirements:
+     - Python 3.8+
+
+ License:
+     MIT License
+===============================================================================
+"""
+import os
+import sys
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+    IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+# struct inotify_event header: wd, mask, cookie, len
+EVENT_HEADER = struct.Struct("iIII")
+
+# Events passed to subscribers
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+def _load_inotify():
+    """Return the libc handle if inotify is available, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class ChangeWatcher:
+    """
+    Per-file version counters driven by inotify or polling.
+    """
+
+    def __init__(self, mode: str = "auto", interval: float = 1.0):
+        """
+        Initialize the watcher (not started).
+
+        Args:
+            mode: "auto" (inotify if available, else polling), "inotify"
+                or "poll".
+            interval: Polling interval in seconds. With inotify it is the
+                interval at which missing directories are checked.
+        """
+        self.mode = mode
+        self.interval = interval
+        # Absolute file path -> version
+        self._versions: Dict[str, int] = {}
+        # Bumped on queue overflow, invalidates every file at once
+        self._epoch = 0
+        # Watched directories (absolute) -> watch subdirectories
+        self._dirs: Dict[str, bool] = {}
+        # Directories covered by the watcher (watched dirs + subdirs)
+        self._covered: Set[str] = set()
+        self._subscribers: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._libc = None
+        self._fd = -1
+        # inotify watch descriptor -> directory
+        self._wds: Dict[int, str] = {}
+        # Polling state: file -> (size, mtime_ns, ino)
+        self._stats: Dict[str, tuple] = {}
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Active backend ("inotify" or "poll"), None if not started."""
+        if self._thread is None:
+            return None
+        return "inotify" if self._fd >= 0 else "poll"
+
+    def subscribe(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Register a callback(path, event) for file changes.
+
+        Callbacks run on the watcher thread and must be quick.
+        """
+        self._subscribers.append(callback)
+
+    def watch(self, directory, subdirs: bool = False) -> None:
+        """
+        Watch the files of a directory.
+
+        Args:
+            directory: Directory to watch, may not exist yet.
+            subdirs: Also watch its direct subdirectories.
+        """
+        directory = os.path.abspath(str(directory))
+        with self._lock:
+            self._dirs[directory] = subdirs
+        if self._thread is not None:
+            self._attach(directory)
+
+    def version(self, path: str) -> Optional[int]:
+        """
+        Return the version of a file, None if it is not watched.
+
+        A dict lookup, no system calls. The version changes whenever the
+        file changed since the previous call returned.
+
+        Args:
+            path: Absolute file path.
+        """
+        if os.path.dirname(path) not in self._covered:
+            return None
+        return self._epoch + self._versions.get(path, 0)
+
+    def start(self) -> "ChangeWatcher":
+        """Start the background thread, returns self."""
+        if self._thread is not None:
+            return self
+
+        if self.mode in ("auto", "inotify"):
+            self._libc = _load_inotify()
+            if self._libc is not None:
+                fd = self._libc.inotify_init1(IN_CLOEXEC)
+                if fd >= 0:
+                    self._fd = fd
+            if self._fd < 0 and self.mode == "inotify":
+                raise OSError(errno.ENOSYS, "inotify is not available")
+
+        for directory in list(self._dirs):
+            if os.path.isdir(directory):
+                self._attach(directory, notify=False)
+            else:
+                # Checked for appearance by the thread, its files are then
+                # reported as created
+                with self._lock:
+                    self._covered.add(directory)
+
+        target = self._run_inotify if self._fd >= 0 else self._run_poll
+        self._thread = threading.Thread(target=target, name="change-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread and release the inotify descriptor."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(2.0, self.interval * 2))
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _bump(self, path: str, event: str) -> None:
+        """Increment the version of a file and notify subscribers."""
+        self._versions[path] = self._versions.get(path, 0) + 1
+        for callback in self._subscribers:
+            try:
+                callback(path, event)
+            except Exception as e:
+                print(f"Change watcher callback failed for {path}: {e}")
+
+    def _attach(self, directory: str, notify: bool = True) -> None:
+        """
+        Start watching a directory (and its subdirectories if requested).
+
+        Files already present are reported as created when `notify` is set
+        (a directory that appeared after start).
+        """
+        if not os.path.isdir(directory):
+            return
+
+        if self._fd >= 0:
+            if directory in self._wds.values():
+                return
+            wd = self._libc.inotify_add_watch(self._fd, directory.encode(), WATCH_MASK)
+            if wd < 0:
+                return
+            self._wds[wd] = directory
+
+        # Covered only once events are delivered
+        with self._lock:
+            self._covered.add(directory)
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+
+        for entry in entries:
+            if entry.is_dir():
+                if self._dirs.get(directory):
+                    self._dirs.setdefault(entry.path, False)
+                    self._attach(entry.path, notify)
+            elif self._fd < 0:
+                # Polling baseline
+                self._stats[entry.path] = self._fingerprint(entry)
+                if notify:
+                    self._bump(entry.path, CREATED)
+            elif notify:
+                self._bump(entry.path, CREATED)
+
+    def _missing(self) -> List[str]:
+        """Return the watched directories (and subdirectories) not attached yet."""
+        attached = set(self._wds.values())
+        return [d for d in self._dirs if d not in attached and os.path.isdir(d)]
+
+    def _run_inotify(self) -> None:
+        """inotify event loop."""
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], self.interval)
+            except (OSError, ValueError):
+                return
+
+            if not ready:
+                # Pick up watched directories that appeared meanwhile
+                for directory in self._missing():
+                    self._attach(directory)
+                continue
+
+            try:
+                buffer = os.read(self._fd, 65536)
+            except OSError:
+                return
+
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buffer):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length]
+                offset += EVENT_HEADER.size + length
+                self._handle(wd, mask, name.rstrip(b"\0").decode(errors="replace"))
+
+    def _handle(self, wd: int, mask: int, name: str) -> None:
+        """Process one inotify event."""
+        if mask & IN_Q_OVERFLOW:
+            # Events were lost, everything is stale
+            self._epoch += 1
+            return
+
+        directory = self._wds.get(wd)
+        if directory is None:
+            return
+
+        if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+            # Directory removed, re-attach when it comes back
+            self._wds.pop(wd, None)
+            self._epoch += 1
+            return
+
+        path = os.path.join(directory, name)
+
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO) and self._dirs.get(directory):
+                self._dirs.setdefault(path, False)
+                self._attach(path)
+            return
+
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            self._bump(path, CREATED)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            self._bump(path, DELETED)
+        else:
+            self._bump(path, MODIFIED)
+
+    @staticmethod
+    def _fingerprint(entry: os.DirEntry) -> tuple:
+        """Return (size, mtime_ns, ino) of a directory entry."""
+        stat = entry.stat()
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+    def _run_poll(self) -> None:
+        """Polling loop, rescans the watched directories."""
+        while not self._stop.wait(self.interval):
+            seen = {}
+            for directory, subdirs in list(self._dirs.items()):
+                if not os.path.isdir(directory):
+                    continue
+                with self._lock:
+                    self._covered.add(directory)
+                try:
+                    for entry in os.scandir(directory):
+                        if entry.is_dir():
+                            if subdirs and entry.path not in self._dirs:
+                                self._dirs[entry.path] = False
+                        else:
+                            seen[entry.path] = self._fingerprint(entry)
+                except OSError:
+                    continue
+
+            for path, fingerprint in seen.items():
+                previous = self._stats.get(path)
+                if previous is None:
+                    self._bump(path, CREATED)
+                elif previous != fingerprint:
+                    self._bump(path, MODIFIED)
+
+            for path in set(self._stats) - set(seen):
+                self._bump(path, DELETED)
+
+            self._stats = seen